@@ -0,0 +1,213 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* MB_Add applied to a plane (params unused) */
+static MB_errcode MB3D_AddPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Add(src1, src2, dest);
+}
+
+/*
+ * Adds the pixels of two 3D images plane by plane (see MB_Add for
+ * the allowed depths and the saturation).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Add(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_AddPlane);
+}
+
+/* MB_Sub applied to a plane (params unused) */
+static MB_errcode MB3D_SubPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Sub(src1, src2, dest);
+}
+
+/*
+ * Subtracts the pixels of the second 3D image from the pixels of the
+ * first one plane by plane (see MB_Sub for the allowed depths).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Sub(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_SubPlane);
+}
+
+/* MB_Mul applied to a plane (params unused) */
+static MB_errcode MB3D_MulPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Mul(src1, src2, dest);
+}
+
+/*
+ * Multiplies the pixels of two 3D images plane by plane (see MB_Mul for
+ * the allowed depths and the saturation).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Mul(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_MulPlane);
+}
+
+/* MB_Div applied to a plane (params unused) */
+static MB_errcode MB3D_DivPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Div(src1, src2, dest);
+}
+
+/*
+ * Divides the pixels of the first 3D image by the pixels of the second
+ * one plane by plane (see MB_Div for the allowed depths).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Div(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_DivPlane);
+}
+
+/* MB_Diff applied to a plane (params unused) */
+static MB_errcode MB3D_DiffPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Diff(src1, src2, dest);
+}
+
+/*
+ * Computes the set difference between two 3D images (see MB_Diff).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Diff(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_DiffPlane);
+}
+
+/* MB_ConAdd applied to a plane (src2 unused) */
+static MB_errcode MB3D_ConAddPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_ConAdd(src1, *((const Sint64 *) params), dest);
+}
+
+/*
+ * Adds a constant value to the pixels of a 3D image (see MB_ConAdd).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_ConAdd(MB3D_Image *src, Sint64 value, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src, NULL, dest, &value, MB3D_ConAddPlane);
+}
+
+/* MB_ConSub applied to a plane (src2 unused) */
+static MB_errcode MB3D_ConSubPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_ConSub(src1, *((const Sint64 *) params), dest);
+}
+
+/*
+ * Subtracts a constant value from the pixels of a 3D image (see
+ * MB_ConSub).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_ConSub(MB3D_Image *src, Sint64 value, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src, NULL, dest, &value, MB3D_ConSubPlane);
+}
+
+/* MB_ConMul applied to a plane (src2 unused) */
+static MB_errcode MB3D_ConMulPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_ConMul(src1, *((const Uint32 *) params), dest);
+}
+
+/*
+ * Multiplies the pixels of a 3D image by a constant value (see
+ * MB_ConMul).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_ConMul(MB3D_Image *src, Uint32 value, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src, NULL, dest, &value, MB3D_ConMulPlane);
+}
+
+/* MB_ConDiv applied to a plane (src2 unused) */
+static MB_errcode MB3D_ConDivPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_ConDiv(src1, *((const Uint32 *) params), dest);
+}
+
+/*
+ * Divides the pixels of a 3D image by a constant value (see MB_ConDiv).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_ConDiv(MB3D_Image *src, Uint32 value, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src, NULL, dest, &value, MB3D_ConDivPlane);
+}
+
+/* MB_Inv applied to a plane (src2 and params unused) */
+static MB_errcode MB3D_InvPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Inv(src1, dest);
+}
+
+/*
+ * Inverts the pixels values (logical NOT) of a 3D image.
+ * \param src source 3D image
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Inv(MB3D_Image *src, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src, NULL, dest, NULL, MB3D_InvPlane);
+}
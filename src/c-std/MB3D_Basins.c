@@ -60,7 +60,7 @@ MB_errcode MB3D_Basins(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, en
     }
 
     /* Invalid grid case */
-    if (grid==MB3D_INVALID_GRID)
+    if (grid!=MB3D_CUBIC_GRID && grid!=MB3D_FCC_GRID)
         return MB_ERR_BAD_PARAMETER;
     
     /* Only grey scale or 32-bit images can be segmented */
@@ -313,7 +313,7 @@ static void MB3D_InsertNeighbors_fcc(void *ctx, int x, int y, int z)
             if ((*p)==0x01000000) {
                 /* The neighbor is not tagged yet */
                 im = local_ctx->seq_src[nbz];
-                value = *((PIX32 *) (im->plines[nby] + nbx));
+                value = *((PIX32 *) (im->plines[nby] + nbx*4));
                 MB3D_InsertInHierarchicalList(local_ctx, nbx, nby, nbz, value);
                 /* The neighbor is updated with the pixel tag value*/
                 *p |= *pix;
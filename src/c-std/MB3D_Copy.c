@@ -0,0 +1,62 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* MB_Copy applied to a plane (src2 and params unused) */
+static MB_errcode MB3D_CopyPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Copy(src1, dest);
+}
+
+/*
+ * Copies a 3D image into another one of the same depth.
+ * \param src source 3D image
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Copy(MB3D_Image *src, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src, NULL, dest, NULL, MB3D_CopyPlane);
+}
+
+/* MB_ConSet applied to a plane (src1 and src2 unused) */
+static MB_errcode MB3D_ConSetPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_ConSet(dest, *((const Uint32 *) params));
+}
+
+/*
+ * Fills a 3D image with a constant value.
+ * \param dest the 3D image to fill
+ * \param value the constant value
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_ConSet(MB3D_Image *dest, Uint32 value)
+{
+    return MB3D_PlaneOperation(NULL, NULL, dest, &value, MB3D_ConSetPlane);
+}
@@ -35,6 +35,8 @@
 MB_errcode MB3D_Create(MB3D_Image *image, Uint32 length)
 {
     image->length = length;
+    image->pixels = NULL;
+    image->planes = NULL;
     image->seq = (MB_Image **) MB_malloc(length*sizeof(MB_Image *));
     if (image->seq==NULL) {
         return MB_ERR_CANT_ALLOCATE_MEMORY;
@@ -43,6 +45,88 @@ MB_errcode MB3D_Create(MB3D_Image *image, Uint32 length)
     return MB_NO_ERR;
 }
 
+/*
+ * Creates a 3D image whose images are stored one after the other in a single
+ * aligned pixel array. The images are created with the image (they must not
+ * be stacked) and are destroyed with it.
+ * \param image the created image
+ * \param width the width of the images
+ * \param height the height of the images
+ * \param depth the depth of the images
+ * \param length the length of the 3D image (number of images)
+ * \return an error code (MB_NO_ERR if everything went OK).
+ */
+MB_errcode MB3D_CreateContiguous(MB3D_Image *image, Uint32 width, Uint32 height,
+                                 Uint32 depth, Uint32 length)
+{
+    PLINE *plines;
+    PIX8 *pixarray;
+    Uint32 i, j;
+    Uint32 full_w;
+    Uint64 image_size, plane_size;
+    MB_errcode err;
+
+    /* Computation of the corrected size (see MB_Create) */
+    width = ((width + MB_ROUND_W-1) / MB_ROUND_W) * MB_ROUND_W;
+    height = ((height + MB_ROUND_H-1) / MB_ROUND_H) * MB_ROUND_H;
+
+    /* Verification over the image size */
+    image_size = ((Uint64)width) * height;
+    if (!(width > 0 && height > 0 && length > 0 &&
+        image_size <= MB_MAX_IMAGE_SIZE) ) {
+        return MB_ERR_BAD_IMAGE_DIMENSIONS;
+    }
+
+    /* Verification over the depth*/
+    if( (depth != 1) && (depth != 8) && (depth != 32) ){
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    err = MB3D_Create(image, length);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    /* Full width in bytes. The size of an image is a multiple of 16 bytes
+     * so that all the images are aligned like the images of MB_Create */
+    full_w = (width*depth+7)/8;
+    plane_size = ((Uint64)full_w) * height;
+
+    image->planes = (MB_Image *) MB_malloc(length*sizeof(MB_Image));
+    plines = (PLINE *) MB_malloc(((size_t)length)*height*sizeof(PLINE));
+    pixarray = (PIX8 *) MB_aligned_malloc((size_t)(plane_size*length), 16);
+    if (image->planes==NULL || plines==NULL || pixarray==NULL) {
+        /* In case allocation goes wrong */
+        MB_aligned_free(pixarray);
+        MB_free(plines);
+        MB_free(image->planes);
+        MB_free(image->seq);
+        image->planes = NULL;
+        image->seq = NULL;
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    image->pixels = pixarray;
+
+    /* Fills in the MB_Image structure of each image */
+    for (i=0; i<length; i++) {
+        MB_memset(pixarray, 0, (int) plane_size);
+        image->planes[i].plines = plines;
+        image->planes[i].pixels = pixarray;
+        image->planes[i].mapping = NULL;
+        image->planes[i].mapsize = 0;
+        image->planes[i].depth = depth;
+        image->planes[i].width = width;
+        image->planes[i].height = height;
+        for (j=0; j<height; j++, pixarray += full_w) {
+            plines[j] = (PLINE) pixarray;
+        }
+        plines += height;
+        image->seq[i] = &image->planes[i];
+    }
+
+    return MB_NO_ERR;
+}
+
 /*
  * Stack the 2D image at the given position.
  * \param image the 3D image
@@ -57,6 +141,11 @@ MB_errcode MB3D_Stack(MB3D_Image *image, MB_Image *stacked, Uint32 position)
     {
         return MB_ERR_BAD_SIZE;
     }
+    /* The images of a contiguous 3D image cannot be replaced */
+    if (image->pixels!=NULL)
+    {
+        return MB_ERR_BAD_PARAMETER;
+    }
     image->seq[position] = stacked;
     
     return MB_NO_ERR;
@@ -71,6 +160,15 @@ MB_errcode MB3D_Destroy(MB3D_Image *image)
 {
     if (image==NULL) return MB_NO_ERR;
     
+    if (image->pixels!=NULL) {
+        /* The images of a contiguous 3D image are destroyed with it */
+        MB_free(image->planes[0].plines);
+        MB_free(image->planes);
+        MB_aligned_free(image->pixels);
+        image->planes = NULL;
+        image->pixels = NULL;
+    }
     MB_free(image->seq);
+    image->seq = NULL;
     return MB_NO_ERR;
 }
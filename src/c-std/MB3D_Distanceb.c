@@ -422,7 +422,7 @@ MB_errcode MB3D_Distanceb(MB3D_Image *src, MB3D_Image *dest, enum MB3D_grid_t gr
         return MB_ERR_BAD_DEPTH;
     }
     /* Invalid grid case */
-    if (grid==MB3D_INVALID_GRID)
+    if (grid!=MB3D_CUBIC_GRID && grid!=MB3D_FCC_GRID)
         return MB_ERR_BAD_PARAMETER;
         
     /* Local context initialisation */
@@ -0,0 +1,1073 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+extern MB_errcode MB3D_Watershed8(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid);
+extern MB_errcode MB3D_Watershed32(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid);
+extern MB_errcode MB3D_Basins8(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid);
+extern MB_errcode MB3D_Basins32(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid);
+
+/* The serial floodings (MB3D_Watershed8/32 and MB3D_Basins8/32) process the */
+/* hierarchical list level by level and, inside a level, in the order of    */
+/* insertion of the pixels. This order is reproduced exactly by the slabs.   */
+/* Every queued pixel gets a key made of its level, of the level and the     */
+/* generation at which it was inserted and of the rank of the pixel which    */
+/* inserted it (with the index of the neighbor). Generation 0 of a level     */
+/* holds the pixels queued before the level is flooded, generation g+1 the   */
+/* pixels queued at this level by generation g. The ranks are numbered over  */
+/* all the slabs so the keys of the slabs can be compared.                   */
+/*                                                                           */
+/* The slabs flood a generation concurrently. A pixel whose neighbor in      */
+/* another slab comes first in the generation waits for it: the slab stops  */
+/* and goes on at the next round. The pixels of the first and last planes of */
+/* a slab (the shared planes) are only queued between two generations: every */
+/* slab proposes them and the proposal with the smallest key wins, as the    */
+/* first insertion does in the serial flooding.                              */
+
+/* Index of the pixels of the shared planes which are not in the generation */
+#define MB3D_NOT_FLOODED 0xffffffff
+
+/* Queued pixel with its key */
+typedef struct {
+    /* Rank of the pixel which inserted it times 32 plus the neighbor index */
+    Uint64 order;
+    /* Level of the pixel */
+    Uint32 level;
+    /* Level and generation at which the pixel was inserted */
+    Uint32 from, gen;
+    /* Position of the pixel (x + (y + z*height)*width) */
+    Uint32 pos;
+    /* Label given to the pixel by the pixel which inserted it (basins) */
+    PIX32 label;
+} MB3D_FloodToken;
+
+/* Growing array of tokens */
+typedef struct {
+    MB3D_FloodToken *tokens;
+    Uint32 size;
+    Uint32 capacity;
+} MB3D_FloodArray;
+
+/* Structure holding the information of a slab */
+typedef struct {
+    /* First plane of the slab and first plane of the next one */
+    Uint32 start, end;
+    /* Pixels queued for the next levels (binary heap on the keys) */
+    MB3D_FloodArray heap;
+    /* Pixels of the flooded generation (sorted on the keys) and their ranks */
+    MB3D_FloodArray current;
+    Uint64 *ranks;
+    Uint32 nbranks;
+    /* Pixels queued in the next generation by the slab */
+    MB3D_FloodArray next;
+    /* Pixels proposed to the previous slab, to this slab and to the next one */
+    MB3D_FloodArray proposals[3];
+    /* Working array */
+    MB3D_FloodArray work;
+    /* Number of pixels of the generation flooded and its value at the */
+    /* beginning of the round */
+    Uint32 progress, snapshot;
+    /* Error raised by the slab */
+    MB_errcode err;
+} MB3D_FloodSlab;
+
+/* Structure holding the function contextual information */
+typedef struct {
+    /* The size of the processed images */
+    Uint32 width, height, length;
+    /* Image sequences for the source and the marker */
+    MB_Image **seq_src;
+    MB_Image **seq_marker;
+    /* Depth of the source image */
+    Uint32 depth;
+    /* 1 to build the watershed line, 0 for the catchment basins only */
+    int watershed;
+    /* The grid used */
+    enum MB3D_grid_t grid;
+    /* The slabs */
+    int nb_slabs;
+    MB3D_FloodSlab *slabs;
+    /* The slab of every plane */
+    Uint32 *zslab;
+    /* Index in the flooded generation of the pixels of the shared planes */
+    /* (NULL for the other planes) */
+    Uint32 **shared;
+    /* The level and the generation flooded */
+    Uint32 level, gen;
+} MB3D_Flood_Ctx;
+
+/****************************************
+ * Token arrays                         *
+ ****************************************/
+
+/*
+ * Compares the keys of two tokens.
+ * \return a negative value if a comes first, a positive one if b does
+ */
+static INLINE int MB3D_FloodCompare(const MB3D_FloodToken *a, const MB3D_FloodToken *b)
+{
+    if (a->level!=b->level) return (a->level<b->level) ? -1 : 1;
+    if (a->from!=b->from) return (a->from<b->from) ? -1 : 1;
+    if (a->gen!=b->gen) return (a->gen<b->gen) ? -1 : 1;
+    if (a->order!=b->order) return (a->order<b->order) ? -1 : 1;
+    return 0;
+}
+
+/* Comparison function sorting the tokens on their keys */
+static int MB3D_FloodKeyCmp(const void *a, const void *b)
+{
+    return MB3D_FloodCompare((const MB3D_FloodToken *) a, (const MB3D_FloodToken *) b);
+}
+
+/* Comparison function sorting the tokens on their positions then keys */
+static int MB3D_FloodPosCmp(const void *a, const void *b)
+{
+    const MB3D_FloodToken *ta = (const MB3D_FloodToken *) a;
+    const MB3D_FloodToken *tb = (const MB3D_FloodToken *) b;
+
+    if (ta->pos!=tb->pos) return (ta->pos<tb->pos) ? -1 : 1;
+    return MB3D_FloodCompare(ta, tb);
+}
+
+/*
+ * Makes room for one more token in an array.
+ * \param array the token array
+ * \return 0 if the memory cannot be allocated
+ */
+static int MB3D_FloodGrow(MB3D_FloodArray *array)
+{
+    MB3D_FloodToken *tokens;
+    Uint32 i, capacity;
+
+    if (array->size<array->capacity)
+        return 1;
+    capacity = (array->capacity>0) ? 2*array->capacity : 1024;
+    tokens = (MB3D_FloodToken *) MB_malloc(((size_t) capacity)*sizeof(MB3D_FloodToken));
+    if (tokens==NULL)
+        return 0;
+    for(i=0; i<array->size; i++) {
+        tokens[i] = array->tokens[i];
+    }
+    MB_free(array->tokens);
+    array->tokens = tokens;
+    array->capacity = capacity;
+    return 1;
+}
+
+/*
+ * Adds a token at the end of an array.
+ * \param array the token array
+ * \param token the token added
+ * \return 0 if the memory cannot be allocated
+ */
+static INLINE int MB3D_FloodPush(MB3D_FloodArray *array, const MB3D_FloodToken *token)
+{
+    if (!MB3D_FloodGrow(array))
+        return 0;
+    array->tokens[array->size++] = *token;
+    return 1;
+}
+
+/*
+ * Adds a token into a heap.
+ * \param heap the token array holding the heap
+ * \param token the token added
+ * \return 0 if the memory cannot be allocated
+ */
+static int MB3D_FloodHeapPush(MB3D_FloodArray *heap, const MB3D_FloodToken *token)
+{
+    Uint32 i, parent;
+
+    if (!MB3D_FloodGrow(heap))
+        return 0;
+    i = heap->size++;
+    while(i>0) {
+        parent = (i-1)/2;
+        if (MB3D_FloodCompare(&heap->tokens[parent], token)<=0)
+            break;
+        heap->tokens[i] = heap->tokens[parent];
+        i = parent;
+    }
+    heap->tokens[i] = *token;
+    return 1;
+}
+
+/*
+ * Removes the first token of a heap.
+ * \param heap the token array holding the heap (not empty)
+ * \param token receives the removed token
+ */
+static void MB3D_FloodHeapPop(MB3D_FloodArray *heap, MB3D_FloodToken *token)
+{
+    MB3D_FloodToken last;
+    Uint32 i, child;
+
+    *token = heap->tokens[0];
+    last = heap->tokens[--heap->size];
+    i = 0;
+    for(child=1; child<heap->size; child=2*i+1) {
+        if (child+1<heap->size &&
+            MB3D_FloodCompare(&heap->tokens[child+1], &heap->tokens[child])<0)
+            child++;
+        if (MB3D_FloodCompare(&last, &heap->tokens[child])<=0)
+            break;
+        heap->tokens[i] = heap->tokens[child];
+        i = child;
+    }
+    if (heap->size>0)
+        heap->tokens[i] = last;
+}
+
+/****************************************
+ * Pixel access                         *
+ ****************************************/
+
+/* Pointer to the marker pixel at (x,y,z) */
+#define MARKER_PIXEL(ctx,x,y,z) ((PIX32 *) ((ctx)->seq_marker[z]->plines[y] + (x)*4))
+
+/*
+ * Reads the source value of a pixel.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param x the position in x of the pixel
+ * \param y the position in y of the pixel
+ * \param z the position in z of the pixel
+ * \return the value of the pixel
+ */
+static INLINE PIX32 MB3D_FloodValue(MB3D_Flood_Ctx *ctx, int x, int y, int z)
+{
+    if (ctx->depth==8)
+        return (PIX32) *(ctx->seq_src[z]->plines[y] + x);
+    return *((PIX32 *) (ctx->seq_src[z]->plines[y] + x*4));
+}
+
+/*
+ * Gives the neighbor offsets of the pixels of a line.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param y the line of the pixels
+ * \param z the plane of the pixels
+ * \param nb receives the number of offsets (the first one being the pixel)
+ * \return the offsets table
+ */
+static INLINE const int (*MB3D_FloodNeighbors(MB3D_Flood_Ctx *ctx, int y, int z, int *nb))[3]
+{
+    if (ctx->grid==MB3D_CUBIC_GRID) {
+        *nb = 27;
+        return cubeNbDir;
+    }
+    *nb = 13;
+    return fccNbDir[((z%3)<<1)+(y%2)];
+}
+
+/*
+ * Gives the index in the flooded generation of a pixel of another slab.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab reading the pixel
+ * \param x the position in x of the pixel
+ * \param y the position in y of the pixel
+ * \param z the position in z of the pixel
+ * \return the index, MB3D_NOT_FLOODED if the pixel is in slab s or not in
+ * the generation
+ */
+static INLINE Uint32 MB3D_FloodOtherIndex(MB3D_Flood_Ctx *ctx, int s, int x, int y, int z)
+{
+    if (((int) ctx->zslab[z])==s || ctx->shared[z]==NULL)
+        return MB3D_NOT_FLOODED;
+    return ctx->shared[z][x+y*ctx->width];
+}
+
+/****************************************
+ * Flooding of a generation             *
+ ****************************************/
+
+/*
+ * Queues a neighbor of a flooded pixel. The pixels of the shared planes
+ * are only proposed.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab of the flooded pixel
+ * \param x the position in x of the neighbor
+ * \param y the position in y of the neighbor
+ * \param z the position in z of the neighbor
+ * \param order the rank of the flooded pixel times 32 plus the neighbor index
+ * \param label the label of the flooded pixel
+ */
+static void MB3D_FloodQueue(MB3D_Flood_Ctx *ctx, int s, int x, int y, int z,
+                            Uint64 order, PIX32 label)
+{
+    MB3D_FloodSlab *slab = &ctx->slabs[s];
+    MB3D_FloodToken token;
+    PIX32 *p;
+    int t, ok;
+
+    /* The value is normed as we do not want to process */
+    /* already flooded levels */
+    token.level = MB3D_FloodValue(ctx, x, y, z);
+    token.level = (token.level<ctx->level) ? ctx->level : token.level;
+    token.from = ctx->level;
+    token.gen = ctx->gen+1;
+    token.order = order;
+    token.pos = x + (y + z*ctx->height)*ctx->width;
+    token.label = label;
+
+    t = (int) ctx->zslab[z];
+    if (t==s && ctx->shared[z]==NULL) {
+        /* Only this slab can queue the pixel, this is done at once */
+        p = MARKER_PIXEL(ctx, x, y, z);
+        if (ctx->watershed) {
+            *p = SET_STATUS(p, QUEUED);
+        } else {
+            *p |= label;
+        }
+        if (token.level==ctx->level) {
+            ok = MB3D_FloodPush(&slab->next, &token);
+        } else {
+            ok = MB3D_FloodHeapPush(&slab->heap, &token);
+        }
+    } else {
+        ok = MB3D_FloodPush(&slab->proposals[t-s+1], &token);
+    }
+    if (!ok)
+        slab->err = MB_ERR_CANT_ALLOCATE_MEMORY;
+}
+
+/*
+ * Tells if a pixel must wait for a neighbor of another slab flooded
+ * before it in the generation.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab of the pixel
+ * \param x the position in x of the pixel
+ * \param y the position in y of the pixel
+ * \param z the position in z of the pixel
+ * \param rank the rank of the pixel
+ * \return 1 if the pixel must wait
+ */
+static int MB3D_FloodBlocked(MB3D_Flood_Ctx *ctx, int s, int x, int y, int z, Uint64 rank)
+{
+    const int (*offsets)[3];
+    MB3D_FloodSlab *other;
+    int neighbor, nb, nbx, nby, nbz;
+    Uint32 idx;
+
+    /* Only the pixels of the shared planes have neighbors in other slabs */
+    if (ctx->shared[z]==NULL)
+        return 0;
+    offsets = MB3D_FloodNeighbors(ctx, y, z, &nb);
+    for(neighbor=1; neighbor<nb; neighbor++) {
+        nbx = x+offsets[neighbor][0];
+        nby = y+offsets[neighbor][1];
+        nbz = z+offsets[neighbor][2];
+        if (nbx>=0 && nbx<((int) ctx->width) &&
+            nby>=0 && nby<((int) ctx->height) &&
+            nbz>=0 && nbz<((int) ctx->length)) {
+            idx = MB3D_FloodOtherIndex(ctx, s, nbx, nby, nbz);
+            if (idx!=MB3D_NOT_FLOODED) {
+                other = &ctx->slabs[ctx->zslab[nbz]];
+                if (other->ranks[idx]<rank && idx>=other->snapshot)
+                    return 1;
+            }
+        }
+    }
+    return 0;
+}
+
+/*
+ * Floods a pixel and evaluates to which basin it belongs or if it is a
+ * point of the watershed (see MB3D_InsertNeighbors_cube in MB3D_Watershed8.c).
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab of the pixel
+ * \param x the position in x of the pixel
+ * \param y the position in y of the pixel
+ * \param z the position in z of the pixel
+ * \param rank the rank of the pixel
+ */
+static void MB3D_FloodWatershedPixel(MB3D_Flood_Ctx *ctx, int s, int x, int y, int z, Uint64 rank)
+{
+    const int (*offsets)[3];
+    int neighbor, nb, nbx, nby, nbz, nbcands, i;
+    int cands[27][4];
+    PIX32 *p, *pix, tag;
+    Uint32 idx;
+
+    pix = MARKER_PIXEL(ctx, x, y, z);
+    *pix = SET_STATUS(pix,RG_LAB);
+
+    /* The neighbors not yet processed or inserted are kept aside and */
+    /* queued if the pixel is not on the watershed at the end */
+    nbcands = 0;
+    offsets = MB3D_FloodNeighbors(ctx, y, z, &nb);
+    for(neighbor=1; neighbor<nb; neighbor++) {
+        nbx = x+offsets[neighbor][0];
+        nby = y+offsets[neighbor][1];
+        nbz = z+offsets[neighbor][2];
+        if (nbx>=0 && nbx<((int) ctx->width) && 
+            nby>=0 && nby<((int) ctx->height) &&
+            nbz>=0 && nbz<((int) ctx->length) ) {
+            idx = MB3D_FloodOtherIndex(ctx, s, nbx, nby, nbz);
+            if (idx!=MB3D_NOT_FLOODED &&
+                ctx->slabs[ctx->zslab[nbz]].ranks[idx]>rank) {
+                /* The neighbor of the other slab is still in the list */
+                continue;
+            }
+            p = MARKER_PIXEL(ctx, nbx, nby, nbz);
+            if( IS_PIXEL(p, CANDIDATE) ) {
+                cands[nbcands][0] = nbx;
+                cands[nbcands][1] = nby;
+                cands[nbcands][2] = nbz;
+                cands[nbcands][3] = neighbor;
+                nbcands++;
+            } else if ( IS_PIXEL(p, RG_LAB) ) {
+                /* The neighbor has already been processed and tagged */
+                tag = READ_LABEL(pix);
+                if (tag==0) {
+                    /* First neighbor we met with a tag, we take it */
+                    /* for our pixel */
+                    *pix |= READ_LABEL(p);
+                } else if ( tag!=READ_LABEL(p) ) {
+                    /* The tag of the neighbor is different that ours */
+                    /* the pixel belongs to the watershed */
+                    *pix = SET_STATUS(pix,WTS_LAB);
+                } 
+            }
+        }
+    }
+
+    if( !IS_PIXEL(pix, WTS_LAB) ) {
+        for(i=0; i<nbcands; i++) {
+            MB3D_FloodQueue(ctx, s, cands[i][0], cands[i][1], cands[i][2],
+                            rank*32+cands[i][3], 0);
+        }
+    }
+}
+
+/*
+ * Floods a pixel and queues its neighbors with its label (see
+ * MB3D_InsertNeighbors_cube in MB3D_Basins8.c).
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab of the pixel
+ * \param x the position in x of the pixel
+ * \param y the position in y of the pixel
+ * \param z the position in z of the pixel
+ * \param rank the rank of the pixel
+ */
+static void MB3D_FloodBasinsPixel(MB3D_Flood_Ctx *ctx, int s, int x, int y, int z, Uint64 rank)
+{
+    const int (*offsets)[3];
+    int neighbor, nb, nbx, nby, nbz;
+    PIX32 *p, *pix;
+
+    pix = MARKER_PIXEL(ctx, x, y, z);
+    *pix &= 0x00FFFFFF;
+
+    offsets = MB3D_FloodNeighbors(ctx, y, z, &nb);
+    for(neighbor=1; neighbor<nb; neighbor++) {
+        nbx = x+offsets[neighbor][0];
+        nby = y+offsets[neighbor][1];
+        nbz = z+offsets[neighbor][2];
+        if (nbx>=0 && nbx<((int) ctx->width) && 
+            nby>=0 && nby<((int) ctx->height) &&
+            nbz>=0 && nbz<((int) ctx->length) ) {
+            /* The pixels of the generation are never candidates */
+            if (MB3D_FloodOtherIndex(ctx, s, nbx, nby, nbz)!=MB3D_NOT_FLOODED)
+                continue;
+            p = MARKER_PIXEL(ctx, nbx, nby, nbz);
+            if ((*p)==CANDIDATE) {
+                MB3D_FloodQueue(ctx, s, nbx, nby, nbz, rank*32+neighbor, *pix);
+            }
+        }
+    }
+}
+
+/*
+ * Floods the pixels of the generation in a slab until one of them must
+ * wait for a neighbor of another slab.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab
+ */
+static void MB3D_FloodRound(MB3D_Flood_Ctx *ctx, int s)
+{
+    MB3D_FloodSlab *slab = &ctx->slabs[s];
+    Uint32 pos, x, y, z;
+    Uint64 rank;
+
+    while(slab->progress<slab->current.size && slab->err==MB_NO_ERR) {
+        pos = slab->current.tokens[slab->progress].pos;
+        rank = slab->ranks[slab->progress];
+        x = pos%ctx->width;
+        y = (pos/ctx->width)%ctx->height;
+        z = pos/(ctx->width*ctx->height);
+        if (ctx->watershed) {
+            if (MB3D_FloodBlocked(ctx, s, x, y, z, rank))
+                break;
+            MB3D_FloodWatershedPixel(ctx, s, x, y, z, rank);
+        } else {
+            MB3D_FloodBasinsPixel(ctx, s, x, y, z, rank);
+        }
+        slab->progress++;
+    }
+}
+
+/****************************************
+ * Generations                          *
+ ****************************************/
+
+/*
+ * Sets the index of the pixels of the shared planes in the generation.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab
+ * \param value 0 to reset the indexes, 1 to set them
+ */
+static void MB3D_FloodIndex(MB3D_Flood_Ctx *ctx, int s, int value)
+{
+    MB3D_FloodSlab *slab = &ctx->slabs[s];
+    Uint32 i, pos, z, plane;
+
+    plane = ctx->width*ctx->height;
+    for(i=0; i<slab->current.size; i++) {
+        pos = slab->current.tokens[i].pos;
+        z = pos/plane;
+        if (ctx->shared[z]!=NULL) {
+            ctx->shared[z][pos%plane] = value ? i : MB3D_NOT_FLOODED;
+        }
+    }
+}
+
+/*
+ * Queues the proposed pixels of a slab and builds its next generation.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab
+ */
+static void MB3D_FloodMerge(MB3D_Flood_Ctx *ctx, int s)
+{
+    MB3D_FloodSlab *slab = &ctx->slabs[s];
+    MB3D_FloodArray *proposals[3];
+    MB3D_FloodToken *token;
+    Uint32 i, j, k, n, x, y, z;
+    PIX32 *p;
+
+    proposals[0] = (s>0) ? &ctx->slabs[s-1].proposals[2] : NULL;
+    proposals[1] = &slab->proposals[1];
+    proposals[2] = (s<ctx->nb_slabs-1) ? &ctx->slabs[s+1].proposals[0] : NULL;
+
+    /* The proposals are gathered and sorted by pixel */
+    slab->work.size = 0;
+    for(k=0; k<3; k++) {
+        for(i=0; proposals[k]!=NULL && i<proposals[k]->size; i++) {
+            if (!MB3D_FloodPush(&slab->work, &proposals[k]->tokens[i])) {
+                slab->err = MB_ERR_CANT_ALLOCATE_MEMORY;
+                return;
+            }
+        }
+    }
+    qsort(slab->work.tokens, slab->work.size, sizeof(MB3D_FloodToken), MB3D_FloodPosCmp);
+
+    /* The first proposal of each pixel is the serial insertion */
+    for(i=0, n=0; i<slab->work.size; i++) {
+        token = &slab->work.tokens[i];
+        if (i>0 && token->pos==slab->work.tokens[i-1].pos)
+            continue;
+        x = token->pos%ctx->width;
+        y = (token->pos/ctx->width)%ctx->height;
+        z = token->pos/(ctx->width*ctx->height);
+        p = MARKER_PIXEL(ctx, x, y, z);
+        if (ctx->watershed) {
+            *p = SET_STATUS(p, QUEUED);
+        } else {
+            *p |= token->label;
+        }
+        if (token->level==ctx->level) {
+            slab->work.tokens[n++] = *token;
+        } else if (!MB3D_FloodHeapPush(&slab->heap, token)) {
+            slab->err = MB_ERR_CANT_ALLOCATE_MEMORY;
+            return;
+        }
+    }
+    qsort(slab->work.tokens, n, sizeof(MB3D_FloodToken), MB3D_FloodKeyCmp);
+
+    /* The next generation merges the pixels queued at once (already */
+    /* sorted) and the proposed ones */
+    MB3D_FloodIndex(ctx, s, 0);
+    slab->current.size = 0;
+    for(i=0, j=0; i<slab->next.size || j<n; ) {
+        if (j>=n || (i<slab->next.size &&
+            MB3D_FloodCompare(&slab->next.tokens[i], &slab->work.tokens[j])<0)) {
+            token = &slab->next.tokens[i++];
+        } else {
+            token = &slab->work.tokens[j++];
+        }
+        if (!MB3D_FloodPush(&slab->current, token)) {
+            slab->err = MB_ERR_CANT_ALLOCATE_MEMORY;
+            return;
+        }
+    }
+    slab->next.size = 0;
+    MB3D_FloodIndex(ctx, s, 1);
+}
+
+/*
+ * Computes the ranks of the pixels of the generation of a slab among all
+ * the pixels of the generation.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab
+ */
+static void MB3D_FloodRanks(MB3D_Flood_Ctx *ctx, int s)
+{
+    MB3D_FloodSlab *slab = &ctx->slabs[s];
+    MB3D_FloodArray *other;
+    Uint32 i, low, high, mid;
+    Uint64 rank;
+    int t;
+
+    if (slab->nbranks<slab->current.capacity) {
+        MB_free(slab->ranks);
+        slab->nbranks = slab->current.capacity;
+        slab->ranks = (Uint64 *) MB_malloc(((size_t) slab->nbranks)*sizeof(Uint64));
+        if (slab->ranks==NULL) {
+            slab->nbranks = 0;
+            slab->err = MB_ERR_CANT_ALLOCATE_MEMORY;
+            return;
+        }
+    }
+    for(i=0; i<slab->current.size; i++) {
+        rank = i;
+        for(t=0; t<ctx->nb_slabs; t++) {
+            if (t==s)
+                continue;
+            /* Number of pixels of slab t coming first */
+            other = &ctx->slabs[t].current;
+            low = 0;
+            high = other->size;
+            while(low<high) {
+                mid = low + (high-low)/2;
+                if (MB3D_FloodCompare(&other->tokens[mid], &slab->current.tokens[i])<0) {
+                    low = mid+1;
+                } else {
+                    high = mid;
+                }
+            }
+            rank += low;
+        }
+        slab->ranks[i] = rank;
+    }
+}
+
+/*
+ * Initializes a slab with the marker image.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab
+ */
+static void MB3D_FloodInit(MB3D_Flood_Ctx *ctx, int s)
+{
+    MB3D_FloodSlab *slab = &ctx->slabs[s];
+    MB3D_FloodToken token;
+    Uint32 x, y, z, i;
+    PIX32 *p;
+
+    for(z=slab->start; z<slab->end; z++) {
+        if (ctx->shared[z]!=NULL) {
+            for(i=0; i<ctx->width*ctx->height; i++) {
+                ctx->shared[z][i] = MB3D_NOT_FLOODED;
+            }
+        }
+    }
+
+    /* The markers make the first generation in raster order */
+    token.level = token.from = token.gen = 0;
+    token.label = 0;
+    for(z=slab->start; z<slab->end; z++) {
+        for(y=0; y<ctx->height; y++) {
+            for(x=0; x<ctx->width; x++) {
+                p = MARKER_PIXEL(ctx, x, y, z);
+                if (READ_LABEL(p)!=0) {
+                    token.pos = x + (y + z*ctx->height)*ctx->width;
+                    token.order = token.pos;
+                    if (!MB3D_FloodPush(&slab->current, &token)) {
+                        slab->err = MB_ERR_CANT_ALLOCATE_MEMORY;
+                        return;
+                    }
+                    if (ctx->watershed) {
+                        *p = SET_STATUS(p,QUEUED);
+                    }
+                } else {
+                    *p = CANDIDATE;
+                }
+            }
+        }
+    }
+    MB3D_FloodIndex(ctx, s, 1);
+}
+
+/*
+ * Takes the pixels of a level out of the heap of a slab to make the first
+ * generation of the level.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab
+ */
+static void MB3D_FloodLevel(MB3D_Flood_Ctx *ctx, int s)
+{
+    MB3D_FloodSlab *slab = &ctx->slabs[s];
+    MB3D_FloodToken token;
+
+    slab->current.size = 0;
+    while(slab->heap.size>0 && slab->heap.tokens[0].level==ctx->level) {
+        MB3D_FloodHeapPop(&slab->heap, &token);
+        if (!MB3D_FloodPush(&slab->current, &token)) {
+            slab->err = MB_ERR_CANT_ALLOCATE_MEMORY;
+            return;
+        }
+    }
+    MB3D_FloodIndex(ctx, s, 1);
+}
+
+/*
+ * Controls that all the pixels of a slab are tagged and if not tags them
+ * as being part of the watershed.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param s the slab
+ */
+static void MB3D_FloodControl(MB3D_Flood_Ctx *ctx, int s)
+{
+    Uint32 x, y, z;
+    PIX32 *p;
+
+    for(z=ctx->slabs[s].start; z<ctx->slabs[s].end; z++) {
+        for(y=0; y<ctx->height; y++) {
+            for(x=0; x<ctx->width; x++) {
+                p = MARKER_PIXEL(ctx, x, y, z);
+                if (IS_PIXEL(p, CANDIDATE)) {
+                    *p = SET_STATUS(p,WTS_LAB);
+                }
+            }
+        }
+    }
+}
+
+/****************************************
+ * Flooding driver                      *
+ ****************************************/
+
+/*
+ * Returns the first error raised by the slabs.
+ */
+static MB_errcode MB3D_FloodError(MB3D_Flood_Ctx *ctx)
+{
+    int s;
+
+    for(s=0; s<ctx->nb_slabs; s++) {
+        if (ctx->slabs[s].err!=MB_NO_ERR)
+            return ctx->slabs[s].err;
+    }
+    return MB_NO_ERR;
+}
+
+/*
+ * Floods the 3D image from the markers by slabs of planes.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param max_level the number of levels flooded (0 for all of them)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB3D_FloodSlabs(MB3D_Flood_Ctx *ctx, Uint32 max_level)
+{
+    MB_errcode err;
+    Uint32 size, level;
+    int s, n, found, done;
+
+    n = ctx->nb_slabs;
+#pragma omp parallel for num_threads(n) if(n>1)
+    for(s=0; s<n; s++) {
+        MB3D_FloodInit(ctx, s);
+    }
+    ctx->level = 0;
+    ctx->gen = 0;
+
+    for(;;) {
+        err = MB3D_FloodError(ctx);
+        if (err!=MB_NO_ERR)
+            return err;
+
+        size = 0;
+        for(s=0; s<n; s++) {
+            size += ctx->slabs[s].current.size;
+        }
+        if (size==0) {
+            /* The level is flooded, the next one is the lowest queued one */
+            found = 0;
+            level = 0;
+            for(s=0; s<n; s++) {
+                if (ctx->slabs[s].heap.size>0 &&
+                    (!found || ctx->slabs[s].heap.tokens[0].level<level)) {
+                    level = ctx->slabs[s].heap.tokens[0].level;
+                    found = 1;
+                }
+            }
+            if (!found || (max_level>0 && level>=max_level))
+                break;
+            ctx->level = level;
+            ctx->gen = 0;
+#pragma omp parallel for num_threads(n) if(n>1)
+            for(s=0; s<n; s++) {
+                MB3D_FloodLevel(ctx, s);
+            }
+            continue;
+        }
+
+        /* Ranks of the generation */
+#pragma omp parallel for num_threads(n) if(n>1)
+        for(s=0; s<n; s++) {
+            MB3D_FloodRanks(ctx, s);
+        }
+        err = MB3D_FloodError(ctx);
+        if (err!=MB_NO_ERR)
+            return err;
+
+        /* The generation is flooded in rounds */
+        for(s=0; s<n; s++) {
+            ctx->slabs[s].progress = 0;
+            ctx->slabs[s].proposals[0].size = 0;
+            ctx->slabs[s].proposals[1].size = 0;
+            ctx->slabs[s].proposals[2].size = 0;
+        }
+        do {
+            for(s=0; s<n; s++) {
+                ctx->slabs[s].snapshot = ctx->slabs[s].progress;
+            }
+#pragma omp parallel for num_threads(n) if(n>1)
+            for(s=0; s<n; s++) {
+                MB3D_FloodRound(ctx, s);
+            }
+            err = MB3D_FloodError(ctx);
+            if (err!=MB_NO_ERR)
+                return err;
+            done = 1;
+            for(s=0; s<n; s++) {
+                if (ctx->slabs[s].progress<ctx->slabs[s].current.size)
+                    done = 0;
+            }
+        } while(!done);
+
+        /* Building the next generation */
+#pragma omp parallel for num_threads(n) if(n>1)
+        for(s=0; s<n; s++) {
+            MB3D_FloodMerge(ctx, s);
+        }
+        ctx->gen++;
+    }
+
+    /* Control pass (only if all levels where flooded) */
+    if (ctx->watershed && max_level==0) {
+#pragma omp parallel for num_threads(n) if(n>1)
+        for(s=0; s<n; s++) {
+            MB3D_FloodControl(ctx, s);
+        }
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Performs the watershed segmentation or the catchment basins computation
+ * of a 3D image by slabs of planes flooded concurrently. The result is the
+ * one of MB3D_Watershed8/32 (MB3D_Basins8/32) whatever the number of slabs.
+ *
+ * \param src the greyscale or 32-bit 3D image to segment
+ * \param marker the marker 3D image in which the result of segmentation will be put
+ * \param max_level the number of levels flooded (0 for all of them)
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \param watershed 1 to build the watershed line, 0 for the catchment basins
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_SlabFlooding(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level,
+                             enum MB3D_grid_t grid, int watershed)
+{
+    MB3D_Flood_Ctx ctx;
+    MB_errcode err;
+    Uint32 z;
+    int s, k;
+
+    ctx.width = src->seq[0]->width;
+    ctx.height = src->seq[0]->height;
+    ctx.length = src->length;
+    ctx.seq_src = &src->seq[0];
+    ctx.seq_marker = &marker->seq[0];
+    ctx.depth = src->seq[0]->depth;
+    ctx.watershed = watershed;
+    ctx.grid = grid;
+    ctx.nb_slabs = (int) MB_SlabCount(src->length);
+
+    /* Allocating the slabs and the planes arrays */
+    ctx.slabs = (MB3D_FloodSlab *) MB_malloc(ctx.nb_slabs*sizeof(MB3D_FloodSlab));
+    ctx.zslab = (Uint32 *) MB_malloc(ctx.length*sizeof(Uint32));
+    ctx.shared = (Uint32 **) MB_malloc(ctx.length*sizeof(Uint32 *));
+    if (ctx.slabs==NULL || ctx.zslab==NULL || ctx.shared==NULL) {
+        /* In case allocation goes wrong */
+        MB_free(ctx.slabs);
+        MB_free(ctx.zslab);
+        MB_free(ctx.shared);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(ctx.slabs, 0, ctx.nb_slabs*sizeof(MB3D_FloodSlab));
+
+    /* The slabs and their shared planes */
+    err = MB_NO_ERR;
+    for(s=0; s<ctx.nb_slabs; s++) {
+        ctx.slabs[s].start = (s*ctx.length)/ctx.nb_slabs;
+        ctx.slabs[s].end = ((s+1)*ctx.length)/ctx.nb_slabs;
+        ctx.slabs[s].err = MB_NO_ERR;
+        for(z=ctx.slabs[s].start; z<ctx.slabs[s].end; z++) {
+            ctx.zslab[z] = s;
+        }
+    }
+    for(z=0; z<ctx.length; z++) {
+        ctx.shared[z] = NULL;
+        if ((z>0 && ctx.zslab[z-1]!=ctx.zslab[z]) ||
+            (z<ctx.length-1 && ctx.zslab[z+1]!=ctx.zslab[z])) {
+            ctx.shared[z] = (Uint32 *) MB_malloc(((size_t) ctx.width)*ctx.height*sizeof(Uint32));
+            if (ctx.shared[z]==NULL)
+                err = MB_ERR_CANT_ALLOCATE_MEMORY;
+        }
+    }
+
+    if (err==MB_NO_ERR)
+        err = MB3D_FloodSlabs(&ctx, max_level);
+
+    /* Freeing the memory */
+    for(z=0; z<ctx.length; z++) {
+        MB_free(ctx.shared[z]);
+    }
+    for(s=0; s<ctx.nb_slabs; s++) {
+        MB_free(ctx.slabs[s].heap.tokens);
+        MB_free(ctx.slabs[s].current.tokens);
+        MB_free(ctx.slabs[s].ranks);
+        MB_free(ctx.slabs[s].next.tokens);
+        MB_free(ctx.slabs[s].work.tokens);
+        for(k=0; k<3; k++) {
+            MB_free(ctx.slabs[s].proposals[k].tokens);
+        }
+    }
+    MB_free(ctx.slabs);
+    MB_free(ctx.zslab);
+    MB_free(ctx.shared);
+
+    return err;
+}
+
+/*
+ * Checks the images and the parameters of a flooding by slabs and performs
+ * it. The serial flooding is used when the planes cannot be split into
+ * several slabs.
+ *
+ * \param src the greyscale or 32-bit 3D image to segment
+ * \param marker the marker 3D image in which the result of segmentation will be put
+ * \param max_level the maximum level reached by the water
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \param watershed 1 to build the watershed line, 0 for the catchment basins
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB3D_SlabSegment(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level,
+                                   enum MB3D_grid_t grid, int watershed)
+{
+    /* Verification over depth and size */
+    if (!MB3D_CHECK_SIZE_2(src, marker)) {
+        return MB_ERR_BAD_SIZE;
+    }
+
+    /* Invalid grid case */
+    if (grid!=MB3D_CUBIC_GRID && grid!=MB3D_FCC_GRID)
+        return MB_ERR_BAD_PARAMETER;
+
+    /* Only grey scale or 32-bit images can be segmented */
+    /* the marker image is 32-bit */
+    switch (MB3D_PROBE_PAIR(src, marker)) {
+    case MB_PAIR_8_32:
+        /* Maximum level for flood cannot be greater than 256 */
+        if (max_level>256)
+            return MB_ERR_BAD_VALUE;
+        if (MB_SlabCount(src->length)<=1)
+            return watershed ? MB3D_Watershed8(src, marker, max_level, grid) :
+                               MB3D_Basins8(src, marker, max_level, grid);
+        return MB3D_SlabFlooding(src, marker, (max_level==256) ? 0 : max_level, grid, watershed);
+        break;
+    case MB_PAIR_32_32:
+        if (MB_SlabCount(src->length)<=1)
+            return watershed ? MB3D_Watershed32(src, marker, max_level, grid) :
+                               MB3D_Basins32(src, marker, max_level, grid);
+        return MB3D_SlabFlooding(src, marker, max_level, grid, watershed);
+        break;
+    default:
+        break;
+    }
+
+    return MB_ERR_BAD_DEPTH;
+}
+
+/*
+ * Performs a watershed segmentation of the 3D image using the 3D marker image
+ * as a starting point for the flooding. The planes of the image are split
+ * into slabs flooded concurrently by the threads. The result is the one of
+ * MB3D_Watershed.
+ *
+ * \param src the greyscale or 32-bit 3D image to segment
+ * \param marker the marker 3D image in which the result of segmentation will be put
+ * \param max_level the maximum level reached by the water
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_SlabWatershed(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid)
+{
+    return MB3D_SlabSegment(src, marker, max_level, grid, 1);
+}
+
+/*
+ * Computes the catchment basins of the 3D image using the 3D marker image
+ * as a starting point for the flooding. The planes of the image are split
+ * into slabs flooded concurrently by the threads. The result is the one of
+ * MB3D_Basins.
+ *
+ * \param src the greyscale or 32-bit 3D image to segment
+ * \param marker the marker 3D image in which the result of segmentation will be put
+ * \param max_level the maximum level reached by the water
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_SlabBasins(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid)
+{
+    return MB3D_SlabSegment(src, marker, max_level, grid, 0);
+}
@@ -0,0 +1,283 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_vector.h"
+
+/* Binary 3D images are rebuilt using a FIFO of pixel registers, as the     */
+/* 2D binary images. The queued registers are filled along the runs of the */
+/* mask they contain and then spread their pixels to the neighbor lines    */
+/* of the same plane and of the previous and next planes. The neighbor     */
+/* lines and the shifts of the pixels are deduced from the offsets of the  */
+/* 3D grid which depend on the parity of the line and on the plane.        */
+
+/* Number of line and plane configurations of the grids (face-centered */
+/* cubic grid has the largest one) */
+#define MB3D_BLD_CONFIGS 6
+
+/* Structure holding the function contextual information */
+typedef struct {
+    /* Number of pixel registers inside a line */
+    Uint32 nbregs;
+    /* The height of the processed images */
+    Uint32 height;
+    /* The length of the processed images */
+    Uint32 length;
+    /* Sequences of the mask and source/destination planes */
+    MB_Image **seq_mask;
+    MB_Image **seq_srcdest;
+    /* Value xored with the pixels to work on the complemented images */
+    MB_Vector1 inv;
+    /* Shifts of the neighbors in every line of the previous, current and */
+    /* next planes (bit 0 for x-1, bit 1 for x and bit 2 for x+1) */
+    Uint32 shifts[MB3D_BLD_CONFIGS][3][3];
+    /* The FIFO holding the queued registers positions */
+    Uint32 *fifo;
+    /* Read and write positions inside the FIFO and number of queued registers */
+    Uint32 first, last, count, size;
+    /* Flag set for every register currently inside the FIFO */
+    Uint8 *queued;
+} MB3D_HierarBldb_Ctx;
+
+/* Accessors to the registers of the images */
+#define SRCDEST_REG3D(ctx,x,y,z) (((MB_Vector1 *) ((ctx)->seq_srcdest[z]->plines[y]))[x])
+#define MASK_REG3D(ctx,x,y,z) ((((MB_Vector1 *) ((ctx)->seq_mask[z]->plines[y]))[x])^((ctx)->inv))
+
+/*
+ * Fills a register along the runs of the mask containing its pixels.
+ * The propagation is done by doubling the shift in both directions.
+ * \param reg the register pixels (included into mask)
+ * \param mask the mask register
+ * \return the filled register
+ */
+static INLINE MB_Vector1 MB3D_fill_register(MB_Vector1 reg, MB_Vector1 mask)
+{
+    MB_Vector1 gen, pro;
+    Uint32 shift;
+
+    /* Towards the most significant bits */
+    gen = reg;
+    pro = mask;
+    for(shift=1; shift<MB_vec1_size; shift<<=1) {
+        gen |= pro & (gen<<shift);
+        pro &= pro<<shift;
+    }
+    /* Towards the least significant bits */
+    pro = mask;
+    for(shift=1; shift<MB_vec1_size; shift<<=1) {
+        gen |= pro & (gen>>shift);
+        pro &= pro>>shift;
+    }
+
+    return gen;
+}
+
+/*
+ * Adds pixels to a register of the rebuilt image. The register is queued
+ * if it gained new pixels.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param x the position of the register inside the line
+ * \param y the line of the register
+ * \param z the plane of the register
+ * \param pixels the pixels propagated into the register
+ */
+static INLINE void MB3D_propagate_register(MB3D_HierarBldb_Ctx *ctx, int x, int y, int z, MB_Vector1 pixels)
+{
+    MB_Vector1 *p;
+    Uint32 pos;
+
+    /* The register must be in the image */
+    if (pixels==0 || x<0 || x>=((int) ctx->nbregs) || y<0 || y>=((int) ctx->height) ||
+        z<0 || z>=((int) ctx->length))
+        return;
+
+    p = &SRCDEST_REG3D(ctx,x,y,z);
+    pixels &= MASK_REG3D(ctx,x,y,z) & ~(*p);
+    if (pixels) {
+        *p |= pixels;
+        pos = x + (y + z*ctx->height)*ctx->nbregs;
+        if (!ctx->queued[pos]) {
+            ctx->queued[pos] = 1;
+            ctx->fifo[ctx->last] = pos;
+            ctx->last = (ctx->last+1)%ctx->size;
+            ctx->count++;
+        }
+    }
+}
+
+/*
+ * Computes the shifts of the neighbors of the lines for every configuration
+ * of the grid.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \return the number of configurations of the grid (the period of the planes
+ * times 2 for the parity of the lines)
+ */
+static Uint32 MB3D_grid_shifts(MB3D_HierarBldb_Ctx *ctx, enum MB3D_grid_t grid)
+{
+    const int *offset;
+    Uint32 configs, c, i, nb;
+
+    if (grid==MB3D_FCC_GRID) {
+        configs = 6;
+        nb = 13;
+    } else {
+        configs = 1;
+        nb = 27;
+    }
+    for(c=0; c<configs; c++) {
+        for(i=0; i<9; i++) {
+            ctx->shifts[c][i/3][i%3] = 0;
+        }
+        for(i=0; i<nb; i++) {
+            offset = (grid==MB3D_FCC_GRID) ? fccNbDir[c][i] : cubeNbDir[i];
+            ctx->shifts[c][offset[2]+1][offset[1]+1] |= 1<<(offset[0]+1);
+        }
+    }
+
+    return configs;
+}
+
+/*
+ * Rebuilds the binary 3D image inside the mask using the FIFO.
+ * \param mask the mask image
+ * \param srcdest the rebuild image
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \param inv 0 to rebuild the images, all bits set to rebuild their complement
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB3D_HierarBldb_FIFO(MB3D_Image *mask, MB3D_Image *srcdest, enum MB3D_grid_t grid, MB_Vector1 inv)
+{
+    MB3D_HierarBldb_Ctx ctx;
+    MB_Vector1 reg, pixels, left, right;
+    Uint32 pos, configs, shifts;
+    int x, y, z, dy, dz, c;
+
+    ctx.nbregs = MB_LINE_COUNT(srcdest->seq[0])/sizeof(MB_Vector1);
+    ctx.height = srcdest->seq[0]->height;
+    ctx.length = srcdest->length;
+    ctx.seq_mask = mask->seq;
+    ctx.seq_srcdest = srcdest->seq;
+    ctx.inv = inv;
+    ctx.size = ctx.nbregs*ctx.height*ctx.length;
+    configs = MB3D_grid_shifts(&ctx, grid);
+
+    /* Allocating the FIFO and the queued flags */
+    /* A register is never inside the FIFO twice */
+    ctx.fifo = MB_malloc(((size_t) ctx.size)*sizeof(Uint32));
+    if (ctx.fifo==NULL) {
+        /* in case allocation goes wrong */
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    ctx.queued = MB_malloc(((size_t) ctx.size)*sizeof(Uint8));
+    if (ctx.queued==NULL) {
+        /* In case allocation goes wrong */
+        /* freeing the FIFO */
+        MB_free(ctx.fifo);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* The rebuilt image is first restricted to the mask and all */
+    /* its non empty registers are queued */
+    ctx.first = ctx.last = ctx.count = 0;
+    for(z=0; z<((int) ctx.length); z++) {
+        for(y=0; y<((int) ctx.height); y++) {
+            for(x=0; x<((int) ctx.nbregs); x++) {
+                reg = (SRCDEST_REG3D(&ctx,x,y,z)^inv) & MASK_REG3D(&ctx,x,y,z);
+                SRCDEST_REG3D(&ctx,x,y,z) = reg;
+                pos = x + (y + z*ctx.height)*ctx.nbregs;
+                ctx.queued[pos] = (reg!=0);
+                if (reg) {
+                    ctx.fifo[ctx.count++] = pos;
+                }
+            }
+        }
+    }
+    ctx.last = ctx.count%ctx.size;
+
+    /* Flooding */
+    while(ctx.count>0) {
+        pos = ctx.fifo[ctx.first];
+        ctx.first = (ctx.first+1)%ctx.size;
+        ctx.queued[pos] = 0;
+        ctx.count--;
+        x = pos%ctx.nbregs;
+        y = (pos/ctx.nbregs)%ctx.height;
+        z = pos/(ctx.nbregs*ctx.height);
+
+        /* The register is filled along the mask runs */
+        reg = MB3D_fill_register(SRCDEST_REG3D(&ctx,x,y,z), MASK_REG3D(&ctx,x,y,z));
+        SRCDEST_REG3D(&ctx,x,y,z) = reg;
+
+        /* Spreading to the neighbor lines of the previous, current and */
+        /* next planes (the line itself gets its left and right registers) */
+        c = (configs==1) ? 0 : ((z%3)<<1)+(y%2);
+        for(dz=-1; dz<=1; dz++) {
+            for(dy=-1; dy<=1; dy++) {
+                shifts = ctx.shifts[c][dz+1][dy+1];
+                if (dz==0 && dy==0) {
+                    shifts &= 5;
+                }
+                if (shifts==0)
+                    continue;
+                pixels = 0;
+                left = right = 0;
+                if (shifts&1) {
+                    pixels |= reg>>1;
+                    left = (reg&1)<<(MB_vec1_size-1);
+                }
+                if (shifts&2) {
+                    pixels |= reg;
+                }
+                if (shifts&4) {
+                    pixels |= reg<<1;
+                    right = reg>>(MB_vec1_size-1);
+                }
+                MB3D_propagate_register(&ctx, x, y+dy, z+dz, pixels);
+                MB3D_propagate_register(&ctx, x-1, y+dy, z+dz, left);
+                MB3D_propagate_register(&ctx, x+1, y+dy, z+dz, right);
+            }
+        }
+    }
+
+    /* Back to the actual pixels values */
+    if (inv) {
+        for(z=0; z<((int) ctx.length); z++) {
+            for(y=0; y<((int) ctx.height); y++) {
+                for(x=0; x<((int) ctx.nbregs); x++) {
+                    SRCDEST_REG3D(&ctx,x,y,z) ^= inv;
+                }
+            }
+        }
+    }
+
+    MB_free(ctx.fifo);
+    MB_free(ctx.queued);
+
+    return MB_NO_ERR;
+}
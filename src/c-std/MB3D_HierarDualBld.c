@@ -25,6 +25,7 @@
  */
 #include "mambaApi_loc.h"
 
+extern MB_errcode MB3D_HierarDualBldb(MB3D_Image *mask, MB3D_Image *srcdest, enum MB3D_grid_t grid);
 extern MB_errcode MB3D_HierarDualBld8(MB3D_Image *mask, MB3D_Image *srcdest, enum MB3D_grid_t grid);
 extern MB_errcode MB3D_HierarDualBld32(MB3D_Image *mask, MB3D_Image *srcdest, enum MB3D_grid_t grid);
 
@@ -46,11 +47,14 @@ MB_errcode MB3D_HierarDualBld(MB3D_Image *mask, MB3D_Image *srcdest, enum MB3D_g
     }
     
     /* Invalid grid case */
-    if (grid==MB3D_INVALID_GRID)
+    if (grid!=MB3D_CUBIC_GRID && grid!=MB3D_FCC_GRID)
         return MB_ERR_BAD_PARAMETER;
 
-    /* Only grey scale can be rebuild */
+    /* Binary, greyscale and 32-bit images can be rebuilt */
     switch (MB3D_PROBE_PAIR(srcdest, mask)) {
+    case MB_PAIR_1_1:
+        return MB3D_HierarDualBldb(mask,srcdest,grid);
+        break;
     case MB_PAIR_8_8:
         return MB3D_HierarDualBld8(mask,srcdest,grid);
         break;
@@ -110,7 +110,7 @@ MB_errcode MB3D_Label(MB3D_Image *src, MB3D_Image *dest,
     if (lblow>=lbhigh) return MB_ERR_BAD_VALUE;
     if (lbhigh>256) return MB_ERR_BAD_VALUE;
     /* Invalid grid case */
-    if (grid==MB3D_INVALID_GRID)
+    if (grid!=MB3D_CUBIC_GRID && grid!=MB3D_FCC_GRID)
         return MB_ERR_BAD_PARAMETER;
     
     /* The output is necessarly a 32-bit image */
@@ -0,0 +1,138 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Computes the size in bytes of the pixels of a 3D image (8-bit or 32-bit).
+ * \param image the 3D image
+ * \param size the size of the pixels of one image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB3D_RawSize(MB3D_Image *image, Uint32 *size)
+{
+    Uint32 i;
+
+    if (image->length==0) {
+        return MB_ERR_BAD_SIZE;
+    }
+    /* Only 8-bit and 32-bit images can be loaded or extracted */
+    if (image->seq[0]->depth!=8 && image->seq[0]->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    for (i=1; i<image->length; i++) {
+        if (!MB_CHECK_SIZE_2(image->seq[0], image->seq[i])) {
+            return MB_ERR_BAD_SIZE;
+        }
+        if (image->seq[i]->depth!=image->seq[0]->depth) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+    *size = image->seq[0]->width*image->seq[0]->height*(image->seq[0]->depth/8);
+    /* The complete data must fit in the length given to the functions */
+    if (((Uint64)*size)*image->length > 0xffffffff) {
+        return MB_ERR_BAD_SIZE;
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Loads the pixels of all the images of a 3D image (8-bit or 32-bit) with
+ * the data given in argument (the images one after the other).
+ * \param image the 3D image to fill
+ * \param indata the data to fill the image with
+ * \param len the length of data given
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Load(MB3D_Image *image, PIX8 *indata, Uint32 len)
+{
+    Uint32 i, size;
+    MB_errcode err;
+
+    err = MB3D_RawSize(image, &size);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    /* The data given must be sufficient to fill the image */
+    if (len!=size*image->length) {
+        return MB_ERR_LOAD_DATA;
+    }
+
+    if (image->pixels!=NULL) {
+        /* Contiguous 3D image, the data is copied at once */
+        memcpy(image->pixels, indata, len);
+    } else {
+        for (i=0; i<image->length; i++, indata += size) {
+            MB_memcpy(image->seq[i]->pixels, indata, size);
+        }
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Reads the pixels of all the images of a 3D image (8-bit or 32-bit) and
+ * puts them in an array (the images one after the other).
+ * \param image the 3D image to read
+ * \param outdata pointer to the array created (malloc) and filled with the 
+ * pixel data of the 3D image
+ * \param len the length in bytes of data extracted (0 if an error occured)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Extract(MB3D_Image *image, PIX8 **outdata, Uint32 *len)
+{
+    Uint32 i, size;
+    PIX8 *data;
+    MB_errcode err;
+
+    *len = 0;
+    err = MB3D_RawSize(image, &size);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    /* Allocating the memory */
+    *outdata = MB_malloc(((size_t)size)*image->length);
+    if(*outdata==NULL){
+        /* In case allocation goes wrong */
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    *len = size*image->length;
+
+    if (image->pixels!=NULL) {
+        /* Contiguous 3D image, the data is copied at once */
+        memcpy(*outdata, image->pixels, *len);
+    } else {
+        data = *outdata;
+        for (i=0; i<image->length; i++, data += size) {
+            MB_memcpy(data, image->seq[i]->pixels, size);
+        }
+    }
+
+    return MB_NO_ERR;
+}
@@ -0,0 +1,118 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* MB_And applied to a plane (params unused) */
+static MB_errcode MB3D_AndPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_And(src1, src2, dest);
+}
+
+/*
+ * Performs a bitwise AND between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_And(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_AndPlane);
+}
+
+/* MB_Or applied to a plane (params unused) */
+static MB_errcode MB3D_OrPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Or(src1, src2, dest);
+}
+
+/*
+ * Performs a bitwise OR between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Or(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_OrPlane);
+}
+
+/* MB_Xor applied to a plane (params unused) */
+static MB_errcode MB3D_XorPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Xor(src1, src2, dest);
+}
+
+/*
+ * Performs a bitwise XOR between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Xor(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_XorPlane);
+}
+
+/* MB_Inf applied to a plane (params unused) */
+static MB_errcode MB3D_InfPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Inf(src1, src2, dest);
+}
+
+/*
+ * Determines the inferior value between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Inf(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_InfPlane);
+}
+
+/* MB_Sup applied to a plane (params unused) */
+static MB_errcode MB3D_SupPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Sup(src1, src2, dest);
+}
+
+/*
+ * Determines the superior value between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Sup(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, NULL, MB3D_SupPlane);
+}
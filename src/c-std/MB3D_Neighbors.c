@@ -0,0 +1,282 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* Conversion of the 3D directions into a plane offset (-1 for the previous */
+/* plane, 1 for the next one) and a 2D direction in this plane. In the */
+/* face-centered cubic and center cubic grids, the conversion depends on */
+/* the position of the plane (modulo 3 and 2 respectively) */
+static const int fccDirPlane[3][13][2] = {
+    {{0,0}, {0,1}, {0,2}, {0,3}, {0,4}, {0,5}, {0,6},
+     {-1,0}, {-1,5}, {-1,6}, {1,6}, {1,1}, {1,0}},
+    {{0,0}, {0,1}, {0,2}, {0,3}, {0,4}, {0,5}, {0,6},
+     {-1,3}, {-1,4}, {-1,0}, {1,5}, {1,0}, {1,4}},
+    {{0,0}, {0,1}, {0,2}, {0,3}, {0,4}, {0,5}, {0,6},
+     {-1,2}, {-1,0}, {-1,1}, {1,0}, {1,2}, {1,3}}
+};
+static const int ccDirPlane[2][17][2] = {
+    {{0,0}, {0,1}, {0,2}, {0,3}, {0,4}, {0,5}, {0,6}, {0,7}, {0,8},
+     {-1,0}, {-1,7}, {-1,8}, {-1,1}, {1,8}, {1,1}, {1,0}, {1,7}},
+    {{0,0}, {0,1}, {0,2}, {0,3}, {0,4}, {0,5}, {0,6}, {0,7}, {0,8},
+     {-1,4}, {-1,5}, {-1,0}, {-1,3}, {1,0}, {1,3}, {1,4}, {1,5}}
+};
+
+/*
+ * Splits the 3D neighbors of the points of plane z into the 2D neighbors
+ * taken in the previous plane, in the plane itself and in the next plane.
+ * \param neighbors the 3D neighbors (bit d set for direction d)
+ * \param z the position of the plane
+ * \param grid the 3D grid
+ * \param codes receives the 2D neighbors in the three planes
+ */
+static void MB3D_PlaneNeighbors(Uint32 neighbors, Uint32 z, enum MB3D_grid_t grid, Uint32 codes[3])
+{
+    const int *conv;
+    int d;
+
+    codes[0] = codes[1] = codes[2] = 0;
+    for(d=0; d<27; d++) {
+        if (neighbors&(1<<d)) {
+            switch(grid) {
+            case MB3D_FCC_GRID:
+                conv = fccDirPlane[z%3][d];
+                break;
+            case MB3D_CC_GRID:
+                conv = ccDirPlane[z%2][d];
+                break;
+            default:
+                /* Cubic grid, the directions are numbered plane by plane */
+                codes[d<9 ? 1 : (d<18 ? 0 : 2)] |= 1<<(d<9 ? d : (d<18 ? d-9 : d-18));
+                continue;
+            }
+            codes[conv[0]+1] |= 1<<conv[1];
+        }
+    }
+}
+
+/*
+ * Creates a plane with the size and depth of another one.
+ * \param model the model image
+ * \param plane receives the created plane
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB3D_CreatePlane(MB_Image *model, MB_Image **plane)
+{
+    MB_errcode err;
+
+    *plane = MB_malloc(sizeof(MB_Image));
+    if (*plane==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    err = MB_Create(*plane, model->width, model->height, model->depth);
+    if (err!=MB_NO_ERR) {
+        MB_free(*plane);
+        *plane = NULL;
+    }
+    return err;
+}
+
+/*
+ * Computes the planes of a slab of the 3D image. When the operation is
+ * performed in place, the original values of the previous and current
+ * planes are kept in two rolling buffers.
+ * \param src the source 3D image
+ * \param srcdest the destination 3D image
+ * \param start the first plane of the slab
+ * \param end the plane following the slab
+ * \param before the original plane before the slab (or the edge plane)
+ * \param after the original plane after the slab (or the edge plane)
+ * \param buffers two planes used as rolling buffers (in place only)
+ * \param neighbors the 3D neighbors
+ * \param grid the 3D grid
+ * \param grid2D the 2D grid of the planes
+ * \param edge the kind of edge
+ * \param nbfunc the 2D neighbor operation
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB3D_NeighborSlab(MB3D_Image *src, MB3D_Image *srcdest,
+                                    Uint32 start, Uint32 end,
+                                    MB_Image *before, MB_Image *after, MB_Image **buffers,
+                                    Uint32 neighbors, enum MB3D_grid_t grid,
+                                    enum MB_grid_t grid2D, enum MB_edgemode_t edge,
+                                    MB_NbOperation *nbfunc)
+{
+    MB_Image *prev, *cur, *next;
+    Uint32 codes[3];
+    Uint32 z;
+    MB_errcode err = MB_NO_ERR;
+
+    prev = before;
+    for(z=start; z<end && err==MB_NO_ERR; z++) {
+        if (buffers!=NULL) {
+            /* The plane is saved before being modified */
+            cur = (prev==buffers[0]) ? buffers[1] : buffers[0];
+            err = MB_Copy(src->seq[z], cur);
+        } else {
+            cur = src->seq[z];
+        }
+        next = (z+1<end) ? src->seq[z+1] : after;
+        MB3D_PlaneNeighbors(neighbors, z, grid, codes);
+        if (err==MB_NO_ERR && codes[0]!=0) {
+            err = nbfunc(prev, srcdest->seq[z], codes[0], grid2D, edge);
+        }
+        if (err==MB_NO_ERR && codes[1]!=0) {
+            err = nbfunc(cur, srcdest->seq[z], codes[1], grid2D, edge);
+        }
+        if (err==MB_NO_ERR && codes[2]!=0) {
+            err = nbfunc(next, srcdest->seq[z], codes[2], grid2D, edge);
+        }
+        prev = cur;
+    }
+
+    return err;
+}
+
+/*
+ * Applies a 2D neighbor operation (see MB_InfNb and MB_SupNb) to a 3D image
+ * with 3D neighbors. The planes outside the image are filled according to
+ * the edge.
+ *
+ * The 3D image is split into slabs of planes computed concurrently. When
+ * the source and destination are the same image, each slab keeps the
+ * original values of its planes in two rolling plane buffers and the planes
+ * bordering the slabs are saved beforehand.
+ *
+ * \param src the source 3D image in which the neighbors are taken
+ * \param srcdest the source of the central points and destination 3D image
+ * \param neighbors the 3D neighbors (bit d set for direction d)
+ * \param grid the 3D grid
+ * \param edge the kind of edge
+ * \param nbfunc the 2D neighbor operation
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_NeighborOperation(MB3D_Image *src, MB3D_Image *srcdest, Uint32 neighbors,
+                                  enum MB3D_grid_t grid, enum MB_edgemode_t edge,
+                                  MB_NbOperation *nbfunc)
+{
+    MB_Image **planes, *edge_plane;
+    MB_errcode *errs;
+    enum MB_grid_t grid2D;
+    Uint32 nb_slabs, nb_planes, start, end, b, i, inplace;
+    MB_errcode err;
+
+    /* Verification over image size compatibility */
+    if (!MB3D_CHECK_SIZE_2(src, srcdest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->seq[0]->depth!=srcdest->seq[0]->depth) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    /* Verification over the grid and the directions */
+    switch(grid) {
+    case MB3D_CUBIC_GRID:
+        grid2D = MB_SQUARE_GRID;
+        err = (neighbors>>27) ? MB_ERR_BAD_DIRECTION : MB_NO_ERR;
+        break;
+    case MB3D_FCC_GRID:
+        grid2D = MB_HEXAGONAL_GRID;
+        err = (neighbors>>13) ? MB_ERR_BAD_DIRECTION : MB_NO_ERR;
+        break;
+    case MB3D_CC_GRID:
+        grid2D = MB_SQUARE_GRID;
+        err = (neighbors>>17) ? MB_ERR_BAD_DIRECTION : MB_NO_ERR;
+        break;
+    default:
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (err!=MB_NO_ERR || neighbors==0) {
+        return err;
+    }
+
+    inplace = (src==srcdest);
+    nb_slabs = MB_SlabCount(src->length);
+    /* The edge plane, then for each slab the two rolling buffers and the */
+    /* original planes around it when the computation is made in place */
+    nb_planes = inplace ? 1+4*nb_slabs : 1;
+    planes = (MB_Image **) MB_malloc(nb_planes*sizeof(MB_Image *));
+    errs = (MB_errcode *) MB_malloc(nb_slabs*sizeof(MB_errcode));
+    if (planes==NULL || errs==NULL) {
+        MB_free(planes);
+        MB_free(errs);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(planes, 0, nb_planes*sizeof(MB_Image *));
+    err = MB_NO_ERR;
+    for(i=0; i<nb_planes && err==MB_NO_ERR; i++) {
+        err = MB3D_CreatePlane(src->seq[0], &planes[i]);
+    }
+    edge_plane = planes[0];
+    if (err==MB_NO_ERR) {
+        err = MB_ConSet(edge_plane, (edge==MB_FILLED_EDGE) ? 0xffffffff : 0);
+    }
+    if (err==MB_NO_ERR && inplace) {
+        for(b=0; b<nb_slabs && err==MB_NO_ERR; b++) {
+            start = (b*src->length)/nb_slabs;
+            end = ((b+1)*src->length)/nb_slabs;
+            if (start>0) {
+                err = MB_Copy(src->seq[start-1], planes[1+4*b+2]);
+            }
+            if (err==MB_NO_ERR && end<src->length) {
+                err = MB_Copy(src->seq[end], planes[1+4*b+3]);
+            }
+        }
+    }
+
+    if (err==MB_NO_ERR) {
+        /* The slabs are computed concurrently */
+#pragma omp parallel for num_threads(nb_slabs) if(nb_slabs>1) private(start, end)
+        for(b=0; b<nb_slabs; b++) {
+            start = (b*src->length)/nb_slabs;
+            end = ((b+1)*src->length)/nb_slabs;
+            if (inplace) {
+                errs[b] = MB3D_NeighborSlab(src, srcdest, start, end,
+                                            start>0 ? planes[1+4*b+2] : edge_plane,
+                                            end<src->length ? planes[1+4*b+3] : edge_plane,
+                                            planes+1+4*b, neighbors, grid, grid2D, edge, nbfunc);
+            } else {
+                errs[b] = MB3D_NeighborSlab(src, srcdest, start, end,
+                                            start>0 ? src->seq[start-1] : edge_plane,
+                                            end<src->length ? src->seq[end] : edge_plane,
+                                            NULL, neighbors, grid, grid2D, edge, nbfunc);
+            }
+        }
+        for(b=0; b<nb_slabs && err==MB_NO_ERR; b++) {
+            err = errs[b];
+        }
+    }
+
+    for(i=0; i<nb_planes; i++) {
+        if (planes[i]!=NULL) {
+            MB_Destroy(planes[i]);
+        }
+    }
+    MB_free(planes);
+    MB_free(errs);
+
+    return err;
+}
@@ -0,0 +1,83 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Applies a 2D operation to the planes of 3D images, plane z of the sources
+ * giving plane z of the destination. The 3D images are split into slabs of
+ * planes computed concurrently. As the planes are independent, the result
+ * does not depend on the number of threads.
+ * \param src1 the first 3D source image (can be NULL)
+ * \param src2 the second 3D source image (can be NULL)
+ * \param dest the 3D destination image
+ * \param params the parameters given to the 2D operation
+ * \param func the 2D operation
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_PlaneOperation(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest,
+                               const void *params, MB_PlaneOperation *func)
+{
+    Uint32 nb_slabs, b, z, start, end;
+    MB_errcode *errs;
+    MB_errcode err = MB_NO_ERR;
+
+    /* Verification over the length of the images, the 2D operation checks
+     * the size and depth of the planes */
+    if ((src1!=NULL && src1->length!=dest->length) ||
+        (src2!=NULL && src2->length!=dest->length)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (dest->length==0) {
+        return MB_NO_ERR;
+    }
+
+    nb_slabs = MB_SlabCount(dest->length);
+    errs = (MB_errcode *) MB_malloc(nb_slabs*sizeof(MB_errcode));
+    if (errs==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* The slabs are computed concurrently */
+#pragma omp parallel for num_threads(nb_slabs) if(nb_slabs>1) private(z, start, end)
+    for(b=0; b<nb_slabs; b++) {
+        start = (b*dest->length)/nb_slabs;
+        end = ((b+1)*dest->length)/nb_slabs;
+        errs[b] = MB_NO_ERR;
+        for(z=start; z<end && errs[b]==MB_NO_ERR; z++) {
+            errs[b] = func((src1!=NULL) ? src1->seq[z] : NULL,
+                           (src2!=NULL) ? src2->seq[z] : NULL,
+                           dest->seq[z], params);
+        }
+    }
+    for(b=0; b<nb_slabs && err==MB_NO_ERR; b++) {
+        err = errs[b];
+    }
+    MB_free(errs);
+
+    return err;
+}
@@ -0,0 +1,50 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Looks for the maximum between two 3D image pixels (a central pixel
+ * and its neighbors in the other 3D image). The neighbors are given by
+ * their directions in the 3D grid (bit d set for direction d). If no
+ * neighbor is defined, the function will leave silently doing nothing.
+ *
+ * The planes of the 3D images are processed concurrently, see
+ * MB3D_NeighborOperation.
+ *
+ * \param src source 3D image in which the neighbors are taken
+ * \param srcdest source of the central pixel and destination 3D image
+ * \param neighbors the neighbors to take into account
+ * \param grid the 3D grid used (cubic, face-centered cubic or center cubic)
+ * \param edge the kind of edge to use (behavior for pixels near edge depends on it)
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_SupNb(MB3D_Image *src, MB3D_Image *srcdest, Uint32 neighbors, enum MB3D_grid_t grid, enum MB_edgemode_t edge)
+{
+    return MB3D_NeighborOperation(src, srcdest, neighbors, grid, edge, MB_SupNb);
+}
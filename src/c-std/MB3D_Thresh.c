@@ -0,0 +1,116 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* MB_Thresh applied to a plane (src2 unused, params holds low and high) */
+static MB_errcode MB3D_ThreshPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Thresh(src1, dest, ((const Uint32 *) params)[0], ((const Uint32 *) params)[1]);
+}
+
+/*
+ * Thresholds a 3D image (see MB_Thresh). The pixels of the binary 3D
+ * destination image are set to 1 when the source pixel value is between
+ * the two thresholds (included) and to 0 otherwise.
+ * \param src source 3D image
+ * \param dest binary destination 3D image
+ * \param low the low threshold
+ * \param high the high threshold
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Thresh(MB3D_Image *src, MB3D_Image *dest, Uint32 low, Uint32 high)
+{
+    Uint32 thresholds[2];
+
+    thresholds[0] = low;
+    thresholds[1] = high;
+    return MB3D_PlaneOperation(src, NULL, dest, thresholds, MB3D_ThreshPlane);
+}
+
+/* MB_Mask applied to a plane (src2 unused, params holds the two values) */
+static MB_errcode MB3D_MaskPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Mask(src1, dest, ((const Uint32 *) params)[0], ((const Uint32 *) params)[1]);
+}
+
+/*
+ * Converts a binary 3D image into a 8-bit or 32-bit 3D image using a value
+ * for the pixels at 0 and a value for the pixels at 1 (see MB_Mask).
+ * \param src binary source 3D image
+ * \param dest destination 3D image
+ * \param maskf the value of the pixels at 0
+ * \param maskt the value of the pixels at 1
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Mask(MB3D_Image *src, MB3D_Image *dest, Uint32 maskf, Uint32 maskt)
+{
+    Uint32 values[2];
+
+    values[0] = maskf;
+    values[1] = maskt;
+    return MB3D_PlaneOperation(src, NULL, dest, values, MB3D_MaskPlane);
+}
+
+/* MB_SupMask applied to a plane (params holds the strict flag) */
+static MB_errcode MB3D_SupMaskPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_SupMask(src1, src2, dest, *((const Uint32 *) params));
+}
+
+/*
+ * Computes a binary 3D image where pixels are set to 1 when the pixels of
+ * 3D image 1 have greater values than pixels of 3D image 2 (see MB_SupMask).
+ * \param src1 source 3D image 1
+ * \param src2 source 3D image 2
+ * \param dest binary destination 3D image
+ * \param strict flag indicating if the comparison is strict or large
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_SupMask(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest, Uint32 strict)
+{
+    return MB3D_PlaneOperation(src1, src2, dest, &strict, MB3D_SupMaskPlane);
+}
+
+/* MB_Lookup applied to a plane (src2 unused, params is the table) */
+static MB_errcode MB3D_LookupPlane(MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params)
+{
+    return MB_Lookup(src1, dest, (Uint32 *) params);
+}
+
+/*
+ * Converts the pixels of a greyscale 3D image using a lookup table (see
+ * MB_Lookup).
+ * \param src source 3D image
+ * \param dest destination 3D image
+ * \param ptab the lookup table (256 values)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Lookup(MB3D_Image *src, MB3D_Image *dest, Uint32 *ptab)
+{
+    return MB3D_PlaneOperation(src, NULL, dest, ptab, MB3D_LookupPlane);
+}
@@ -345,10 +345,23 @@ static INLINE void MB_Flooding(MB_Basins32_Ctx *local_ctx, Uint32 max_level)
 MB_errcode MB_Basins32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid)
 {
     MB_Basins32_Ctx *local_ctx;
+    MB_Image *levels;
+    MB_errcode err;
+    
+    /* Images with sparse levels are flooded through the ranks of */
+    /* their levels */
+    err = MB_FloodingLevels32(src, &levels, &max_level);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    if (levels!=NULL) {
+        src = levels;
+    }
     
     local_ctx = (MB_Basins32_Ctx *)MB_malloc(sizeof(MB_Basins32_Ctx));
     if(local_ctx==NULL){
         /* In case allocation goes wrong */
+        MB_Destroy(levels);
         return MB_ERR_CANT_ALLOCATE_MEMORY;
     }
     
@@ -366,6 +379,7 @@ MB_errcode MB_Basins32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum M
     if(local_ctx->TokensArray==NULL){
         /* In case allocation goes wrong */
         MB_free(local_ctx);
+        MB_Destroy(levels);
         return MB_ERR_CANT_ALLOCATE_MEMORY;
     }
     
@@ -386,6 +400,8 @@ MB_errcode MB_Basins32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum M
     MB_free(local_ctx->TokensArray);
     /* Freeing the context */
     MB_free(local_ctx);
+    /* Freeing the ranks of the levels */
+    MB_Destroy(levels);
     
     return MB_NO_ERR;
 }
@@ -0,0 +1,131 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+/* This file is used to avoid code repetition between the cells
+ * reconstructions of greyscale and 32-bit images.
+ * It is used by the following files :
+ *    MB_CellsBld8.c
+ *    MB_CellsBld32.c
+ *
+ * You will need to define the following macro :
+ * PIX_TYPE (the type of the pixels of the processed images)
+ *
+ * The cells are the connected sets of pixels of the same value in the
+ * partition image. They are found one after the other in raster order and
+ * flooded with a FIFO of pixel positions. Once a cell is entirely inside
+ * the FIFO, all its pixels are given the maximum value of the markers met
+ * during the flooding. Every pixel is queued exactly once, so the result
+ * is obtained in a single pass over the image whatever the shape of the
+ * cells.
+ */
+
+/*
+ * Rebuilds the cells of the partition image marked by the marker image.
+ * \param cells the partition image
+ * \param srcdest the marker image, also holding the result
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_CellsBld_FIFO(MB_Image *cells, MB_Image *srcdest, enum MB_grid_t grid)
+{
+    Uint32 *fifo;
+    Uint8 *queued;
+    Uint32 width, height, size, pos, first, last, i, nbs;
+    int x, y, nbx, nby;
+    PIX_TYPE value, maxval;
+    const int (*nbdir)[2];
+
+    width = srcdest->width;
+    height = srcdest->height;
+    size = width*height;
+    nbs = (grid==MB_SQUARE_GRID) ? 8 : 6;
+
+    /* Allocating the FIFO and the queued flags */
+    /* A pixel is never inside the FIFO twice */
+    fifo = MB_malloc(size*sizeof(Uint32));
+    if (fifo==NULL) {
+        /* in case allocation goes wrong */
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    queued = MB_malloc(size*sizeof(Uint8));
+    if (queued==NULL) {
+        /* In case allocation goes wrong */
+        /* freeing the FIFO */
+        MB_free(fifo);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(queued, 0, size*sizeof(Uint8));
+
+#define CELL_PIX(x,y) (((PIX_TYPE *) (cells->plines[y]))[x])
+#define MARK_PIX(x,y) (((PIX_TYPE *) (srcdest->plines[y]))[x])
+
+    for(pos=0; pos<size; pos++) {
+        if (queued[pos])
+            continue;
+
+        /* A new cell is found, it is flooded from this pixel */
+        value = CELL_PIX(pos%width, pos/width);
+        maxval = 0;
+        queued[pos] = 1;
+        fifo[0] = pos;
+        first = 0;
+        last = 1;
+        while(first<last) {
+            x = fifo[first]%width;
+            y = fifo[first]/width;
+            first++;
+            if (MARK_PIX(x,y)>maxval)
+                maxval = MARK_PIX(x,y);
+
+            /* The neighbors of the same value are added to the cell */
+            nbdir = (grid==MB_SQUARE_GRID) ? sqNbDir : hxNbDir[y%2];
+            for(i=1; i<=nbs; i++) {
+                nbx = x+nbdir[i][0];
+                nby = y+nbdir[i][1];
+                if (nbx>=0 && nbx<((int) width) && nby>=0 && nby<((int) height)) {
+                    if (!queued[nbx+nby*width] && CELL_PIX(nbx,nby)==value) {
+                        queued[nbx+nby*width] = 1;
+                        fifo[last++] = nbx+nby*width;
+                    }
+                }
+            }
+        }
+
+        /* All the pixels of the cell take the value of its greatest marker */
+        for(first=0; first<last; first++) {
+            MARK_PIX(fifo[first]%width, fifo[first]/width) = maxval;
+        }
+    }
+
+#undef CELL_PIX
+#undef MARK_PIX
+
+    MB_free(fifo);
+    MB_free(queued);
+
+    return MB_NO_ERR;
+}
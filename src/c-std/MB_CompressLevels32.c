@@ -0,0 +1,217 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Sorts the array of values in increasing order (LSD radix sort on two
+ * 16-bit digits).
+ * \param values the array of values
+ * \param tmp an array of the same size used by the sort
+ * \param size the number of values
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_SortValues(PIX32 *values, PIX32 *tmp, Uint64 size)
+{
+    Uint64 *count;
+    Uint64 i, sum, n;
+    Uint32 shift, d;
+    PIX32 *in, *out, *swap;
+
+    count = (Uint64 *) MB_malloc(65536*sizeof(Uint64));
+    if (count==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    in = values;
+    out = tmp;
+    for(shift=0; shift<32; shift+=16) {
+        MB_memset(count, 0, 65536*sizeof(Uint64));
+        for(i=0; i<size; i++) {
+            count[(in[i]>>shift)&0xffff]++;
+        }
+        sum = 0;
+        for(d=0; d<65536; d++) {
+            n = count[d];
+            count[d] = sum;
+            sum += n;
+        }
+        for(i=0; i<size; i++) {
+            out[count[(in[i]>>shift)&0xffff]++] = in[i];
+        }
+        swap = in;
+        in = out;
+        out = swap;
+    }
+    /* after an even number of passes the result is back in values */
+    MB_free(count);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Returns the number of levels lower than value.
+ * \param levels the sorted array of levels
+ * \param nb_levels the number of levels
+ * \param value the value searched
+ * \return the position of the first level greater or equal to value
+ */
+static INLINE Uint32 MB_LevelRank(PIX32 *levels, Uint32 nb_levels, PIX32 value)
+{
+    Uint32 low = 0, high = nb_levels, mid;
+
+    while (low<high) {
+        mid = low + (high-low)/2;
+        if (levels[mid]<value) {
+            low = mid+1;
+        } else {
+            high = mid;
+        }
+    }
+    return low;
+}
+
+/*
+ * Compresses the grey levels of a 32-bit image: each pixel value is replaced
+ * by its rank among the values present in the image (value 0 always keeps
+ * rank 0). The order of the values is kept so a flooding of the resulting
+ * image processes the pixels in the same order as a flooding of the source
+ * image, but it only goes through the levels actually present.
+ * \param src the 32-bit source image
+ * \param dest the 32-bit image receiving the ranks
+ * \param limit a limit value
+ * \param limit_rank the rank corresponding to limit (number of levels of
+ * the image lower than limit)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_CompressLevels32(MB_Image *src, MB_Image *dest, PIX32 limit, Uint32 *limit_rank)
+{
+    PIX32 *values, *tmp, *p, *q;
+    Uint64 size, i, k;
+    Uint32 x, y, nb_levels;
+    MB_errcode err;
+
+    size = ((Uint64) src->width)*src->height;
+    /* one extra value for level 0 */
+    values = (PIX32 *) MB_malloc((size+1)*sizeof(PIX32));
+    tmp = (PIX32 *) MB_malloc((size+1)*sizeof(PIX32));
+    if (values==NULL || tmp==NULL) {
+        MB_free(values);
+        MB_free(tmp);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* Sorted list of the levels */
+    values[0] = 0;
+    for(y=0, k=1; y<src->height; y++) {
+        p = (PIX32 *) src->plines[y];
+        for(x=0; x<src->width; x++) {
+            values[k++] = p[x];
+        }
+    }
+    err = MB_SortValues(values, tmp, size+1);
+    MB_free(tmp);
+    if (err!=MB_NO_ERR) {
+        MB_free(values);
+        return err;
+    }
+    for(i=1, k=0; i<=size; i++) {
+        if (values[i]!=values[k]) {
+            values[++k] = values[i];
+        }
+    }
+    nb_levels = (Uint32) (k+1);
+
+    /* Rank of each pixel */
+    for(y=0; y<src->height; y++) {
+        p = (PIX32 *) src->plines[y];
+        q = (PIX32 *) dest->plines[y];
+        for(x=0; x<src->width; x++) {
+            q[x] = MB_LevelRank(values, nb_levels, p[x]);
+        }
+    }
+    *limit_rank = MB_LevelRank(values, nb_levels, limit);
+
+    MB_free(values);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Prepares the flooding of a 32-bit image by a hierarchical list. The list
+ * goes through all the levels between 0 and the maximum of the image, which
+ * is too long when the image holds few levels spread over a large range.
+ * In this case the image of the ranks of its levels is flooded instead (see
+ * MB_CompressLevels32), with the same result.
+ * \param src the 32-bit image to flood
+ * \param levels receives the image to flood in place of src (to be destroyed
+ * with MB_Destroy) or NULL if src can be flooded directly
+ * \param max_level the maximum level reached by the water (0 for all the
+ * levels), converted for the image to flood
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_FloodingLevels32(MB_Image *src, MB_Image **levels, Uint32 *max_level)
+{
+    PIX32 *p, maxval = 0;
+    Uint32 x, y, rank;
+    MB_errcode err;
+
+    *levels = NULL;
+    for(y=0; y<src->height; y++) {
+        p = (PIX32 *) src->plines[y];
+        for(x=0; x<src->width; x++) {
+            maxval = (p[x]>maxval) ? p[x] : maxval;
+        }
+    }
+    /* The levels are compressed when the range of values is larger than */
+    /* the number of pixels */
+    if (maxval<=0xffff || ((Uint64) maxval)<((Uint64) src->width)*src->height) {
+        return MB_NO_ERR;
+    }
+
+    *levels = (MB_Image *) MB_malloc(sizeof(MB_Image));
+    if (*levels==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    err = MB_Create(*levels, src->width, src->height, 32);
+    if (err!=MB_NO_ERR) {
+        MB_free(*levels);
+        *levels = NULL;
+        return err;
+    }
+    err = MB_CompressLevels32(src, *levels, *max_level, &rank);
+    if (err!=MB_NO_ERR) {
+        MB_Destroy(*levels);
+        *levels = NULL;
+        return err;
+    }
+    /* level 0 keeps rank 0 so a limited flooding keeps at least one level */
+    if (*max_level!=0) {
+        *max_level = rank;
+    }
+
+    return MB_NO_ERR;
+}
@@ -27,8 +27,8 @@
  */
 #include "mambaApi_loc.h"
 
-/* Image counter */
-static Uint32 MB_refcounter = 0;
+/* Image counter (images can be created and destroyed concurrently) */
+static volatile Uint32 MB_refcounter = 0;
 
 /*
  * \return the number of image that have been allocated so far.
@@ -97,6 +97,8 @@ MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth)
     MB_memset(pixarray, 0, full_w*full_h);
     image->plines = plines;
     image->pixels = pixarray;
+    image->mapping = NULL;
+    image->mapsize = 0;
     image->depth = depth;
     image->width = width;
     image->height = height;
@@ -105,11 +107,87 @@ MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth)
         plines[i] = (PLINE) pixarray;
     }
     
-    MB_refcounter++;
+    MB_ATOMIC_INC(MB_refcounter);
     
     return MB_NO_ERR;
 }
 
+/*
+ * Creates an image whose pixels are read directly from a region of a raw
+ * file mapped in memory (no copy is made). The region holds the image lines
+ * one after the other, each line having the size in bytes of the lines of
+ * the images created by MB_Create (width*depth/8). The size must already be
+ * a multiple of MB_ROUND_W for width and MB_ROUND_H for height.
+ * The image can be modified but the changes are never written into the
+ * file (copy-on-write).
+ * \param image the created image
+ * \param path the path of the raw file
+ * \param offset the position in bytes of the pixels in the file (it must be
+ * a multiple of 16)
+ * \param width the width of the created image
+ * \param height the height of the created image
+ * \param depth the depth of the created image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_CreateMapped(MB_Image *image, const char *path, Uint64 offset,
+                           Uint32 width, Uint32 height, Uint32 depth) {
+    PLINE *plines = NULL;
+    PIX8 *pixarray;
+    void *base;
+    Uint64 mapsize;
+    Uint32 i;
+    Uint32 full_w;
+    Uint64 image_size;
+
+    /* Verification over the image size */
+    image_size = ((Uint64)width) * height;
+    if (!(width > 0 && height > 0 && width%MB_ROUND_W==0 &&
+        height%MB_ROUND_H==0 && image_size <= MB_MAX_IMAGE_SIZE) ) {
+        return MB_ERR_BAD_IMAGE_DIMENSIONS;
+    }
+
+    /* Verification over the depth*/
+    if( (depth != 1) && (depth != 8) && (depth != 32) ){
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    /* The pixels must be aligned for the vectorization instructions */
+    if (offset%16!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    /* Full width in bytes */
+    full_w = (width*depth+7)/8;
+
+    plines = (PLINE *) MB_malloc(height*sizeof(PLINE));
+    if (plines==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    pixarray = (PIX8 *) MB_map_file(path, offset, ((Uint64) full_w)*height,
+                                    &base, &mapsize);
+    if (pixarray==NULL) {
+        MB_free(plines);
+        return MB_ERR_LOAD_DATA;
+    }
+
+    /* Fills in the MB_Image structure */
+    image->plines = plines;
+    image->pixels = pixarray;
+    image->mapping = base;
+    image->mapsize = mapsize;
+    image->depth = depth;
+    image->width = width;
+    image->height = height;
+
+    for (i=0;i<height;i++, pixarray += full_w) {
+        plines[i] = (PLINE) pixarray;
+    }
+
+    MB_ATOMIC_INC(MB_refcounter);
+
+    return MB_NO_ERR;
+}
+
 /*
  * Destroys an image (memory freeing).
  * \param image the image to be destroyed
@@ -118,12 +196,17 @@ MB_errcode MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth)
 MB_errcode MB_Destroy(MB_Image *image) {
     if (image==NULL) return MB_NO_ERR;
 
+    /* Only the images actually created are counted */
+    if (image->plines!=NULL) {
+        MB_ATOMIC_DEC(MB_refcounter);
+    }
     MB_free(image->plines);
-    MB_aligned_free(image->pixels);
-    MB_free(image);
-    if (MB_refcounter>0) {
-        MB_refcounter--;
+    if (image->mapping!=NULL) {
+        MB_unmap_file(image->mapping, image->mapsize);
+    } else {
+        MB_aligned_free(image->pixels);
     }
+    MB_free(image);
     
     return MB_NO_ERR;
 }
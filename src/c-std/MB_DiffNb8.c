@@ -152,6 +152,17 @@ MB_errcode MB_DiffNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum M
         return MB_ERR_BAD_DEPTH;
     }
 
+    /* No neighbors to take into account */
+    if (grid==MB_SQUARE_GRID) {
+        if ((neighbors&MB_NEIGHBOR_ALL_SQUARE)==0) {
+            return MB_NO_ERR;
+        }
+    } else {
+        if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
+            return MB_NO_ERR;
+        }
+    }
+
     /* If src and srcdest are the same image, we create a temporary */
     /* image where we copy the pixels value */
     if (src==srcdest) {
@@ -177,28 +188,15 @@ MB_errcode MB_DiffNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum M
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    if (grid==MB_SQUARE_GRID) {
-        if ((neighbors&MB_NEIGHBOR_ALL_SQUARE)==0) {
-            /* No neighbors to take into account */
-            return MB_NO_ERR;
-        }
-        MB_comp_neighbors_square(plines_inout, plines_in, bytes_in, temp->height,
-                                 neighbors, edge_val);
-    } else {
-        if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
-            /* No neighbors to take into account */
-            return MB_NO_ERR;
-        }
-        MB_comp_neighbors_hexagonal(plines_inout, plines_in, bytes_in, temp->height,
-                                    neighbors, edge_val);
-    }
+    err = MB_comp_neighbors(plines_inout, plines_in, bytes_in, temp->height,
+                            neighbors, grid, edge_val, edge);
 
     /* Destroying the temporary image if one was created */
     if (src==srcdest) {
         MB_Destroy(temp);
     }
     
-    return MB_NO_ERR;
+    return err;
 }
 
 
@@ -0,0 +1,573 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/* Decoded operation of an expression */
+typedef struct {
+    /* The operation */
+    Uint32 op;
+    /* Depth of the operand(s) */
+    Uint32 depth;
+    /* Pointer to the arguments of the operation inside the program */
+    Uint32 *args;
+} MB_Expr_Inst;
+
+/* Structure holding the decoded expression */
+typedef struct {
+    /* The decoded operations */
+    MB_Expr_Inst *insts;
+    /* The number of operations */
+    Uint32 nbinsts;
+    /* The maximum number of values inside the stack */
+    Uint32 stack_size;
+    /* The source images */
+    MB_Image **srcs;
+    /* The width of the images */
+    Uint32 width;
+} MB_Expr_Ctx;
+
+/* Number of arguments of each operation */
+static const Uint32 MB_expr_nbargs[] = {
+    1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 2, 1, 2, 3, 256
+};
+
+/****************************************
+ * Decoding                             *
+ ****************************************/
+
+/*
+ * Decodes the program of an expression and verifies it is correct.
+ * \param ctx the expression context (the operations array must hold at
+ * least proglen operations)
+ * \param nbsrcs the number of source images
+ * \param dest the destination image
+ * \param pprog the program
+ * \param proglen the number of values in the program
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_expr_decode(MB_Expr_Ctx *ctx, Uint32 nbsrcs, MB_Image *dest,
+                                 Uint32 *pprog, Uint32 proglen)
+{
+    Uint32 depths[MB_EXPR_STACK_SIZE];
+    Uint32 pc, op, sp = 0;
+    MB_Expr_Inst *inst;
+
+    ctx->nbinsts = 0;
+    ctx->stack_size = 0;
+    for(pc=0; pc<proglen; pc+=1+MB_expr_nbargs[op]) {
+        op = pprog[pc];
+        if (op>MB_EXPR_LOOKUP || pc+MB_expr_nbargs[op]>=proglen) {
+            return MB_ERR_BAD_VALUE;
+        }
+        inst = &ctx->insts[ctx->nbinsts++];
+        inst->op = op;
+        inst->args = pprog+pc+1;
+
+        switch(op) {
+        case MB_EXPR_LOAD:
+            /* The source image must exist and have the size of dest */
+            if (inst->args[0]>=nbsrcs || sp==MB_EXPR_STACK_SIZE) {
+                return MB_ERR_BAD_VALUE;
+            }
+            if (!MB_CHECK_SIZE_2(ctx->srcs[inst->args[0]], dest)) {
+                return MB_ERR_BAD_SIZE;
+            }
+            inst->depth = ctx->srcs[inst->args[0]]->depth;
+            depths[sp++] = inst->depth;
+            break;
+
+        case MB_EXPR_INF:
+        case MB_EXPR_SUP:
+        case MB_EXPR_AND:
+        case MB_EXPR_OR:
+        case MB_EXPR_XOR:
+        case MB_EXPR_ADD:
+        case MB_EXPR_SUB:
+        case MB_EXPR_DIFF:
+        case MB_EXPR_SUPMASK:
+            /* Both operands must have the same depth */
+            if (sp<2) {
+                return MB_ERR_BAD_VALUE;
+            }
+            sp--;
+            if (depths[sp]!=depths[sp-1]) {
+                return MB_ERR_BAD_DEPTH;
+            }
+            inst->depth = depths[sp];
+            if (op==MB_EXPR_SUPMASK) {
+                depths[sp-1] = 1;
+            }
+            break;
+
+        default:
+            /* Operations on the top value */
+            if (sp<1) {
+                return MB_ERR_BAD_VALUE;
+            }
+            inst->depth = depths[sp-1];
+            switch(op) {
+            case MB_EXPR_ADDCONST:
+            case MB_EXPR_SUBCONST:
+            case MB_EXPR_MULCONST:
+                if (inst->depth==1) {
+                    return MB_ERR_BAD_DEPTH;
+                }
+                break;
+            case MB_EXPR_THRESH:
+                if (inst->depth==1) {
+                    return MB_ERR_BAD_DEPTH;
+                }
+                if (inst->args[0]>inst->args[1]) {
+                    return MB_ERR_BAD_VALUE;
+                }
+                depths[sp-1] = 1;
+                break;
+            case MB_EXPR_MASK:
+                if (inst->depth!=1 || (inst->args[0]!=8 && inst->args[0]!=32)) {
+                    return MB_ERR_BAD_DEPTH;
+                }
+                depths[sp-1] = inst->args[0];
+                break;
+            case MB_EXPR_LOOKUP:
+                if (inst->depth!=8) {
+                    return MB_ERR_BAD_DEPTH;
+                }
+                break;
+            default:
+                break;
+            }
+            break;
+        }
+        if (sp>ctx->stack_size) {
+            ctx->stack_size = sp;
+        }
+    }
+
+    /* The program must leave a single value of the destination depth */
+    if (sp!=1) {
+        return MB_ERR_BAD_VALUE;
+    }
+    if (depths[0]!=dest->depth) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    return MB_NO_ERR;
+}
+
+/****************************************
+ * Line functions                       *
+ ****************************************/
+
+/* The stack lines hold one byte per pixel for binary (0 or 1) and */
+/* greyscale values and a PIX32 per pixel for 32-bit values. */
+
+/* Applies 'expr' to all the pixels of line 'pa' seen as an array of */
+/* 'type' values */
+#define MB_EXPR_LOOP1(type, expr) { \
+    type *a = (type *) pa; \
+    for(i=0; i<width; i++) { \
+        expr; \
+    } \
+}
+
+/* Applies 'expr' to all the pixels of lines 'pa' and 'pb' seen as arrays */
+/* of 'type' values */
+#define MB_EXPR_LOOP2(type, expr) { \
+    type *a = (type *) pa; \
+    type *b = (type *) pb; \
+    for(i=0; i<width; i++) { \
+        expr; \
+    } \
+}
+
+/* Same as MB_EXPR_LOOP2 with the type of the given depth */
+#define MB_EXPR_LOOP2_DEPTH(depth, expr) { \
+    if ((depth)==32) \
+        MB_EXPR_LOOP2(PIX32, expr) \
+    else \
+        MB_EXPR_LOOP2(PIX8, expr) \
+}
+
+/*
+ * Loads a line of an image into a stack line.
+ * \param pout the stack line
+ * \param pin the image line
+ * \param width the number of pixels in the line
+ * \param depth the depth of the image
+ */
+static INLINE void MB_expr_load_line(PLINE pout, PLINE pin, Uint32 width, Uint32 depth)
+{
+    Uint32 i;
+    Uint64 bytes;
+
+    switch(depth) {
+    case 1:
+        /* Each bit of the input byte is spread into a byte of value 0 or 1 */
+        for(i=0; i<width; i+=8, pin++, pout+=8) {
+            bytes = (((Uint64) *pin)*0x0101010101010101ULL) & 0x8040201008040201ULL;
+            bytes = ((bytes+0x7F7F7F7F7F7F7F7FULL)>>7) & 0x0101010101010101ULL;
+            MB_memcpy(pout, &bytes, 8);
+        }
+        break;
+    case 8:
+        MB_memcpy(pout, pin, width);
+        break;
+    default:
+        MB_memcpy(pout, pin, width*sizeof(PIX32));
+        break;
+    }
+}
+
+/*
+ * Stores a stack line into a line of an image.
+ * \param pout the image line
+ * \param pin the stack line
+ * \param width the number of pixels in the line
+ * \param depth the depth of the image
+ */
+static INLINE void MB_expr_store_line(PLINE pout, PLINE pin, Uint32 width, Uint32 depth)
+{
+    Uint32 i;
+    Uint64 bytes;
+
+    switch(depth) {
+    case 1:
+        /* Eight bytes of value 0 or 1 are gathered into a byte */
+        for(i=0; i<width; i+=8, pin+=8, pout++) {
+            MB_memcpy(&bytes, pin, 8);
+            *pout = (PIX8) ((bytes*0x0102040810204080ULL)>>56);
+        }
+        break;
+    case 8:
+        MB_memcpy(pout, pin, width);
+        break;
+    default:
+        MB_memcpy(pout, pin, width*sizeof(PIX32));
+        break;
+    }
+}
+
+/*
+ * Applies an operation with two operands to stack lines. The result is put
+ * in the first line.
+ * \param inst the operation
+ * \param pa the first operand line
+ * \param pb the second operand line
+ * \param pspare a spare line
+ * \param width the number of pixels in the line
+ * \return the line holding the result (pa or pspare)
+ */
+static INLINE PLINE MB_expr_binary_line(MB_Expr_Inst *inst, PLINE pa, PLINE pb,
+                                        PLINE pspare, Uint32 width)
+{
+    Uint32 i;
+    Uint32 depth = inst->depth;
+    PLINE pc;
+    PIX32 *a32, *b32;
+
+    switch(inst->op) {
+    case MB_EXPR_INF:
+        MB_EXPR_LOOP2_DEPTH(depth, a[i] = a[i]<b[i] ? a[i] : b[i]);
+        break;
+    case MB_EXPR_SUP:
+        MB_EXPR_LOOP2_DEPTH(depth, a[i] = a[i]>b[i] ? a[i] : b[i]);
+        break;
+    case MB_EXPR_AND:
+        MB_EXPR_LOOP2_DEPTH(depth, a[i] &= b[i]);
+        break;
+    case MB_EXPR_OR:
+        MB_EXPR_LOOP2_DEPTH(depth, a[i] |= b[i]);
+        break;
+    case MB_EXPR_XOR:
+        MB_EXPR_LOOP2_DEPTH(depth, a[i] ^= b[i]);
+        break;
+    case MB_EXPR_ADD:
+        if (depth==1) {
+            /* Binary addition is a union */
+            MB_EXPR_LOOP2(PIX8, a[i] |= b[i]);
+        } else if (depth==8) {
+            /* Saturated addition */
+            MB_EXPR_LOOP2(PIX8, a[i] = (a[i]+b[i])>255 ? 255 : a[i]+b[i]);
+        } else {
+            MB_EXPR_LOOP2(PIX32, a[i] += b[i]);
+        }
+        break;
+    case MB_EXPR_SUB:
+        if (depth==32) {
+            MB_EXPR_LOOP2(PIX32, a[i] -= b[i]);
+        } else {
+            /* Saturated subtraction (set difference for binary) */
+            MB_EXPR_LOOP2(PIX8, a[i] = a[i]>b[i] ? a[i]-b[i] : 0);
+        }
+        break;
+    case MB_EXPR_DIFF:
+#ifdef MB_VECTORIZATION_32
+        if (depth==32) {
+            /* Same comparison as the vectorized set difference */
+            MB_EXPR_LOOP2(Sint32, a[i] = a[i]>b[i] ? a[i] : 0);
+            break;
+        }
+#endif
+        MB_EXPR_LOOP2_DEPTH(depth, a[i] = a[i]>b[i] ? a[i] : 0);
+        break;
+    case MB_EXPR_SUPMASK:
+        if (depth==32) {
+            /* The binary result is put in the spare line */
+            a32 = (PIX32 *) pa;
+            b32 = (PIX32 *) pb;
+            if (inst->args[0]) {
+                for(i=0; i<width; i++) pspare[i] = a32[i]>b32[i];
+            } else {
+                for(i=0; i<width; i++) pspare[i] = a32[i]>=b32[i];
+            }
+            pc = pa;
+            pa = pspare;
+            pspare = pc;
+        } else if (inst->args[0]) {
+            MB_EXPR_LOOP2(PIX8, a[i] = a[i]>b[i]);
+        } else {
+            MB_EXPR_LOOP2(PIX8, a[i] = a[i]>=b[i]);
+        }
+        break;
+    default:
+        break;
+    }
+
+    return pa;
+}
+
+/*
+ * Applies an operation with a single operand to a stack line.
+ * \param inst the operation
+ * \param pa the operand line
+ * \param pspare a spare line
+ * \param width the number of pixels in the line
+ * \return the line holding the result (pa or pspare)
+ */
+static INLINE PLINE MB_expr_unary_line(MB_Expr_Inst *inst, PLINE pa, PLINE pspare, Uint32 width)
+{
+    Uint32 i;
+    Sint64 value;
+    Sint32 value8;
+    PIX32 low, high, maskf, maskt, mul;
+    PIX32 *a32;
+    Uint32 *args = inst->args;
+    Uint32 depth = inst->depth;
+
+    switch(inst->op) {
+    case MB_EXPR_NEGATE:
+        if (depth==1) {
+            MB_EXPR_LOOP1(PIX8, a[i] ^= 1);
+        } else {
+            if (depth==32) {
+                MB_EXPR_LOOP1(PIX32, a[i] = ~a[i]);
+            } else {
+                MB_EXPR_LOOP1(PIX8, a[i] = ~a[i]);
+            }
+        }
+        break;
+    case MB_EXPR_ADDCONST:
+    case MB_EXPR_SUBCONST:
+        value = (Sint64) (((Uint64) args[1])<<32 | args[0]);
+        if (depth==8) {
+            /* Saturated operation, the constant is reduced to 16 bits */
+            /* as in MB_ConAdd and MB_ConSub */
+            value8 = (Sint16) value;
+            if (inst->op==MB_EXPR_SUBCONST) {
+                value8 = -value8;
+            }
+            value8 = value8>255 ? 255 : (value8<-255 ? -255 : value8);
+            MB_EXPR_LOOP1(PIX8, a[i] = (a[i]+value8)>255 ? 255 : ((a[i]+value8)<0 ? 0 : a[i]+value8));
+        } else {
+            if (inst->op==MB_EXPR_SUBCONST) {
+                value = -value;
+            }
+            MB_EXPR_LOOP1(PIX32, a[i] = (PIX32) (a[i]+value));
+        }
+        break;
+    case MB_EXPR_MULCONST:
+        mul = args[0];
+        if (depth==8) {
+            /* Saturated operation */
+            MB_EXPR_LOOP1(PIX8, a[i] = (a[i]*mul)>255 ? 255 : a[i]*mul);
+        } else {
+            MB_EXPR_LOOP1(PIX32, a[i] *= mul);
+        }
+        break;
+    case MB_EXPR_THRESH:
+        low = args[0];
+        high = args[1];
+        if (depth==8) {
+            /* The limits are greyscale values as in MB_Thresh */
+            low = (PIX8) low;
+            high = (PIX8) high;
+            MB_EXPR_LOOP1(PIX8, a[i] = (a[i]>=low) && (a[i]<=high));
+        } else {
+            /* The binary result is put in the spare line */
+            a32 = (PIX32 *) pa;
+            for(i=0; i<width; i++) pspare[i] = (a32[i]>=low) && (a32[i]<=high);
+            pa = pspare;
+        }
+        break;
+    case MB_EXPR_MASK:
+        maskf = args[1];
+        maskt = args[2];
+        if (args[0]==8) {
+            MB_EXPR_LOOP1(PIX8, a[i] = a[i] ? (PIX8) maskt : (PIX8) maskf);
+        } else {
+            /* The 32-bit result is put in the spare line */
+            a32 = (PIX32 *) pspare;
+            for(i=0; i<width; i++) a32[i] = pa[i] ? maskt : maskf;
+            pa = pspare;
+        }
+        break;
+    case MB_EXPR_LOOKUP:
+        MB_EXPR_LOOP1(PIX8, a[i] = (PIX8) args[a[i]]);
+        break;
+    default:
+        break;
+    }
+
+    return pa;
+}
+
+/*
+ * Evaluates the expression over a band of lines.
+ * \param ctx the decoded expression
+ * \param buffer the memory for the stack lines used by the band
+ * \param dest the destination image
+ * \param start the first line of the band
+ * \param end the line after the last line of the band
+ */
+static void MB_expr_band(MB_Expr_Ctx *ctx, PLINE buffer, MB_Image *dest,
+                         Uint32 start, Uint32 end)
+{
+    Uint32 y, k, sp;
+    MB_Expr_Inst *inst;
+    MB_Image *src;
+    PLINE stack[MB_EXPR_STACK_SIZE+1], result, spare;
+    Uint32 width = ctx->width;
+
+    /* The last line is the spare line */
+    for(k=0; k<=ctx->stack_size; k++) {
+        stack[k] = buffer + k*width*sizeof(PIX32);
+    }
+
+    for(y=start; y<end; y++) {
+        sp = 0;
+        for(k=0, inst=ctx->insts; k<ctx->nbinsts; k++, inst++) {
+            switch(inst->op) {
+            case MB_EXPR_LOAD:
+                src = ctx->srcs[inst->args[0]];
+                MB_expr_load_line(stack[sp], src->plines[y], width, src->depth);
+                sp++;
+                break;
+            case MB_EXPR_INF:
+            case MB_EXPR_SUP:
+            case MB_EXPR_AND:
+            case MB_EXPR_OR:
+            case MB_EXPR_XOR:
+            case MB_EXPR_ADD:
+            case MB_EXPR_SUB:
+            case MB_EXPR_DIFF:
+            case MB_EXPR_SUPMASK:
+                sp--;
+                result = MB_expr_binary_line(inst, stack[sp-1], stack[sp],
+                                             stack[ctx->stack_size], width);
+                break;
+            default:
+                result = MB_expr_unary_line(inst, stack[sp-1],
+                                            stack[ctx->stack_size], width);
+                break;
+            }
+            if (inst->op!=MB_EXPR_LOAD && result!=stack[sp-1]) {
+                /* The result was put in the spare line, which takes the */
+                /* place of the operand line */
+                spare = stack[sp-1];
+                stack[sp-1] = result;
+                stack[ctx->stack_size] = spare;
+            }
+        }
+        MB_expr_store_line(dest->plines[y], stack[0], width, dest->depth);
+    }
+}
+
+/****************************************
+ * Main function                        *
+ ****************************************/
+
+/*
+ * Evaluates a point-wise expression over the source images and puts the
+ * result in the destination image.
+ * \param psrcs the array of source images
+ * \param nbsrcs the number of source images
+ * \param dest destination image
+ * \param pprog the program
+ * \param proglen the number of values in the program
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_Expression(MB_Image **psrcs, Uint32 nbsrcs, MB_Image *dest, Uint32 *pprog, Uint32 proglen)
+{
+    MB_Expr_Ctx ctx;
+    MB_errcode err;
+    PLINE buffers;
+    int b, nb_bands;
+
+    ctx.srcs = psrcs;
+    ctx.width = dest->width;
+    ctx.insts = MB_malloc((proglen+1)*sizeof(MB_Expr_Inst));
+    if (ctx.insts==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    err = MB_expr_decode(&ctx, nbsrcs, dest, pprog, proglen);
+    if (err!=MB_NO_ERR) {
+        MB_free(ctx.insts);
+        return err;
+    }
+
+    /* Each band has its own stack lines plus a spare line */
+    nb_bands = (int) MB_BandCount(dest->height);
+    buffers = MB_malloc(nb_bands*(ctx.stack_size+1)*ctx.width*sizeof(PIX32));
+    if (buffers==NULL) {
+        MB_free(ctx.insts);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+#pragma omp parallel for num_threads(nb_bands) if(nb_bands>1)
+    for(b=0; b<nb_bands; b++) {
+        MB_expr_band(&ctx, buffers+b*(ctx.stack_size+1)*ctx.width*sizeof(PIX32), dest,
+                     MB_BAND_START(b, nb_bands, dest->height),
+                     MB_BAND_START(b+1, nb_bands, dest->height));
+    }
+
+    MB_free(buffers);
+    MB_free(ctx.insts);
+
+    return MB_NO_ERR;
+}
@@ -27,6 +27,7 @@
  */
 #include "mambaApi_loc.h"
 
+extern MB_errcode MB_HierarBldb(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid);
 extern MB_errcode MB_HierarBld8(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid);
 extern MB_errcode MB_HierarBld32(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid);
 
@@ -47,8 +48,10 @@ MB_errcode MB_HierarBld(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid)
         return MB_ERR_BAD_SIZE;
     }
 
-    /* Only grey scale can be rebuild */
     switch (MB_PROBE_PAIR(srcdest, mask)) {
+    case MB_PAIR_1_1:
+        return MB_HierarBldb(mask,srcdest,grid);
+        break;
     case MB_PAIR_8_8:
         return MB_HierarBld8(mask,srcdest,grid);
         break;
@@ -0,0 +1,228 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_vector.h"
+
+/* Binary images are rebuilt using a FIFO of pixel registers. The queued  */
+/* registers are filled along the runs of the mask they contain and then  */
+/* spread their pixels to the registers of the same line and of the lines */
+/* above and below. A register is only queued again when it gains new     */
+/* pixels, so every register is handled a bounded number of times and the */
+/* result is obtained in a single pass whatever the shape of the mask.    */
+
+/* Structure holding the function contextual information */
+typedef struct {
+    /* Number of pixel registers inside a line */
+    Uint32 nbregs;
+    /* The height of the processed images */
+    Uint32 height;
+    /* Pointer to the lines of the mask image */
+    PLINE *plines_mask;
+    /* Pointer to the lines of the source/destination image */
+    PLINE *plines_srcdest;
+    /* Value xored with the pixels to work on the complemented images */
+    MB_Vector1 inv;
+    /* The FIFO holding the queued registers positions */
+    Uint32 *fifo;
+    /* Read and write positions inside the FIFO and number of queued registers */
+    Uint32 first, last, count;
+    /* Flag set for every register currently inside the FIFO */
+    Uint8 *queued;
+} MB_HierarBldb_Ctx;
+
+/* Accessors to the registers of the images */
+#define SRCDEST_REG(ctx,x,y) (((MB_Vector1 *) ((ctx)->plines_srcdest[y]))[x])
+#define MASK_REG(ctx,x,y) ((((MB_Vector1 *) ((ctx)->plines_mask[y]))[x])^((ctx)->inv))
+
+/*
+ * Fills a register along the runs of the mask containing its pixels.
+ * The propagation is done by doubling the shift in both directions.
+ * \param reg the register pixels (included into mask)
+ * \param mask the mask register
+ * \return the filled register
+ */
+static INLINE MB_Vector1 MB_fill_register(MB_Vector1 reg, MB_Vector1 mask)
+{
+    MB_Vector1 gen, pro;
+    Uint32 shift;
+
+    /* Towards the most significant bits */
+    gen = reg;
+    pro = mask;
+    for(shift=1; shift<MB_vec1_size; shift<<=1) {
+        gen |= pro & (gen<<shift);
+        pro &= pro<<shift;
+    }
+    /* Towards the least significant bits */
+    pro = mask;
+    for(shift=1; shift<MB_vec1_size; shift<<=1) {
+        gen |= pro & (gen>>shift);
+        pro &= pro>>shift;
+    }
+
+    return gen;
+}
+
+/*
+ * Adds pixels to a register of the rebuilt image. The register is queued
+ * if it gained new pixels.
+ * \param ctx pointer to the structure holding all the information needed 
+ * by the algorithm
+ * \param x the position of the register inside the line
+ * \param y the line of the register
+ * \param pixels the pixels propagated into the register
+ */
+static INLINE void MB_propagate_register(MB_HierarBldb_Ctx *ctx, int x, int y, MB_Vector1 pixels)
+{
+    MB_Vector1 *p;
+    Uint32 pos;
+
+    /* The register must be in the image */
+    if (pixels==0 || x<0 || x>=((int) ctx->nbregs) || y<0 || y>=((int) ctx->height))
+        return;
+
+    p = &SRCDEST_REG(ctx,x,y);
+    pixels &= MASK_REG(ctx,x,y) & ~(*p);
+    if (pixels) {
+        *p |= pixels;
+        pos = x + y*ctx->nbregs;
+        if (!ctx->queued[pos]) {
+            ctx->queued[pos] = 1;
+            ctx->fifo[ctx->last] = pos;
+            ctx->last = (ctx->last+1)%(ctx->nbregs*ctx->height);
+            ctx->count++;
+        }
+    }
+}
+
+/*
+ * Rebuilds the binary image inside the mask using the FIFO.
+ * \param mask the mask image
+ * \param srcdest the rebuild image
+ * \param grid the grid used (either square or hexagonal)
+ * \param inv 0 to rebuild the images, all bits set to rebuild their complement
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_HierarBldb_FIFO(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid, MB_Vector1 inv)
+{
+    MB_HierarBldb_Ctx ctx;
+    MB_Vector1 reg, up, left, right;
+    Uint32 pos, size;
+    int x, y;
+
+    ctx.nbregs = MB_LINE_COUNT(srcdest)/sizeof(MB_Vector1);
+    ctx.height = srcdest->height;
+    ctx.plines_mask = mask->plines;
+    ctx.plines_srcdest = srcdest->plines;
+    ctx.inv = inv;
+    size = ctx.nbregs*ctx.height;
+
+    /* Allocating the FIFO and the queued flags */
+    /* A register is never inside the FIFO twice */
+    ctx.fifo = MB_malloc(size*sizeof(Uint32));
+    if (ctx.fifo==NULL) {
+        /* in case allocation goes wrong */
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    ctx.queued = MB_malloc(size*sizeof(Uint8));
+    if (ctx.queued==NULL) {
+        /* In case allocation goes wrong */
+        /* freeing the FIFO */
+        MB_free(ctx.fifo);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* The rebuilt image is first restricted to the mask and all */
+    /* its non empty registers are queued */
+    ctx.first = ctx.last = ctx.count = 0;
+    for(y=0; y<((int) ctx.height); y++) {
+        for(x=0; x<((int) ctx.nbregs); x++) {
+            reg = (SRCDEST_REG(&ctx,x,y)^inv) & MASK_REG(&ctx,x,y);
+            SRCDEST_REG(&ctx,x,y) = reg;
+            pos = x + y*ctx.nbregs;
+            ctx.queued[pos] = (reg!=0);
+            if (reg) {
+                ctx.fifo[ctx.count++] = pos;
+            }
+        }
+    }
+    ctx.last = ctx.count%size;
+
+    /* Flooding */
+    while(ctx.count>0) {
+        pos = ctx.fifo[ctx.first];
+        ctx.first = (ctx.first+1)%size;
+        ctx.queued[pos] = 0;
+        ctx.count--;
+        x = pos%ctx.nbregs;
+        y = pos/ctx.nbregs;
+
+        /* The register is filled along the mask runs */
+        reg = MB_fill_register(SRCDEST_REG(&ctx,x,y), MASK_REG(&ctx,x,y));
+        SRCDEST_REG(&ctx,x,y) = reg;
+
+        /* Pixels at the ends of the register spread into the registers */
+        /* on their left and right */
+        left = (reg&1)<<(MB_vec1_size-1);
+        right = reg>>(MB_vec1_size-1);
+        MB_propagate_register(&ctx, x-1, y, left);
+        MB_propagate_register(&ctx, x+1, y, right);
+
+        /* Spreading to the lines above and below */
+        if (grid==MB_SQUARE_GRID) {
+            up = reg | (reg<<1) | (reg>>1);
+        } else if (y%2==0) {
+            /* Even lines neighbors are on the left */
+            up = reg | (reg>>1);
+            right = 0;
+        } else {
+            /* Odd lines neighbors are on the right */
+            up = reg | (reg<<1);
+            left = 0;
+        }
+        MB_propagate_register(&ctx, x, y-1, up);
+        MB_propagate_register(&ctx, x, y+1, up);
+        MB_propagate_register(&ctx, x-1, y-1, left);
+        MB_propagate_register(&ctx, x-1, y+1, left);
+        MB_propagate_register(&ctx, x+1, y-1, right);
+        MB_propagate_register(&ctx, x+1, y+1, right);
+    }
+
+    /* Back to the actual pixels values */
+    if (inv) {
+        for(y=0; y<((int) ctx.height); y++) {
+            for(x=0; x<((int) ctx.nbregs); x++) {
+                SRCDEST_REG(&ctx,x,y) ^= inv;
+            }
+        }
+    }
+
+    MB_free(ctx.fifo);
+    MB_free(ctx.queued);
+
+    return MB_NO_ERR;
+}
@@ -0,0 +1,98 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/****************************************
+ * Segment functions                    *
+ ****************************************/
+
+#define DATA_TYPE PIX32
+#define COMP(a,b) (((a)<(b)) ? (a) : (b))
+#define IN_LINE(pline,buf,width) ((PIX32 *) (pline))
+#define OUT_LINE(pline,buf) ((PIX32 *) (pline))
+#define STORE_LINE(pline,buf,width)
+
+#include "MB_Segment.h"
+
+#undef DATA_TYPE
+#undef COMP
+#undef IN_LINE
+#undef OUT_LINE
+#undef STORE_LINE
+
+/****************************************/
+/* Main function                        */
+/****************************************/
+
+/*
+ * Computes for each pixel the minimum of the pixels found on the segment
+ * starting at this pixel and made of size steps in the given direction.
+ * Pixels of the segment falling outside the image take the edge value.
+ * The computation time does not depend on the size of the segment.
+ *
+ * \param src source image
+ * \param dest destination image (can be the same as src)
+ * \param dirnum the direction of the segment
+ * \param size the size of the segment (number of steps)
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_InfSegment32(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 size, enum MB_grid_t grid, enum MB_edgemode_t edge)
+{
+    /* Error management */
+    /* Verification over image size compatibility */
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    /* Grid value and possible directions are connected, grid value is the */
+    /* maximum number of directions */
+    if(dirnum>6 && grid==MB_HEXAGONAL_GRID) {
+        return MB_ERR_BAD_DIRECTION;
+    }
+    if(dirnum>8 && grid==MB_SQUARE_GRID) {
+        return MB_ERR_BAD_DIRECTION;
+    }
+    /* Only 32-bit images can be processed */
+    switch (MB_PROBE_PAIR(src, dest)) {
+    case MB_PAIR_32_32:
+        break;
+    default:
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    /* A segment of size 0 or in direction 0 is the pixel itself */
+    if (size==0 || dirnum==0) {
+        return MB_Copy(src, dest);
+    }
+
+    return MB_comp_segment(dest->plines, src->plines,
+                           (Sint32) src->width, (Sint32) src->height,
+                           dirnum, size, grid, (PIX32) I32_FILL_VALUE(edge));
+}
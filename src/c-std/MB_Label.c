@@ -99,6 +99,213 @@ void MB_TidyLabel(PLINE *plines_out,
     }
 }
 
+/****************************************
+ * Band functions                       *
+ ****************************************
+ * The image is split into horizontal bands labelled concurrently, each one
+ * with its own range of labels. The bands are then merged along their seams.
+ */
+
+/*
+ * Merges two sets of labels (concurrent union). The root of greater value
+ * is linked to the other one with an atomic operation, so that seams can be
+ * merged concurrently.
+ * \param labels the labels arrays and context
+ * \param a a label
+ * \param b another label
+ */
+static void MB_MergeLabels(MB_Label_struct *labels, PIX32 a, PIX32 b)
+{
+    PIX32 swap;
+
+    for(;;) {
+        a = MB_find_above_label(labels, a);
+        b = MB_find_above_label(labels, b);
+        if (a==b) {
+            return;
+        }
+        if (a<b) {
+            swap = a;
+            a = b;
+            b = swap;
+        }
+        /* a is linked to b unless another thread linked it meanwhile */
+        if (MB_ATOMIC_CAS(labels->EQ[a], a, b)) {
+            return;
+        }
+    }
+}
+
+/*
+ * Merges the labels of the first line of a band with the ones of the last
+ * line of the previous band. Two neighbor pixels are in the same object if
+ * they have the same value in the source image.
+ * \param src the source image
+ * \param dest the 32-bit image where object are labelled
+ * \param line the first line of the band (always even)
+ * \param grid the grid used (either square or hexagonal)
+ * \param labels the labels arrays and context
+ */
+static void MB_MergeSeam(MB_Image *src, MB_Image *dest, Uint32 line,
+                         enum MB_grid_t grid, MB_Label_struct *labels)
+{
+    PIX32 *pout = (PIX32 *) dest->plines[line];
+    PIX32 *poutpre = (PIX32 *) dest->plines[line-1];
+    PLINE pin = src->plines[line];
+    PLINE pinpre = src->plines[line-1];
+    PIX32 value, value_up;
+    Uint32 x;
+    int dx, first, last;
+
+    /* The neighbors of an even line in the previous line are at x-1 */
+    /* and x on the hexagonal grid and from x-1 to x+1 on the square grid */
+    first = -1;
+    last = (grid==MB_SQUARE_GRID) ? 1 : 0;
+    for(x=0; x<dest->width; x++) {
+        if (pout[x]==0) {
+            continue;
+        }
+        for(dx=first; dx<=last; dx++) {
+            if (((int) x)+dx<0 || x+dx>=dest->width || poutpre[x+dx]==0) {
+                continue;
+            }
+            /* Binary pixels that are labelled are all set */
+            if (src->depth==8) {
+                value = pin[x];
+                value_up = pinpre[x+dx];
+            } else if (src->depth==32) {
+                value = ((PIX32 *) pin)[x];
+                value_up = ((PIX32 *) pinpre)[x+dx];
+            } else {
+                value = value_up = 1;
+            }
+            if (value==value_up) {
+                MB_MergeLabels(labels, pout[x], poutpre[x+dx]);
+            }
+        }
+    }
+}
+
+/*
+ * Labels the objects found in src image band by band. Each band is labelled
+ * by the grid function of the source depth with its own range of labels (the
+ * labels are created in the order of the pixels, so the smallest label of
+ * an object is the one of its first pixel). The bands are then merged
+ * along their seams and the labels are tidied in the order of their
+ * creation. The result does not depend on the number of bands.
+ *
+ * \param src the source image where the object must be labelled
+ * \param dest the 32-bit image where object are labelled
+ * \param lblow the lowest value allowed for label on the low byte (must be inferior to lbhigh)
+ * \param lbhigh the first high value NOT allowed for label on the low byte (maximum allowed is 256)
+ * \param pNbobj the number of object founds
+ * \param grid the grid used (either square or hexagonal)
+ * \param fn the grid function labelling the lines of a band
+ * \param density the number of pixels per label created at most (the first
+ * line of a band excepted)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_LabelBands(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh,
+                         Uint32 *pNbobj, enum MB_grid_t grid,
+                         LABELGRIDFUNC *fn, Uint32 density)
+{
+    Uint32 bytes_in, bytes_out;
+    PLINE *plines_in, *plines_out;
+    MB_Label_struct labels, *bands;
+    PIX32 label;
+    Uint32 start, end;
+    int b, nb_bands;
+
+    nb_bands = (int) MB_BandCount(src->height);
+    bands = (MB_Label_struct *) MB_malloc(nb_bands*sizeof(MB_Label_struct));
+    if (bands==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* Each band takes its labels in its own range */
+    labels.maxEQ = 1;
+    for(b=0; b<nb_bands; b++) {
+        start = MB_BAND_START(b, nb_bands, src->height);
+        end = MB_BAND_START(b+1, nb_bands, src->height);
+        bands[b].current = labels.maxEQ;
+        labels.maxEQ += ((end-start)*src->width)/density + src->width;
+    }
+
+    /* Initializing the algorithm parameters */
+    labels.current = 1;
+    labels.ccurrent = 1;
+    labels.nbObjs = 0;
+    labels.EQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
+    if(labels.EQ==NULL){
+        /* In case allocation goes wrong */
+        MB_free(bands);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    labels.CEQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
+    if(labels.CEQ==NULL){
+        /* In case allocation goes wrong */
+        MB_free(labels.EQ);
+        MB_free(bands);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(labels.EQ, 0, labels.maxEQ*sizeof(PIX32));
+    MB_memset(labels.CEQ, 0, labels.maxEQ*sizeof(PIX32));
+
+    /* The label image is reset */
+    MB_ConSet(dest, 0);
+
+    /* Setting up pointers */
+    plines_in = src->plines;
+    plines_out = dest->plines;
+    bytes_in = MB_LINE_COUNT(src);
+    bytes_out = MB_LINE_COUNT(dest);
+
+    /* The bands are labelled concurrently */
+#pragma omp parallel for num_threads(nb_bands) if(nb_bands>1) private(start, end)
+    for(b=0; b<nb_bands; b++) {
+        start = MB_BAND_START(b, nb_bands, src->height);
+        end = MB_BAND_START(b+1, nb_bands, src->height);
+        bands[b].EQ = labels.EQ;
+        bands[b].CEQ = labels.CEQ;
+        bands[b].maxEQ = labels.maxEQ;
+        /* ccurrent keeps the first label of the band */
+        bands[b].ccurrent = bands[b].current;
+        fn(plines_out+start, plines_in+start, bytes_in, end-start, &bands[b]);
+    }
+
+    /* The seams are merged concurrently */
+#pragma omp parallel for num_threads(nb_bands) if(nb_bands>2)
+    for(b=1; b<nb_bands; b++) {
+        MB_MergeSeam(src, dest, MB_BAND_START(b, nb_bands, src->height), grid, &labels);
+    }
+
+    /* The objects are numbered in the order of their first label, which */
+    /* is the order of their first pixel */
+    for(b=0; b<nb_bands; b++) {
+        for(label=bands[b].ccurrent; label<bands[b].current; label++) {
+            MB_find_correct_label(&labels, label, (PIX32) lblow, (PIX32) lbhigh);
+        }
+    }
+
+    /* The labels are tidied concurrently (all the objects are numbered) */
+#pragma omp parallel for num_threads(nb_bands) if(nb_bands>1) private(start, end)
+    for(b=0; b<nb_bands; b++) {
+        start = MB_BAND_START(b, nb_bands, src->height);
+        end = MB_BAND_START(b+1, nb_bands, src->height);
+        MB_TidyLabel(plines_out+start, bytes_out, end-start,
+                     (PIX32) lblow, (PIX32) lbhigh, &labels);
+    }
+
+    *pNbobj = (Uint32) (labels.nbObjs);
+
+    /* Freeing the labels arrays */
+    MB_free(labels.EQ);
+    MB_free(labels.CEQ);
+    MB_free(bands);
+
+    return MB_NO_ERR;
+}
+
 /*
  * Labeling the object found in src image.
  *
@@ -352,51 +352,6 @@ static INLINE void QLAB_LINE(PLINE *plines_out, PLINE *plines_in, Uint32 index,
  */
 MB_errcode MB_Label8(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid)
 {
-    Uint32 bytes_in, bytes_out;
-    PLINE *plines_in, *plines_out;
-    MB_Label_struct labels;
-    LABELGRIDFUNC *fn;
-    
-    /* Initializing the algorithm parameters */
-    labels.current = 1;
-    labels.ccurrent = 1;
-    labels.nbObjs = 0;
-    labels.maxEQ = (src->width*src->height);
-    labels.EQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    if(labels.EQ==NULL){
-        /* In case allocation goes wrong */
-        return MB_ERR_CANT_ALLOCATE_MEMORY;
-    } 
-    labels.CEQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    if(labels.CEQ==NULL){
-        /* in case allocation goes wrong */
-        MB_free(labels.EQ);
-        return MB_ERR_CANT_ALLOCATE_MEMORY;
-    } 
-    MB_memset(labels.EQ, 0, labels.maxEQ*sizeof(PIX32));
-    MB_memset(labels.CEQ, 0, labels.maxEQ*sizeof(PIX32));
-    
-    /* The label image is reset */
-    MB_ConSet(dest, 0);
-    
-    /* Setting up pointers */
-    plines_in = src->plines;
-    plines_out = dest->plines;
-    bytes_in = MB_LINE_COUNT(src);
-    bytes_out = MB_LINE_COUNT(dest);
-    
-    /* Calling the corresponding function */
-    fn = SwitchTo[grid];
-    fn(plines_out, plines_in, bytes_in, src->height, &labels);
-
-    MB_TidyLabel(plines_out, bytes_out, src->height, (PIX32) lblow, (PIX32) lbhigh, &labels);
-    
-    *pNbobj = (Uint32) (labels.nbObjs);
-    
-    /* Freeing the labels arrays */
-    MB_free(labels.EQ);
-    MB_free(labels.CEQ);
-
-    return MB_NO_ERR;
+    /* The bands of the image are labelled concurrently */
+    return MB_LabelBands(src, dest, lblow, lbhigh, pNbobj, grid, SwitchTo[grid], 1);
 }
-
@@ -0,0 +1,63 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Replaces each value of a label image by the value of the table found at
+ * this index (0 for the values outside of the table).
+ *
+ * \param label the label image (32-bit)
+ * \param dest the destination image (32-bit)
+ * \param pvalues the table of the values
+ * \param nbvalues the number of values in the table
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_LabelLookup(MB_Image *label, MB_Image *dest, Uint32 *pvalues, Uint32 nbvalues)
+{
+    PIX32 *plabel, *pdest;
+    Uint32 x, y;
+
+    /* Verification over depth and size */
+    if (!MB_CHECK_SIZE_2(label, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (label->depth!=32 || dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    for(y=0; y<label->height; y++) {
+        plabel = (PIX32 *) label->plines[y];
+        pdest = (PIX32 *) dest->plines[y];
+        for(x=0; x<label->width; x++) {
+            pdest[x] = plabel[x]<nbvalues ? pvalues[plabel[x]] : 0;
+        }
+    }
+
+    return MB_NO_ERR;
+}
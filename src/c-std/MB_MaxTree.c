@@ -0,0 +1,304 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* The component tree is built with the union-find algorithm of Berger et
+ * al. The pixels are sorted by increasing values and processed in reverse
+ * order: every pixel becomes the root of the components of its already
+ * processed neighbors. The pixels of the same component and level are then
+ * linked to a single canonical pixel, which is the node of the tree.
+ * The min-tree is the max-tree of the complemented values.
+ */
+
+/* Mark of the pixels not processed yet */
+#define MB_TREE_NONE 0xffffffff
+
+/*
+ * Sorts the pixels by increasing values (LSD radix sort on 16-bit digits,
+ * a single counting pass for greyscale values).
+ * \param values the value of each pixel
+ * \param sorted receives the pixels positions sorted
+ * \param tmp an array of the same size used by the sort
+ * \param size the number of pixels
+ * \param depth the depth of the values (8 or 32)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_SortPixels(PIX32 *values, Uint32 *sorted, Uint32 *tmp, Uint32 size, Uint32 depth)
+{
+    Uint32 *count;
+    Uint32 *in, *out, *swap;
+    Uint32 i, sum, n, shift, d;
+
+    count = (Uint32 *) MB_malloc(65536*sizeof(Uint32));
+    if (count==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    /* The first pass reads the pixels in raster order */
+    for(i=0; i<size; i++) {
+        tmp[i] = i;
+    }
+    in = tmp;
+    out = sorted;
+    for(shift=0; shift<depth; shift+=16) {
+        MB_memset(count, 0, 65536*sizeof(Uint32));
+        for(i=0; i<size; i++) {
+            count[(values[in[i]]>>shift)&0xffff]++;
+        }
+        sum = 0;
+        for(d=0; d<65536; d++) {
+            n = count[d];
+            count[d] = sum;
+            sum += n;
+        }
+        for(i=0; i<size; i++) {
+            out[count[(values[in[i]]>>shift)&0xffff]++] = in[i];
+        }
+        swap = in;
+        in = out;
+        out = swap;
+    }
+    /* an even number of passes leaves the result in tmp */
+    if (in!=sorted) {
+        MB_memcpy(sorted, in, size*sizeof(Uint32));
+    }
+    MB_free(count);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Finds the root of the component of a pixel (with path halving).
+ * \param zpar the union-find links
+ * \param p the pixel position
+ * \return the position of the root
+ */
+static INLINE Uint32 MB_FindRoot(Uint32 *zpar, Uint32 p)
+{
+    while (zpar[p]!=p) {
+        zpar[p] = zpar[zpar[p]];
+        p = zpar[p];
+    }
+    return p;
+}
+
+/*
+ * Checks that the nodes image and the tree table of a component tree are
+ * consistent (every pixel has a node of the table and every node comes
+ * after its parent).
+ * \param nodes the image of the node of each pixel
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_CheckTree(MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes)
+{
+    Uint32 x, y, n;
+    PIX32 *p;
+
+    if (nodes->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (nbnodes==0 || ptree[MB_TREE_PARENT*nbnodes]!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    for(n=1; n<nbnodes; n++) {
+        if (ptree[MB_TREE_PARENT*nbnodes+n]>=n) {
+            return MB_ERR_BAD_PARAMETER;
+        }
+    }
+    for(y=0; y<nodes->height; y++) {
+        p = (PIX32 *) nodes->plines[y];
+        for(x=0; x<nodes->width; x++) {
+            if (p[x]>=nbnodes) {
+                return MB_ERR_BAD_VALUE;
+            }
+        }
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Links every pixel to its parent in the component tree. The parent of a
+ * canonical pixel is the canonical pixel of the parent node, the parent of
+ * the other pixels is the canonical pixel of their node.
+ * \param values the value of each pixel
+ * \param sorted the pixels positions sorted by increasing values
+ * \param parent receives the parent of each pixel
+ * \param zpar an array of the same size used by the union-find
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param grid the grid used (either square or hexagonal)
+ */
+static void MB_LinkPixels(PIX32 *values, Uint32 *sorted, Uint32 *parent, Uint32 *zpar,
+                          Uint32 width, Uint32 height, enum MB_grid_t grid)
+{
+    Uint32 size, i, k, nbs, p, q, r;
+    int x, y, nbx, nby;
+    const int (*nbdir)[2];
+
+    size = width*height;
+    nbs = (grid==MB_SQUARE_GRID) ? 8 : 6;
+
+    /* Union-find from the highest pixels */
+    for(i=0; i<size; i++) {
+        zpar[i] = MB_TREE_NONE;
+    }
+    for(i=size; i>0; i--) {
+        p = sorted[i-1];
+        parent[p] = p;
+        zpar[p] = p;
+        x = p%width;
+        y = p/width;
+        nbdir = (grid==MB_SQUARE_GRID) ? sqNbDir : hxNbDir[y%2];
+        for(k=1; k<=nbs; k++) {
+            nbx = x+nbdir[k][0];
+            nby = y+nbdir[k][1];
+            if (nbx>=0 && nbx<((int) width) && nby>=0 && nby<((int) height)) {
+                q = nbx+nby*width;
+                if (zpar[q]!=MB_TREE_NONE) {
+                    r = MB_FindRoot(zpar, q);
+                    if (r!=p) {
+                        parent[r] = p;
+                        zpar[r] = p;
+                    }
+                }
+            }
+        }
+    }
+
+    /* Every pixel is linked to the canonical pixel of its level */
+    for(i=0; i<size; i++) {
+        p = sorted[i];
+        q = parent[p];
+        if (values[parent[q]]==values[q]) {
+            parent[p] = parent[q];
+        }
+    }
+}
+
+/*
+ * Builds the component tree (max-tree) of an image.
+ *
+ * \param src the greyscale or 32-bit source image
+ * \param nodes the 32-bit image receiving the node of each pixel
+ * \param ptree the tree table receiving the parent and level of each node
+ * \param nbnodes the number of rows of the tree table
+ * \param pNbnodes receives the number of nodes of the tree
+ * \param dual 1 to build the min-tree, 0 for the max-tree
+ * \param grid the grid used (either square or hexagonal)
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_MaxTree(MB_Image *src, MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes, Uint32 *pNbnodes, Uint32 dual, enum MB_grid_t grid)
+{
+    PIX32 *values;
+    Uint32 *sorted, *parent, *zpar;
+    Uint32 width, height, size, i, p, q, n, count;
+    PIX32 maxval;
+    Uint32 x, y;
+    MB_errcode err;
+
+    /* Verification over depth and size */
+    if (!MB_CHECK_SIZE_2(src, nodes)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    switch (MB_PROBE_PAIR(src, nodes)) {
+    case MB_PAIR_8_32:
+    case MB_PAIR_32_32:
+        break;
+    default:
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    width = src->width;
+    height = src->height;
+    size = width*height;
+    maxval = (src->depth==8) ? 0xff : 0xffffffff;
+
+    values = (PIX32 *) MB_malloc(size*sizeof(PIX32));
+    sorted = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    parent = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    zpar = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    if (values==NULL || sorted==NULL || parent==NULL || zpar==NULL) {
+        /* in case allocation goes wrong */
+        MB_free(values);
+        MB_free(sorted);
+        MB_free(parent);
+        MB_free(zpar);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* Values of the pixels, complemented for the min-tree */
+    for(y=0, p=0; y<height; y++) {
+        for(x=0; x<width; x++, p++) {
+            values[p] = MB_TREE_PIXEL(src, x, y);
+            if (dual) {
+                values[p] = maxval-values[p];
+            }
+        }
+    }
+    err = MB_SortPixels(values, sorted, zpar, size, src->depth);
+    if (err==MB_NO_ERR) {
+        MB_LinkPixels(values, sorted, parent, zpar, width, height, grid);
+
+        /* Numbering of the nodes, parents first (zpar now holds the node */
+        /* of each pixel) */
+        count = 0;
+        for(i=0; i<size && err==MB_NO_ERR; i++) {
+            p = sorted[i];
+            q = parent[p];
+            if (q!=p && values[q]==values[p]) {
+                zpar[p] = zpar[q];
+            } else if (count<nbnodes) {
+                n = count++;
+                zpar[p] = n;
+                ptree[MB_TREE_PARENT*nbnodes+n] = (q==p) ? 0 : zpar[q];
+                ptree[MB_TREE_LEVEL*nbnodes+n] = dual ? maxval-values[p] : values[p];
+            } else {
+                /* The table is too small */
+                err = MB_ERR_BAD_PARAMETER;
+            }
+        }
+        if (err==MB_NO_ERR) {
+            for(y=0, p=0; y<height; y++) {
+                for(x=0; x<width; x++, p++) {
+                    MB_TREE_NODE(nodes, x, y) = zpar[p];
+                }
+            }
+            *pNbnodes = count;
+        }
+    }
+
+    MB_free(values);
+    MB_free(sorted);
+    MB_free(parent);
+    MB_free(zpar);
+
+    return err;
+}
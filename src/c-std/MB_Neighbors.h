@@ -44,170 +44,135 @@
  * You will need to define the following macros :
  * DATA_TYPE
  * COMP(cond,inout,in)
+ *
+ * The image is computed line by line. The lines above and below the
+ * computed line are given to the line functions, when they fall outside
+ * the image a line filled with the edge value is given instead. This allows
+ * to split the image into bands of lines computed by different threads.
  */
 
 /***************
  * SQUARE GRID *
  ***************/
 
-static void MB_comp_neighbors_square(
-        PLINE *plines_inout, PLINE *plines_in,
-        Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        DATA_TYPE edge)
+static void MB_comp_line_square(
+        DATA_TYPE *pinout, DATA_TYPE *pina, DATA_TYPE *pinb, DATA_TYPE *pinc,
+        Uint32 bytes_in, Uint32 neighbors, DATA_TYPE edge)
 {
-    Uint32 x,y;
+    Uint32 x;
     DATA_TYPE in8, in1, in2;
     DATA_TYPE in7, in0, in3;
     DATA_TYPE in6, in5, in4;
-    DATA_TYPE *pinout;
-    DATA_TYPE *pina,*pinb,*pinc;
     DATA_TYPE inout;
 
-    /* FIRST LINE */
+    in8 = edge;
     in7 = edge;
     in6 = edge;
-    pinb = (DATA_TYPE*) (plines_in[0]);
-    pinc = (DATA_TYPE*) (plines_in[1]);
+    in1 = *pina;
     in0 = *pinb;
     in5 = *pinc;
+    pina++;
     pinb++;
     pinc++;
-    pinout = (DATA_TYPE*) (plines_inout[0]);
-    for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pinb++,pinc++,pinout++) {
+    for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinc++,pinout++) {
         inout = *pinout;
         if (x==(bytes_in-sizeof(DATA_TYPE))) {
+            in2 = edge;
             in3 = edge;
             in4 = edge;
         } else {
+            in2 = *pina;
             in3 = *pinb;
             in4 = *pinc;
         }
 
         COMP(MB_NEIGHBOR_0,inout,in0);
+        COMP(MB_NEIGHBOR_1,inout,in1);
+        COMP(MB_NEIGHBOR_2,inout,in2);
         COMP(MB_NEIGHBOR_3,inout,in3);
         COMP(MB_NEIGHBOR_4,inout,in4);
         COMP(MB_NEIGHBOR_5,inout,in5);
         COMP(MB_NEIGHBOR_6,inout,in6);
         COMP(MB_NEIGHBOR_7,inout,in7);
-        COMP(MB_NEIGHBOR_8|MB_NEIGHBOR_1|MB_NEIGHBOR_2,inout,edge);
+        COMP(MB_NEIGHBOR_8,inout,in8);
         
         *pinout = inout;
+        in8 = in1;
+        in1 = in2;
         in7 = in0;
         in0 = in3;
         in6 = in5;
         in5 = in4;
     }
+}
 
-    /* MIDDLE LINES */
-    for(y=1; y<height-1; y++) {
-        in8 = edge;
-        in7 = edge;
-        in6 = edge;
-        pina = (DATA_TYPE*) (plines_in[y-1]);
-        pinb = (DATA_TYPE*) (plines_in[y]);
-        pinc = (DATA_TYPE*) (plines_in[y+1]);
-        in1 = *pina;
-        in0 = *pinb;
-        in5 = *pinc;
-        pina++;
-        pinb++;
-        pinc++;
-        pinout = (DATA_TYPE*) (plines_inout[y]);
-        for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinc++,pinout++) {
-            inout = *pinout;
-            if (x==(bytes_in-sizeof(DATA_TYPE))) {
-                in2 = edge;
-                in3 = edge;
-                in4 = edge;
-            } else {
-                in2 = *pina;
-                in3 = *pinb;
-                in4 = *pinc;
-            }
+/******************
+ * HEXAGONAL GRID *
+ ******************/
 
-            COMP(MB_NEIGHBOR_0,inout,in0);
-            COMP(MB_NEIGHBOR_1,inout,in1);
-            COMP(MB_NEIGHBOR_2,inout,in2);
-            COMP(MB_NEIGHBOR_3,inout,in3);
-            COMP(MB_NEIGHBOR_4,inout,in4);
-            COMP(MB_NEIGHBOR_5,inout,in5);
-            COMP(MB_NEIGHBOR_6,inout,in6);
-            COMP(MB_NEIGHBOR_7,inout,in7);
-            COMP(MB_NEIGHBOR_8,inout,in8);
-            
-            *pinout = inout;
-            in8 = in1;
-            in1 = in2;
-            in7 = in0;
-            in0 = in3;
-            in6 = in5;
-            in5 = in4;
-        }
-    }
+static void MB_comp_line_hexagonal_odd(
+        DATA_TYPE *pinout, DATA_TYPE *pina, DATA_TYPE *pinb, DATA_TYPE *pinc,
+        Uint32 bytes_in, Uint32 neighbors, DATA_TYPE edge)
+{
+    Uint32 x;
+    DATA_TYPE in1, in2;
+    DATA_TYPE in7, in0, in3;
+    DATA_TYPE in5, in4;
+    DATA_TYPE inout;
 
-    /* END LINE */
-    in8 = edge;
     in7 = edge;
-    pina = (DATA_TYPE*) (plines_in[y-1]);
-    pinb = (DATA_TYPE*) (plines_in[y]);
     in1 = *pina;
     in0 = *pinb;
+    in5 = *pinc;
     pina++;
     pinb++;
-    pinout = (DATA_TYPE*) (plines_inout[y]);
-    for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinout++) {
+    pinc++;
+    for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinc++,pinout++) {
         inout = *pinout;
         if (x==(bytes_in-sizeof(DATA_TYPE))) {
             in2 = edge;
             in3 = edge;
+            in4 = edge;
         } else {
             in2 = *pina;
             in3 = *pinb;
+            in4 = *pinc;
         }
 
         COMP(MB_NEIGHBOR_0,inout,in0);
-        COMP(MB_NEIGHBOR_1,inout,in1);
-        COMP(MB_NEIGHBOR_2,inout,in2);
-        COMP(MB_NEIGHBOR_3,inout,in3);
-        COMP(MB_NEIGHBOR_4|MB_NEIGHBOR_5|MB_NEIGHBOR_6,inout,edge);
-        COMP(MB_NEIGHBOR_7,inout,in7);
-        COMP(MB_NEIGHBOR_8,inout,in8);
+        COMP(MB_NEIGHBOR_1,inout,in2);
+        COMP(MB_NEIGHBOR_2,inout,in3);
+        COMP(MB_NEIGHBOR_3,inout,in4);
+        COMP(MB_NEIGHBOR_4,inout,in5);
+        COMP(MB_NEIGHBOR_5,inout,in7);
+        COMP(MB_NEIGHBOR_6,inout,in1);
         
         *pinout = inout;
-        in8 = in1;
         in1 = in2;
         in7 = in0;
         in0 = in3;
+        in5 = in4;
     }
 }
 
-/******************
- * HEXAGONAL GRID *
- ******************/
-
-static void MB_comp_neighbors_hexagonal(
-        PLINE *plines_inout, PLINE *plines_in,
-        Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        DATA_TYPE edge)
+static void MB_comp_line_hexagonal_even(
+        DATA_TYPE *pinout, DATA_TYPE *pina, DATA_TYPE *pinb, DATA_TYPE *pinc,
+        Uint32 bytes_in, Uint32 neighbors, DATA_TYPE edge)
 {
-    Uint32 x,y;
-    DATA_TYPE in8, in1, in2;
+    Uint32 x;
+    DATA_TYPE in8, in1;
     DATA_TYPE in7, in0, in3;
-    DATA_TYPE in6, in5, in4;
-    DATA_TYPE *pinout;
-    DATA_TYPE *pina,*pinb,*pinc;
+    DATA_TYPE in6, in5;
     DATA_TYPE inout;
 
-    /* FIRST LINE (even) */
+    in8 = edge;
     in7 = edge;
     in6 = edge;
-    pinb = (DATA_TYPE*) (plines_in[0]);
-    pinc = (DATA_TYPE*) (plines_in[1]);
     in0 = *pinb;
     pinb++;
-    pinout = (DATA_TYPE*) (plines_inout[0]);
-    for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pinb++,pinc++,pinout++) {
+    for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinc++,pinout++) {
         inout = *pinout;
+        in1 = *pina;
         in5 = *pinc;
         if (x==(bytes_in-sizeof(DATA_TYPE))) {
             in3 = edge;
@@ -216,125 +181,75 @@ static void MB_comp_neighbors_hexagonal(
         }
 
         COMP(MB_NEIGHBOR_0,inout,in0);
+        COMP(MB_NEIGHBOR_1,inout,in1);
         COMP(MB_NEIGHBOR_2,inout,in3);
         COMP(MB_NEIGHBOR_3,inout,in5);
         COMP(MB_NEIGHBOR_4,inout,in6);
         COMP(MB_NEIGHBOR_5,inout,in7);
-        COMP(MB_NEIGHBOR_6|MB_NEIGHBOR_1,inout,edge);
+        COMP(MB_NEIGHBOR_6,inout,in8);
         
         *pinout = inout;
+        in8 = in1;
         in7 = in0;
         in0 = in3;
         in6 = in5;
     }
+}
 
-    /* MIDDLE LINES */
-    for(y=1; y<height-1; y+=2) {
-        /* Odd line */
-        in7 = edge;
-        pina = (DATA_TYPE*) (plines_in[y-1]);
-        pinb = (DATA_TYPE*) (plines_in[y]);
-        pinc = (DATA_TYPE*) (plines_in[y+1]);
-        in1 = *pina;
-        in0 = *pinb;
-        in5 = *pinc;
-        pina++;
-        pinb++;
-        pinc++;
-        pinout = (DATA_TYPE*) (plines_inout[y]);
-        for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinc++,pinout++) {
-            inout = *pinout;
-            if (x==(bytes_in-sizeof(DATA_TYPE))) {
-                in2 = edge;
-                in3 = edge;
-                in4 = edge;
-            } else {
-                in2 = *pina;
-                in3 = *pinb;
-                in4 = *pinc;
-            }
-
-            COMP(MB_NEIGHBOR_0,inout,in0);
-            COMP(MB_NEIGHBOR_1,inout,in2);
-            COMP(MB_NEIGHBOR_2,inout,in3);
-            COMP(MB_NEIGHBOR_3,inout,in4);
-            COMP(MB_NEIGHBOR_4,inout,in5);
-            COMP(MB_NEIGHBOR_5,inout,in7);
-            COMP(MB_NEIGHBOR_6,inout,in1);
-            
-            *pinout = inout;
-            in1 = in2;
-            in7 = in0;
-            in0 = in3;
-            in5 = in4;
-        }
+/*********
+ * BANDS *
+ *********/
 
-        /* Even line */
-        in8 = edge;
-        in7 = edge;
-        in6 = edge;
-        pina = (DATA_TYPE*) (plines_in[y]);
-        pinb = (DATA_TYPE*) (plines_in[y+1]);
-        pinc = (DATA_TYPE*) (plines_in[y+2]);
-        in0 = *pinb;
-        pinb++;
-        for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinc++,pinout++) {
-            inout = *pinout;
-            in1 = *pina;
-            in5 = *pinc;
-            if (x==(bytes_in-sizeof(DATA_TYPE))) {
-                in3 = edge;
-            } else {
-                in3 = *pinb;
-            }
+static void MB_comp_neighbors_band(
+        PLINE *plines_inout, PLINE *plines_in, PLINE edge_line,
+        Uint32 bytes_in, Uint32 height, Uint32 ystart, Uint32 yend,
+        Uint32 neighbors, enum MB_grid_t grid, DATA_TYPE edge)
+{
+    Uint32 y;
+    DATA_TYPE *pinout;
+    DATA_TYPE *pina,*pinb,*pinc;
 
-            COMP(MB_NEIGHBOR_0,inout,in0);
-            COMP(MB_NEIGHBOR_1,inout,in1);
-            COMP(MB_NEIGHBOR_2,inout,in3);
-            COMP(MB_NEIGHBOR_3,inout,in5);
-            COMP(MB_NEIGHBOR_4,inout,in6);
-            COMP(MB_NEIGHBOR_5,inout,in7);
-            COMP(MB_NEIGHBOR_6,inout,in8);
-            
-            *pinout = inout;
-            in8 = in1;
-            in7 = in0;
-            in0 = in3;
-            in6 = in5;
+    for(y=ystart; y<yend; y++) {
+        pina = (DATA_TYPE*) ((y==0) ? edge_line : plines_in[y-1]);
+        pinb = (DATA_TYPE*) (plines_in[y]);
+        pinc = (DATA_TYPE*) ((y==height-1) ? edge_line : plines_in[y+1]);
+        pinout = (DATA_TYPE*) (plines_inout[y]);
+        if (grid==MB_SQUARE_GRID) {
+            MB_comp_line_square(pinout, pina, pinb, pinc, bytes_in, neighbors, edge);
+        } else if (y%2==0) {
+            MB_comp_line_hexagonal_even(pinout, pina, pinb, pinc, bytes_in, neighbors, edge);
+        } else {
+            MB_comp_line_hexagonal_odd(pinout, pina, pinb, pinc, bytes_in, neighbors, edge);
         }
     }
+}
 
-    /* END LINE (odd) */
-    in7 = edge;
-    pina = (DATA_TYPE*) (plines_in[y-1]);
-    pinb = (DATA_TYPE*) (plines_in[y]);
-    in1 = *pina;
-    in0 = *pinb;
-    pina++;
-    pinb++;
-    pinc++;
-    pinout = (DATA_TYPE*) (plines_inout[y]);
-    for(x=0; x<bytes_in; x+=sizeof(DATA_TYPE),pina++,pinb++,pinout++) {
-        inout = *pinout;
-        if (x==(bytes_in-sizeof(DATA_TYPE))) {
-            in2 = edge;
-            in3 = edge;
-        } else {
-            in2 = *pina;
-            in3 = *pinb;
-        }
+static MB_errcode MB_comp_neighbors(
+        PLINE *plines_inout, PLINE *plines_in,
+        Uint32 bytes_in, Uint32 height, Uint32 neighbors,
+        enum MB_grid_t grid, DATA_TYPE edge_val, enum MB_edgemode_t edge)
+{
+    PLINE edge_line;
+    int b, nb_bands;
 
-        COMP(MB_NEIGHBOR_0,inout,in0);
-        COMP(MB_NEIGHBOR_1,inout,in2);
-        COMP(MB_NEIGHBOR_2,inout,in3);
-        COMP(MB_NEIGHBOR_3|MB_NEIGHBOR_4,inout,edge);
-        COMP(MB_NEIGHBOR_5,inout,in7);
-        COMP(MB_NEIGHBOR_6,inout,in1);
-        
-        *pinout = inout;
-        in1 = in2;
-        in7 = in0;
-        in0 = in3;
+    /* The line used above the first line and below the last one */
+    edge_line = (PLINE) MB_aligned_malloc(bytes_in, 16);
+    if (edge_line==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(edge_line, (edge==MB_FILLED_EDGE) ? 0xff : 0, bytes_in);
+
+    /* The bands only read the input lines, they can be computed */
+    /* concurrently */
+    nb_bands = (int) MB_BandCount(height);
+#pragma omp parallel for num_threads(nb_bands) if(nb_bands>1)
+    for(b=0; b<nb_bands; b++) {
+        MB_comp_neighbors_band(plines_inout, plines_in, edge_line, bytes_in, height,
+                               MB_BAND_START(b, nb_bands, height),
+                               MB_BAND_START(b+1, nb_bands, height),
+                               neighbors, grid, edge_val);
     }
-}
 
+    MB_aligned_free(edge_line);
+    return MB_NO_ERR;
+}
@@ -0,0 +1,174 @@
+/*
+ * Copyright (c) <2012>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+/* This file is used to avoid code repetition between the operators iterating
+ * the neighbor functions (erosions and dilations of size n).
+ * It must be included after MB_Neighbors.h or MB_Neighbors_vector.h as it
+ * uses the line functions they define.
+ * It is used by the following files :
+ *    MB_InfNbb.c
+ *    MB_InfNb8.c
+ *    MB_InfNb32.c
+ *    MB_SupNbb.c
+ *    MB_SupNb8.c
+ *    MB_SupNb32.c
+ *
+ * You will need to define the following macro :
+ * LINE_TYPE (the type handled by the line functions)
+ *
+ * The n iterations are computed in a single pass over the image. Each
+ * iteration keeps a window of three lines of the result of the previous
+ * iteration (the lines above, on and below the computed line). As soon as
+ * the line below is available, the line is computed and given to the next
+ * iteration. The last iteration writes directly into the destination image,
+ * n lines behind the source line being read, which allows the source and
+ * destination to be the same image.
+ *
+ * The image is split into horizontal bands computed concurrently. A line of
+ * the result only depends on the n source lines above and below it, so each
+ * band also computes the iterations over n lines on each side of it.
+ */
+
+static void MB_comp_iterate_band(
+        PLINE *plines_out, PLINE *plines_in, PLINE edge_line, PLINE window,
+        Uint32 bytes_in, Uint32 height, Uint32 ystart, Uint32 yend,
+        Uint32 neighbors, Uint32 n, enum MB_grid_t grid, LINE_TYPE edge_val,
+        Uint8 neutral)
+{
+    PLINE pina, pinb, pinc, pinout;
+    Uint32 t, k, y, ymin, ymax;
+
+#define WINDOW_LINE(k, y) (window + ((k)*3 + (y)%3)*bytes_in)
+
+    /* Source lines read by the band */
+    ymin = (ystart>n) ? ystart-n : 0;
+    ymax = (yend+n<height) ? yend+n : height;
+
+    for(t=ymin; t<ymax+n; t++) {
+        if (t<ymax) {
+            MB_memcpy(WINDOW_LINE(0, t), plines_in[t], bytes_in);
+        }
+        /* At step t, iteration k computes line t-k, provided it is */
+        /* within n-k lines of the band */
+        for(k=1; k<=n && k<=t; k++) {
+            y = t-k;
+            if ((y+n-k<ystart) || (y>=yend+n-k) || (y>=height)) {
+                continue;
+            }
+            pina = (y==0) ? edge_line : WINDOW_LINE(k-1, y-1);
+            pinb = WINDOW_LINE(k-1, y);
+            pinc = (y==height-1) ? edge_line : WINDOW_LINE(k-1, y+1);
+            pinout = (k==n) ? plines_out[y] : WINDOW_LINE(k, y);
+            MB_memset(pinout, neutral, bytes_in);
+            if (grid==MB_SQUARE_GRID) {
+                MB_comp_line_square((LINE_TYPE *) pinout, (LINE_TYPE *) pina,
+                                    (LINE_TYPE *) pinb, (LINE_TYPE *) pinc,
+                                    bytes_in, neighbors, edge_val);
+            } else if (y%2==0) {
+                MB_comp_line_hexagonal_even((LINE_TYPE *) pinout, (LINE_TYPE *) pina,
+                                            (LINE_TYPE *) pinb, (LINE_TYPE *) pinc,
+                                            bytes_in, neighbors, edge_val);
+            } else {
+                MB_comp_line_hexagonal_odd((LINE_TYPE *) pinout, (LINE_TYPE *) pina,
+                                           (LINE_TYPE *) pinb, (LINE_TYPE *) pinc,
+                                           bytes_in, neighbors, edge_val);
+            }
+        }
+    }
+#undef WINDOW_LINE
+}
+
+static MB_errcode MB_comp_iterate(
+        PLINE *plines_out, PLINE *plines_in,
+        Uint32 bytes_in, Uint32 height, Uint32 neighbors, Uint32 n,
+        enum MB_grid_t grid, LINE_TYPE edge_val, enum MB_edgemode_t edge,
+        Uint8 neutral)
+{
+    PLINE edge_line, window, copy_pixels = NULL;
+    PLINE *plines_src, *copy_lines = NULL;
+    Uint32 y;
+    int b, nb_bands;
+
+    /* The bands are computed again over n lines on each side, they are */
+    /* not made smaller than n lines */
+    nb_bands = (int) MB_BandCount(height);
+    if (nb_bands>1 && ((Uint64) n)*nb_bands>height) {
+        nb_bands = (n<height) ? (int) (height/n) : 1;
+    }
+
+    /* The line used above the first line and below the last one */
+    edge_line = (PLINE) MB_aligned_malloc(bytes_in, 16);
+    if (edge_line==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(edge_line, (edge==MB_FILLED_EDGE) ? 0xff : 0, bytes_in);
+
+    /* Three lines per iteration and per band, the first window holds */
+    /* the source lines */
+    window = (PLINE) MB_aligned_malloc(((size_t) nb_bands)*3*n*bytes_in, 16);
+    if (window==NULL) {
+        MB_aligned_free(edge_line);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* When the computation is made in place, a band would read the lines */
+    /* already written by its neighbor bands, so they read a copy of the */
+    /* source instead */
+    plines_src = plines_in;
+    if (nb_bands>1 && plines_out==plines_in) {
+        copy_lines = (PLINE *) MB_malloc(height*sizeof(PLINE));
+        copy_pixels = (PLINE) MB_aligned_malloc(((size_t) height)*bytes_in, 16);
+        if (copy_lines==NULL || copy_pixels==NULL) {
+            MB_free(copy_lines);
+            MB_aligned_free(copy_pixels);
+            MB_aligned_free(window);
+            MB_aligned_free(edge_line);
+            return MB_ERR_CANT_ALLOCATE_MEMORY;
+        }
+        for(y=0; y<height; y++) {
+            copy_lines[y] = copy_pixels + ((size_t) y)*bytes_in;
+            MB_memcpy(copy_lines[y], plines_in[y], bytes_in);
+        }
+        plines_src = copy_lines;
+    }
+
+#pragma omp parallel for num_threads(nb_bands) if(nb_bands>1)
+    for(b=0; b<nb_bands; b++) {
+        MB_comp_iterate_band(plines_out, plines_src, edge_line,
+                             window + ((size_t) b)*3*n*bytes_in,
+                             bytes_in, height,
+                             MB_BAND_START(b, nb_bands, height),
+                             MB_BAND_START(b+1, nb_bands, height),
+                             neighbors, n, grid, edge_val, neutral);
+    }
+
+    MB_free(copy_lines);
+    MB_aligned_free(copy_pixels);
+    MB_aligned_free(window);
+    MB_aligned_free(edge_line);
+    return MB_NO_ERR;
+}
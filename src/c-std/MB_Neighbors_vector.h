@@ -48,170 +48,135 @@
  * COMP_NO_SHIFT(cond,inout,in)
  * COMP_SHIFT_LEFT(cond,inout,inl,inr)
  * COMP_SHIFT_RIGHT(cond,inout,inl,inr)
+ *
+ * The image is computed line by line. The lines above and below the
+ * computed line are given to the line functions, when they fall outside
+ * the image a line filled with the edge value is given instead. This allows
+ * to split the image into bands of lines computed by different threads.
  */
 
 /***************
  * SQUARE GRID *
  ***************/
 
-static void MB_comp_neighbors_square(
-        PLINE *plines_inout, PLINE *plines_in,
-        Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        VEC_TYPE edge)
+static void MB_comp_line_square(
+        VEC_TYPE *pinout, VEC_TYPE *pina, VEC_TYPE *pinb, VEC_TYPE *pinc,
+        Uint32 bytes_in, Uint32 neighbors, VEC_TYPE edge)
 {
-    Uint32 x,y;
+    Uint32 x;
     VEC_TYPE in8, in1, in2;
     VEC_TYPE in7, in0, in3;
     VEC_TYPE in6, in5, in4;
-    VEC_TYPE *pinout;
-    VEC_TYPE *pina,*pinb,*pinc;
     VEC_TYPE inout;
 
-    /* FIRST LINE */
-    in7 = edge;
+    in8 = edge;
     in6 = edge;
-    pinb = (VEC_TYPE*) (plines_in[0]);
-    pinc = (VEC_TYPE*) (plines_in[1]);
-    in0 = VEC_LOAD(pinb);
-    in5 = VEC_LOAD(pinc);
+    in7 = edge;
+    in1 = VEC_LOAD (pina);
+    in0 = VEC_LOAD (pinb);
+    in5 = VEC_LOAD (pinc);
+    pina++;
     pinb++;
     pinc++;
-    pinout = (VEC_TYPE*) (plines_inout[0]);
-    for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pinb++,pinc++,pinout++) {
+    for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinc++,pinout++) {
         inout = VEC_LOAD(pinout);
         if (x==(bytes_in-sizeof(VEC_TYPE))) {
+            in2 = edge;
             in3 = edge;
             in4 = edge;
         } else {
+            in2 = VEC_LOAD(pina);
             in3 = VEC_LOAD(pinb);
             in4 = VEC_LOAD(pinc);
         }
 
         COMP_NO_SHIFT(MB_NEIGHBOR_0,inout,in0);
+        COMP_NO_SHIFT(MB_NEIGHBOR_1,inout,in1);
+        COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in1,in2);
         COMP_SHIFT_LEFT(MB_NEIGHBOR_3,inout,in0,in3);
         COMP_SHIFT_LEFT(MB_NEIGHBOR_4,inout,in5,in4);
         COMP_NO_SHIFT(MB_NEIGHBOR_5,inout,in5);
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_6,inout,in6,in5);
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_7,inout,in7,in0);
-        COMP_NO_SHIFT(MB_NEIGHBOR_8|MB_NEIGHBOR_1|MB_NEIGHBOR_2,inout,edge);
+        COMP_SHIFT_RIGHT(MB_NEIGHBOR_8,inout,in8,in1);
         
         VEC_STORE(pinout, inout);
+        in8 = in1;
+        in1 = in2;
         in7 = in0;
         in0 = in3;
         in6 = in5;
         in5 = in4;
     }
+}
 
-    /* MIDDLE LINES */
-    for(y=1; y<height-1; y++) {
-        in8 = edge;
-        in6 = edge;
-        in7 = edge;
-        pina = (VEC_TYPE*) (plines_in[y-1]);
-        pinb = (VEC_TYPE*) (plines_in[y]);
-        pinc = (VEC_TYPE*) (plines_in[y+1]);
-        in1 = VEC_LOAD (pina);
-        in0 = VEC_LOAD (pinb);
-        in5 = VEC_LOAD (pinc);
-        pina++;
-        pinb++;
-        pinc++;
-        pinout = (VEC_TYPE*) (plines_inout[y]);
-        for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinc++,pinout++) {
-            inout = VEC_LOAD(pinout);
-            if (x==(bytes_in-sizeof(VEC_TYPE))) {
-                in2 = edge;
-                in3 = edge;
-                in4 = edge;
-            } else {
-                in2 = VEC_LOAD(pina);
-                in3 = VEC_LOAD(pinb);
-                in4 = VEC_LOAD(pinc);
-            }
+/******************
+ * HEXAGONAL GRID *
+ ******************/
 
-            COMP_NO_SHIFT(MB_NEIGHBOR_0,inout,in0);
-            COMP_NO_SHIFT(MB_NEIGHBOR_1,inout,in1);
-            COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in1,in2);
-            COMP_SHIFT_LEFT(MB_NEIGHBOR_3,inout,in0,in3);
-            COMP_SHIFT_LEFT(MB_NEIGHBOR_4,inout,in5,in4);
-            COMP_NO_SHIFT(MB_NEIGHBOR_5,inout,in5);
-            COMP_SHIFT_RIGHT(MB_NEIGHBOR_6,inout,in6,in5);
-            COMP_SHIFT_RIGHT(MB_NEIGHBOR_7,inout,in7,in0);
-            COMP_SHIFT_RIGHT(MB_NEIGHBOR_8,inout,in8,in1);
-            
-            VEC_STORE(pinout, inout);
-            in8 = in1;
-            in1 = in2;
-            in7 = in0;
-            in0 = in3;
-            in6 = in5;
-            in5 = in4;
-        }
-    }
+static void MB_comp_line_hexagonal_odd(
+        VEC_TYPE *pinout, VEC_TYPE *pina, VEC_TYPE *pinb, VEC_TYPE *pinc,
+        Uint32 bytes_in, Uint32 neighbors, VEC_TYPE edge)
+{
+    Uint32 x;
+    VEC_TYPE in1, in2;
+    VEC_TYPE in7, in0, in3;
+    VEC_TYPE in5, in4;
+    VEC_TYPE inout;
 
-    /* END LINE */
-    in8 = edge;
     in7 = edge;
-    pina = (VEC_TYPE*) (plines_in[y-1]);
-    pinb = (VEC_TYPE*) (plines_in[y]);
     in1 = VEC_LOAD (pina);
     in0 = VEC_LOAD (pinb);
+    in5 = VEC_LOAD (pinc);
     pina++;
     pinb++;
-    pinout = (VEC_TYPE*) (plines_inout[y]);
-    for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinout++) {
+    pinc++;
+    for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinc++,pinout++) {
         inout = VEC_LOAD(pinout);
         if (x==(bytes_in-sizeof(VEC_TYPE))) {
             in2 = edge;
             in3 = edge;
+            in4 = edge;
         } else {
             in2 = VEC_LOAD(pina);
             in3 = VEC_LOAD(pinb);
+            in4 = VEC_LOAD(pinc);
         }
 
         COMP_NO_SHIFT(MB_NEIGHBOR_0,inout,in0);
-        COMP_NO_SHIFT(MB_NEIGHBOR_1,inout,in1);
-        COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in1,in2);
-        COMP_SHIFT_LEFT(MB_NEIGHBOR_3,inout,in0,in3);
-        COMP_NO_SHIFT(MB_NEIGHBOR_4|MB_NEIGHBOR_5|MB_NEIGHBOR_6,inout,edge);
-        COMP_SHIFT_RIGHT(MB_NEIGHBOR_7,inout,in7,in0);
-        COMP_SHIFT_RIGHT(MB_NEIGHBOR_8,inout,in8,in1);
+        COMP_SHIFT_LEFT(MB_NEIGHBOR_1,inout,in1,in2);
+        COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in0,in3);
+        COMP_SHIFT_LEFT(MB_NEIGHBOR_3,inout,in5,in4);
+        COMP_NO_SHIFT(MB_NEIGHBOR_4,inout,in5);
+        COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
+        COMP_NO_SHIFT(MB_NEIGHBOR_6,inout,in1);
         
         VEC_STORE(pinout, inout);
-        in8 = in1;
         in1 = in2;
         in7 = in0;
         in0 = in3;
+        in5 = in4;
     }
 }
 
-/******************
- * HEXAGONAL GRID *
- ******************/
-
-static void MB_comp_neighbors_hexagonal(
-        PLINE *plines_inout, PLINE *plines_in,
-        Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        VEC_TYPE edge)
+static void MB_comp_line_hexagonal_even(
+        VEC_TYPE *pinout, VEC_TYPE *pina, VEC_TYPE *pinb, VEC_TYPE *pinc,
+        Uint32 bytes_in, Uint32 neighbors, VEC_TYPE edge)
 {
-    Uint32 x,y;
-    VEC_TYPE in8, in1, in2;
+    Uint32 x;
+    VEC_TYPE in8, in1;
     VEC_TYPE in7, in0, in3;
-    VEC_TYPE in6, in5, in4;
-    VEC_TYPE *pinout;
-    VEC_TYPE *pina,*pinb,*pinc;
+    VEC_TYPE in6, in5;
     VEC_TYPE inout;
 
-    /* FIRST LINE (even) */
-    in7 = edge;
+    in8 = edge;
     in6 = edge;
-    pinb = (VEC_TYPE*) (plines_in[0]);
-    pinc = (VEC_TYPE*) (plines_in[1]);
+    in7 = edge;
     in0 = VEC_LOAD (pinb);
     pinb++;
-    pinout = (VEC_TYPE*) (plines_inout[0]);
-    for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pinb++,pinc++,pinout++) {
+    for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinc++,pinout++) {
         inout = VEC_LOAD(pinout);
+        in1 = VEC_LOAD(pina);
         in5 = VEC_LOAD(pinc);
         if (x==(bytes_in-sizeof(VEC_TYPE))) {
             in3 = edge;
@@ -220,123 +185,75 @@ static void MB_comp_neighbors_hexagonal(
         }
 
         COMP_NO_SHIFT(MB_NEIGHBOR_0,inout,in0);
+        COMP_NO_SHIFT(MB_NEIGHBOR_1,inout,in1);
         COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in0,in3);
         COMP_NO_SHIFT(MB_NEIGHBOR_3,inout,in5);
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_4,inout,in6,in5);
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
-        COMP_NO_SHIFT(MB_NEIGHBOR_1|MB_NEIGHBOR_6,inout,edge);
+        COMP_SHIFT_RIGHT(MB_NEIGHBOR_6,inout,in8,in1);
         
         VEC_STORE(pinout, inout);
+        in8 = in1;
         in7 = in0;
         in0 = in3;
         in6 = in5;
     }
+}
 
-    /* MIDDLE LINES */
-    for(y=1; y<height-1; y+=2) {
-        /* Odd line */
-        in7 = edge;
-        pina = (VEC_TYPE*) (plines_in[y-1]);
-        pinb = (VEC_TYPE*) (plines_in[y]);
-        pinc = (VEC_TYPE*) (plines_in[y+1]);
-        in1 = VEC_LOAD (pina);
-        in0 = VEC_LOAD (pinb);
-        in5 = VEC_LOAD (pinc);
-        pina++;
-        pinb++;
-        pinc++;
-        pinout = (VEC_TYPE*) (plines_inout[y]);
-        for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinc++,pinout++) {
-            inout = VEC_LOAD(pinout);
-            if (x==(bytes_in-sizeof(VEC_TYPE))) {
-                in2 = edge;
-                in3 = edge;
-                in4 = edge;
-            } else {
-                in2 = VEC_LOAD(pina);
-                in3 = VEC_LOAD(pinb);
-                in4 = VEC_LOAD(pinc);
-            }
+/*********
+ * BANDS *
+ *********/
 
-            COMP_NO_SHIFT(MB_NEIGHBOR_0,inout,in0);
-            COMP_SHIFT_LEFT(MB_NEIGHBOR_1,inout,in1,in2);
-            COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in0,in3);
-            COMP_SHIFT_LEFT(MB_NEIGHBOR_3,inout,in5,in4);
-            COMP_NO_SHIFT(MB_NEIGHBOR_4,inout,in5);
-            COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
-            COMP_NO_SHIFT(MB_NEIGHBOR_6,inout,in1);
-            
-            VEC_STORE(pinout, inout);
-            in1 = in2;
-            in7 = in0;
-            in0 = in3;
-            in5 = in4;
-        }
-        /* Even line */
-        in8 = edge;
-        in6 = edge;
-        in7 = edge;
-        pina = (VEC_TYPE*) (plines_in[y]);
-        pinb = (VEC_TYPE*) (plines_in[y+1]);
-        pinc = (VEC_TYPE*) (plines_in[y+2]);
-        in0 = VEC_LOAD (pinb);
-        pinb++;
-        for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinc++,pinout++) {
-            inout = VEC_LOAD(pinout);
-            in1 = VEC_LOAD(pina);
-            in5 = VEC_LOAD(pinc);
-            if (x==(bytes_in-sizeof(VEC_TYPE))) {
-                in3 = edge;
-            } else {
-                in3 = VEC_LOAD(pinb);
-            }
+static void MB_comp_neighbors_band(
+        PLINE *plines_inout, PLINE *plines_in, PLINE edge_line,
+        Uint32 bytes_in, Uint32 height, Uint32 ystart, Uint32 yend,
+        Uint32 neighbors, enum MB_grid_t grid, VEC_TYPE edge)
+{
+    Uint32 y;
+    VEC_TYPE *pinout;
+    VEC_TYPE *pina,*pinb,*pinc;
 
-            COMP_NO_SHIFT(MB_NEIGHBOR_0,inout,in0);
-            COMP_NO_SHIFT(MB_NEIGHBOR_1,inout,in1);
-            COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in0,in3);
-            COMP_NO_SHIFT(MB_NEIGHBOR_3,inout,in5);
-            COMP_SHIFT_RIGHT(MB_NEIGHBOR_4,inout,in6,in5);
-            COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
-            COMP_SHIFT_RIGHT(MB_NEIGHBOR_6,inout,in8,in1);
-            
-            VEC_STORE(pinout, inout);
-            in8 = in1;
-            in7 = in0;
-            in0 = in3;
-            in6 = in5;
+    for(y=ystart; y<yend; y++) {
+        pina = (VEC_TYPE*) ((y==0) ? edge_line : plines_in[y-1]);
+        pinb = (VEC_TYPE*) (plines_in[y]);
+        pinc = (VEC_TYPE*) ((y==height-1) ? edge_line : plines_in[y+1]);
+        pinout = (VEC_TYPE*) (plines_inout[y]);
+        if (grid==MB_SQUARE_GRID) {
+            MB_comp_line_square(pinout, pina, pinb, pinc, bytes_in, neighbors, edge);
+        } else if (y%2==0) {
+            MB_comp_line_hexagonal_even(pinout, pina, pinb, pinc, bytes_in, neighbors, edge);
+        } else {
+            MB_comp_line_hexagonal_odd(pinout, pina, pinb, pinc, bytes_in, neighbors, edge);
         }
     }
+}
 
-    /* END LINE (odd) */
-    in7 = edge;
-    pina = (VEC_TYPE*) (plines_in[y-1]);
-    pinb = (VEC_TYPE*) (plines_in[y]);
-    in1 = VEC_LOAD (pina);
-    in0 = VEC_LOAD (pinb);
-    pina++;
-    pinb++;
-    pinout = (VEC_TYPE*) (plines_inout[y]);
-    for(x=0; x<bytes_in; x+=sizeof(VEC_TYPE),pina++,pinb++,pinout++) {
-        inout = VEC_LOAD(pinout);
-        if (x==(bytes_in-sizeof(VEC_TYPE))) {
-            in2 = edge;
-            in3 = edge;
-        } else {
-            in2 = VEC_LOAD(pina);
-            in3 = VEC_LOAD(pinb);
-        }
+static MB_errcode MB_comp_neighbors(
+        PLINE *plines_inout, PLINE *plines_in,
+        Uint32 bytes_in, Uint32 height, Uint32 neighbors,
+        enum MB_grid_t grid, VEC_TYPE edge_val, enum MB_edgemode_t edge)
+{
+    PLINE edge_line;
+    int b, nb_bands;
 
-        COMP_NO_SHIFT(MB_NEIGHBOR_0,inout,in0);
-        COMP_SHIFT_LEFT(MB_NEIGHBOR_1,inout,in1,in2);
-        COMP_SHIFT_LEFT(MB_NEIGHBOR_2,inout,in0,in3);
-        COMP_NO_SHIFT(MB_NEIGHBOR_3|MB_NEIGHBOR_4,inout,edge);
-        COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
-        COMP_NO_SHIFT(MB_NEIGHBOR_6,inout,in1);
-        
-        VEC_STORE(pinout, inout);
-        in1 = in2;
-        in7 = in0;
-        in0 = in3;
+    /* The line used above the first line and below the last one */
+    edge_line = (PLINE) MB_aligned_malloc(bytes_in, 16);
+    if (edge_line==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
     }
-}
+    MB_memset(edge_line, (edge==MB_FILLED_EDGE) ? 0xff : 0, bytes_in);
 
+    /* The bands only read the input lines, they can be computed */
+    /* concurrently */
+    nb_bands = (int) MB_BandCount(height);
+#pragma omp parallel for num_threads(nb_bands) if(nb_bands>1)
+    for(b=0; b<nb_bands; b++) {
+        MB_comp_neighbors_band(plines_inout, plines_in, edge_line, bytes_in, height,
+                               MB_BAND_START(b, nb_bands, height),
+                               MB_BAND_START(b+1, nb_bands, height),
+                               neighbors, grid, edge_val);
+    }
+
+    MB_aligned_free(edge_line);
+    return MB_NO_ERR;
+}
@@ -0,0 +1,119 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* Comparison of two labels for qsort */
+static int MB_LabelCmp(const void *a, const void *b)
+{
+    Uint32 la = *((const Uint32 *) a);
+    Uint32 lb = *((const Uint32 *) b);
+    return (la>lb) - (la<lb);
+}
+
+/*
+ * Lists the labels found in a label image in increasing order.
+ *
+ * \param label the label image (32-bit)
+ * \param plabels the table receiving the labels
+ * \param nblabels the number of entries of the table
+ * \param pNbobj the number of labels found
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RegionLabels(MB_Image *label, Uint32 *plabels, Uint32 nblabels, Uint32 *pNbobj)
+{
+    PIX32 *plabel;
+    Uint8 *found;
+    Uint32 *sorted;
+    Uint32 x, y, l, n, maxlabel;
+    Uint64 size;
+
+    /* Verification over depth */
+    if (label->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    size = ((Uint64) label->width)*label->height;
+    maxlabel = 0;
+    for(y=0; y<label->height; y++) {
+        plabel = (PIX32 *) label->plines[y];
+        for(x=0; x<label->width; x++) {
+            if (plabel[x]>maxlabel) maxlabel = plabel[x];
+        }
+    }
+
+    n = 0;
+    if (maxlabel<size) {
+        /* Labels lower than the number of pixels are marked in a table */
+        found = (Uint8 *) MB_malloc(((size_t) maxlabel)+1);
+        if (found==NULL) {
+            return MB_ERR_CANT_ALLOCATE_MEMORY;
+        }
+        memset(found, 0, ((size_t) maxlabel)+1);
+        for(y=0; y<label->height; y++) {
+            plabel = (PIX32 *) label->plines[y];
+            for(x=0; x<label->width; x++) {
+                found[plabel[x]] = 1;
+            }
+        }
+        for(l=0; l<=maxlabel; l++) {
+            if (found[l]) {
+                if (n>=nblabels) {
+                    MB_free(found);
+                    return MB_ERR_BAD_PARAMETER;
+                }
+                plabels[n++] = l;
+            }
+        }
+        MB_free(found);
+    } else {
+        /* Otherwise the pixels are sorted to find the labels */
+        sorted = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+        if (sorted==NULL) {
+            return MB_ERR_CANT_ALLOCATE_MEMORY;
+        }
+        for(y=0; y<label->height; y++) {
+            memcpy(sorted+((Uint64) y)*label->width, label->plines[y],
+                   label->width*sizeof(Uint32));
+        }
+        qsort(sorted, (size_t) size, sizeof(Uint32), MB_LabelCmp);
+        for(x=0; x<size; x++) {
+            if (n==0 || sorted[x]!=plabels[n-1]) {
+                if (n>=nblabels) {
+                    MB_free(sorted);
+                    return MB_ERR_BAD_PARAMETER;
+                }
+                plabels[n++] = sorted[x];
+            }
+        }
+        MB_free(sorted);
+    }
+
+    *pNbobj = n;
+    return MB_NO_ERR;
+}
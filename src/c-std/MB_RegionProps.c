@@ -0,0 +1,208 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/*
+ * Reads the value of a pixel of the measure image.
+ * \param line the pixel line of the measure image
+ * \param depth the depth of the measure image
+ * \param x the position of the pixel in the line
+ * \return the pixel value
+ */
+static INLINE Uint64 MB_MeasureValue(PLINE line, Uint32 depth, Uint32 x)
+{
+    switch(depth) {
+    case 1:
+        return (((MB_Vector1 *) line)[x/MB_vec1_size]>>(x%MB_vec1_size))&1;
+    case 8:
+        return ((PIX8 *) line)[x];
+    default:
+        return ((PIX32 *) line)[x];
+    }
+}
+
+/*
+ * Returns the row of a label in the sorted table of the labels (nblabels
+ * if the label is not in the table).
+ * \param plabels the labels in increasing order
+ * \param nblabels the number of labels
+ * \param lbl the label
+ * \return the row of the label
+ */
+static Uint32 MB_LabelRow(Uint32 *plabels, Uint32 nblabels, Uint32 lbl)
+{
+    Uint32 low, high, mid;
+
+    low = 0;
+    high = nblabels;
+    while(low<high) {
+        mid = low + (high-low)/2;
+        if (plabels[mid]<lbl) {
+            low = mid+1;
+        } else {
+            high = mid;
+        }
+    }
+    return (low<nblabels && plabels[low]==lbl) ? low : nblabels;
+}
+
+/*
+ * Computes the properties of the regions of a label image in a single pass.
+ * The columns of the table are stored one after the other (column c of
+ * the region of row r is at index c*nbrows+r).
+ *
+ * \param label the label image (32-bit)
+ * \param measure the measure image (binary, greyscale or 32-bit) or NULL
+ * \param plabels the labels of the rows in increasing order
+ * \param nblabels the number of labels
+ * \param pprops the table of the region properties
+ * \param nbrows the number of rows of the table
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RegionProps(MB_Image *label, MB_Image *measure, Uint32 *plabels, Uint32 nblabels,
+                          Uint64 *pprops, Uint32 nbrows)
+{
+    Uint64 *area, *volume, *vmin, *vmax, *xmin, *ymin, *xmax, *ymax;
+    Uint64 *sumx, *sumy, *dmin, *dmax, *amin, *amax;
+    Uint64 value;
+    PIX32 *plabel;
+    Uint32 *rows;
+    Uint32 x, y, l, lbl, i;
+
+    /* Verification over depth and size */
+    if (label->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (measure!=NULL) {
+        if (!MB_CHECK_SIZE_2(label, measure)) {
+            return MB_ERR_BAD_SIZE;
+        }
+        if (measure->depth!=1 && measure->depth!=8 && measure->depth!=32) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+    if (nblabels==0 || nbrows<nblabels) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    for(l=1; l<nblabels; l++) {
+        if (plabels[l]<=plabels[l-1]) {
+            return MB_ERR_BAD_PARAMETER;
+        }
+    }
+
+    /* When the labels are lower than the number of pixels, their rows */
+    /* are given by a table, otherwise they are searched in the labels */
+    rows = NULL;
+    if (((Uint64) plabels[nblabels-1]) < ((Uint64) label->width)*label->height) {
+        rows = (Uint32 *) MB_malloc((((size_t) plabels[nblabels-1])+1)*sizeof(Uint32));
+        if (rows==NULL) {
+            return MB_ERR_CANT_ALLOCATE_MEMORY;
+        }
+        for(i=0; i<=plabels[nblabels-1]; i++) {
+            rows[i] = nblabels;
+        }
+        for(l=0; l<nblabels; l++) {
+            rows[plabels[l]] = l;
+        }
+    }
+
+    area = pprops + MB_REGION_AREA*nbrows;
+    volume = pprops + MB_REGION_VOLUME*nbrows;
+    vmin = pprops + MB_REGION_MIN*nbrows;
+    vmax = pprops + MB_REGION_MAX*nbrows;
+    xmin = pprops + MB_REGION_XMIN*nbrows;
+    ymin = pprops + MB_REGION_YMIN*nbrows;
+    xmax = pprops + MB_REGION_XMAX*nbrows;
+    ymax = pprops + MB_REGION_YMAX*nbrows;
+    sumx = pprops + MB_REGION_SUMX*nbrows;
+    sumy = pprops + MB_REGION_SUMY*nbrows;
+    dmin = pprops + MB_REGION_DMIN*nbrows;
+    dmax = pprops + MB_REGION_DMAX*nbrows;
+    amin = pprops + MB_REGION_AMIN*nbrows;
+    amax = pprops + MB_REGION_AMAX*nbrows;
+
+    /* The minimum columns start at their highest value */
+    memset(pprops, 0, MB_REGION_COLUMNS*nbrows*sizeof(Uint64));
+    for(l=0; l<nbrows; l++) {
+        vmin[l] = xmin[l] = ymin[l] = dmin[l] = amin[l] = ~((Uint64) 0);
+    }
+
+    lbl = plabels[0];
+    l = 0;
+    for(y=0; y<label->height; y++) {
+        plabel = (PIX32 *) label->plines[y];
+        for(x=0; x<label->width; x++) {
+            /* The row of the previous pixel is kept for the same label */
+            if (plabel[x]!=lbl) {
+                lbl = plabel[x];
+                if (rows!=NULL) {
+                    l = lbl<=plabels[nblabels-1] ? rows[lbl] : nblabels;
+                } else {
+                    l = MB_LabelRow(plabels, nblabels, lbl);
+                }
+            }
+            if (l>=nblabels) {
+                MB_free(rows);
+                return MB_ERR_BAD_VALUE;
+            }
+            area[l]++;
+            sumx[l] += x;
+            sumy[l] += y;
+            if (x<xmin[l]) xmin[l] = x;
+            if (x>xmax[l]) xmax[l] = x;
+            if (y<ymin[l]) ymin[l] = y;
+            ymax[l] = y;
+            if (x+y<dmin[l]) dmin[l] = x+y;
+            if (x+y>dmax[l]) dmax[l] = x+y;
+            if (x+label->height-1-y<amin[l]) amin[l] = x+label->height-1-y;
+            if (x+label->height-1-y>amax[l]) amax[l] = x+label->height-1-y;
+            if (measure!=NULL) {
+                value = MB_MeasureValue(measure->plines[y], measure->depth, x);
+                volume[l] += value;
+                if (value<vmin[l]) vmin[l] = value;
+                if (value>vmax[l]) vmax[l] = value;
+            }
+        }
+    }
+
+    MB_free(rows);
+
+    /* The regions without pixel are reset */
+    for(l=0; l<nbrows; l++) {
+        if (area[l]==0 || measure==NULL) {
+            vmin[l] = 0;
+        }
+        if (area[l]==0) {
+            xmin[l] = ymin[l] = dmin[l] = amin[l] = 0;
+        }
+    }
+
+    return MB_NO_ERR;
+}
@@ -0,0 +1,305 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+/* This file is used to avoid code repetition between the operators computing
+ * the minimum or maximum over a segment.
+ * It is used by the following files :
+ *    MB_InfSegmentb.c
+ *    MB_InfSegment8.c
+ *    MB_InfSegment32.c
+ *    MB_SupSegmentb.c
+ *    MB_SupSegment8.c
+ *    MB_SupSegment32.c
+ *
+ * To use the van Herk/Gil-Werman computation (MB_comp_segment), you will need
+ * to define the following macros :
+ * DATA_TYPE (the type of the pixels inside the computation lines)
+ * COMP(a,b) (the result of the comparison of a and b)
+ * IN_LINE(pline,buf,width) (pointer on the DATA_TYPE pixels of an image line,
+ *                          buf can be used to unpack them)
+ * OUT_LINE(pline,buf) (pointer where the pixels of an image line are written)
+ * STORE_LINE(pline,buf,width) (finishes the writing of an image line)
+ *
+ * To use the computation by doublets of points (MB_comp_segment_doubling),
+ * you will need to define the following macro :
+ * FARNB_FUNC (the far neighbor function of the depth)
+ *
+ * The segment values are computed using the van Herk/Gil-Werman algorithm.
+ * The paths following the direction are cut into blocks of the segment
+ * length. Inside each block, the running values are computed backward (A)
+ * and forward (B) and every segment is obtained by combining one value of
+ * A with one value of B taken in the next block. The cost per pixel does not
+ * depend on the size of the segment.
+ * When the direction is not horizontal, every step along the path moves
+ * to the next line, so the running values are computed on whole lines at
+ * once, the horizontal displacement of the step being a shift of the line.
+ *
+ * Along a binary line or a horizontal greyscale line, a vectorized far
+ * neighbor pass on the whole image costs less than the running values
+ * computed pixel after pixel. The segment is then obtained with doublets of
+ * points at doubling distances, in log2(size) passes.
+ */
+
+#ifdef FARNB_FUNC
+/*
+ * Computes the segment by successive combinations with the far neighbor
+ * at distances 1, 2, 4, ... (the last one completing the size).
+ */
+static MB_errcode MB_comp_segment_doubling(MB_Image *src, MB_Image *dest,
+                                           Uint32 dir, Uint32 size,
+                                           enum MB_grid_t grid,
+                                           enum MB_edgemode_t edge)
+{
+    MB_errcode err;
+    Uint32 step, max_len;
+
+    /* The segment cannot be longer than the longest path */
+    max_len = src->width+src->height;
+    if (size>max_len) {
+        size = max_len;
+    }
+
+    err = MB_Copy(src, dest);
+    for(step=1; err==MB_NO_ERR && size>0; step*=2) {
+        if (step>size) {
+            step = size;
+        }
+        err = FARNB_FUNC(dest, dest, dir, step, grid, edge);
+        size -= step;
+    }
+    return err;
+}
+#endif
+
+#ifdef DATA_TYPE
+
+/* Displacements for the square grid and for the even and odd lines */
+/* of the hexagonal grid */
+static const Sint32 sq_dx[9] = {0, 0, 1, 1, 1, 0,-1,-1,-1};
+static const Sint32 sq_dy[9] = {0,-1,-1, 0, 1, 1, 1, 0,-1};
+static const Sint32 hx_dx[2][7] = {{0, 0, 1, 0,-1,-1,-1},
+                                   {0, 1, 1, 1, 0,-1, 0}};
+static const Sint32 hx_dy[7] = {0,-1, 0, 1, 1, 0,-1};
+
+/*
+ * Combines line a with line b shifted by dx pixels (out[x] = COMP(a[x],
+ * b[x+dx])). Pixels of b outside the line take the edge value.
+ */
+static void MB_segment_line(DATA_TYPE *out, DATA_TYPE *a, DATA_TYPE *b,
+                            Sint32 dx, Sint32 width, DATA_TYPE edge)
+{
+    Sint32 x, xstart, xend;
+
+    xstart = (dx<0) ? -dx : 0;
+    xend = (dx>0) ? width-dx : width;
+    if (xstart>width) xstart = width;
+    if (xend<xstart) xend = xstart;
+
+    for(x=0; x<xstart; x++) {
+        out[x] = COMP(a[x], edge);
+    }
+    for(x=xstart; x<xend; x++) {
+        out[x] = COMP(a[x], b[x+dx]);
+    }
+    for(x=xend; x<width; x++) {
+        out[x] = COMP(a[x], edge);
+    }
+}
+
+/*
+ * Computes the segment values inside a line (horizontal direction). When
+ * reverse is set, the segment goes toward the beginning of the line.
+ */
+static void MB_segment_row(DATA_TYPE *out, DATA_TYPE *in,
+                           DATA_TYPE *fwd, DATA_TYPE *bwd,
+                           Sint32 width, Sint32 reverse, Sint32 size,
+                           DATA_TYPE edge)
+{
+    Sint32 i, b0, b1, last, block;
+    DATA_TYPE val;
+
+    /* The running values are kept in val to avoid reading back the */
+    /* value just written */
+    block = size+1;
+    for(b0=0; b0<width; b0=b1) {
+        b1 = (b0+block<width) ? b0+block : width;
+        val = in[b0];
+        fwd[b0] = val;
+        for(i=b0+1; i<b1; i++) {
+            val = COMP(val, in[i]);
+            fwd[i] = val;
+        }
+        val = in[b1-1];
+        bwd[b1-1] = val;
+        for(i=b1-2; i>=b0; i--) {
+            val = COMP(val, in[i]);
+            bwd[i] = val;
+        }
+    }
+
+    if (reverse) {
+        /* The first segments go out of the image (they are inside the */
+        /* first block) */
+        for(i=0; i<size && i<width; i++) {
+            out[i] = COMP(fwd[i], edge);
+        }
+        for(i=size; i<width; i++) {
+            out[i] = COMP(fwd[i], bwd[i-size]);
+        }
+    } else {
+        for(i=0; i<width-size; i++) {
+            out[i] = COMP(bwd[i], fwd[i+size]);
+        }
+        /* The last segments go out of the image */
+        last = ((width-1)/block)*block;
+        for(i=(width-size>0) ? width-size : 0; i<width; i++) {
+            out[i] = (i>=last) ? COMP(bwd[i], edge) :
+                                 COMP(COMP(bwd[i], fwd[width-1]), edge);
+        }
+    }
+}
+
+static MB_errcode MB_comp_segment(PLINE *plines_out, PLINE *plines_in,
+                                  Sint32 width, Sint32 height,
+                                  Uint32 dir, Uint32 size,
+                                  enum MB_grid_t grid, DATA_TYPE edge_val)
+{
+    DATA_TYPE *buffer, *bufin, *bufout, *bufext, *A, *B, *pin, *pout;
+    Sint32 dx[2], dy, s, block, t, t0, t1, t2, j, k, x, y;
+    Sint32 max_len, nb_lines, margin, wext;
+
+    if (grid==MB_SQUARE_GRID) {
+        dx[0] = sq_dx[dir];
+        dx[1] = sq_dx[dir];
+        dy = sq_dy[dir];
+    } else {
+        dx[0] = hx_dx[0][dir];
+        dx[1] = hx_dx[1][dir];
+        dy = hx_dy[dir];
+    }
+
+    /* The segment cannot be longer than the longest path */
+    max_len = (dy==0) ? width : height;
+    s = (size>(Uint32) max_len) ? max_len : (Sint32) size;
+    block = s+1;
+
+    /* The lines of the second block are extended on both sides by the */
+    /* largest horizontal displacement of a segment, the pixels outside */
+    /* the image taking the edge value. Thus the running values of the */
+    /* paths that leave the image are still available. */
+    margin = (dy==0) ? 0 : s;
+    wext = width+2*margin;
+
+    /* Lines of the two blocks (only one line in each when horizontal), */
+    /* plus the lines to unpack and extend the pixels */
+    nb_lines = (dy==0) ? 1 : ((block<height) ? block : height);
+    buffer = MB_malloc((nb_lines*(width+wext)+2*width+wext)*sizeof(DATA_TYPE));
+    if (buffer==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    A = buffer;
+    B = A+nb_lines*width;
+    bufin = B+nb_lines*wext;
+    bufout = bufin+width;
+    bufext = bufout+width;
+    for(x=0; x<margin; x++) {
+        bufext[x] = edge_val;
+        bufext[margin+width+x] = edge_val;
+    }
+
+    if (dy==0) {
+        /* Horizontal segments, the lines are computed one by one */
+        for(y=0; y<height; y++) {
+            pin = IN_LINE(plines_in[y], bufin, width);
+            pout = OUT_LINE(plines_out[y], bufout);
+            MB_segment_row(pout, pin, A, B, width, dx[0]<0, s, edge_val);
+            STORE_LINE(plines_out[y], bufout, width);
+        }
+        MB_free(buffer);
+        return MB_NO_ERR;
+    }
+
+    /* The lines are taken in the order of the path (index t) */
+#define LINE_Y(t) ((dy>0) ? (t) : height-1-(t))
+#define DX(t) (dx[LINE_Y(t)&1])
+    for(t0=0; t0<height; t0=t1) {
+        t1 = (t0+block<height) ? t0+block : height;
+        t2 = (t1+block<height) ? t1+block : height;
+
+        /* Running values from each line to the end of the block */
+        for(t=t1-1; t>=t0; t--) {
+            pin = IN_LINE(plines_in[LINE_Y(t)], bufin, width);
+            if (t==t1-1) {
+                MB_memcpy(A+(t-t0)*width, pin, width*sizeof(DATA_TYPE));
+            } else {
+                MB_segment_line(A+(t-t0)*width, pin, A+(t+1-t0)*width,
+                                DX(t), width, edge_val);
+            }
+        }
+        /* Running values from the beginning of the next block */
+        for(t=t1; t<t2; t++) {
+            pin = IN_LINE(plines_in[LINE_Y(t)], bufin, width);
+            MB_memcpy(bufext+margin, pin, width*sizeof(DATA_TYPE));
+            if (t==t1) {
+                MB_memcpy(B, bufext, wext*sizeof(DATA_TYPE));
+            } else {
+                MB_segment_line(B+(t-t1)*wext, bufext, B+(t-1-t1)*wext,
+                                -DX(t-1), wext, edge_val);
+            }
+        }
+
+        /* Combining them, the segment of line t ends on line t+s */
+        for(t=t0; t<t1; t++) {
+            y = LINE_Y(t);
+            pout = OUT_LINE(plines_out[y], bufout);
+            j = (t+s<height) ? t+s : height-1;
+            if (j<t1) {
+                MB_memcpy(pout, A+(t-t0)*width, width*sizeof(DATA_TYPE));
+            } else {
+                /* horizontal displacement between lines t and j */
+                k = j-t;
+                MB_segment_line(pout, A+(t-t0)*width,
+                                B+(j-t1)*wext+margin
+                                 +(k/2)*(dx[0]+dx[1])+(k%2)*dx[y&1],
+                                0, width, edge_val);
+            }
+            if (t+s>=height) {
+                /* the segment goes out of the image */
+                for(k=0; k<width; k++) {
+                    pout[k] = COMP(pout[k], edge_val);
+                }
+            }
+            STORE_LINE(plines_out[y], bufout, width);
+        }
+    }
+#undef LINE_Y
+#undef DX
+
+    MB_free(buffer);
+    return MB_NO_ERR;
+}
+#endif
@@ -69,6 +69,9 @@
 }                                                                           \
 
 #include "MB_Neighbors_vector.h"
+#define LINE_TYPE VEC_TYPE
+#include "MB_Neighbors_iterate.h"
+#undef LINE_TYPE
 
 #undef VEC_TYPE
 #undef VEC_LOAD
@@ -90,6 +93,9 @@
 }                                                                           \
 
 #include "MB_Neighbors.h"
+#define LINE_TYPE DATA_TYPE
+#include "MB_Neighbors_iterate.h"
+#undef LINE_TYPE
 
 #undef DATA_TYPE
 #undef COMP
@@ -141,6 +147,17 @@ MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB
         return MB_ERR_BAD_DEPTH;
     }
 
+    /* No neighbors to take into account */
+    if (grid==MB_SQUARE_GRID) {
+        if ((neighbors&MB_NEIGHBOR_ALL_SQUARE)==0) {
+            return MB_NO_ERR;
+        }
+    } else {
+        if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
+            return MB_NO_ERR;
+        }
+    }
+
     /* If src and srcdest are the same image, we create a temporary */
     /* images where we copy the pixels value */
     if (src==srcdest) {
@@ -166,30 +183,59 @@ MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB
     bytes_in = MB_LINE_COUNT(src);
 
     /* Calling the corresponding function */
-    if (grid==MB_SQUARE_GRID) {
-        if ((neighbors&MB_NEIGHBOR_ALL_SQUARE)==0) {
-            /* No neighbors to take into account */
-            return MB_NO_ERR;
-        }
-        MB_comp_neighbors_square(plines_inout, plines_in, bytes_in, temp->height,
-                                 neighbors, edge_val);
-    } else {
-        if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
-            /* No neighbors to take into account */
-            return MB_NO_ERR;
-        }
-        MB_comp_neighbors_hexagonal(plines_inout, plines_in, bytes_in, temp->height,
-                                    neighbors, edge_val);
-    }
+    err = MB_comp_neighbors(plines_inout, plines_in, bytes_in, temp->height,
+                            neighbors, grid, edge_val, edge);
 
     /* Destroying the temporary image if one was created */
     if (src==srcdest) {
         MB_Destroy(temp);
     }
     
-    return MB_NO_ERR;
+    return err;
 }
 
+/*
+ * Dilates the greyscale image n times using the given neighbors (the central
+ * pixel being neighbor 0). The result is the same as n successive calls to
+ * MB_SupNb8 on an image initialized with the minimum value but the
+ * iterations are computed in a single pass, without intermediate image.
+ *
+ * \param src source image
+ * \param dest destination image (can be the same as src)
+ * \param neighbors the neighbors of the structuring element
+ * \param n the number of iterations
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_Dilate8(MB_Image *src, MB_Image *dest, Uint32 neighbors, Uint32 n, enum MB_grid_t grid, enum MB_edgemode_t edge)
+{
+#ifdef MB_VECTORIZATION_8
+    MB_Vector8 edge_val = MB_vec8_set(GREY_FILL_VALUE(edge));
+#else
+    PIX8 edge_val = GREY_FILL_VALUE(edge);
+#endif
 
+    /* Error management */
+    /* Verification over image size compatibility */
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    /* Only greyscale images can be processed */
+    switch (MB_PROBE_PAIR(src, dest)) {
+    case MB_PAIR_8_8:
+        break;
+    default:
+        return MB_ERR_BAD_DEPTH;
+    }
 
+    /* No iteration, the image is simply copied */
+    if (n==0) {
+        return MB_Copy(src, dest);
+    }
 
+    return MB_comp_iterate(dest->plines, src->plines, MB_LINE_COUNT(src),
+                           src->height, neighbors, n, grid, edge_val, edge,
+                           0);
+}
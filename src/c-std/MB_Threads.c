@@ -0,0 +1,97 @@
+/*
+ * Copyright (c) <2026>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+/* Number of threads used by the operators computing image bands concurrently */
+static Uint32 MB_threadNumber = 1;
+
+/*
+ * Sets the number of threads that the operators can use to compute an image.
+ * Results do not depend on the number of threads. When the library was not
+ * compiled with OpenMP support, the computations are always performed on
+ * a single thread.
+ * \param number the number of threads (at least 1)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_SetThreadNumber(Uint32 number)
+{
+    if (number==0) {
+        return MB_ERR_BAD_VALUE;
+    }
+    MB_threadNumber = number;
+    
+    return MB_NO_ERR;
+}
+
+/*
+ * \return the number of threads that the operators can use.
+ */
+Uint32 MB_GetThreadNumber(void)
+{
+    return MB_threadNumber;
+}
+
+/*
+ * Computes the number of bands into which an image of the given height is
+ * split, so that each thread gets at least MB_BAND_MIN_LINES lines.
+ * \param height the height of the image
+ * \return the number of bands (1 when the computation is not multithreaded)
+ */
+Uint32 MB_BandCount(Uint32 height)
+{
+#ifdef _OPENMP
+    Uint32 nb_bands;
+    
+    nb_bands = height/MB_BAND_MIN_LINES;
+    if (nb_bands>MB_threadNumber) {
+        nb_bands = MB_threadNumber;
+    }
+    return (nb_bands>0) ? nb_bands : 1;
+#else
+    return 1;
+#endif
+}
+
+/*
+ * Computes the number of slabs of planes into which a 3D image of the given
+ * length is split, so that each thread gets at least one plane.
+ * \param length the number of planes of the 3D image
+ * \return the number of slabs (1 when the computation is not multithreaded)
+ */
+Uint32 MB_SlabCount(Uint32 length)
+{
+#ifdef _OPENMP
+    return (length<MB_threadNumber) ? ((length>0) ? length : 1) : MB_threadNumber;
+#else
+    return 1;
+#endif
+}
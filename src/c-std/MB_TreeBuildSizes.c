@@ -0,0 +1,184 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Sets the jump pointer of every node. The nodes being numbered after their
+ * parent, the pointers are computed in a single pass.
+ */
+static void MB_SetJumps(Uint32 *parent, Uint32 nbnodes, Uint32 *depth, Uint32 *jump)
+{
+    Uint32 n, p;
+
+    depth[0] = 0;
+    jump[0] = 0;
+    for(n=1; n<nbnodes; n++) {
+        p = parent[n];
+        depth[n] = depth[p]+1;
+        if (depth[p]-depth[jump[p]] == depth[jump[p]]-depth[jump[jump[p]]]) {
+            jump[n] = jump[jump[p]];
+        } else {
+            jump[n] = p;
+        }
+    }
+}
+
+/*
+ * Computes, for each node of a component tree, the largest size of the
+ * erosions of the image which still meet the node at its level (dilations
+ * for a min-tree). The opening by reconstruction of size k keeps the nodes
+ * of size k or more, so this size is the attribute of the openings by
+ * reconstruction.
+ *
+ * The erosions are computed one size after the other until the image stops
+ * changing. Every pixel keeps the highest node of its branch reached by
+ * the eroded value, which only goes down the branch towards the root as the
+ * size increases. The sizes are finally propagated to the ancestors.
+ *
+ * The branches of the max-tree of a 32-bit image can be as long as the
+ * image, the pixels thus go down their branch through jump pointers
+ * (skew-binary jumps, as in the random access lists of Myers) which reach
+ * the right node in a logarithmic number of steps.
+ *
+ * \param src the image the tree was built from
+ * \param nodes the image of the node of each pixel
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr receives the size of each node
+ * \param nbattr the number of attribute values
+ * \param neighbors the neighbors of the structuring element
+ * \param grid the grid used by the erosions (either square or hexagonal)
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_TreeBuildSizes(MB_Image *src, MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr, Uint32 neighbors, enum MB_grid_t grid)
+{
+    MB_Image *work;
+    Uint32 *parent, *level, *cursor, *depth, *jump;
+    Uint64 volume, prev_volume, k;
+    PIX32 value;
+    Uint32 x, y, n, c, dual;
+    MB_errcode err;
+
+    /* Verification over depth and size */
+    if (!MB_CHECK_SIZE_2(src, nodes)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=8 && src->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (nbattr<nbnodes) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    err = MB_CheckTree(nodes, ptree, nbnodes);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    parent = ptree + MB_TREE_PARENT*nbnodes;
+    level = ptree + MB_TREE_LEVEL*nbnodes;
+    /* A min-tree is recognized by its children below their parent */
+    dual = (nbnodes>1 && level[1]<level[0]);
+
+    cursor = (Uint32 *) MB_malloc(src->width*src->height*sizeof(Uint32));
+    depth = (Uint32 *) MB_malloc(2*nbnodes*sizeof(Uint32));
+    work = MB_malloc(sizeof(MB_Image));
+    if (cursor==NULL || depth==NULL || work==NULL) {
+        MB_free(work);
+        MB_free(depth);
+        MB_free(cursor);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    err = MB_Create(work, src->width, src->height, src->depth);
+    if (err!=MB_NO_ERR) {
+        MB_free(work);
+        MB_free(depth);
+        MB_free(cursor);
+        return err;
+    }
+    MB_Copy(src, work);
+    jump = depth + nbnodes;
+    MB_SetJumps(parent, nbnodes, depth, jump);
+
+    /* Every pixel starts from its own node, the root is never removed */
+    volume = 0;
+    for(y=0; y<src->height; y++) {
+        for(x=0; x<src->width; x++) {
+            cursor[x+y*src->width] = MB_TREE_NODE(nodes, x, y);
+            volume += MB_TREE_PIXEL(src, x, y);
+        }
+    }
+    memset(pattr, 0, nbnodes*sizeof(Uint64));
+    pattr[0] = ~((Uint64) 0);
+
+    prev_volume = volume+1;
+    for(k=1; volume!=prev_volume && err==MB_NO_ERR; k++) {
+        if (dual) {
+            err = MB_Dilate(work, work, neighbors, 1, grid, MB_EMPTY_EDGE);
+        } else {
+            err = MB_Erode(work, work, neighbors, 1, grid, MB_FILLED_EDGE);
+        }
+        prev_volume = volume;
+        volume = 0;
+        for(y=0; y<src->height && err==MB_NO_ERR; y++) {
+            for(x=0; x<src->width; x++) {
+                value = MB_TREE_PIXEL(work, x, y);
+                volume += value;
+                c = cursor[x+y*src->width];
+                /* The levels strictly decrease towards the root (increase */
+                /* for a min-tree), no node skipped by a jump is reached */
+                if (dual) {
+                    while (level[c]<value) {
+                        c = (level[jump[c]]<value) ? jump[c] : parent[c];
+                    }
+                } else {
+                    while (level[c]>value) {
+                        c = (level[jump[c]]>value) ? jump[c] : parent[c];
+                    }
+                }
+                cursor[x+y*src->width] = c;
+                if (c!=0) {
+                    pattr[c] = k;
+                }
+            }
+        }
+    }
+
+    /* From the leaves to the root */
+    for(n=nbnodes-1; n>0; n--) {
+        if (pattr[n]>pattr[parent[n]]) {
+            pattr[parent[n]] = pattr[n];
+        }
+    }
+
+    MB_Destroy(work);
+    MB_free(depth);
+    MB_free(cursor);
+
+    return err;
+}
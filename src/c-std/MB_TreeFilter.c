@@ -0,0 +1,306 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Writes the value of each node into the pixels of the node.
+ * \param nodes the image of the node of each pixel
+ * \param dest the greyscale or 32-bit image receiving the values
+ * \param values the value of each node
+ */
+static void MB_PaintNodes(MB_Image *nodes, MB_Image *dest, PIX32 *values)
+{
+    Uint32 x, y;
+    PIX8 *p8;
+    PIX32 *p32;
+
+    for(y=0; y<nodes->height; y++) {
+        if (dest->depth==8) {
+            p8 = (PIX8 *) dest->plines[y];
+            for(x=0; x<nodes->width; x++) {
+                p8[x] = (PIX8) values[MB_TREE_NODE(nodes, x, y)];
+            }
+        } else {
+            p32 = (PIX32 *) dest->plines[y];
+            for(x=0; x<nodes->width; x++) {
+                p32[x] = values[MB_TREE_NODE(nodes, x, y)];
+            }
+        }
+    }
+}
+
+/*
+ * Filters an image through its component tree. The nodes whose attribute is
+ * lower than the threshold are removed and their pixels take the level of
+ * the closest ancestor kept (the root is always kept).
+ *
+ * \param nodes the image of the node of each pixel
+ * \param dest the greyscale or 32-bit image receiving the result
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr the attribute of each node
+ * \param nbattr the number of attribute values
+ * \param threshold the lowest attribute value of the nodes kept
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_TreeFilter(MB_Image *nodes, MB_Image *dest, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr, Uint64 threshold)
+{
+    Uint32 *parent, *level;
+    PIX32 *values;
+    Uint32 n;
+    MB_errcode err;
+
+    /* Verification over depth and size */
+    if (!MB_CHECK_SIZE_2(nodes, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (dest->depth!=8 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (nbattr<nbnodes) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    err = MB_CheckTree(nodes, ptree, nbnodes);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    parent = ptree + MB_TREE_PARENT*nbnodes;
+    level = ptree + MB_TREE_LEVEL*nbnodes;
+    for(n=0; n<nbnodes; n++) {
+        if (dest->depth==8 && level[n]>0xff) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    values = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    if (values==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* From the root to the leaves */
+    values[0] = level[0];
+    for(n=1; n<nbnodes; n++) {
+        values[n] = (pattr[n]>=threshold) ? level[n] : values[parent[n]];
+    }
+    MB_PaintNodes(nodes, dest, values);
+
+    MB_free(values);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Computes the reconstruction of the image lowered by a constant (raised for
+ * a min-tree) through its component tree. The pixels of a node whose height
+ * is greater than the constant are lowered down to the top of the node
+ * minus the constant, the others take the value of their parent. The values
+ * are kept within the range of the destination image, as the subtraction
+ * and addition operators do.
+ *
+ * \param nodes the image of the node of each pixel
+ * \param dest the greyscale or 32-bit image receiving the result
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr the height of each node (see MB_TreeProps)
+ * \param nbattr the number of attribute values
+ * \param h the constant
+ * \param dual 0 for a max-tree, 1 for a min-tree
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_TreeDynamicBuild(MB_Image *nodes, MB_Image *dest, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr, Uint32 h, Uint32 dual)
+{
+    Uint32 *parent, *level;
+    PIX32 *values;
+    Uint64 top, plevel, maxval;
+    Uint32 n;
+    MB_errcode err;
+
+    /* Verification over depth and size */
+    if (!MB_CHECK_SIZE_2(nodes, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (dest->depth!=8 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (nbattr<nbnodes) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    err = MB_CheckTree(nodes, ptree, nbnodes);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    parent = ptree + MB_TREE_PARENT*nbnodes;
+    level = ptree + MB_TREE_LEVEL*nbnodes;
+    maxval = (dest->depth==8) ? 0xff : 0xffffffff;
+    for(n=0; n<nbnodes; n++) {
+        if (level[n]>maxval) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    values = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    if (values==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* From the root to the leaves. The top of a node is its extreme value, */
+    /* the root spans all the levels down to the bound of the range */
+    for(n=0; n<nbnodes; n++) {
+        plevel = level[parent[n]];
+        if (dual) {
+            top = (pattr[n]>plevel) ? 0 : plevel-pattr[n];
+            if (n==0 || top+h<plevel) {
+                top = (top+h<level[n]) ? level[n] : top+h;
+                values[n] = (PIX32) ((top>maxval) ? maxval : top);
+            } else {
+                values[n] = values[parent[n]];
+            }
+        } else {
+            top = plevel+pattr[n];
+            if (n==0 || top>plevel+h) {
+                top = (top<h) ? 0 : top-h;
+                values[n] = (PIX32) ((top>level[n]) ? level[n] : top);
+            } else {
+                values[n] = values[parent[n]];
+            }
+        }
+    }
+    MB_PaintNodes(nodes, dest, values);
+
+    MB_free(values);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Computes the ultimate attribute opening (or closing for a min-tree) of an
+ * image through its component tree.
+ *
+ * Along the branch of the tree going from the root to the node of a pixel,
+ * the attribute decreases. The filter of attribute threshold k keeps the
+ * nodes of attribute k or more, so the residue between the filters of
+ * thresholds k-1 and k is the sum of the contrasts of the nodes of attribute
+ * k-1 in the branch. These sums are accumulated from the root to the leaves
+ * with the greatest one and its size (k). When two residues are equal, the
+ * larger size is kept.
+ *
+ * \param nodes the image of the node of each pixel
+ * \param res the greyscale or 32-bit image receiving the maximal residue
+ * \param size the 32-bit image receiving the size of the maximal residue
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr the (increasing) attribute of each node
+ * \param nbattr the number of attribute values
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_TreeUltimateOpening(MB_Image *nodes, MB_Image *res, MB_Image *size, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr)
+{
+    Uint32 *parent, *level;
+    PIX32 *run, *above_res, *above_size, *best_res, *best_size;
+    PIX32 contrast;
+    Uint32 n, p;
+    MB_errcode err;
+
+    /* Verification over depth and size */
+    if (!MB_CHECK_SIZE_3(nodes, res, size)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if ((res->depth!=8 && res->depth!=32) || size->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (nbattr<nbnodes) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    err = MB_CheckTree(nodes, ptree, nbnodes);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    parent = ptree + MB_TREE_PARENT*nbnodes;
+    level = ptree + MB_TREE_LEVEL*nbnodes;
+    for(n=0; n<nbnodes; n++) {
+        if (res->depth==8 && level[n]>0xff) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    run = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    above_res = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    above_size = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    best_res = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    best_size = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    if (run==NULL || above_res==NULL || above_size==NULL || best_res==NULL || best_size==NULL) {
+        /* in case allocation goes wrong */
+        MB_free(run);
+        MB_free(above_res);
+        MB_free(above_size);
+        MB_free(best_res);
+        MB_free(best_size);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* The root has no residue */
+    run[0] = above_res[0] = above_size[0] = best_res[0] = best_size[0] = 0;
+    for(n=1; n<nbnodes; n++) {
+        p = parent[n];
+        contrast = (level[n]>level[p]) ? level[n]-level[p] : level[p]-level[n];
+        if (pattr[n]==pattr[p]) {
+            /* The node extends the residue of its parent */
+            run[n] = run[p] + contrast;
+            above_res[n] = above_res[p];
+            above_size[n] = above_size[p];
+        } else {
+            run[n] = contrast;
+            above_res[n] = best_res[p];
+            above_size[n] = best_size[p];
+        }
+        /* The residues above come from larger sizes and win ties */
+        if (run[n]>above_res[n]) {
+            best_res[n] = run[n];
+            best_size[n] = (pattr[n]>=0xffffffff) ? 0xffffffff : (PIX32) (pattr[n]+1);
+        } else {
+            best_res[n] = above_res[n];
+            best_size[n] = above_size[n];
+        }
+    }
+    MB_PaintNodes(nodes, res, best_res);
+    MB_PaintNodes(nodes, size, best_size);
+
+    MB_free(run);
+    MB_free(above_res);
+    MB_free(above_size);
+    MB_free(best_res);
+    MB_free(best_size);
+
+    return MB_NO_ERR;
+}
@@ -0,0 +1,139 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Computes the properties of the nodes of a component tree in a single pass
+ * over the image. The properties are first gathered for the pixels of each
+ * node and then accumulated from the children to their parents.
+ *
+ * \param src the image the tree was built from
+ * \param nodes the image of the node of each pixel
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pnodeprops the table of the node properties
+ * \param nbrows the number of rows of the properties table
+ *
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_TreeProps(MB_Image *src, MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes, Uint64 *pnodeprops, Uint32 nbrows)
+{
+    Uint64 *area, *volume, *height, *xmin, *ymin, *xmax, *ymax;
+    Uint32 *parent, *level;
+    PIX32 *extreme;
+    PIX32 plevel;
+    Uint32 x, y, n, p, dual;
+    MB_errcode err;
+
+    /* Verification over depth and size */
+    if (!MB_CHECK_SIZE_2(src, nodes)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=8 && src->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (nbrows<nbnodes) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    err = MB_CheckTree(nodes, ptree, nbnodes);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    parent = ptree + MB_TREE_PARENT*nbnodes;
+    level = ptree + MB_TREE_LEVEL*nbnodes;
+    area = pnodeprops + MB_NODE_AREA*nbrows;
+    volume = pnodeprops + MB_NODE_VOLUME*nbrows;
+    height = pnodeprops + MB_NODE_HEIGHT*nbrows;
+    xmin = pnodeprops + MB_NODE_XMIN*nbrows;
+    ymin = pnodeprops + MB_NODE_YMIN*nbrows;
+    xmax = pnodeprops + MB_NODE_XMAX*nbrows;
+    ymax = pnodeprops + MB_NODE_YMAX*nbrows;
+
+    /* The extreme value of each component (the maximum for a max-tree, */
+    /* the minimum for a min-tree) */
+    extreme = (PIX32 *) MB_malloc(nbnodes*sizeof(PIX32));
+    if (extreme==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    /* A min-tree is recognized by its children below their parent */
+    dual = (nbnodes>1 && level[1]<level[0]);
+
+    /* The minimum columns start at their highest value */
+    memset(pnodeprops, 0, MB_NODE_COLUMNS*nbrows*sizeof(Uint64));
+    for(n=0; n<nbnodes; n++) {
+        xmin[n] = ymin[n] = ~((Uint64) 0);
+        extreme[n] = level[n];
+    }
+
+    /* The volume column holds the sum of the values until the end */
+    for(y=0; y<nodes->height; y++) {
+        for(x=0; x<nodes->width; x++) {
+            n = MB_TREE_NODE(nodes, x, y);
+            area[n]++;
+            volume[n] += MB_TREE_PIXEL(src, x, y);
+            if (x<xmin[n]) xmin[n] = x;
+            if (x>xmax[n]) xmax[n] = x;
+            if (y<ymin[n]) ymin[n] = y;
+            ymax[n] = y;
+        }
+    }
+
+    /* From the leaves to the root */
+    for(n=nbnodes-1; n>0; n--) {
+        p = parent[n];
+        area[p] += area[n];
+        volume[p] += volume[n];
+        if (xmin[n]<xmin[p]) xmin[p] = xmin[n];
+        if (xmax[n]>xmax[p]) xmax[p] = xmax[n];
+        if (ymin[n]<ymin[p]) ymin[p] = ymin[n];
+        if (ymax[n]>ymax[p]) ymax[p] = ymax[n];
+        if (dual ? extreme[n]<extreme[p] : extreme[n]>extreme[p]) {
+            extreme[p] = extreme[n];
+        }
+    }
+
+    /* Volume and height above the parent level */
+    for(n=0; n<nbnodes; n++) {
+        plevel = level[parent[n]];
+        if (dual) {
+            volume[n] = area[n]*plevel - volume[n];
+            height[n] = plevel - extreme[n];
+        } else {
+            volume[n] = volume[n] - area[n]*plevel;
+            height[n] = extreme[n] - plevel;
+        }
+    }
+    /* Rows beyond the nodes are left empty */
+    for(n=nbnodes; n<nbrows; n++) {
+        xmin[n] = ymin[n] = 0;
+    }
+    MB_free(extreme);
+
+    return MB_NO_ERR;
+}
@@ -27,6 +27,15 @@
  */
 #include "mambaApi_loc.h"
 
+#if defined(_WIN32) || defined(__WIN32__) || defined(__CYGWIN__)
+#include <windows.h>
+#else
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <fcntl.h>
+#include <unistd.h>
+#endif
+
 /*
  * This file redefines some basic OS and memory functions that are used in the 
  * mamba API so that they could be modified or replaced in needed.
@@ -38,7 +47,7 @@
  *
  * \return a pointer to the memory space or NULL if unsuccessful
  */
-void *MB_malloc(int size) {
+void *MB_malloc(size_t size) {
     return malloc(size);
 }
 
@@ -51,7 +60,7 @@ void *MB_malloc(int size) {
  *
  * \return a pointer to the memory space or NULL if unsuccessful
  */
-void *MB_aligned_malloc(int size, int alignment) {
+void *MB_aligned_malloc(size_t size, int alignment) {
 # if defined(__MINGW32__)
     return __mingw_aligned_malloc(size, alignment);
 # elif defined(_WIN32) || defined(__WIN32__) || defined(__CYGWIN__)
@@ -115,3 +124,93 @@ void *MB_memcpy(void *dest, const void *src, int size) {
     return memmove(dest, src, size);
 }
 
+/*
+ * Maps a region of a file in memory. The mapping is private (copy-on-write):
+ * the memory can be modified but the changes are never written into the file.
+ *
+ * \param path the path of the file
+ * \param offset the position in bytes of the region in the file
+ * \param size the size in bytes of the region
+ * \param base the start of the mapping (to be given to MB_unmap_file)
+ * \param length the size of the mapping (to be given to MB_unmap_file)
+ *
+ * \return a pointer to the region or NULL if unsuccessful (the file cannot
+ * be opened or is too small)
+ */
+void *MB_map_file(const char *path, Uint64 offset, Uint64 size,
+                  void **base, Uint64 *length) {
+    Uint64 start;
+#if defined(_WIN32) || defined(__WIN32__) || defined(__CYGWIN__)
+    HANDLE file, map;
+    LARGE_INTEGER file_size;
+    SYSTEM_INFO info;
+    void *view;
+
+    GetSystemInfo(&info);
+    /* the mapping starts on a multiple of the allocation granularity */
+    start = offset - offset%info.dwAllocationGranularity;
+    file = CreateFileA(path, GENERIC_READ, FILE_SHARE_READ, NULL,
+                       OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+    if (file==INVALID_HANDLE_VALUE) {
+        return NULL;
+    }
+    if (!GetFileSizeEx(file, &file_size) ||
+        (Uint64) file_size.QuadPart < offset+size) {
+        CloseHandle(file);
+        return NULL;
+    }
+    map = CreateFileMappingA(file, NULL, PAGE_WRITECOPY, 0, 0, NULL);
+    CloseHandle(file);
+    if (map==NULL) {
+        return NULL;
+    }
+    view = MapViewOfFile(map, FILE_MAP_COPY,
+                         (DWORD) (start>>32), (DWORD) (start&0xffffffff),
+                         (SIZE_T) (offset-start+size));
+    /* the view keeps the mapping alive */
+    CloseHandle(map);
+    if (view==NULL) {
+        return NULL;
+    }
+    *base = view;
+#else
+    int fd;
+    struct stat file_stat;
+    void *view;
+
+    /* the mapping starts on a page boundary */
+    start = offset - offset%((Uint64) sysconf(_SC_PAGESIZE));
+    fd = open(path, O_RDONLY);
+    if (fd<0) {
+        return NULL;
+    }
+    if (fstat(fd, &file_stat)!=0 || (Uint64) file_stat.st_size < offset+size) {
+        close(fd);
+        return NULL;
+    }
+    view = mmap(NULL, (size_t) (offset-start+size), PROT_READ|PROT_WRITE,
+                MAP_PRIVATE, fd, (off_t) start);
+    /* the mapping stays valid once the file is closed */
+    close(fd);
+    if (view==MAP_FAILED) {
+        return NULL;
+    }
+    *base = view;
+#endif
+    *length = offset-start+size;
+    return ((PIX8 *) *base) + (offset-start);
+}
+
+/*
+ * Unmaps a file region mapped with MB_map_file.
+ * \param base the start of the mapping
+ * \param length the size of the mapping
+ */
+void MB_unmap_file(void *base, Uint64 length) {
+#if defined(_WIN32) || defined(__WIN32__) || defined(__CYGWIN__)
+    (void) length;
+    UnmapViewOfFile(base);
+#else
+    munmap(base, (size_t) length);
+#endif
+}
@@ -533,10 +533,23 @@ static INLINE void MB_ControlPass(MB_Watershed32_Ctx *local_ctx)
 MB_errcode MB_Watershed32(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid)
 {
     MB_Watershed32_Ctx *local_ctx;
+    MB_Image *levels;
+    MB_errcode err;
+    
+    /* Images with sparse levels are flooded through the ranks of */
+    /* their levels */
+    err = MB_FloodingLevels32(src, &levels, &max_level);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    if (levels!=NULL) {
+        src = levels;
+    }
     
     local_ctx = (MB_Watershed32_Ctx *)MB_malloc(sizeof(MB_Watershed32_Ctx));
     if(local_ctx==NULL){
         /* In case allocation goes wrong */
+        MB_Destroy(levels);
         return MB_ERR_CANT_ALLOCATE_MEMORY;
     }
     
@@ -554,6 +567,7 @@ MB_errcode MB_Watershed32(MB_Image *src, MB_Image *marker, Uint32 max_level, enu
     if(local_ctx->TokensArray==NULL){
         /* In case allocation goes wrong */
         MB_free(local_ctx);
+        MB_Destroy(levels);
         return MB_ERR_CANT_ALLOCATE_MEMORY;
     } 
     
@@ -578,6 +592,8 @@ MB_errcode MB_Watershed32(MB_Image *src, MB_Image *marker, Uint32 max_level, enu
     MB_free(local_ctx->TokensArray);
     /* Freeing the context */
     MB_free(local_ctx);
+    /* Freeing the ranks of the levels */
+    MB_Destroy(levels);
     
     return MB_NO_ERR;
 }
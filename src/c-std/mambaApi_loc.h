@@ -154,6 +154,10 @@ typedef void (LABELGRIDFUNC) (PLINE *plines_out, PLINE *plines_in,
                               Uint32 bytes_in, Uint32 nb_lines,
                               MB_Label_struct *labels);
 
+MB_errcode MB_LabelBands(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh,
+                         Uint32 *pNbobj, enum MB_grid_t grid,
+                         LABELGRIDFUNC *fn, Uint32 density);
+
 
 /* Definitions for the hierarchical queues :
  * Each pixel is tagged with one of these values in the MSByte of the 
@@ -261,6 +265,79 @@ extern const int cubePreDir[13][3];
 /* the direction depends on the coordinates of the line y and planes z*/
 extern const int fccPreDir[6][6][3];
 
+/****************************************/
+/* Multithreading                       */
+/****************************************/
+
+/** Minimum number of lines in a band of image computed by a thread */
+#define MB_BAND_MIN_LINES 32
+
+/** First line of band b when an image is split into nb_bands bands */
+/* bands always start on an even line to respect the hexagonal grid parity */
+#define MB_BAND_START(b, nb_bands, height) \
+    ((Uint32) ((((Uint64) ((height)/2))*(b))/(nb_bands))*2)
+
+Uint32 MB_BandCount(Uint32 height);
+Uint32 MB_SlabCount(Uint32 length);
+
+/****************************************/
+/* 3D neighbor operations               */
+/****************************************/
+
+/** 2D neighbor operation applied to the planes of 3D images */
+typedef MB_errcode (MB_NbOperation) (MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge);
+
+MB_errcode MB3D_NeighborOperation(MB3D_Image *src, MB3D_Image *srcdest, Uint32 neighbors,
+                                  enum MB3D_grid_t grid, enum MB_edgemode_t edge,
+                                  MB_NbOperation *nbfunc);
+
+/** 2D operation applied to the planes of 3D images (NULL sources unused) */
+typedef MB_errcode (MB_PlaneOperation) (MB_Image *src1, MB_Image *src2, MB_Image *dest, const void *params);
+
+MB_errcode MB3D_PlaneOperation(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest,
+                               const void *params, MB_PlaneOperation *func);
+
+/** Watershed (or basins) flooding of 3D images by slabs of planes */
+MB_errcode MB3D_SlabFlooding(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level,
+                             enum MB3D_grid_t grid, int watershed);
+
+/****************************************/
+/* Flooding of 32-bit images            */
+/****************************************/
+
+MB_errcode MB_FloodingLevels32(MB_Image *src, MB_Image **levels, Uint32 *max_level);
+
+/****************************************/
+/* Component trees                      */
+/****************************************/
+
+/** Node of pixel (x,y) in the nodes image of a component tree */
+#define MB_TREE_NODE(nodes, x, y) (((PIX32 *) ((nodes)->plines[y]))[x])
+
+/** Value of pixel (x,y) of a greyscale or 32-bit image */
+#define MB_TREE_PIXEL(image, x, y) ((image)->depth==8 ? \
+    (PIX32) (((PIX8 *) ((image)->plines[y]))[x]) : ((PIX32 *) ((image)->plines[y]))[x])
+
+MB_errcode MB_CheckTree(MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes);
+
+/****************************************/
+/* Atomic counters                      */
+/****************************************/
+
+/* counters and labels updated by concurrent threads (the Python wrapper
+ * releases the interpreter lock during the calls) */
+#if defined(_MSC_VER)
+#include <intrin.h>
+#define MB_ATOMIC_INC(counter) _InterlockedIncrement((volatile long *) &(counter))
+#define MB_ATOMIC_DEC(counter) _InterlockedDecrement((volatile long *) &(counter))
+#define MB_ATOMIC_CAS(var, oldval, newval) \
+    (_InterlockedCompareExchange((volatile long *) &(var), (long) (newval), (long) (oldval))==(long) (oldval))
+#else
+#define MB_ATOMIC_INC(counter) __sync_add_and_fetch(&(counter), 1)
+#define MB_ATOMIC_DEC(counter) __sync_sub_and_fetch(&(counter), 1)
+#define MB_ATOMIC_CAS(var, oldval, newval) __sync_bool_compare_and_swap(&(var), oldval, newval)
+#endif
+
 /****************************************/
 /* Volume arrays                        */
 /****************************************/
@@ -272,12 +349,16 @@ extern const Uint64 MB_VolumePerByte[256];
 /* Internal memory management           */
 /****************************************/
 
-void *MB_malloc(int size);
-void *MB_aligned_malloc(int size, int alignment);
+void *MB_malloc(size_t size);
+void *MB_aligned_malloc(size_t size, int alignment);
 void MB_free(void *ptr);
 void MB_aligned_free(void *ptr);
 
 void *MB_memset(void *s, int c, int size);
 void *MB_memcpy(void *dest, const void *src, int size);
 
+void *MB_map_file(const char *path, Uint64 offset, Uint64 size,
+                  void **base, Uint64 *length);
+void MB_unmap_file(void *base, Uint64 length);
+
 #endif
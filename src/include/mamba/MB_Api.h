@@ -392,6 +392,65 @@ MB_Distanceb(MB_Image *src, MB_Image *dest, enum MB_grid_t grid, enum MB_edgemod
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Frame(MB_Image *src, Uint32 thresval, Uint32 *ulx, Uint32 *uly, Uint32 *brx, Uint32 *bry);
+/**
+ * Evaluates a point-wise expression over the source images and puts the
+ * result in the destination image. The expression is a program for a stack
+ * machine (see enum MB_expr_op_t) whose operations have the same effect as
+ * the corresponding image operators. The whole program is applied to a line
+ * before going to the next one, so the intermediate results never leave
+ * the cache.
+ * \param psrcs the array of source images
+ * \param nbsrcs the number of source images
+ * \param dest destination image
+ * \param pprog the program
+ * \param proglen the number of values in the program
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_Expression(MB_Image **psrcs, Uint32 nbsrcs, MB_Image *dest, Uint32 *pprog, Uint32 proglen);
+/**
+ * Lists the labels found in a label image in increasing order (see
+ * MB_RegionProps). The table must be large enough to hold all the labels
+ * (the number of pixels of the image is always enough).
+ * \param label the label image (32-bit)
+ * \param plabels the table receiving the labels
+ * \param nblabels the number of entries of the table
+ * \param pNbobj the number of labels found
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RegionLabels(MB_Image *label, Uint32 *plabels, Uint32 nblabels, Uint32 *pNbobj);
+/**
+ * Computes the properties of the regions of a label image in a single pass
+ * (see enum MB_regionprop_t for the content of the table). Row r of the
+ * table holds the region of label plabels[r]; the labels are given in
+ * increasing order (see MB_RegionLabels) and every label of the image must
+ * be found among them. The measure image values are summed over each
+ * region and their minimum and maximum are computed. Without measure
+ * image (NULL) the corresponding columns are set to 0. The table of a label
+ * without any pixel contains an area of 0.
+ * \param label the label image (32-bit)
+ * \param measure the measure image (binary, greyscale or 32-bit) or NULL
+ * \param plabels the labels of the rows in increasing order
+ * \param nblabels the number of labels
+ * \param pprops the table of the region properties (MB_REGION_COLUMNS columns)
+ * \param nbrows the number of rows of the table
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RegionProps(MB_Image *label, MB_Image *measure, Uint32 *plabels, Uint32 nblabels,
+               Uint64 *pprops, Uint32 nbrows);
+/**
+ * Replaces each value of a label image by the value of the table found at
+ * this index. Values outside of the table are replaced by 0.
+ * \param label the label image (32-bit)
+ * \param dest the destination image (32-bit)
+ * \param pvalues the table of the values
+ * \param nbvalues the number of values in the table
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_LabelLookup(MB_Image *label, MB_Image *dest, Uint32 *pvalues, Uint32 nbvalues);
 
 #ifdef __cplusplus
 }
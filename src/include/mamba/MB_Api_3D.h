@@ -84,6 +84,36 @@ MB3D_Watershed(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB3D_Basins(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid);
+/**
+ * Performs a watershed segmentation of the 3D image using the 3D marker image
+ * as a starting point for the flooding. The planes of the image are split
+ * into slabs flooded concurrently by the threads (see MB_SetThreadNumber).
+ * The result is exactly the one of MB3D_Watershed but the total amount of
+ * work is larger, so this is only faster with enough cores.
+ *
+ * \param src the 3D image (greyscale or 32-bit) to segment
+ * \param marker the marker 3D image in which the result of segmentation will be put
+ * \param max_level the maximum level reached by the water
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_SlabWatershed(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid);
+/**
+ * Computes the catchment basins of the 3D image using the 3D marker image
+ * as a starting point for the flooding. The planes of the image are split
+ * into slabs flooded concurrently by the threads (see MB_SetThreadNumber).
+ * The result is exactly the one of MB3D_Basins but the total amount of
+ * work is larger, so this is only faster with enough cores.
+ *
+ * \param src the 3D image (greyscale or 32-bit) to segment
+ * \param marker the 3D marker image in which the result of segmentation will be put
+ * \param max_level the maximum level reached by the water
+ * \param grid the grid used (either cubic or face-centered cubic)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_SlabBasins(MB3D_Image *src, MB3D_Image *marker, Uint32 max_level, enum MB3D_grid_t grid);
 /**
  * (re)Builds a 3D image according to a 3D mask image and using a hierarchical
  * list to compute the rebuild.
@@ -135,6 +165,230 @@ MB3D_Label(MB3D_Image *src, MB3D_Image *dest,
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB3D_Distanceb(MB3D_Image *src, MB3D_Image *dest, enum MB3D_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Looks for the minimum between two 3D image pixels (a central pixel
+ * and its neighbors in the other 3D image).
+ * \param src source 3D image in which the neighbors are taken
+ * \param srcdest source of the central pixel and destination 3D image
+ * \param neighbors the neighbors to take into account (bit d set for direction d of the grid)
+ * \param grid the grid used (cubic, face-centered cubic or center cubic)
+ * \param edge the kind of edge to use (behavior for pixels near edge depends on it)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_InfNb(MB3D_Image *src, MB3D_Image *srcdest, Uint32 neighbors, enum MB3D_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Looks for the maximum between two 3D image pixels (a central pixel
+ * and its neighbors in the other 3D image).
+ * \param src source 3D image in which the neighbors are taken
+ * \param srcdest source of the central pixel and destination 3D image
+ * \param neighbors the neighbors to take into account (bit d set for direction d of the grid)
+ * \param grid the grid used (cubic, face-centered cubic or center cubic)
+ * \param edge the kind of edge to use (behavior for pixels near edge depends on it)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_SupNb(MB3D_Image *src, MB3D_Image *srcdest, Uint32 neighbors, enum MB3D_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Adds the pixels of two 3D images plane by plane (see MB_Add for
+ * the allowed depths and the saturation).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Add(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Subtracts the pixels of the second 3D image from the pixels of the
+ * first one plane by plane (see MB_Sub for the allowed depths).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Sub(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Multiplies the pixels of two 3D images plane by plane (see MB_Mul for
+ * the allowed depths and the saturation).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Mul(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Divides the pixels of the first 3D image by the pixels of the second
+ * one plane by plane (see MB_Div for the allowed depths).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Div(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Computes the set difference between two 3D images (see MB_Diff).
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Diff(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Adds a constant value to the pixels of a 3D image (see MB_ConAdd).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_ConAdd(MB3D_Image *src, Sint64 value, MB3D_Image *dest);
+/**
+ * Subtracts a constant value from the pixels of a 3D image (see
+ * MB_ConSub).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_ConSub(MB3D_Image *src, Sint64 value, MB3D_Image *dest);
+/**
+ * Multiplies the pixels of a 3D image by a constant value (see
+ * MB_ConMul).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_ConMul(MB3D_Image *src, Uint32 value, MB3D_Image *dest);
+/**
+ * Divides the pixels of a 3D image by a constant value (see MB_ConDiv).
+ * \param src source 3D image
+ * \param value the constant value
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_ConDiv(MB3D_Image *src, Uint32 value, MB3D_Image *dest);
+/**
+ * Inverts the pixels values (logical NOT) of a 3D image.
+ * \param src source 3D image
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Inv(MB3D_Image *src, MB3D_Image *dest);
+/**
+ * Performs a bitwise AND between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_And(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Performs a bitwise OR between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Or(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Performs a bitwise XOR between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Xor(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Determines the inferior value between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Inf(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Determines the superior value between the pixels of two 3D images.
+ * \param src1 3D image 1
+ * \param src2 3D image 2
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Sup(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest);
+/**
+ * Copies a 3D image into another one of the same depth.
+ * \param src source 3D image
+ * \param dest destination 3D image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Copy(MB3D_Image *src, MB3D_Image *dest);
+/**
+ * Fills a 3D image with a constant value.
+ * \param dest the 3D image to fill
+ * \param value the constant value
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_ConSet(MB3D_Image *dest, Uint32 value);
+/**
+ * Thresholds a 3D image (see MB_Thresh). The pixels of the binary 3D
+ * destination image are set to 1 when the source pixel value is between
+ * the two thresholds (included) and to 0 otherwise.
+ * \param src source 3D image
+ * \param dest binary destination 3D image
+ * \param low the low threshold
+ * \param high the high threshold
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Thresh(MB3D_Image *src, MB3D_Image *dest, Uint32 low, Uint32 high);
+/**
+ * Converts a binary 3D image into a 8-bit or 32-bit 3D image using a value
+ * for the pixels at 0 and a value for the pixels at 1 (see MB_Mask).
+ * \param src binary source 3D image
+ * \param dest destination 3D image
+ * \param maskf the value of the pixels at 0
+ * \param maskt the value of the pixels at 1
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Mask(MB3D_Image *src, MB3D_Image *dest, Uint32 maskf, Uint32 maskt);
+/**
+ * Computes a binary 3D image where pixels are set to 1 when the pixels of
+ * 3D image 1 have greater values than pixels of 3D image 2 (see MB_SupMask).
+ * \param src1 source 3D image 1
+ * \param src2 source 3D image 2
+ * \param dest binary destination 3D image
+ * \param strict flag indicating if the comparison is strict or large
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_SupMask(MB3D_Image *src1, MB3D_Image *src2, MB3D_Image *dest, Uint32 strict);
+/**
+ * Converts the pixels of a greyscale 3D image using a lookup table (see
+ * MB_Lookup).
+ * \param src source 3D image
+ * \param dest destination 3D image
+ * \param ptab the lookup table (256 values)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Lookup(MB3D_Image *src, MB3D_Image *dest, Uint32 *ptab);
 
 #ifdef __cplusplus
 }
@@ -109,6 +109,117 @@ MB_Watershed(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t g
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Basins(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
+/**
+ * Rebuilds the cells of a partition image which are marked by the
+ * source/destination image. Every connected set of pixels of the same value
+ * in the partition image (a cell) takes the maximum value of the markers it
+ * contains. The cells are flooded in a single pass using a FIFO.
+ *
+ * \param cells the partition image
+ * \param srcdest the marker image in which the rebuilt cells are put
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_CellsBld(MB_Image *cells, MB_Image *srcdest, enum MB_grid_t grid);
+/**
+ * Builds the component tree (max-tree) of an image. Every node of the tree
+ * is a connected component of an upper threshold set of the image (a lower
+ * threshold set for the min-tree). The nodes are numbered so that a parent
+ * always comes before its children, the root being node 0.
+ *
+ * \param src the greyscale or 32-bit source image
+ * \param nodes the 32-bit image receiving the node of each pixel
+ * \param ptree the tree table receiving the parent and level of each node
+ * \param nbnodes the number of rows of the tree table
+ * \param pNbnodes receives the number of nodes of the tree
+ * \param dual 1 to build the min-tree, 0 for the max-tree
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_MaxTree(MB_Image *src, MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes, Uint32 *pNbnodes, Uint32 dual, enum MB_grid_t grid);
+/**
+ * Computes the properties (area, volume, height and bounding box) of each
+ * node of a component tree in a single pass over the image.
+ *
+ * \param src the image the tree was built from
+ * \param nodes the image of the node of each pixel
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pnodeprops the table of the node properties
+ * \param nbrows the number of rows of the properties table
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_TreeProps(MB_Image *src, MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes, Uint64 *pnodeprops, Uint32 nbrows);
+/**
+ * Filters an image through its component tree. The nodes whose attribute is
+ * lower than the threshold are removed and their pixels take the level of
+ * the closest ancestor kept.
+ *
+ * \param nodes the image of the node of each pixel
+ * \param dest the greyscale or 32-bit image receiving the result
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr the attribute of each node
+ * \param nbattr the number of attribute values
+ * \param threshold the lowest attribute value of the nodes kept
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_TreeFilter(MB_Image *nodes, MB_Image *dest, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr, Uint64 threshold);
+/**
+ * Computes the reconstruction of an image lowered by a constant (raised
+ * for a min-tree) through its component tree, as the build (dual build)
+ * operators would do.
+ *
+ * \param nodes the image of the node of each pixel
+ * \param dest the greyscale or 32-bit image receiving the result
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr the height of each node
+ * \param nbattr the number of attribute values
+ * \param h the constant
+ * \param dual 0 for a max-tree, 1 for a min-tree
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_TreeDynamicBuild(MB_Image *nodes, MB_Image *dest, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr, Uint32 h, Uint32 dual);
+/**
+ * Computes the ultimate attribute opening (or closing for a min-tree) of an
+ * image through its component tree. The residue between the filters of
+ * attribute threshold k-1 and k is maximal at size k.
+ *
+ * \param nodes the image of the node of each pixel
+ * \param res the greyscale or 32-bit image receiving the maximal residue
+ * \param size the 32-bit image receiving the size of the maximal residue
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr the (increasing) attribute of each node
+ * \param nbattr the number of attribute values
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_TreeUltimateOpening(MB_Image *nodes, MB_Image *res, MB_Image *size, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr);
+/**
+ * Computes, for each node of a component tree, the largest size of the
+ * erosions (dilations for a min-tree) of the image which still meet the
+ * node at its level. The node is kept by the openings (closings) by
+ * reconstruction up to this size.
+ *
+ * \param src the image the tree was built from
+ * \param nodes the image of the node of each pixel
+ * \param ptree the tree table
+ * \param nbnodes the number of nodes of the tree
+ * \param pattr receives the size of each node
+ * \param nbattr the number of attribute values
+ * \param neighbors the neighbors of the structuring element
+ * \param grid the grid used by the erosions (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_TreeBuildSizes(MB_Image *src, MB_Image *nodes, Uint32 *ptree, Uint32 nbnodes, Uint64 *pattr, Uint32 nbattr, Uint32 neighbors, enum MB_grid_t grid);
 
 #ifdef __cplusplus
 }
@@ -104,6 +104,40 @@ MB_SupNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_SupFarNb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 count, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Computes for each pixel the minimum of the pixels found on the segment
+ * starting at this pixel and made of size steps in the given direction.
+ * The computation time does not depend on the size of the segment.
+ * The direction depends on the grid used.
+ *
+ * \param src source image
+ * \param dest destination image (can be the same as src)
+ * \param dirnum the direction of the segment
+ * \param size the size of the segment (number of steps)
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge to use (behavior for pixels near edge depends on it)
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_InfSegment(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 size, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Computes for each pixel the maximum of the pixels found on the segment
+ * starting at this pixel and made of size steps in the given direction.
+ * The computation time does not depend on the size of the segment.
+ * The direction depends on the grid used.
+ *
+ * \param src source image
+ * \param dest destination image (can be the same as src)
+ * \param dirnum the direction of the segment
+ * \param size the size of the segment (number of steps)
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge to use (behavior for pixels near edge depends on it)
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_SupSegment(MB_Image *src, MB_Image *dest, Uint32 dirnum, Uint32 size, enum MB_grid_t grid, enum MB_edgemode_t edge);
 /**
  * Computes the set difference between two image pixels
  * (a central pixel and its neighbors in the other image)
@@ -123,6 +157,42 @@ MB_SupFarNb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 count, enum
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_DiffNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Erodes an image n times using a structuring element made of neighbors
+ * (the central pixel being neighbor 0). The iterations are computed in
+ * a single pass over the image.
+ *
+ *\see MB_Neighbors_code_t for encoding neighbors patterns.
+ *
+ * \param src source image
+ * \param dest destination image (can be the same as src)
+ * \param neighbors the neighbors of the structuring element
+ * \param n the number of iterations
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_Erode(MB_Image *src, MB_Image *dest, Uint32 neighbors, Uint32 n, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Dilates an image n times using a structuring element made of neighbors
+ * (the central pixel being neighbor 0). The iterations are computed in
+ * a single pass over the image.
+ *
+ *\see MB_Neighbors_code_t for encoding neighbors patterns.
+ *
+ * \param src source image
+ * \param dest destination image (can be the same as src)
+ * \param neighbors the neighbors of the structuring element
+ * \param n the number of iterations
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ *
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_Dilate(MB_Image *src, MB_Image *dest, Uint32 neighbors, Uint32 n, enum MB_grid_t grid, enum MB_edgemode_t edge);
 /**
  * (re)Builds an image according to a direction and a mask image.
  * The direction depends on the grid used.
@@ -124,6 +124,10 @@ typedef struct {
     PLINE *plines;
     /** pixel array */
     PIX8 *pixels;
+    /** mapped file region holding the pixels (NULL if they were allocated) */
+    void *mapping;
+    /** size in bytes of the mapped file region */
+    Uint64 mapsize;
 } MB_Image;
 
 /** 3D image */
@@ -132,6 +136,10 @@ typedef struct {
     MB_Image **seq;
     /** the length of the sequence */
     Uint32 length;
+    /** contiguous pixel array of all the images (NULL if they were stacked) */
+    PIX8 *pixels;
+    /** images sharing the contiguous pixel array (NULL if they were stacked) */
+    MB_Image *planes;
 } MB3D_Image;
 
 /** Possible grid values: */
@@ -159,7 +167,9 @@ enum MB3D_grid_t {
     /** Cubic grid */
     MB3D_CUBIC_GRID = 1024,
     /** Face centered cubic grid (fcc, also known as cubic close-packed or ccp) */
-    MB3D_FCC_GRID = 1025
+    MB3D_FCC_GRID = 1025,
+    /** Center cubic grid (body-centered cubic) */
+    MB3D_CC_GRID = 1026
 };
 
 /** Neighbors encoding: */
@@ -177,6 +187,121 @@ enum MB_Neighbors_code_t {
     MB_NEIGHBOR_ALL_SQUARE = 0x01ff
 };
 
+/** Maximum number of values the stack of an expression can hold */
+#define MB_EXPR_STACK_SIZE 16
+
+/** Operations of the point-wise expressions (see MB_Expression).
+ * Each operation is followed in the program by the arguments given
+ * in brackets.
+ */
+enum MB_expr_op_t {
+    /** Pushes source image [index] */
+    MB_EXPR_LOAD = 0,
+    /** Negates the top value */
+    MB_EXPR_NEGATE = 1,
+    /** Minimum of the two top values */
+    MB_EXPR_INF = 2,
+    /** Maximum of the two top values */
+    MB_EXPR_SUP = 3,
+    /** Bitwise AND of the two top values */
+    MB_EXPR_AND = 4,
+    /** Bitwise OR of the two top values */
+    MB_EXPR_OR = 5,
+    /** Bitwise XOR of the two top values */
+    MB_EXPR_XOR = 6,
+    /** Addition of the two top values */
+    MB_EXPR_ADD = 7,
+    /** Subtraction of the two top values */
+    MB_EXPR_SUB = 8,
+    /** Set difference of the two top values */
+    MB_EXPR_DIFF = 9,
+    /** Superior mask of the two top values [strict] */
+    MB_EXPR_SUPMASK = 10,
+    /** Adds a constant to the top value [low 32 bits, high 32 bits] */
+    MB_EXPR_ADDCONST = 11,
+    /** Subtracts a constant to the top value [low 32 bits, high 32 bits] */
+    MB_EXPR_SUBCONST = 12,
+    /** Multiplies the top value by a constant [value] */
+    MB_EXPR_MULCONST = 13,
+    /** Thresholds the top value [low, high] */
+    MB_EXPR_THRESH = 14,
+    /** Converts the binary top value [depth, false value, true value] */
+    MB_EXPR_MASK = 15,
+    /** Applies a lookup table to the greyscale top value [256 values] */
+    MB_EXPR_LOOKUP = 16
+};
+
+/** Columns of the region properties table (see MB_RegionProps).
+ * Column c of the region of row r is at index c*nbrows+r in the table.
+ */
+enum MB_regionprop_t {
+    /** Number of pixels of the region */
+    MB_REGION_AREA = 0,
+    /** Sum of the measure image values over the region */
+    MB_REGION_VOLUME = 1,
+    /** Minimum of the measure image values over the region */
+    MB_REGION_MIN = 2,
+    /** Maximum of the measure image values over the region */
+    MB_REGION_MAX = 3,
+    /** Minimal x-coordinate of the region */
+    MB_REGION_XMIN = 4,
+    /** Minimal y-coordinate of the region */
+    MB_REGION_YMIN = 5,
+    /** Maximal x-coordinate of the region */
+    MB_REGION_XMAX = 6,
+    /** Maximal y-coordinate of the region */
+    MB_REGION_YMAX = 7,
+    /** Sum of the x-coordinates of the region pixels */
+    MB_REGION_SUMX = 8,
+    /** Sum of the y-coordinates of the region pixels */
+    MB_REGION_SUMY = 9,
+    /** Minimum of x+y over the region */
+    MB_REGION_DMIN = 10,
+    /** Maximum of x+y over the region */
+    MB_REGION_DMAX = 11,
+    /** Minimum of x-y+height-1 over the region */
+    MB_REGION_AMIN = 12,
+    /** Maximum of x-y+height-1 over the region */
+    MB_REGION_AMAX = 13,
+    /** Number of columns of the table */
+    MB_REGION_COLUMNS = 14
+};
+
+/** Columns of the component tree table (see MB_MaxTree).
+ * Column c of node n is at index c*nbnodes+n in the table.
+ */
+enum MB_treecol_t {
+    /** Parent of the node (the root is its own parent) */
+    MB_TREE_PARENT = 0,
+    /** Grey level of the node */
+    MB_TREE_LEVEL = 1,
+    /** Number of columns of the table */
+    MB_TREE_COLUMNS = 2
+};
+
+/** Columns of the node properties table (see MB_TreeProps).
+ * Column c of node n is at index c*nbrows+n in the table. The properties
+ * of a node are computed over its component (the node and its descendants).
+ */
+enum MB_nodeprop_t {
+    /** Number of pixels of the component */
+    MB_NODE_AREA = 0,
+    /** Sum of the differences between the pixel values and the parent level */
+    MB_NODE_VOLUME = 1,
+    /** Maximal difference between the pixel values and the parent level */
+    MB_NODE_HEIGHT = 2,
+    /** Minimal x-coordinate of the component */
+    MB_NODE_XMIN = 3,
+    /** Minimal y-coordinate of the component */
+    MB_NODE_YMIN = 4,
+    /** Maximal x-coordinate of the component */
+    MB_NODE_XMAX = 5,
+    /** Maximal y-coordinate of the component */
+    MB_NODE_YMAX = 6,
+    /** Number of columns of the table */
+    MB_NODE_COLUMNS = 7
+};
+
 #ifdef __cplusplus
 }
 #endif
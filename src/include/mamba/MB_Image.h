@@ -47,6 +47,26 @@ extern "C" {
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Create(MB_Image *image, Uint32 width, Uint32 height, Uint32 depth);
+/**
+ * Creates an image whose pixels are read directly from a region of a raw
+ * file mapped in memory (no copy is made). The region holds the image lines
+ * one after the other, each line having the size in bytes of the lines of
+ * the images created by MB_Create (width*depth/8). The size must already be
+ * a multiple of MB_ROUND_W for width and MB_ROUND_H for height.
+ * The image can be modified but the changes are never written into the
+ * file (copy-on-write).
+ * \param image the created image
+ * \param path the path of the raw file
+ * \param offset the position in bytes of the pixels in the file (it must be
+ * a multiple of 16)
+ * \param width the width of the created image
+ * \param height the height of the created image
+ * \param depth the depth of the created image
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_CreateMapped(MB_Image *image, const char *path, Uint64 offset,
+                Uint32 width, Uint32 height, Uint32 depth);
 /**
  * Destroys an image (memory freeing).
  * \param image the image to be destroyed
@@ -59,6 +79,18 @@ MB_Destroy(MB_Image *image);
  */
 extern MB_API_ENTRY Uint32 MB_API_CALL
 MB_getImageCounter(void);
+/**
+ * Sets the number of threads the operators can use to compute an image.
+ * \param number the number of threads (at least 1)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_SetThreadNumber(Uint32 number);
+/**
+ * \return the number of threads the operators can use
+ */
+extern MB_API_ENTRY Uint32 MB_API_CALL
+MB_GetThreadNumber(void);
 /**
  * Loads an image data with data given in argument.
  * \param image the image to fill
@@ -158,6 +190,20 @@ MB_GetPixel(MB_Image *src, Uint32 *pixVal, Uint32 x, Uint32 y);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB3D_Create(MB3D_Image *image, Uint32 length);
+/**
+ * Creates a 3D image whose images are stored one after the other in a single
+ * aligned pixel array. The images are created with the image (they must not
+ * be stacked) and are destroyed with it.
+ * \param image the created image
+ * \param width the width of the images
+ * \param height the height of the images
+ * \param depth the depth of the images
+ * \param length the length of the 3D image (number of images)
+ * \return an error code (NO_ERR if everything went OK).
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_CreateContiguous(MB3D_Image *image, Uint32 width, Uint32 height,
+                      Uint32 depth, Uint32 length);
 /**
  * Stack the 2D image at the given position.
  * \param image the 3D image
@@ -183,6 +229,27 @@ MB3D_Destroy(MB3D_Image *image);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB3D_Convert(MB3D_Image *src, MB3D_Image *dest);
+/**
+ * Loads the pixels of all the images of a 3D image (8-bit or 32-bit) with
+ * the data given in argument (the images one after the other).
+ * \param image the 3D image to fill
+ * \param indata the data to fill the image with
+ * \param len the length of data given
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Load(MB3D_Image *image, PIX8 *indata, Uint32 len);
+/**
+ * Reads the pixels of all the images of a 3D image (8-bit or 32-bit) and
+ * puts them in an array (the images one after the other).
+ * \param image the 3D image to read
+ * \param outdata pointer to the array created (malloc) and filled with the 
+ * pixel data of the 3D image
+ * \param len the length in bytes of data extracted
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Extract(MB3D_Image *image, PIX8 **outdata, Uint32 *len);
 
 #ifdef __cplusplus
 }
@@ -20,6 +20,7 @@ from .contrasts import *
 from .geodesy import *
 from .filter import *
 from .residues import *
+from .trees import *
 from .thinthick import *
 from .measure import *
 from .segment import *
@@ -29,4 +30,8 @@ from .hierarchies import *
 from .partitions import *
 from .extrema import *
 from .labellings import *
+from .expressions import *
+from .profiling import *
+from .tiles import *
+from . import batch
 
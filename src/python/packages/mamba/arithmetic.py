@@ -212,12 +212,11 @@ def ceilingAddConst(imIn, v, imOut):
     of the addition is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn, 1)
-    imWrk = mamba.imageMb(imIn)
-    mamba.addConst(imIn, v, imWrk)
-    mamba.generateSupMask(imIn, imWrk, imMask, True)
-    mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
-    mamba.logic(imOut, imWrk, imOut, "sup")
+    with mamba.scratchImages(imIn, [1, None]) as (imMask, imWrk):
+        mamba.addConst(imIn, v, imWrk)
+        mamba.generateSupMask(imIn, imWrk, imMask, True)
+        mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
+        mamba.logic(imOut, imWrk, imOut, "sup")
     
 def ceilingAdd(imIn1, imIn2, imOut):
     """
@@ -232,12 +231,11 @@ def ceilingAdd(imIn1, imIn2, imOut):
     of the addition is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn1, 1)
-    imWrk = mamba.imageMb(imIn1)
-    mamba.add(imIn1, imIn2, imWrk)
-    mamba.generateSupMask(imIn1, imWrk, imMask, True)
-    mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
-    mamba.logic(imOut, imWrk, imOut, "sup")
+    with mamba.scratchImages(imIn1, [1, None]) as (imMask, imWrk):
+        mamba.add(imIn1, imIn2, imWrk)
+        mamba.generateSupMask(imIn1, imWrk, imMask, True)
+        mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
+        mamba.logic(imOut, imWrk, imOut, "sup")
 
 def floorSubConst(imIn, v, imOut):
     """
@@ -248,12 +246,11 @@ def floorSubConst(imIn, v, imOut):
     of the subtraction is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn, 1)
-    imWrk = mamba.imageMb(imIn)
-    mamba.subConst(imIn, v, imWrk)
-    mamba.generateSupMask(imIn, imWrk, imMask, False)
-    mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
-    mamba.logic(imOut, imWrk, imOut, "inf")
+    with mamba.scratchImages(imIn, [1, None]) as (imMask, imWrk):
+        mamba.subConst(imIn, v, imWrk)
+        mamba.generateSupMask(imIn, imWrk, imMask, False)
+        mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
+        mamba.logic(imOut, imWrk, imOut, "inf")
    
 def floorSub(imIn1, imIn2, imOut):
     """
@@ -267,12 +264,11 @@ def floorSub(imIn1, imIn2, imOut):
     of the subtraction is always truncated for 8-bit images.
     """
     
-    imMask = mamba.imageMb(imIn1, 1)
-    imWrk = mamba.imageMb(imIn1)
-    mamba.sub(imIn1, imIn2, imWrk)
-    mamba.generateSupMask(imIn1, imWrk, imMask, False)
-    mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
-    mamba.logic(imOut, imWrk, imOut, "inf")
+    with mamba.scratchImages(imIn1, [1, None]) as (imMask, imWrk):
+        mamba.sub(imIn1, imIn2, imWrk)
+        mamba.generateSupMask(imIn1, imWrk, imMask, False)
+        mamba.convertByMask(imMask, imOut, 0, mamba.computeMaxRange(imOut)[1])
+        mamba.logic(imOut, imWrk, imOut, "inf")
     
 def mulRealConst(imIn, v, imOut, nearest=False, precision=2):
     """
@@ -288,25 +284,24 @@ def mulRealConst(imIn, v, imOut, nearest=False, precision=2):
     
     if imIn.getDepth()==1 or imOut.getDepth()==1:
         mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 1)
-    precVal = (10 ** precision)
-    v1 = int(v * precVal)
-    if imIn.getDepth()==8:
-        imWrk1.reset()
-        mamba.copyBytePlane(imIn, 0, imWrk1)
-    else:
-        mamba.copy(imIn, imWrk1)
-    mulConst(imWrk1, v1, imWrk1)
-    if nearest:
-        adjVal = int(5 * (10 ** (precision - 1)))
-        addConst(imWrk1, adjVal , imWrk1)
-    divConst(imWrk1, precVal, imWrk1)
-    if imOut.getDepth()==8:
-        mamba.threshold(imWrk1, imWrk2, 255, mamba.computeMaxRange(imWrk1)[1])
-        mamba.copyBytePlane(imWrk1, 0, imOut)
-        imWrk2.convert(8)
-        mamba.logic(imOut, imWrk2, imOut, "sup")
-    else:
-        mamba.copy(imWrk1, imOut)
+    with mamba.scratchImages(imIn, [32, 1, 8]) as (imWrk1, imWrk2, imWrk3):
+        precVal = (10 ** precision)
+        v1 = int(v * precVal)
+        if imIn.getDepth()==8:
+            imWrk1.reset()
+            mamba.copyBytePlane(imIn, 0, imWrk1)
+        else:
+            mamba.copy(imIn, imWrk1)
+        mulConst(imWrk1, v1, imWrk1)
+        if nearest:
+            adjVal = int(5 * (10 ** (precision - 1)))
+            addConst(imWrk1, adjVal , imWrk1)
+        divConst(imWrk1, precVal, imWrk1)
+        if imOut.getDepth()==8:
+            mamba.threshold(imWrk1, imWrk2, 255, mamba.computeMaxRange(imWrk1)[1])
+            mamba.copyBytePlane(imWrk1, 0, imOut)
+            mamba.convert(imWrk2, imWrk3)
+            mamba.logic(imOut, imWrk3, imOut, "sup")
+        else:
+            mamba.copy(imWrk1, imOut)
 
@@ -11,6 +11,8 @@ from mambaDisplay import getDisplayer
 from .error import *
 
 import os.path
+import collections as _collections
+import threading as _threading
 
 ###############################################################################
 #  Local variables and constants
@@ -53,6 +55,50 @@ def getImageCounter():
     """
     return core.MB_getImageCounter()
 
+def setThreadNumber(number):
+    """
+    Sets the number of threads that the Mamba library can use to compute
+    an image (the image is split into bands of lines computed concurrently).
+    The results do not depend on this number. It has no effect if the library
+    was compiled without OpenMP support.
+    """
+    err = core.MB_SetThreadNumber(number)
+    raiseExceptionOnError(err)
+
+def getThreadNumber():
+    """
+    Returns the number of threads that the Mamba library can use.
+    """
+    return core.MB_GetThreadNumber()
+
+def loadFrames(path, imOut, rgbfilter=None):
+    """
+    Loads, one after the other, the images found in directory 'path' into 
+    image 'imOut' and yields 'imOut' after each load. 'path' can also be a
+    list of image file paths.
+    
+    The images of a directory are selected and ordered as in a 3D image
+    sequence: their file names must be of the form X.ext where X is a number
+    and they are read in increasing order of X.
+    
+    'imOut' is reused for all the images (they are padded or cropped to its
+    size and converted to its depth), so no image is allocated when the
+    loaded images already have the depth of 'imOut'.
+    
+    Example:
+    >>>im = imageMb(1024, 1024, 32)
+    >>>for frame in loadFrames("frames", im):
+    >>>    ...
+    """
+    
+    if isinstance(path, str):
+        files = utils.listNumberedFiles(path)
+    else:
+        files = path
+    for f in files:
+        imOut.load(f, rgbfilter=rgbfilter)
+        yield imOut
+
 ###############################################################################
 #  Classes
 
@@ -198,9 +244,12 @@ class imageMb:
         By default, the color conversion uses the ITU-R 601-2 luma transform (see
         PIL/PILLOW documentation for details).
         """
-        next_mbIm = utils.load(path, size=(self.mbIm.width,self.mbIm.height), rgb2l=rgbfilter)
-        err = core.MB_Convert(next_mbIm, self.mbIm)
-        raiseExceptionOnError(err)
+        next_mbIm = utils.load(path, size=(self.mbIm.width,self.mbIm.height),
+                               rgb2l=rgbfilter, im_out=self.mbIm)
+        if next_mbIm is not self.mbIm:
+            # The loaded image depth is not the image depth
+            err = core.MB_Convert(next_mbIm, self.mbIm)
+            raiseExceptionOnError(err)
         self.setName(os.path.split(path)[1])
         
     def save(self, path, palette=None):
@@ -255,6 +304,40 @@ class imageMb:
         if self.displayId != '':
             self.gd.updateWindow(self.displayId)
         
+    @staticmethod
+    def _fromMbIm(mbIm, name):
+        # Creates an image around the existing C core image 'mbIm'
+        im = imageMb.__new__(imageMb)
+        im.displayId = ''
+        im.gd = None
+        im.mbIm = mbIm
+        im.name = name
+        return im
+        
+    @staticmethod
+    def fromMapped(path, width, height, depth=8, offset=0):
+        """
+        Creates an image of size 'width'x'height' and depth 'depth' whose
+        pixels are read directly from the raw file in 'path', starting at
+        position 'offset' (in bytes, a multiple of 16). The file is mapped in
+        memory instead of being loaded: the image is created instantly and
+        only the parts of the file actually used are read.
+        
+        The file contains the image lines one after the other, each one
+        holding width*depth/8 bytes (the pixels of binary images are packed,
+        pixel x being bit x%8 of byte x/8). The width must be a multiple of 64
+        and the height must be even.
+        
+        The image can be modified but the changes are never written into
+        the file (copy-on-write): only the modified parts of the image use
+        their own memory.
+        """
+        mbIm = utils.createMapped(path, offset, width, height, depth)
+        im = imageMb._fromMbIm(mbIm, os.path.split(path)[1])
+        if getShowImages():
+            im.show()
+        return im
+        
     def extractRaw(self):
         """
         Extracts and returns the image raw string data.
@@ -263,7 +346,26 @@ class imageMb:
         err,data = core.MB_Extract(self.mbIm)
         raiseExceptionOnError(err)
         return data
-        
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        Returns a NumPy array sharing its memory with the image (no copy is
+        made unless 'copy' is True or a different 'dtype' is requested).
+        Writing into the array modifies the image pixels.
+
+        8-bit and 32-bit images give arrays of shape (height, width). Binary
+        images give the bit-packed pixels in an array of shape
+        (height, width/8), use numpy.unpackbits with bitorder='little' to
+        obtain one value per pixel.
+
+        The array keeps the pixels alive but is no longer linked to the
+        image after its depth was changed with the convert method.
+        """
+        import numpy
+        if copy is None:
+            return numpy.asarray(self.mbIm, dtype=dtype)
+        return numpy.array(self.mbIm, dtype=dtype, copy=copy)
+
     def fill(self, v):
         """
         Completely fills the image with a given value 'v'.
@@ -376,3 +478,142 @@ class imageMb:
         raiseExceptionOnError(err)
         return value
 
+###############################################################################
+#  Scratch images
+#
+# The work images needed by the operators are taken from a pool of unused
+# images, sorted by size and depth, instead of being allocated for each call.
+# The images returned to the pool are kept in the order of their release and
+# the oldest ones are freed when the pool exceeds its memory budget.
+
+_scratch_budget = 64*1024*1024
+_scratch_free = {}
+_scratch_lru = _collections.OrderedDict()
+_scratch_bytes = 0
+_scratch_lock = _threading.Lock()
+
+def _scratchSize(im):
+    # Memory used by the pixels of image 'im' (in bytes).
+    return (im.mbIm.width*im.mbIm.height*im.mbIm.depth)//8
+
+def _scratchTrim(budget):
+    # Frees the least recently released images until the memory used by the
+    # pool is below 'budget'. The lock must be held by the caller.
+    global _scratch_bytes
+    
+    while _scratch_bytes>budget and _scratch_lru:
+        key, im = _scratch_lru.popitem(last=False)[1]
+        _scratch_free[key].remove(im)
+        if not _scratch_free[key]:
+            del _scratch_free[key]
+        _scratch_bytes -= _scratchSize(im)
+
+def _acquireScratch(width, height, depth):
+    # Returns an image of the given size and depth, taken from the pool when
+    # possible. Its content is undefined.
+    global _scratch_bytes
+    
+    key = (width, height, depth)
+    with _scratch_lock:
+        ims = _scratch_free.get(key)
+        if ims:
+            im = ims.pop()
+            if not ims:
+                del _scratch_free[key]
+            del _scratch_lru[id(im)]
+            _scratch_bytes -= _scratchSize(im)
+            return im
+    return imageMb(width, height, depth)
+
+def _releaseScratch(im):
+    # Gives image 'im' back to the pool.
+    global _scratch_bytes
+    
+    size = _scratchSize(im)
+    with _scratch_lock:
+        if size>_scratch_budget:
+            return
+        key = (im.mbIm.width, im.mbIm.height, im.mbIm.depth)
+        _scratch_free.setdefault(key, []).append(im)
+        _scratch_lru[id(im)] = (key, im)
+        _scratch_bytes += size
+        _scratchTrim(_scratch_budget)
+
+class _scratchContext:
+    # Context manager returned by scratchImages.
+
+    def __init__(self, im, depths):
+        self.im = im
+        self.depths = depths
+        self.ims = []
+
+    def __enter__(self):
+        w, h = self.im.getSize()
+        for depth in self.depths:
+            if depth is None:
+                depth = self.im.getDepth()
+            self.ims.append(_acquireScratch(w, h, depth))
+        if len(self.ims)==1:
+            return self.ims[0]
+        return self.ims
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for im in self.ims:
+            _releaseScratch(im)
+        self.ims = []
+        return False
+
+def scratchImages(im, n=1, depth=None):
+    """
+    Returns a context manager providing 'n' work images with the size of
+    image 'im' and the given 'depth' (the depth of 'im' when not specified).
+    'n' can also be a list giving the depth of each image (None for the depth
+    of 'im').
+    The images are taken from a pool of unused images and are given back
+    to it when the context is left, which avoids allocating new images in
+    each call of an operator. The content of these images is undefined.
+    
+    A single image is returned when only one is requested, a list of images
+    otherwise.
+    
+    Example:
+    >>>with scratchImages(imIn, 2) as (imWrk1, imWrk2):
+    >>>    ...
+    >>>with scratchImages(imIn, depth=1) as imMask:
+    >>>    ...
+    >>>with scratchImages(imIn, [1, None, 32]) as (imMask, imWrk1, imWrk2):
+    >>>    ...
+    """
+    if isinstance(n, (list, tuple)):
+        depths = list(n)
+    else:
+        depths = [depth]*n
+    return _scratchContext(im, depths)
+
+def setScratchPoolSize(size):
+    """
+    Sets the maximum amount of memory (in bytes) kept by the pool of work
+    images (see scratchImages). The least recently used images are freed
+    when this amount is exceeded. A size of 0 disables the pool.
+    """
+    global _scratch_budget
+    
+    if size<0:
+        raiseExceptionOnError(core.MB_ERR_BAD_VALUE)
+    with _scratch_lock:
+        _scratch_budget = size
+        _scratchTrim(size)
+
+def getScratchPoolSize():
+    """
+    Returns the maximum amount of memory (in bytes) kept by the pool of work
+    images and the amount currently used by the images it holds.
+    """
+    return (_scratch_budget, _scratch_bytes)
+
+def clearScratchPool():
+    """
+    Frees all the work images kept by the pool.
+    """
+    with _scratch_lock:
+        _scratchTrim(-1)
@@ -0,0 +1,163 @@
+"""
+Batch processing.
+
+This module applies the same pipeline of operators to a sequence of images
+using a pool of worker processes. The images and the results are exchanged
+with the workers through shared memory (no pickling of the pixels) and the
+results are returned in the order of the inputs.
+
+The functions of this module are not imported in the mamba namespace (map
+would hide the Python built-in function), use mamba.batch.map.
+"""
+
+import mamba
+import mamba.core as core
+
+import collections
+import ctypes
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+
+# Pipeline, images and shared memory blocks of a worker process
+_pipeline = None
+_workerImages = {}
+_workerBlocks = {}
+
+def _byteSize(width, height, depth):
+    # Size in bytes of the pixels of an image
+    return (width*height*depth)//8
+
+class _sharedBlock:
+    # Shared memory block holding an image and its result
+    
+    def __init__(self, size=0, name=None):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.size = size
+        self.name = self.shm.name
+        self._buffer = ctypes.c_char.from_buffer(self.shm.buf)
+        self.address = ctypes.addressof(self._buffer)
+        
+    def write(self, im, offset=0):
+        # Copies the pixels of image 'im' at 'offset' in the block
+        (w, h) = im.getSize()
+        ctypes.memmove(self.address+offset, im.mbIm._pixelsAddress(),
+                       _byteSize(w, h, im.getDepth()))
+        
+    def read(self, im, offset=0):
+        # Copies the pixels at 'offset' in the block into image 'im'
+        (w, h) = im.getSize()
+        ctypes.memmove(im.mbIm._pixelsAddress(), self.address+offset,
+                       _byteSize(w, h, im.getDepth()))
+        im.update()
+        
+    def close(self, unlink=True):
+        del self._buffer
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def _initWorker(pipeline, threads):
+    # Initializes a worker process
+    global _pipeline
+    _pipeline = pipeline
+    mamba.setThreadNumber(threads)
+
+def _workerImage(width, height, depth, role):
+    # Returns the input (role 0) or output (role 1) image of the worker for
+    # the given size and depth, the images are kept from one call to the next
+    key = (width, height, depth, role)
+    if key not in _workerImages:
+        _workerImages[key] = mamba.imageMb(width, height, depth)
+    return _workerImages[key]
+
+def _processImage(name, width, height, depth, outDepth):
+    # Applies the pipeline to the image found in shared memory block 'name'
+    # and puts the result after it in the block
+    if name not in _workerBlocks:
+        _workerBlocks[name] = _sharedBlock(name=name)
+    block = _workerBlocks[name]
+    imIn = _workerImage(width, height, depth, 0)
+    imOut = _workerImage(width, height, outDepth, 1)
+    block.read(imIn)
+    _pipeline(imIn, imOut)
+    block.write(imOut, _byteSize(width, height, depth))
+
+def map(pipeline, inputs, workers=None, depth=None, threads=1):
+    """
+    Applies 'pipeline' to each image of 'inputs' (an iterable of images,
+    possibly a generator) using 'workers' processes (by default, one per
+    processor) and yields the results, in the order of the inputs.
+    
+    'pipeline' is called in the worker processes as pipeline(imIn, imOut)
+    where 'imIn' holds a copy of an input image and 'imOut' is an image of
+    the same size and of depth 'depth' (by default the depth of the input
+    image). Each worker reuses its images (and its scratch images) from
+    one call to the next, so 'imOut' must be filled completely by the
+    pipeline. 'pipeline' must be a function defined at the top level of a
+    module when the processes are not created by fork.
+    
+    Each result is yielded as a new image. An error in the pipeline is
+    raised again here. Each worker uses 'threads' threads to compute the
+    operators (see setThreadNumber).
+    
+    Example:
+    >>>for imOut in mamba.batch.map(myPipeline, loadFrames(path, imIn), 4):
+    >>>    ...
+    """
+    
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers<1 or threads<1:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    if depth not in (None, 1, 8, 32):
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+    inputs = iter(inputs)
+    # Free shared memory blocks, by size
+    freeBlocks = {}
+    # Images being processed
+    pending = collections.deque()
+    # The workers must share the resource tracker of this process, which
+    # otherwise removes the shared memory blocks when a worker ends
+    resource_tracker.ensure_running()
+    pool = multiprocessing.Pool(workers, _initWorker, (pipeline, threads))
+    try:
+        while True:
+            # Keeps the workers busy with two images each
+            while len(pending)<2*workers:
+                try:
+                    imIn = next(inputs)
+                except StopIteration:
+                    break
+                (w, h) = imIn.getSize()
+                d = imIn.getDepth()
+                outDepth = depth or d
+                size = _byteSize(w, h, d) + _byteSize(w, h, outDepth)
+                if freeBlocks.get(size):
+                    block = freeBlocks[size].pop()
+                else:
+                    block = _sharedBlock(size)
+                block.write(imIn)
+                result = pool.apply_async(_processImage,
+                                          (block.name, w, h, d, outDepth))
+                pending.append((block, w, h, d, outDepth, result))
+            if not pending:
+                break
+            (block, w, h, d, outDepth, result) = pending.popleft()
+            try:
+                result.get()
+                imOut = mamba.imageMb(w, h, outDepth)
+                block.read(imOut, _byteSize(w, h, d))
+            finally:
+                freeBlocks.setdefault(block.size, []).append(block)
+            yield imOut
+    finally:
+        pool.terminate()
+        pool.join()
+        for (block, w, h, d, outDepth, result) in pending:
+            block.close()
+        for blocks in freeBlocks.values():
+            for block in blocks:
+                block.close()
@@ -17,10 +17,10 @@ def gradient(imIn, imOut, n=1, se=mamba.DEFAULT_SE):
     (DEFAULT_SE by default).
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.erode(imIn, imWrk, n, se=se)
-    mamba.dilate(imIn, imOut, n, se=se)
-    mamba.sub(imOut, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.erode(imIn, imWrk, n, se=se)
+        mamba.dilate(imIn, imOut, n, se=se)
+        mamba.sub(imOut, imWrk, imOut)
 
 def halfGradient(imIn, imOut, type="intern", n=1, se=mamba.DEFAULT_SE):
     """
@@ -36,13 +36,13 @@ def halfGradient(imIn, imOut, type="intern", n=1, se=mamba.DEFAULT_SE):
     structuring element used by the erosion or the dilation is defined by 'se'.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if type=="extern":
-        mamba.dilate(imIn, imWrk, n, se=se)
-        mamba.sub(imWrk, imIn, imOut)
-    else:
-        mamba.erode(imIn, imWrk, n, se=se)
-        mamba.sub(imIn, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        if type=="extern":
+            mamba.dilate(imIn, imWrk, n, se=se)
+            mamba.sub(imWrk, imIn, imOut)
+        else:
+            mamba.erode(imIn, imWrk, n, se=se)
+            mamba.sub(imIn, imWrk, imOut)
     
 def whiteTopHat(imIn, imOut, n, se=mamba.DEFAULT_SE):
     """
@@ -52,9 +52,9 @@ def whiteTopHat(imIn, imOut, n, se=mamba.DEFAULT_SE):
     The structuring element used is defined by 'se' ('DEFAULT_SE' by default).
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.opening(imIn, imWrk, n, se=se)
-    mamba.sub(imIn, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.opening(imIn, imWrk, n, se=se)
+        mamba.sub(imIn, imWrk, imOut)
 
 def blackTopHat(imIn, imOut, n, se=mamba.DEFAULT_SE):
     """
@@ -64,9 +64,9 @@ def blackTopHat(imIn, imOut, n, se=mamba.DEFAULT_SE):
     The structuring element used is defined by 'se' ('DEFAULT_SE' by default).
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.closing(imIn, imWrk, n, se=se)
-    mamba.sub(imWrk, imIn, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.closing(imIn, imWrk, n, se=se)
+        mamba.sub(imWrk, imIn, imOut)
 
 def supWhiteTopHat(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     """
@@ -76,9 +76,9 @@ def supWhiteTopHat(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     in at least one direction of 'grid' is smaller than 'n'.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.supOpen(imIn, imWrk, n, grid=grid)
-    mamba.sub(imIn, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.supOpen(imIn, imWrk, n, grid=grid)
+        mamba.sub(imIn, imWrk, imOut)
 
 def supBlackTopHat(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     """
@@ -88,9 +88,9 @@ def supBlackTopHat(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     in at least one direction of 'grid' is smaller than 'n'.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.infClose(imIn, imWrk, n, grid=grid)
-    mamba.sub(imWrk, imIn, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.infClose(imIn, imWrk, n, grid=grid)
+        mamba.sub(imWrk, imIn, imOut)
         
 def regularisedGradient(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     """
@@ -101,9 +101,9 @@ def regularisedGradient(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     This operation is only valid for omnidirectional structuring elements.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    gradient(imIn, imWrk, n, se=se)
-    whiteTopHat(imWrk, imWrk, n, se=se)
-    mamba.erode(imWrk, imOut, n-1, se=se)
+    with mamba.scratchImages(imIn) as imWrk:
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        gradient(imIn, imWrk, n, se=se)
+        whiteTopHat(imWrk, imWrk, n, se=se)
+        mamba.erode(imWrk, imOut, n-1, se=se)
     
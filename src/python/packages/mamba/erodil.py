@@ -316,14 +316,12 @@ def dilate(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.EMPTY):
     use is at position 0 even if this point does not belong to it.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    dirs = se.getEncodedDirections(withoutZero=True)
-    for i in range(n):
-        mamba.copy(imOut, imWrk)
-        if not se.hasZero():
-            imOut.reset()
-        supNeighbor(imWrk, imOut, dirs, grid=se.getGrid(), edge=edge)
+    # The n iterations are computed in a single pass by the library (a
+    # negative size leaves the image unchanged)
+    dirs = se.getEncodedDirections()
+    err = core.MB_Dilate(imIn.mbIm, imOut.mbIm, dirs, max(n, 0), se.getGrid().id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
     
 def doublePointDilate(imIn, imOut, d, n, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY):
     """
@@ -347,10 +345,11 @@ def linearDilate(imIn, imOut, d, n=1, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY)
     are defined according to the grid in use.
     """
     
-    mamba.copy(imIn, imOut)
     # Basically its only calling the supNeighbor function in the direction d
-    for i in range(n):
-        supNeighbor(imOut, imOut, 1<<d, edge=edge, grid=grid)
+    # (and the center) n times
+    err = core.MB_Dilate(imIn.mbIm, imOut.mbIm, 1|(1<<d), max(n, 0), grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
     
 def erode(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.FILLED):
     """
@@ -363,14 +362,12 @@ def erode(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.FILLED):
     use is at position 0 even if this point does not belong to it.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    dirs = se.getEncodedDirections(withoutZero=True)
-    for i in range(n):
-        mamba.copy(imOut, imWrk)
-        if not se.hasZero():
-            imOut.fill(mamba.computeMaxRange(imIn)[1])
-        infNeighbor(imWrk, imOut, dirs, grid=se.getGrid(), edge=edge)
+    # The n iterations are computed in a single pass by the library (a
+    # negative size leaves the image unchanged)
+    dirs = se.getEncodedDirections()
+    err = core.MB_Erode(imIn.mbIm, imOut.mbIm, dirs, max(n, 0), se.getGrid().id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
     
 def doublePointErode(imIn, imOut, d, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -392,10 +389,11 @@ def linearErode( imIn, imOut, d, n=1, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED
     will assume a FILLED edge unless specified otherwise using 'edge'.
     """
     
-    mamba.copy(imIn, imOut)
     # Basically its only calling the infNeighbor function in the direction d
-    for i in range(n):
-        infNeighbor(imOut, imOut, 1<<d, grid=grid, edge=edge)
+    # (and the center) n times
+    err = core.MB_Erode(imIn.mbIm, imOut.mbIm, 1|(1<<d), max(n, 0), grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
 
 # The following operations are defined on hexagonal grid only    
 def conjugateHexagonalErode(imIn, imOut, size, edge=mamba.FILLED):
@@ -508,18 +506,17 @@ def isotropicDistance(imIn, imOut, edge=mamba.FILLED):
     imOut.reset()
     oldn = 0
     size = 0
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk1)
-    while mamba.computeVolume(imWrk1) != 0:
-        mamba.add(imOut, imWrk1, imOut)
-        size += 1
-        n = int(0.4641*size)
-        n += abs(n % 2 - size % 2)
-        if (n - oldn) == 1:
-            mamba.copy(imWrk1, imWrk2)
-            mamba.erode(imWrk1, imWrk1, 1, se=mamba.HEXAGON, edge=edge)
-        else:
-            mamba.conjugateHexagonalErode(imWrk2, imWrk1, 1, edge=edge)
-        oldn = n
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        mamba.copy(imIn, imWrk1)
+        while mamba.computeVolume(imWrk1) != 0:
+            mamba.add(imOut, imWrk1, imOut)
+            size += 1
+            n = int(0.4641*size)
+            n += abs(n % 2 - size % 2)
+            if (n - oldn) == 1:
+                mamba.copy(imWrk1, imWrk2)
+                mamba.erode(imWrk1, imWrk1, 1, se=mamba.HEXAGON, edge=edge)
+            else:
+                mamba.conjugateHexagonalErode(imWrk2, imWrk1, 1, edge=edge)
+            oldn = n
 
@@ -68,25 +68,27 @@ def supFarNeighbor(imIn, imInout, nb, amp, grid=mamba.DEFAULT_GRID, edge=mamba.E
 
 def largeLinearErode(imIn, imOut, dir, size, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
-    Erosion by a large segment in direction 'dir' in a reduced number of iterations.
-    Uses the erosions by doublets of points (supposed to be faster, thanks to
-    an enhanced shift operator).
+    Erosion by a large segment in direction 'dir' of length 'size' (number of
+    steps). For greyscale and 32-bit images, the computation time does not
+    depend on the size of the segment (van Herk/Gil-Werman algorithm). Binary
+    images and vectorized horizontal segments use doublets of points.
     """
     
-    mamba.copy(imIn, imOut)
-    for i in _sizeSplit(size):
-        infFarNeighbor(imOut, imOut, dir, i, grid=grid, edge=edge)
+    err = core.MB_InfSegment(imIn.mbIm, imOut.mbIm, dir, max(size, 0), grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
 
 def largeLinearDilate(imIn, imOut, dir, size, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY):
     """
-    Dilation by a large segment in direction 'dir' in a reduced number of iterations.
-    Uses the dilations by doublets of points (supposed to be faster, thanks to
-    an enhanced shift operator).
+    Dilation by a large segment in direction 'dir' of length 'size' (number of
+    steps). For greyscale and 32-bit images, the computation time does not
+    depend on the size of the segment (van Herk/Gil-Werman algorithm). Binary
+    images and vectorized horizontal segments use doublets of points.
     """
     
-    mamba.copy(imIn, imOut)
-    for i in _sizeSplit(size):
-        supFarNeighbor(imOut, imOut, dir, i, grid=grid, edge=edge)
+    err = core.MB_SupSegment(imIn.mbIm, imOut.mbIm, dir, max(size, 0), grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
 
 # Operations with large hexagons
 def largeHexagonalErode(imIn, imOut, size, edge=mamba.FILLED):
@@ -99,28 +101,27 @@ def largeHexagonalErode(imIn, imOut, size, edge=mamba.FILLED):
     This operator is quite complex to avoid edge effects.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    sizemax = min(imIn.getSize())//2
-    # If size larger than sizemax, the operation must be iterated to prevent edge effects.
-    n = size
-    mamba.copy(imIn, imOut)
-    while n > 0:
-        s = min(n, sizemax)
-        largeLinearErode(imOut, imWrk1, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imWrk1, imWrk1, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imWrk2, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imWrk2, imWrk2, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-        largeLinearErode(imWrk1, imWrk2, 2, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imWrk1, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imWrk1, imWrk1, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imOut, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearErode(imOut, imOut, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imOut, imWrk1, "inf")
-        largeLinearErode(imWrk1, imOut, 5, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imOut, imWrk2, imOut, "inf")
-        n = n - s
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        sizemax = min(imIn.getSize())//2
+        # If size larger than sizemax, the operation must be iterated to prevent edge effects.
+        n = size
+        mamba.copy(imIn, imOut)
+        while n > 0:
+            s = min(n, sizemax)
+            largeLinearErode(imOut, imWrk1, 6, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearErode(imWrk1, imWrk1, 4, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearErode(imOut, imWrk2, 4, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearErode(imWrk2, imWrk2, 6, s, grid=mamba.HEXAGONAL, edge=edge)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
+            largeLinearErode(imWrk1, imWrk2, 2, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearErode(imOut, imWrk1, 1, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearErode(imWrk1, imWrk1, 3, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearErode(imOut, imOut, 3, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearErode(imOut, imOut, 1, s, grid=mamba.HEXAGONAL, edge=edge)
+            mamba.logic(imWrk1, imOut, imWrk1, "inf")
+            largeLinearErode(imWrk1, imOut, 5, s, grid=mamba.HEXAGONAL, edge=edge)
+            mamba.logic(imOut, imWrk2, imOut, "inf")
+            n = n - s
         
 def largeHexagonalDilate(imIn, imOut, size, edge=mamba.EMPTY):
     """
@@ -132,28 +133,27 @@ def largeHexagonalDilate(imIn, imOut, size, edge=mamba.EMPTY):
     This operator is quite complex to avoid edge effects.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    sizemax = min(imIn.getSize())//2
-    # If size larger than sizemax, the operation must be iterated to prevent edge effects.
-    n = size
-    mamba.copy(imIn, imOut)
-    while n >  0:
-        s = min(n, sizemax)
-        largeLinearDilate(imOut, imWrk1, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imWrk1, imWrk1, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imWrk2, 4, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imWrk2, imWrk2, 6, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        largeLinearDilate(imWrk1, imWrk2, 2, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imWrk1, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imWrk1, imWrk1, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imOut, 3, s, grid=mamba.HEXAGONAL, edge=edge)
-        largeLinearDilate(imOut, imOut, 1, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imWrk1, imOut, imWrk1, "sup")
-        largeLinearDilate(imWrk1, imOut, 5, s, grid=mamba.HEXAGONAL, edge=edge)
-        mamba.logic(imOut, imWrk2, imOut, "sup")
-        n = n - s
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        sizemax = min(imIn.getSize())//2
+        # If size larger than sizemax, the operation must be iterated to prevent edge effects.
+        n = size
+        mamba.copy(imIn, imOut)
+        while n >  0:
+            s = min(n, sizemax)
+            largeLinearDilate(imOut, imWrk1, 6, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearDilate(imWrk1, imWrk1, 4, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearDilate(imOut, imWrk2, 4, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearDilate(imWrk2, imWrk2, 6, s, grid=mamba.HEXAGONAL, edge=edge)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+            largeLinearDilate(imWrk1, imWrk2, 2, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearDilate(imOut, imWrk1, 1, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearDilate(imWrk1, imWrk1, 3, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearDilate(imOut, imOut, 3, s, grid=mamba.HEXAGONAL, edge=edge)
+            largeLinearDilate(imOut, imOut, 1, s, grid=mamba.HEXAGONAL, edge=edge)
+            mamba.logic(imWrk1, imOut, imWrk1, "sup")
+            largeLinearDilate(imWrk1, imOut, 5, s, grid=mamba.HEXAGONAL, edge=edge)
+            mamba.logic(imOut, imWrk2, imOut, "sup")
+            n = n - s
     
 # Operations with large squares
 def largeSquareErode(imIn, imOut, size, edge=mamba.FILLED):
@@ -191,24 +191,23 @@ def _sparseConjugateHexagonErode(imIn, imOut, size, edge=mamba.FILLED):
     internal use only).
     """
 
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    val = mamba.computeMaxRange(imIn)[1]*int(edge==mamba.FILLED)
-    for i in _sizeSplit(size):
-        mamba.copy(imOut, imWrk1)
-        j = 2*i
-        infFarNeighbor(imWrk1, imOut, 1, j, grid=mamba.SQUARE, edge=edge)
-        mamba.shift(imWrk1, imWrk2, 2, i, val, grid=mamba.HEXAGONAL)
-        infFarNeighbor(imWrk2, imOut, 4, i, grid=mamba.HEXAGONAL, edge=edge)
-        infFarNeighbor(imWrk2, imOut, 6, i, grid=mamba.HEXAGONAL, edge=edge)
-        infFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.SQUARE, edge=edge)
-        mamba.shift(imWrk1, imWrk2, 5, i, val, grid=mamba.HEXAGONAL)
-        infFarNeighbor(imWrk2, imOut, 1, i, grid=mamba.HEXAGONAL, edge=edge)
-        infFarNeighbor(imWrk2, imOut, 3, i, grid=mamba.HEXAGONAL, edge=edge)
-        j = 3*i//2
-        infFarNeighbor(imWrk1, imOut, 2, j, grid=mamba.HEXAGONAL, edge=edge)
-        infFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.HEXAGONAL, edge=edge)
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        mamba.copy(imIn, imOut)
+        val = mamba.computeMaxRange(imIn)[1]*int(edge==mamba.FILLED)
+        for i in _sizeSplit(size):
+            mamba.copy(imOut, imWrk1)
+            j = 2*i
+            infFarNeighbor(imWrk1, imOut, 1, j, grid=mamba.SQUARE, edge=edge)
+            mamba.shift(imWrk1, imWrk2, 2, i, val, grid=mamba.HEXAGONAL)
+            infFarNeighbor(imWrk2, imOut, 4, i, grid=mamba.HEXAGONAL, edge=edge)
+            infFarNeighbor(imWrk2, imOut, 6, i, grid=mamba.HEXAGONAL, edge=edge)
+            infFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.SQUARE, edge=edge)
+            mamba.shift(imWrk1, imWrk2, 5, i, val, grid=mamba.HEXAGONAL)
+            infFarNeighbor(imWrk2, imOut, 1, i, grid=mamba.HEXAGONAL, edge=edge)
+            infFarNeighbor(imWrk2, imOut, 3, i, grid=mamba.HEXAGONAL, edge=edge)
+            j = 3*i//2
+            infFarNeighbor(imWrk1, imOut, 2, j, grid=mamba.HEXAGONAL, edge=edge)
+            infFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.HEXAGONAL, edge=edge)
         
 def _sparseConjugateHexagonDilate(imIn, imOut, size, edge=mamba.EMPTY):
     """
@@ -218,24 +217,23 @@ def _sparseConjugateHexagonDilate(imIn, imOut, size, edge=mamba.EMPTY):
     internal use only).
     """   
 
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    val = mamba.computeMaxRange(imIn)[1]*int(edge!=mamba.EMPTY)
-    for i in _sizeSplit(size):
-        mamba.copy(imOut, imWrk1)
-        j = 2*i
-        supFarNeighbor(imWrk1, imOut, 1, j, grid=mamba.SQUARE, edge=edge)
-        mamba.shift(imWrk1, imWrk2, 2, i, val, grid=mamba.HEXAGONAL)
-        supFarNeighbor(imWrk2, imOut, 4, i, grid=mamba.HEXAGONAL, edge=edge)
-        supFarNeighbor(imWrk2, imOut, 6, i, grid=mamba.HEXAGONAL, edge=edge)
-        supFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.SQUARE, edge=edge)
-        mamba.shift(imWrk1, imWrk2, 5, i, val, grid=mamba.HEXAGONAL)
-        supFarNeighbor(imWrk2, imOut, 1, i, grid=mamba.HEXAGONAL, edge=edge)
-        supFarNeighbor(imWrk2, imOut, 3, i, grid=mamba.HEXAGONAL, edge=edge)
-        j = 3*i//2
-        supFarNeighbor(imWrk1, imOut, 2, j, grid=mamba.HEXAGONAL, edge=edge)
-        supFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.HEXAGONAL, edge=edge)
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        mamba.copy(imIn, imOut)
+        val = mamba.computeMaxRange(imIn)[1]*int(edge!=mamba.EMPTY)
+        for i in _sizeSplit(size):
+            mamba.copy(imOut, imWrk1)
+            j = 2*i
+            supFarNeighbor(imWrk1, imOut, 1, j, grid=mamba.SQUARE, edge=edge)
+            mamba.shift(imWrk1, imWrk2, 2, i, val, grid=mamba.HEXAGONAL)
+            supFarNeighbor(imWrk2, imOut, 4, i, grid=mamba.HEXAGONAL, edge=edge)
+            supFarNeighbor(imWrk2, imOut, 6, i, grid=mamba.HEXAGONAL, edge=edge)
+            supFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.SQUARE, edge=edge)
+            mamba.shift(imWrk1, imWrk2, 5, i, val, grid=mamba.HEXAGONAL)
+            supFarNeighbor(imWrk2, imOut, 1, i, grid=mamba.HEXAGONAL, edge=edge)
+            supFarNeighbor(imWrk2, imOut, 3, i, grid=mamba.HEXAGONAL, edge=edge)
+            j = 3*i//2
+            supFarNeighbor(imWrk1, imOut, 2, j, grid=mamba.HEXAGONAL, edge=edge)
+            supFarNeighbor(imWrk1, imOut, 5, j, grid=mamba.HEXAGONAL, edge=edge)
   
 def largeDodecagonalErode(imIn, imOut, size, edge=mamba.FILLED):
     """
@@ -272,14 +270,14 @@ def _sparseDiamondDilate(imIn, imOut, size, edge=mamba.EMPTY):
     is not completely filled. It is for internal use only.
     """
 
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    for i in _sizeSplit(size):
-        mamba.copy(imOut, imWrk)
-        supFarNeighbor(imWrk, imOut, 1, i, grid=mamba.SQUARE, edge=edge)
-        supFarNeighbor(imWrk, imOut, 3, i, grid=mamba.SQUARE, edge=edge)
-        supFarNeighbor(imWrk, imOut, 5, i, grid=mamba.SQUARE, edge=edge)
-        supFarNeighbor(imWrk, imOut, 7, i, grid=mamba.SQUARE, edge=edge)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imOut)
+        for i in _sizeSplit(size):
+            mamba.copy(imOut, imWrk)
+            supFarNeighbor(imWrk, imOut, 1, i, grid=mamba.SQUARE, edge=edge)
+            supFarNeighbor(imWrk, imOut, 3, i, grid=mamba.SQUARE, edge=edge)
+            supFarNeighbor(imWrk, imOut, 5, i, grid=mamba.SQUARE, edge=edge)
+            supFarNeighbor(imWrk, imOut, 7, i, grid=mamba.SQUARE, edge=edge)
 
 def _sparseDiamondErode(imIn, imOut, size, edge=mamba.FILLED):
     """
@@ -287,14 +285,14 @@ def _sparseDiamondErode(imIn, imOut, size, edge=mamba.FILLED):
     is not completely filled. It is for internal use only.
     """
 
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    for i in _sizeSplit(size):
-        mamba.copy(imOut, imWrk)
-        infFarNeighbor(imWrk, imOut, 1, i, grid=mamba.SQUARE, edge=edge)
-        infFarNeighbor(imWrk, imOut, 3, i, grid=mamba.SQUARE, edge=edge)
-        infFarNeighbor(imWrk, imOut, 5, i, grid=mamba.SQUARE, edge=edge)
-        infFarNeighbor(imWrk, imOut, 7, i, grid=mamba.SQUARE, edge=edge)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imOut)
+        for i in _sizeSplit(size):
+            mamba.copy(imOut, imWrk)
+            infFarNeighbor(imWrk, imOut, 1, i, grid=mamba.SQUARE, edge=edge)
+            infFarNeighbor(imWrk, imOut, 3, i, grid=mamba.SQUARE, edge=edge)
+            infFarNeighbor(imWrk, imOut, 5, i, grid=mamba.SQUARE, edge=edge)
+            infFarNeighbor(imWrk, imOut, 7, i, grid=mamba.SQUARE, edge=edge)
          
 def largeOctogonalErode(imIn, imOut, size, edge=mamba.FILLED):
     """
@@ -0,0 +1,296 @@
+"""
+Point-wise expressions.
+
+This module provides lazy expressions combining the point-wise operators
+(logical and arithmetic operators, threshold, conversions, look-up ...).
+An expression records the operators applied to its images and evaluates
+the whole chain in a single pass over the image lines, so intermediate
+results are never written to full-size images.
+"""
+
+import mamba
+import mamba.core as core
+
+# Operators with two operands and their C operation code
+_binaryOps = {
+    "inf": core.MB_EXPR_INF,
+    "sup": core.MB_EXPR_SUP,
+    "and": core.MB_EXPR_AND,
+    "or": core.MB_EXPR_OR,
+    "xor": core.MB_EXPR_XOR,
+    "add": core.MB_EXPR_ADD,
+    "sub": core.MB_EXPR_SUB,
+    "diff": core.MB_EXPR_DIFF,
+    "supMask": core.MB_EXPR_SUPMASK,
+}
+
+class _notFused(Exception):
+    # Raised when an expression cannot be evaluated in a single pass
+    pass
+
+class expression:
+    """
+    Defines a point-wise expression over images.
+
+    Expressions are created with function expr and extended with the methods
+    below, each of them returning a new expression. Nothing is computed until
+    method evaluate is called.
+
+    Example:
+    >>>expr(imA).inf(imB).threshold(10, 200).convertByMask(0, 255).evaluate(imOut)
+
+    The result is the same as the one obtained by calling the corresponding
+    operators in sequence. Operations mixing images of different depths
+    (allowed for add and sub) are computed in this way.
+    """
+
+    def __init__(self, op, depth, operands=(), args=(), image=None):
+        self._op = op
+        self.depth = depth
+        self._operands = tuple(operands)
+        self._args = tuple(args)
+        self._image = image
+
+    def __repr__(self):
+        if self._op is None:
+            return "expr(" + repr(self._image) + ")"
+        args = [repr(o) for o in self._operands[1:]]
+        args += [repr(a) for a in self._args]
+        return repr(self._operands[0]) + "." + self._op + "(" + ", ".join(args) + ")"
+
+    def _binary(self, other, op, sameDepth=True):
+        other = _asExpression(other)
+        if sameDepth and other.depth!=self.depth:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        return expression(op, max(self.depth, other.depth), (self, other))
+
+    def negate(self):
+        """
+        Negates the expression (see negate).
+        """
+        return expression("negate", self.depth, (self,))
+
+    def logic(self, other, log):
+        """
+        Performs logic operation 'log' between the expression and 'other'
+        (an image or an expression of the same depth). 'log' can be "and",
+        "or", "xor", "inf" or "sup" (see logic).
+        """
+        if log not in ("and", "or", "xor", "inf", "sup"):
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        return self._binary(other, log)
+
+    def inf(self, other):
+        """
+        Minimum between the expression and 'other' (see logic).
+        """
+        return self._binary(other, "inf")
+
+    def sup(self, other):
+        """
+        Maximum between the expression and 'other' (see logic).
+        """
+        return self._binary(other, "sup")
+
+    def add(self, other):
+        """
+        Adds 'other' to the expression (see add). The result is as deep as
+        the deepest of the two operands.
+        """
+        return self._binary(other, "add", False)
+
+    def sub(self, other):
+        """
+        Subtracts 'other' to the expression (see sub). The result is as deep
+        as the deepest of the two operands.
+        """
+        return self._binary(other, "sub", False)
+
+    def diff(self, other):
+        """
+        Set difference between the expression and 'other' (see diff).
+        """
+        return self._binary(other, "diff")
+
+    def generateSupMask(self, other, strict):
+        """
+        Binary mask of the pixels where the expression is greater (strictly
+        if 'strict' is True) than 'other' (see generateSupMask).
+        """
+        e = self._binary(other, "supMask")
+        e.depth = 1
+        e._args = (int(strict),)
+        return e
+
+    def addConst(self, v):
+        """
+        Adds value 'v' to the expression (see addConst).
+        """
+        if self.depth==1:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        return expression("addConst", self.depth, (self,), (v,))
+
+    def subConst(self, v):
+        """
+        Subtracts value 'v' to the expression (see subConst).
+        """
+        if self.depth==1:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        return expression("subConst", self.depth, (self,), (v,))
+
+    def mulConst(self, v):
+        """
+        Multiplies the expression by value 'v' (see mulConst).
+        """
+        if self.depth==1:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        return expression("mulConst", self.depth, (self,), (v,))
+
+    def threshold(self, low, high):
+        """
+        Thresholds the expression between 'low' and 'high' (see threshold).
+        The result is binary.
+        """
+        if self.depth==1:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        if low>high:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_VALUE)
+        return expression("threshold", 1, (self,), (low, high))
+
+    def convertByMask(self, mFalse, mTrue, depth=8):
+        """
+        Converts the binary expression into a greyscale (or 32-bit if 'depth'
+        is 32) expression using values 'mFalse' and 'mTrue' (see
+        convertByMask).
+        """
+        if self.depth!=1 or depth not in (8, 32):
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        return expression("convertByMask", depth, (self,), (mFalse, mTrue))
+
+    def lookup(self, lutable):
+        """
+        Applies look-up table 'lutable' (a list of 256 values) to the
+        greyscale expression (see lookup).
+        """
+        if self.depth!=8:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        if len(lutable)!=256:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        return expression("lookup", 8, (self,), (list(lutable),))
+
+    def evaluate(self, imOut):
+        """
+        Computes the expression and puts the result in 'imOut', which must
+        have the depth of the expression. 'imOut' can be one of the images
+        used by the expression. Returns 'imOut'.
+        """
+        if imOut.getDepth()!=self.depth:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        try:
+            images = []
+            prog = []
+            self._compile(images, prog, 0)
+        except _notFused:
+            self._evaluateEager(imOut)
+        else:
+            err = core.MB_Expression([im.mbIm for im in images], imOut.mbIm, prog)
+            mamba.raiseExceptionOnError(err)
+            imOut.update()
+        return imOut
+
+    def _compile(self, images, prog, sp):
+        # Appends the program computing the expression to 'prog'. 'sp' is
+        # the number of values already in the stack.
+        if sp>=core.MB_EXPR_STACK_SIZE:
+            raise _notFused()
+        if self._op is None:
+            for i, im in enumerate(images):
+                if im is self._image:
+                    break
+            else:
+                i = len(images)
+                images.append(self._image)
+            prog += [core.MB_EXPR_LOAD, i]
+            return
+        self._operands[0]._compile(images, prog, sp)
+        if len(self._operands)==2:
+            if self._operands[1].depth!=self._operands[0].depth:
+                raise _notFused()
+            self._operands[1]._compile(images, prog, sp+1)
+            prog.append(_binaryOps[self._op])
+            if self._op=="supMask":
+                prog.append(self._args[0])
+        elif self._op=="negate":
+            prog.append(core.MB_EXPR_NEGATE)
+        elif self._op in ("addConst", "subConst"):
+            v = self._args[0]
+            prog += [(self._op=="addConst") and core.MB_EXPR_ADDCONST or core.MB_EXPR_SUBCONST,
+                     v&0xffffffff, (v>>32)&0xffffffff]
+        elif self._op=="mulConst":
+            prog += [core.MB_EXPR_MULCONST, self._args[0]]
+        elif self._op=="threshold":
+            prog += [core.MB_EXPR_THRESH, self._args[0], self._args[1]]
+        elif self._op=="convertByMask":
+            prog += [core.MB_EXPR_MASK, self.depth, self._args[0], self._args[1]]
+        else:
+            prog.append(core.MB_EXPR_LOOKUP)
+            prog += self._args[0]
+
+    def _evaluateEager(self, imOut):
+        # Computes the expression by calling the operators in sequence
+        if self._op is None:
+            mamba.copy(self._image, imOut)
+            return
+        ims = []
+        wrks = [o for o in self._operands if o._op is not None]
+        with mamba.scratchImages(imOut, [o.depth for o in wrks]) as imWrks:
+            if len(wrks)==1:
+                imWrks = [imWrks]
+            for o in self._operands:
+                if o._op is None:
+                    ims.append(o._image)
+                else:
+                    imWrk = imWrks[wrks.index(o)]
+                    o._evaluateEager(imWrk)
+                    ims.append(imWrk)
+            if self._op in ("and", "or", "xor", "inf", "sup"):
+                mamba.logic(ims[0], ims[1], imOut, self._op)
+            elif self._op=="add":
+                mamba.add(ims[0], ims[1], imOut)
+            elif self._op=="sub":
+                mamba.sub(ims[0], ims[1], imOut)
+            elif self._op=="diff":
+                mamba.diff(ims[0], ims[1], imOut)
+            elif self._op=="supMask":
+                mamba.generateSupMask(ims[0], ims[1], imOut, self._args[0])
+            elif self._op=="negate":
+                mamba.negate(ims[0], imOut)
+            elif self._op=="addConst":
+                mamba.addConst(ims[0], self._args[0], imOut)
+            elif self._op=="subConst":
+                mamba.subConst(ims[0], self._args[0], imOut)
+            elif self._op=="mulConst":
+                mamba.mulConst(ims[0], self._args[0], imOut)
+            elif self._op=="threshold":
+                mamba.threshold(ims[0], imOut, self._args[0], self._args[1])
+            elif self._op=="convertByMask":
+                mamba.convertByMask(ims[0], imOut, self._args[0], self._args[1])
+            else:
+                mamba.lookup(ims[0], imOut, self._args[0])
+
+def _asExpression(x):
+    # Converts an image into an expression
+    if isinstance(x, expression):
+        return x
+    return expr(x)
+
+def expr(imIn):
+    """
+    Returns an expression made of image 'imIn' (see class expression).
+    The expression is built by chaining point-wise operators and is only
+    computed when its method evaluate is called.
+
+    Example:
+    >>>expr(imA).inf(imB).threshold(10, 200).evaluate(imBin)
+    """
+    return expression(None, imIn.getDepth(), image=imIn)
@@ -20,16 +20,16 @@ def minima(imIn, imOut, h=1, grid=mamba.DEFAULT_GRID):
     Only works with 8-bit or 32-bit images as input. 'imOut' must be binary.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.addConst(imIn, h, imWrk)
-        mamba.hierarDualBuild(imIn, imWrk, grid=grid)
-        mamba.sub(imWrk, imIn, imWrk)
-    else:
-        mamba.ceilingAddConst(imIn, h, imWrk)
-        mamba.dualBuild(imIn, imWrk, grid=grid)
-        mamba.floorSub(imWrk, imIn, imWrk)
-    mamba.threshold(imWrk, imOut, 1, mamba.computeMaxRange(imIn)[1])
+    with mamba.scratchImages(imIn) as imWrk:
+        if imIn.getDepth() == 8:
+            mamba.addConst(imIn, h, imWrk)
+            mamba.hierarDualBuild(imIn, imWrk, grid=grid)
+            mamba.sub(imWrk, imIn, imWrk)
+        else:
+            mamba.ceilingAddConst(imIn, h, imWrk)
+            mamba.dualBuild(imIn, imWrk, grid=grid)
+            mamba.floorSub(imWrk, imIn, imWrk)
+        mamba.threshold(imWrk, imOut, 1, mamba.computeMaxRange(imIn)[1])
 
 def maxima(imIn, imOut, h=1, grid=mamba.DEFAULT_GRID):
     """
@@ -42,16 +42,16 @@ def maxima(imIn, imOut, h=1, grid=mamba.DEFAULT_GRID):
     Only works with with 8-bit or 32-bit images as input. 'imOut' must be binary.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.subConst(imIn, h, imWrk)
-        mamba.hierarBuild(imIn, imWrk, grid=grid)
-        mamba.sub(imIn, imWrk, imWrk)
-    else:
-        mamba.floorSubConst(imIn, h, imWrk)
-        mamba.build(imIn, imWrk, grid=grid)
-        mamba.floorSub(imIn, imWrk, imWrk)
-    mamba.threshold(imWrk, imOut, 1, mamba.computeMaxRange(imIn)[1])
+    with mamba.scratchImages(imIn) as imWrk:
+        if imIn.getDepth() == 8:
+            mamba.subConst(imIn, h, imWrk)
+            mamba.hierarBuild(imIn, imWrk, grid=grid)
+            mamba.sub(imIn, imWrk, imWrk)
+        else:
+            mamba.floorSubConst(imIn, h, imWrk)
+            mamba.build(imIn, imWrk, grid=grid)
+            mamba.floorSub(imIn, imWrk, imWrk)
+        mamba.threshold(imWrk, imOut, 1, mamba.computeMaxRange(imIn)[1])
 
 def minDynamics(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     """
@@ -63,16 +63,16 @@ def minDynamics(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     Only works with 8-bit or 32-bit images as input. 'imOut' must be binary.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.addConst(imIn, h, imWrk)
-        mamba.hierarDualBuild(imIn, imWrk, grid=grid)
-        mamba.sub(imWrk, imIn, imWrk)
-    else:
-        mamba.ceilingAddConst(imIn, h, imWrk)
-        mamba.dualBuild(imIn, imWrk, grid=grid)
-        mamba.floorSub(imWrk, imIn, imWrk)
-    mamba.threshold(imWrk, imOut, h, mamba.computeMaxRange(imIn)[1])
+    with mamba.scratchImages(imIn) as imWrk:
+        if imIn.getDepth() == 8:
+            mamba.addConst(imIn, h, imWrk)
+            mamba.hierarDualBuild(imIn, imWrk, grid=grid)
+            mamba.sub(imWrk, imIn, imWrk)
+        else:
+            mamba.ceilingAddConst(imIn, h, imWrk)
+            mamba.dualBuild(imIn, imWrk, grid=grid)
+            mamba.floorSub(imWrk, imIn, imWrk)
+        mamba.threshold(imWrk, imOut, h, mamba.computeMaxRange(imIn)[1])
     
 def maxDynamics(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     """
@@ -84,16 +84,16 @@ def maxDynamics(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     Only works with 8-bit or 32-bit images as input. 'imOut' must be binary.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.subConst(imIn, h, imWrk)
-        mamba.hierarBuild(imIn, imWrk, grid=grid)
-        mamba.sub(imIn, imWrk, imWrk)
-    else:
-        mamba.floorSubConst(imIn, h, imWrk)
-        mamba.build(imIn, imWrk, grid=grid)
-        mamba.floorSub(imIn, imWrk, imWrk)
-    mamba.threshold(imWrk, imOut, h, mamba.computeMaxRange(imIn)[1])
+    with mamba.scratchImages(imIn) as imWrk:
+        if imIn.getDepth() == 8:
+            mamba.subConst(imIn, h, imWrk)
+            mamba.hierarBuild(imIn, imWrk, grid=grid)
+            mamba.sub(imIn, imWrk, imWrk)
+        else:
+            mamba.floorSubConst(imIn, h, imWrk)
+            mamba.build(imIn, imWrk, grid=grid)
+            mamba.floorSub(imIn, imWrk, imWrk)
+        mamba.threshold(imWrk, imOut, h, mamba.computeMaxRange(imIn)[1])
 
 def deepMinima(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     """
@@ -105,14 +105,14 @@ def deepMinima(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     Only works with 8-bit or 32-bit images as input. 'imOut' must be binary.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.addConst(imIn, h, imWrk)
-        mamba.hierarDualBuild(imIn, imWrk, grid=grid)
-    else:
-        mamba.ceilingAddConst(imIn, h, imWrk)
-        mamba.dualBuild(imIn, imWrk, grid=grid)
-    minima(imWrk, imOut, 1, grid=grid)
+    with mamba.scratchImages(imIn) as imWrk:
+        if imIn.getDepth() == 8:
+            mamba.addConst(imIn, h, imWrk)
+            mamba.hierarDualBuild(imIn, imWrk, grid=grid)
+        else:
+            mamba.ceilingAddConst(imIn, h, imWrk)
+            mamba.dualBuild(imIn, imWrk, grid=grid)
+        minima(imWrk, imOut, 1, grid=grid)
 
 def highMaxima(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     """
@@ -124,14 +124,14 @@ def highMaxima(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     Only works with 8-bit or 32-bit images as input. 'imOut' must be binary.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.subConst(imIn, h, imWrk)
-        mamba.hierarBuild(imIn, imWrk, grid=grid)
-    else:
-        mamba.floorSubConst(imIn, h, imWrk)
-        mamba.build(imIn, imWrk, grid=grid)
-    maxima(imWrk, imOut, 1, grid=grid)
+    with mamba.scratchImages(imIn) as imWrk:
+        if imIn.getDepth() == 8:
+            mamba.subConst(imIn, h, imWrk)
+            mamba.hierarBuild(imIn, imWrk, grid=grid)
+        else:
+            mamba.floorSubConst(imIn, h, imWrk)
+            mamba.build(imIn, imWrk, grid=grid)
+        maxima(imWrk, imOut, 1, grid=grid)
     
 def maxPartialBuild(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -141,12 +141,12 @@ def maxPartialBuild(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     'imIn' and 'imOut' must be different and greyscale images.
     """
     
-    imWrk = mamba.imageMb(imIn, 1)
-    maxima(imIn, imWrk, 1, grid=grid)
-    mamba.logic(imMask, imWrk, imWrk, "inf")
-    mamba.convertByMask(imWrk, imOut, 0, mamba.computeMaxRange(imIn)[1])
-    mamba.logic(imIn, imOut, imOut, "inf")
-    mamba.build(imIn, imOut)
+    with mamba.scratchImages(imIn, depth=1) as imWrk:
+        maxima(imIn, imWrk, 1, grid=grid)
+        mamba.logic(imMask, imWrk, imWrk, "inf")
+        mamba.convertByMask(imWrk, imOut, 0, mamba.computeMaxRange(imIn)[1])
+        mamba.logic(imIn, imOut, imOut, "inf")
+        mamba.build(imIn, imOut)
 
 def minPartialBuild(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -156,10 +156,10 @@ def minPartialBuild(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     'imIn' and 'imOut' must be different and greyscale images.
     """
     
-    imWrk = mamba.imageMb(imIn, 1)
-    minima(imIn, imWrk, 1, grid=grid)
-    mamba.logic(imMask, imWrk, imWrk, "inf")
-    mamba.convertByMask(imWrk, imOut, mamba.computeMaxRange(imIn)[1], 0)
-    mamba.logic(imIn, imOut, imOut, "sup")
-    mamba.dualBuild(imIn, imOut)
+    with mamba.scratchImages(imIn, depth=1) as imWrk:
+        minima(imIn, imWrk, 1, grid=grid)
+        mamba.logic(imMask, imWrk, imWrk, "inf")
+        mamba.convertByMask(imWrk, imOut, mamba.computeMaxRange(imIn)[1], 0)
+        mamba.logic(imIn, imOut, imOut, "sup")
+        mamba.dualBuild(imIn, imOut)
 
@@ -60,18 +60,16 @@ def autoMedian(imIn, imOut, n, se=mamba.DEFAULT_SE):
     Morphological automedian filter performed with alternate sequential filters.
     """
     
-    oc_im = mamba.imageMb(imIn)
-    co_im = mamba.imageMb(imIn)
-    imWrk = mamba.imageMb(imIn)
-    alternateFilter(imIn, oc_im, n, True, se=se)
-    alternateFilter(imIn, co_im, n, False, se=se)
-    mamba.copy(imIn, imOut)
-    mamba.copy(oc_im, imWrk)
-    mamba.logic(co_im, imWrk, imWrk, "sup")
-    mamba.logic(imWrk, imOut, imOut, "inf")
-    mamba.copy(oc_im, imWrk)
-    mamba.logic(co_im, imWrk, imWrk, "inf")
-    mamba.logic(imWrk, imOut, imOut, "sup")
+    with mamba.scratchImages(imIn, 3) as (oc_im, co_im, imWrk):
+        alternateFilter(imIn, oc_im, n, True, se=se)
+        alternateFilter(imIn, co_im, n, False, se=se)
+        mamba.copy(imIn, imOut)
+        mamba.copy(oc_im, imWrk)
+        mamba.logic(co_im, imWrk, imWrk, "sup")
+        mamba.logic(imWrk, imOut, imOut, "inf")
+        mamba.copy(oc_im, imWrk)
+        mamba.logic(co_im, imWrk, imWrk, "inf")
+        mamba.logic(imWrk, imOut, imOut, "sup")
 
 def simpleLevelling(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -81,19 +79,17 @@ def simpleLevelling(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     image of homogeneous grey values.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    mask_im = mamba.imageMb(imIn, 1)
-    mamba.logic(imIn, imMask, imWrk1, "inf")
-    mamba.build(imIn, imWrk1, grid=grid)
-    mamba.logic(imIn, imMask, imWrk2, "sup")
-    mamba.dualBuild(imIn, imWrk2, grid=grid)
-    mamba.generateSupMask(imIn, imMask, mask_im, False)
-    mamba.convertByMask(mask_im, imOut, 0, mamba.computeMaxRange(imIn)[1])
-    mamba.logic(imOut, imWrk1, imWrk1, "inf")
-    mamba.negate(imOut, imOut)
-    mamba.logic(imOut, imWrk2, imOut, "inf")
-    mamba.logic(imWrk1, imOut, imOut, "sup")
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2), mamba.scratchImages(imIn, depth=1) as mask_im:
+        mamba.logic(imIn, imMask, imWrk1, "inf")
+        mamba.build(imIn, imWrk1, grid=grid)
+        mamba.logic(imIn, imMask, imWrk2, "sup")
+        mamba.dualBuild(imIn, imWrk2, grid=grid)
+        mamba.generateSupMask(imIn, imMask, mask_im, False)
+        mamba.convertByMask(mask_im, imOut, 0, mamba.computeMaxRange(imIn)[1])
+        mamba.logic(imOut, imWrk1, imWrk1, "inf")
+        mamba.negate(imOut, imOut)
+        mamba.logic(imOut, imWrk2, imOut, "inf")
+        mamba.logic(imWrk1, imOut, imOut, "sup")
 
 def strongLevelling(imIn, imOut, n, eroFirst, grid=mamba.DEFAULT_GRID):
     """
@@ -105,18 +101,18 @@ def strongLevelling(imIn, imOut, n, eroFirst, grid=mamba.DEFAULT_GRID):
     order of the initial operations (erosion and dilation) matters.    
     """
     
-    imWrk = mamba.imageMb(imIn)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    if eroFirst:
-        mamba.erode(imIn, imWrk, n, se=se)
-        mamba.build(imIn, imWrk, grid=grid)
-        mamba.dilate(imIn, imOut, n, se=se)
-        mamba.dualBuild(imWrk, imOut, grid=grid)
-    else:
-        mamba.dilate(imIn, imWrk, n, se=se)
-        mamba.dualBuild(imIn, imWrk, grid=grid)
-        mamba.erode(imIn, imOut, n, se=se)
-        mamba.build(imWrk, imOut, grid=grid)
+    with mamba.scratchImages(imIn) as imWrk:
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        if eroFirst:
+            mamba.erode(imIn, imWrk, n, se=se)
+            mamba.build(imIn, imWrk, grid=grid)
+            mamba.dilate(imIn, imOut, n, se=se)
+            mamba.dualBuild(imWrk, imOut, grid=grid)
+        else:
+            mamba.dilate(imIn, imWrk, n, se=se)
+            mamba.dualBuild(imIn, imWrk, grid=grid)
+            mamba.erode(imIn, imOut, n, se=se)
+            mamba.build(imWrk, imOut, grid=grid)
 
 def largeHexagonalAlternateFilter(imIn, imOut, start, end, step, openFirst):
     """
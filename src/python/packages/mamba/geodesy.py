@@ -27,14 +27,13 @@ def upperGeodesicDilate(imIn, imMask, imOut, n=1, se=mamba.DEFAULT_SE):
             mamba.dilate(imOut, imOut, se=se)
             mamba.logic(imMask, imOut, imOut, "sup")
     else:
-        imWrk1 = mamba.imageMb(imIn)
-        imWrk2 = mamba.imageMb(imIn, 1)
-        for i in range(n):
-            mamba.generateSupMask(imOut, imMask, imWrk2, True)
-            mamba.convertByMask(imWrk2, imWrk1, 0, mamba.computeMaxRange(imWrk1)[1])
-            mamba.logic(imOut, imWrk1, imOut, "inf")
-            mamba.dilate(imOut, imOut, se=se)
-            mamba.logic(imOut, imMask, imOut, "sup")
+        with mamba.scratchImages(imIn) as imWrk1, mamba.scratchImages(imIn, depth=1) as imWrk2:
+            for i in range(n):
+                mamba.generateSupMask(imOut, imMask, imWrk2, True)
+                mamba.convertByMask(imWrk2, imWrk1, 0, mamba.computeMaxRange(imWrk1)[1])
+                mamba.logic(imOut, imWrk1, imOut, "inf")
+                mamba.dilate(imOut, imOut, se=se)
+                mamba.logic(imOut, imMask, imOut, "sup")
 
 def lowerGeodesicDilate(imIn, imMask, imOut, n=1, se=mamba.DEFAULT_SE):
     """
@@ -93,15 +92,14 @@ def lowerGeodesicErode(imIn, imMask, imOut, n=1, se=mamba.DEFAULT_SE):
         lowerGeodesicDilate(imOut, imMask, imOut, n, se=se)
         mamba.diff(imMask, imOut, imOut)
     else:
-        imWrk1 = mamba.imageMb(imIn)
-        imWrk2 = mamba.imageMb(imIn, 1)
-        mamba.logic(imIn, imMask, imOut, "inf")
-        for i in range(n):
-            mamba.generateSupMask(imOut, imMask, imWrk2, False)
-            mamba.convertByMask(imWrk2, imWrk1, 0, mamba.computeMaxRange(imWrk1)[1])
-            mamba.logic(imOut, imWrk1, imOut, "sup")
-            mamba.erode(imOut, imOut, se=se)
-            mamba.logic(imOut, imMask, imOut, "inf")
+        with mamba.scratchImages(imIn) as imWrk1, mamba.scratchImages(imIn, depth=1) as imWrk2:
+            mamba.logic(imIn, imMask, imOut, "inf")
+            for i in range(n):
+                mamba.generateSupMask(imOut, imMask, imWrk2, False)
+                mamba.convertByMask(imWrk2, imWrk1, 0, mamba.computeMaxRange(imWrk1)[1])
+                mamba.logic(imOut, imWrk1, imOut, "sup")
+                mamba.erode(imOut, imOut, se=se)
+                mamba.logic(imOut, imMask, imOut, "inf")
  
 def geodesicErode(imIn, imMask, imOut, n=1, se=mamba.DEFAULT_SE):
     """
@@ -153,11 +151,15 @@ def build(imMask, imInout, grid=mamba.DEFAULT_GRID):
     result in the same image.
     
     This operator uses a recursive implementation of the reconstruction.
+    Binary images are rebuilt in a single pass (see hierarBuild).
     
     This function will use the mamba default grid unless specified otherwise in
     'grid'.
     """
     
+    if imInout.getDepth()==1:
+        hierarBuild(imMask, imInout, grid)
+        return
     vol = 0
     prec_vol = -1
     dirs = mamba.getDirections(grid, True)
@@ -173,11 +175,15 @@ def dualBuild(imMask, imInout, grid=mamba.DEFAULT_GRID):
     the mask image and puts the result in the same image.
     
     This operator uses a recursive implementation of the reconstruction.
+    Binary images are rebuilt in a single pass (see hierarDualBuild).
     
     This function will use the mamba default grid unless specified otherwise in
     'grid'.
     """
     
+    if imInout.getDepth()==1:
+        hierarDualBuild(imMask, imInout, grid)
+        return
     vol = 0
     prec_vol = -1
     dirs = mamba.getDirections(grid, True)
@@ -188,9 +194,9 @@ def dualBuild(imMask, imInout, grid=mamba.DEFAULT_GRID):
             
 def hierarBuild(imMask, imInout, grid=mamba.DEFAULT_GRID):
     """
-    Builds image 'imInout' using 'imMask' as a mask. This function only
-    works with greyscale and 32-bit images and uses a hierarchical queue algorithm to
-    compute the result.
+    Builds image 'imInout' using 'imMask' as a mask. This function works
+    with binary, greyscale and 32-bit images and uses a hierarchical queue
+    algorithm to compute the result (a simple FIFO for binary images).
     
     'grid' will set the number of neighbors considered by the algorithm 
     (HEXAGONAL is 6-Neighbors and SQUARE is 8-Neighbors).
@@ -205,8 +211,8 @@ def hierarBuild(imMask, imInout, grid=mamba.DEFAULT_GRID):
 def hierarDualBuild(imMask, imInout, grid=mamba.DEFAULT_GRID):
     """
     Builds (dual build) image 'imInout' using 'imMask' as a mask. This function 
-    works with greyscale and 32-bit images and uses a hierarchical queue 
-    algorithm to compute the result.
+    works with binary, greyscale and 32-bit images and uses a hierarchical queue 
+    algorithm to compute the result (a simple FIFO for binary images).
     
     'grid' will set the number of neighbors considered by the algorithm 
     (HEXAGONAL is 6-Neighbors and SQUARE is 8-Neighbors).
@@ -225,13 +231,13 @@ def closeHoles(imIn, imOut, grid=mamba.DEFAULT_GRID):
     used cautiously.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.negate(imIn, imIn)
-    mamba.drawEdge(imWrk)
-    mamba.logic(imIn, imWrk, imWrk, "inf")
-    build(imIn, imWrk, grid=grid)
-    mamba.negate(imIn, imIn)
-    mamba.negate(imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.negate(imIn, imIn)
+        mamba.drawEdge(imWrk)
+        mamba.logic(imIn, imWrk, imWrk, "inf")
+        build(imIn, imWrk, grid=grid)
+        mamba.negate(imIn, imIn)
+        mamba.negate(imWrk, imOut)
 
 def removeEdgeParticles(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -241,12 +247,13 @@ def removeEdgeParticles(imIn, imOut, grid=mamba.DEFAULT_GRID):
     considered with caution.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    mamba.dilate(imWrk, imWrk, se=se, edge=mamba.FILLED)
-    mamba.logic(imIn, imWrk, imWrk, "inf")
-    build(imIn, imWrk, grid=grid)
-    mamba.diff(imIn, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        imWrk.reset()
+        mamba.dilate(imWrk, imWrk, se=se, edge=mamba.FILLED)
+        mamba.logic(imIn, imWrk, imWrk, "inf")
+        build(imIn, imWrk, grid=grid)
+        mamba.diff(imIn, imWrk, imOut)
 
 def geodesicDistance(imIn, imMask, imOut, se=mamba.DEFAULT_SE):
     """
@@ -262,9 +269,9 @@ def geodesicDistance(imIn, imMask, imOut, se=mamba.DEFAULT_SE):
     if imIn.getDepth() != 1:
         mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
     imOut.reset()
-    imWrk = mamba.imageMb(imIn)
-    mamba.logic(imIn, imMask, imWrk, "inf")
-    while mamba.computeVolume(imWrk) != 0:
-        mamba.add(imOut, imWrk, imOut)
-        lowerGeodesicErode(imWrk, imMask, imWrk, se=se)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.logic(imIn, imMask, imWrk, "inf")
+        while mamba.computeVolume(imWrk) != 0:
+            mamba.add(imOut, imWrk, imOut)
+            lowerGeodesicErode(imWrk, imMask, imWrk, se=se)
     
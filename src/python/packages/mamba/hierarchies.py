@@ -20,14 +20,14 @@ def hierarchy(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     The hierarchical image is put in 'imOut'.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if mamba.checkEmptiness(imIn):
-        mamba.copy(imIn, imOut)
-    else:
-        mamba.convertByMask(imMask, imWrk, 255, 0)
-        mamba.logic(imIn, imWrk, imWrk, "sup")
-        mamba.hierarDualBuild(imIn, imWrk)
-        mamba.copy(imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        if mamba.checkEmptiness(imIn):
+            mamba.copy(imIn, imOut)
+        else:
+            mamba.convertByMask(imMask, imWrk, 255, 0)
+            mamba.logic(imIn, imWrk, imWrk, "sup")
+            mamba.hierarDualBuild(imIn, imWrk)
+            mamba.copy(imWrk, imOut)
 
 def hierarchicalLevel(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -38,27 +38,23 @@ def hierarchicalLevel(imIn, imOut, grid=mamba.DEFAULT_GRID):
     'imIn' must be a valued watershed image.
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn, 1)
-    imWrk2 = mamba.imageMb(imIn, 1)
-    imWrk3 = mamba.imageMb(imIn, 1)
-    imWrk4 = mamba.imageMb(imIn, 32)
-    mamba.threshold(imIn,imWrk1, 0, 0)
-    mamba.negate(imWrk1, imWrk2)
-    hierarchy(imIn, imWrk2, imWrk0, grid=grid)
-    mamba.minima(imWrk0, imWrk2, grid=grid)
-    mamba.label(imWrk2, imWrk4, grid=grid)
-    mamba.watershedSegment(imWrk0, imWrk4, grid=grid)
-    mamba.copyBytePlane(imWrk4, 3, imWrk0)
-    mamba.threshold(imWrk0, imWrk2, 0, 0)
-    mamba.diff(imWrk1, imWrk2, imWrk3)
-    mamba.build(imWrk1, imWrk3)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    mamba.dilate(imWrk3, imWrk1, 1, se)
-    mamba.diff(imWrk2, imWrk1, imWrk1)
-    mamba.logic(imWrk1, imWrk3, imWrk1, "sup")
-    mamba.convertByMask(imWrk1, imWrk0, 255, 0)
-    mamba.logic(imIn, imWrk0, imOut, "inf")
+    with mamba.scratchImages(imIn, [None, 1, 1, 1, 32]) as (imWrk0, imWrk1, imWrk2, imWrk3, imWrk4):
+        mamba.threshold(imIn,imWrk1, 0, 0)
+        mamba.negate(imWrk1, imWrk2)
+        hierarchy(imIn, imWrk2, imWrk0, grid=grid)
+        mamba.minima(imWrk0, imWrk2, grid=grid)
+        mamba.label(imWrk2, imWrk4, grid=grid)
+        mamba.watershedSegment(imWrk0, imWrk4, grid=grid)
+        mamba.copyBytePlane(imWrk4, 3, imWrk0)
+        mamba.threshold(imWrk0, imWrk2, 0, 0)
+        mamba.diff(imWrk1, imWrk2, imWrk3)
+        mamba.build(imWrk1, imWrk3)
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        mamba.dilate(imWrk3, imWrk1, 1, se)
+        mamba.diff(imWrk2, imWrk1, imWrk1)
+        mamba.logic(imWrk1, imWrk3, imWrk1, "sup")
+        mamba.convertByMask(imWrk1, imWrk0, 255, 0)
+        mamba.logic(imIn, imWrk0, imOut, "inf")
 
 def waterfalls(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -69,20 +65,18 @@ def waterfalls(imIn, imOut, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 1)
-    mamba.copy(imIn, imWrk1)
-    imOut.reset()
-    nbLevels = 0
-    mamba.threshold(imWrk1, imWrk3, 1, 255)
-    while mamba.computeVolume(imWrk3) != 0:
-        mamba.add(imOut, imWrk3, imOut)
-        hierarchicalLevel(imWrk1, imWrk2, grid=grid)
-        mamba.threshold(imWrk2, imWrk3, 1, 255)
-        mamba.copy(imWrk2, imWrk1)
-        nbLevels += 1
-    return nbLevels
+    with mamba.scratchImages(imIn, [None, None, 1]) as (imWrk1, imWrk2, imWrk3):
+        mamba.copy(imIn, imWrk1)
+        imOut.reset()
+        nbLevels = 0
+        mamba.threshold(imWrk1, imWrk3, 1, 255)
+        while mamba.computeVolume(imWrk3) != 0:
+            mamba.add(imOut, imWrk3, imOut)
+            hierarchicalLevel(imWrk1, imWrk2, grid=grid)
+            mamba.threshold(imWrk2, imWrk3, 1, 255)
+            mamba.copy(imWrk2, imWrk1)
+            nbLevels += 1
+        return nbLevels
 
 def enhancedWaterfalls(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -98,33 +92,29 @@ def enhancedWaterfalls(imIn, imOut, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 32)   
-    mamba.copy(imIn, imWrk1)
-    imOut.reset()
-    nbLevels = 0
-    mamba.threshold(imWrk1, imWrk4, 1, 255)
-    flag = not(mamba.checkEmptiness(imWrk4))
-    while flag:
-        mamba.add(imOut, imWrk4, imOut)
-        hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
-        mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
-        mamba.threshold(imWrk3, imWrk4, 1, 255)
-        flag = not(mamba.checkEmptiness(imWrk4))
-        hierarchy(imWrk3, imWrk4, imWrk2, grid=grid)
-        mamba.generateSupMask(imWrk2, imWrk1, imWrk4, strict=True)
-        mamba.convertByMask(imWrk4, imWrk3, 255, 0)
-        mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
-        mamba.label(imWrk4, imWrk5, grid=grid)
-        mamba.watershedSegment(imWrk3, imWrk5, grid=grid)
-        mamba.copyBytePlane(imWrk5, 3, imWrk1)
-        mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+    with mamba.scratchImages(imIn, [None, None, None, 1, 32]) as (imWrk1, imWrk2, imWrk3, imWrk4, imWrk5):
+        mamba.copy(imIn, imWrk1)
+        imOut.reset()
+        nbLevels = 0
         mamba.threshold(imWrk1, imWrk4, 1, 255)
-        nbLevels += 1
-    return nbLevels
+        flag = not(mamba.checkEmptiness(imWrk4))
+        while flag:
+            mamba.add(imOut, imWrk4, imOut)
+            hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
+            mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
+            mamba.threshold(imWrk3, imWrk4, 1, 255)
+            flag = not(mamba.checkEmptiness(imWrk4))
+            hierarchy(imWrk3, imWrk4, imWrk2, grid=grid)
+            mamba.generateSupMask(imWrk2, imWrk1, imWrk4, strict=True)
+            mamba.convertByMask(imWrk4, imWrk3, 255, 0)
+            mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
+            mamba.label(imWrk4, imWrk5, grid=grid)
+            mamba.watershedSegment(imWrk3, imWrk5, grid=grid)
+            mamba.copyBytePlane(imWrk5, 3, imWrk1)
+            mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+            mamba.threshold(imWrk1, imWrk4, 1, 255)
+            nbLevels += 1
+        return nbLevels
     
 def standardSegment(imIn, imOut, gain=2.0, grid=mamba.DEFAULT_GRID):
     """
@@ -141,45 +131,39 @@ def standardSegment(imIn, imOut, gain=2.0, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 1)
-    imWrk6 = mamba.imageMb(imIn, 32)    
-    mamba.copy(imIn, imWrk1)
-    mamba.mulRealConst(imIn, gain, imWrk6)
-    mamba.floorSubConst(imWrk6, 1, imWrk6)
-    mamba.threshold(imWrk6, imWrk4, 255, mamba.computeMaxRange(imWrk6)[1])  
-    mamba.copyBytePlane(imWrk6, 0, imWrk0)
-    mamba.convert(imWrk4, imWrk2)
-    mamba.logic(imWrk0, imWrk2, imWrk0, "sup")
-    mamba.logic(imWrk0, imWrk1, imWrk0, "sup")
-    imOut.reset()
-    nbLevels = 0
-    mamba.threshold(imWrk1, imWrk4, 1, 255)
-    flag = not(mamba.checkEmptiness(imWrk4))
-    while flag:
-        hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
-        mamba.add(imOut, imWrk4, imOut)
-        mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
-        mamba.threshold(imWrk3, imWrk5, 1, 255)
-        flag = not(mamba.checkEmptiness(imWrk5))
-        hierarchy(imWrk3, imWrk5, imWrk2, grid=grid)
-        mamba.generateSupMask(imWrk0, imWrk2, imWrk5, strict=False)
-        mamba.logic(imWrk4, imWrk5, imWrk4, "inf")
-        mamba.convertByMask(imWrk4, imWrk3, 0, 255)
-        mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
-        mamba.negate(imWrk4, imWrk4)
-        mamba.label(imWrk4, imWrk6, grid=grid)
-        mamba.watershedSegment(imWrk3, imWrk6, grid=grid)
-        mamba.copyBytePlane(imWrk6, 3, imWrk3)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+    with mamba.scratchImages(imIn, [None, None, None, None, 1, 1, 32]) as (imWrk0, imWrk1, imWrk2, imWrk3, imWrk4, imWrk5, imWrk6):
+        mamba.copy(imIn, imWrk1)
+        mamba.mulRealConst(imIn, gain, imWrk6)
+        mamba.floorSubConst(imWrk6, 1, imWrk6)
+        mamba.threshold(imWrk6, imWrk4, 255, mamba.computeMaxRange(imWrk6)[1])  
+        mamba.copyBytePlane(imWrk6, 0, imWrk0)
+        mamba.convert(imWrk4, imWrk2)
+        mamba.logic(imWrk0, imWrk2, imWrk0, "sup")
+        mamba.logic(imWrk0, imWrk1, imWrk0, "sup")
+        imOut.reset()
+        nbLevels = 0
         mamba.threshold(imWrk1, imWrk4, 1, 255)
-        nbLevels += 1
-    return nbLevels
+        flag = not(mamba.checkEmptiness(imWrk4))
+        while flag:
+            hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
+            mamba.add(imOut, imWrk4, imOut)
+            mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
+            mamba.threshold(imWrk3, imWrk5, 1, 255)
+            flag = not(mamba.checkEmptiness(imWrk5))
+            hierarchy(imWrk3, imWrk5, imWrk2, grid=grid)
+            mamba.generateSupMask(imWrk0, imWrk2, imWrk5, strict=False)
+            mamba.logic(imWrk4, imWrk5, imWrk4, "inf")
+            mamba.convertByMask(imWrk4, imWrk3, 0, 255)
+            mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
+            mamba.negate(imWrk4, imWrk4)
+            mamba.label(imWrk4, imWrk6, grid=grid)
+            mamba.watershedSegment(imWrk3, imWrk6, grid=grid)
+            mamba.copyBytePlane(imWrk6, 3, imWrk3)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+            mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+            mamba.threshold(imWrk1, imWrk4, 1, 255)
+            nbLevels += 1
+        return nbLevels
 
 def segmentByP(imIn, imOut, gain=2.0, grid=mamba.DEFAULT_GRID):
     """
@@ -196,43 +180,38 @@ def segmentByP(imIn, imOut, gain=2.0, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 32)    
-    mamba.copy(imIn, imWrk1)
-    mamba.mulRealConst(imIn, gain, imWrk5)
-    mamba.floorSubConst(imWrk5, 1, imWrk5)
-    mamba.threshold(imWrk5, imWrk4, 255, mamba.computeMaxRange(imWrk5)[1])  
-    mamba.copyBytePlane(imWrk5, 0, imWrk0)
-    mamba.convert(imWrk4, imWrk2)
-    mamba.logic(imWrk0, imWrk2, imWrk0, "sup")
-    mamba.logic(imWrk0, imWrk1, imWrk0, "sup")
-    imOut.reset()
-    nbLevels = 0
-    mamba.threshold(imWrk1, imWrk4, 1, 255)
-    flag = not(mamba.checkEmptiness(imWrk4))
-    while flag:
-        hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
-        mamba.add(imOut, imWrk4, imOut)
-        mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
-        mamba.threshold(imWrk3, imWrk4, 1, 255)
-        flag = not(mamba.checkEmptiness(imWrk4))
-        hierarchy(imWrk3, imWrk4, imWrk2, grid=grid)
-        mamba.generateSupMask(imWrk0, imWrk2, imWrk4, strict=False)
-        mamba.convertByMask(imWrk4, imWrk3, 0, 255)
-        mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
-        mamba.negate(imWrk4, imWrk4)
-        mamba.label(imWrk4, imWrk5, grid=grid)
-        mamba.watershedSegment(imWrk3, imWrk5, grid=grid)
-        mamba.copyBytePlane(imWrk5, 3, imWrk3)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+    with mamba.scratchImages(imIn, [None, None, None, None, 1, 32]) as (imWrk0, imWrk1, imWrk2, imWrk3, imWrk4, imWrk5):
+        mamba.copy(imIn, imWrk1)
+        mamba.mulRealConst(imIn, gain, imWrk5)
+        mamba.floorSubConst(imWrk5, 1, imWrk5)
+        mamba.threshold(imWrk5, imWrk4, 255, mamba.computeMaxRange(imWrk5)[1])  
+        mamba.copyBytePlane(imWrk5, 0, imWrk0)
+        mamba.convert(imWrk4, imWrk2)
+        mamba.logic(imWrk0, imWrk2, imWrk0, "sup")
+        mamba.logic(imWrk0, imWrk1, imWrk0, "sup")
+        imOut.reset()
+        nbLevels = 0
         mamba.threshold(imWrk1, imWrk4, 1, 255)
-        nbLevels += 1
-    return nbLevels
+        flag = not(mamba.checkEmptiness(imWrk4))
+        while flag:
+            hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
+            mamba.add(imOut, imWrk4, imOut)
+            mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
+            mamba.threshold(imWrk3, imWrk4, 1, 255)
+            flag = not(mamba.checkEmptiness(imWrk4))
+            hierarchy(imWrk3, imWrk4, imWrk2, grid=grid)
+            mamba.generateSupMask(imWrk0, imWrk2, imWrk4, strict=False)
+            mamba.convertByMask(imWrk4, imWrk3, 0, 255)
+            mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
+            mamba.negate(imWrk4, imWrk4)
+            mamba.label(imWrk4, imWrk5, grid=grid)
+            mamba.watershedSegment(imWrk3, imWrk5, grid=grid)
+            mamba.copyBytePlane(imWrk5, 3, imWrk3)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+            mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+            mamba.threshold(imWrk1, imWrk4, 1, 255)
+            nbLevels += 1
+        return nbLevels
     
 def generalSegment(imIn, imOut, gain=2.0, offset=1, grid=mamba.DEFAULT_GRID):
     """
@@ -250,47 +229,41 @@ def generalSegment(imIn, imOut, gain=2.0, offset=1, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk0 = mamba.imageMb(imIn)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 1)
-    imWrk6 = mamba.imageMb(imIn, 32)    
-    mamba.copy(imIn, imWrk1)
-    mamba.mulRealConst(imIn, gain, imWrk6)
-    mamba.floorSubConst(imWrk6, 1, imWrk6)
-    mamba.threshold(imWrk6, imWrk4, 255, mamba.computeMaxRange(imWrk6)[1])  
-    mamba.copyBytePlane(imWrk6, 0, imWrk0)
-    mamba.convert(imWrk4, imWrk2)
-    mamba.logic(imWrk0, imWrk2, imWrk0, "sup")
-    mamba.logic(imWrk0, imWrk1, imWrk0, "sup")
-    imOut.reset()
-    nbLevels = 0
-    mamba.threshold(imWrk1, imWrk4, 1, 255)
-    flag = not(mamba.checkEmptiness(imWrk4))
-    while flag:
-        nbLevels += 1
-        hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
-        mamba.add(imOut, imWrk4, imOut)
-        v = max(nbLevels - offset, 0) + 1
-        mamba.threshold(imOut, imWrk4, v, 255)
-        mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
-        mamba.threshold(imWrk3, imWrk5, 1, 255)
-        flag = not(mamba.checkEmptiness(imWrk5))
-        hierarchy(imWrk3, imWrk5, imWrk2, grid=grid)
-        mamba.generateSupMask(imWrk0, imWrk2, imWrk5, strict=False)
-        mamba.logic(imWrk4, imWrk5, imWrk4, "inf")
-        mamba.convertByMask(imWrk4, imWrk3, 0, 255)
-        mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
-        mamba.negate(imWrk4, imWrk4)
-        mamba.label(imWrk4, imWrk6, grid=grid)
-        mamba.watershedSegment(imWrk3, imWrk6, grid=grid)
-        mamba.copyBytePlane(imWrk6, 3, imWrk3)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+    with mamba.scratchImages(imIn, [None, None, None, None, 1, 1, 32]) as (imWrk0, imWrk1, imWrk2, imWrk3, imWrk4, imWrk5, imWrk6):
+        mamba.copy(imIn, imWrk1)
+        mamba.mulRealConst(imIn, gain, imWrk6)
+        mamba.floorSubConst(imWrk6, 1, imWrk6)
+        mamba.threshold(imWrk6, imWrk4, 255, mamba.computeMaxRange(imWrk6)[1])  
+        mamba.copyBytePlane(imWrk6, 0, imWrk0)
+        mamba.convert(imWrk4, imWrk2)
+        mamba.logic(imWrk0, imWrk2, imWrk0, "sup")
+        mamba.logic(imWrk0, imWrk1, imWrk0, "sup")
+        imOut.reset()
+        nbLevels = 0
         mamba.threshold(imWrk1, imWrk4, 1, 255)
-    return nbLevels
+        flag = not(mamba.checkEmptiness(imWrk4))
+        while flag:
+            nbLevels += 1
+            hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
+            mamba.add(imOut, imWrk4, imOut)
+            v = max(nbLevels - offset, 0) + 1
+            mamba.threshold(imOut, imWrk4, v, 255)
+            mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
+            mamba.threshold(imWrk3, imWrk5, 1, 255)
+            flag = not(mamba.checkEmptiness(imWrk5))
+            hierarchy(imWrk3, imWrk5, imWrk2, grid=grid)
+            mamba.generateSupMask(imWrk0, imWrk2, imWrk5, strict=False)
+            mamba.logic(imWrk4, imWrk5, imWrk4, "inf")
+            mamba.convertByMask(imWrk4, imWrk3, 0, 255)
+            mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
+            mamba.negate(imWrk4, imWrk4)
+            mamba.label(imWrk4, imWrk6, grid=grid)
+            mamba.watershedSegment(imWrk3, imWrk6, grid=grid)
+            mamba.copyBytePlane(imWrk6, 3, imWrk3)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+            mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+            mamba.threshold(imWrk1, imWrk4, 1, 255)
+        return nbLevels
     
 def extendedSegment(imIn, imTest, imOut, offset=255, grid=mamba.DEFAULT_GRID):
     """
@@ -306,37 +279,32 @@ def extendedSegment(imIn, imTest, imOut, offset=255, grid=mamba.DEFAULT_GRID):
     This transformation returns the number of hierarchical levels.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn, 1)
-    imWrk5 = mamba.imageMb(imIn, 1)
-    imWrk6 = mamba.imageMb(imIn, 32)    
-    mamba.copy(imIn, imWrk1)
-    imOut.reset()
-    nbLevels = 0
-    mamba.threshold(imWrk1, imWrk4, 1, 255)
-    flag = not(mamba.checkEmptiness(imWrk4))
-    while flag:
-        nbLevels += 1
-        hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
-        mamba.add(imOut, imWrk4, imOut)
-        v = max(nbLevels - offset, 0) + 1
-        mamba.threshold(imOut, imWrk4, v, 255)
-        mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
-        mamba.threshold(imWrk3, imWrk5, 1, 255)
-        flag = not(mamba.checkEmptiness(imWrk5))
-        hierarchy(imWrk3, imWrk5, imWrk2, grid=grid)
-        mamba.generateSupMask(imTest, imWrk2, imWrk5, strict=False)
-        mamba.logic(imWrk4, imWrk5, imWrk4, "inf")
-        mamba.convertByMask(imWrk4, imWrk3, 0, 255)
-        mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
-        mamba.negate(imWrk4, imWrk4)
-        mamba.label(imWrk4, imWrk6, grid=grid)
-        mamba.watershedSegment(imWrk3, imWrk6, grid=grid)
-        mamba.copyBytePlane(imWrk6, 3, imWrk3)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+    with mamba.scratchImages(imIn, [None, None, None, 1, 1, 32]) as (imWrk1, imWrk2, imWrk3, imWrk4, imWrk5, imWrk6):
+        mamba.copy(imIn, imWrk1)
+        imOut.reset()
+        nbLevels = 0
         mamba.threshold(imWrk1, imWrk4, 1, 255)
-    return nbLevels
+        flag = not(mamba.checkEmptiness(imWrk4))
+        while flag:
+            nbLevels += 1
+            hierarchy(imWrk1, imWrk4, imWrk2, grid=grid)
+            mamba.add(imOut, imWrk4, imOut)
+            v = max(nbLevels - offset, 0) + 1
+            mamba.threshold(imOut, imWrk4, v, 255)
+            mamba.valuedWatershed(imWrk2, imWrk3, grid=grid)
+            mamba.threshold(imWrk3, imWrk5, 1, 255)
+            flag = not(mamba.checkEmptiness(imWrk5))
+            hierarchy(imWrk3, imWrk5, imWrk2, grid=grid)
+            mamba.generateSupMask(imTest, imWrk2, imWrk5, strict=False)
+            mamba.logic(imWrk4, imWrk5, imWrk4, "inf")
+            mamba.convertByMask(imWrk4, imWrk3, 0, 255)
+            mamba.logic(imWrk1, imWrk3, imWrk3, "inf")
+            mamba.negate(imWrk4, imWrk4)
+            mamba.label(imWrk4, imWrk6, grid=grid)
+            mamba.watershedSegment(imWrk3, imWrk6, grid=grid)
+            mamba.copyBytePlane(imWrk6, 3, imWrk3)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+            mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+            mamba.threshold(imWrk1, imWrk4, 1, 255)
+        return nbLevels
     
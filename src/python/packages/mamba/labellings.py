@@ -7,6 +7,112 @@ They use the label operator now available for sets and for grey images.
 
 import mamba
 import mamba.core as core
+
+import array as _array
+
+# Names of the columns of the region properties table computed by the library
+_regionColumns = (
+    ("area", core.MB_REGION_AREA),
+    ("volume", core.MB_REGION_VOLUME),
+    ("minimum", core.MB_REGION_MIN),
+    ("maximum", core.MB_REGION_MAX),
+    ("xmin", core.MB_REGION_XMIN),
+    ("ymin", core.MB_REGION_YMIN),
+    ("xmax", core.MB_REGION_XMAX),
+    ("ymax", core.MB_REGION_YMAX),
+)
+
+def regionProps(imLabel, imMeasure=None):
+    """
+    Computes the properties of each region of the 32-bit label image
+    'imLabel' (for instance the result of label or partitionLabel) in a
+    single pass over the image. The properties are returned in a dictionary
+    of arrays with one entry per label found in the image (the labels are in
+    increasing order and the arrays are as long as the number of labels,
+    whatever their values):
+        "label": label of the region
+        "area": number of pixels of the region
+        "xmin", "ymin", "xmax", "ymax": bounding box of the region
+        "xcentroid", "ycentroid": centroid of the region
+        "horizontalFeret", "verticalFeret": Feret diameters (number of
+        pixels of the projection of the region) in the horizontal and
+        vertical directions
+        "diagonalFeret", "antidiagonalFeret": Feret diameters in the
+        directions at 45 and 135 degrees (number of diagonal lines crossing
+        the region)
+    If the binary, greyscale or 32-bit image 'imMeasure' is given, the
+    dictionary also contains:
+        "volume": sum of the 'imMeasure' values over the region
+        "minimum", "maximum": minimal and maximal values of 'imMeasure'
+        over the region
+    """
+    
+    (w, h) = imLabel.getSize()
+    labels = _array.array("I", [0]) * (w * h)
+    err, nbRows = core.MB_RegionLabels(imLabel.mbIm, labels)
+    mamba.raiseExceptionOnError(err)
+    labels = labels[:nbRows]
+    table = _array.array("Q", [0]) * (core.MB_REGION_COLUMNS * nbRows)
+    mbMeasure = imMeasure and imMeasure.mbIm or None
+    err = core.MB_RegionProps(imLabel.mbIm, mbMeasure, labels, table)
+    mamba.raiseExceptionOnError(err)
+    columns = [c[1] for c in _regionColumns]
+    columns += [core.MB_REGION_SUMX, core.MB_REGION_SUMY, core.MB_REGION_DMIN,
+                core.MB_REGION_DMAX, core.MB_REGION_AMIN, core.MB_REGION_AMAX]
+    cols = dict((c, table[c*nbRows:(c+1)*nbRows]) for c in columns)
+    props = {"label": labels}
+    for name, c in _regionColumns:
+        if imMeasure or c not in (core.MB_REGION_VOLUME, core.MB_REGION_MIN, core.MB_REGION_MAX):
+            props[name] = cols[c]
+    area = cols[core.MB_REGION_AREA]
+    for name, c in (("xcentroid", core.MB_REGION_SUMX), ("ycentroid", core.MB_REGION_SUMY)):
+        props[name] = _array.array("d", [a and float(s)/a or 0.0 for s, a in zip(cols[c], area)])
+    for name, cmin, cmax in (
+            ("horizontalFeret", core.MB_REGION_XMIN, core.MB_REGION_XMAX),
+            ("verticalFeret", core.MB_REGION_YMIN, core.MB_REGION_YMAX),
+            ("diagonalFeret", core.MB_REGION_DMIN, core.MB_REGION_DMAX),
+            ("antidiagonalFeret", core.MB_REGION_AMIN, core.MB_REGION_AMAX)):
+        props[name] = _array.array("Q", [a and vmax-vmin+1 or 0
+                                        for vmin, vmax, a in zip(cols[cmin], cols[cmax], area)])
+    return props
+
+def labelLookup(imLabel, imOut, values):
+    """
+    Replaces each label of the 32-bit image 'imLabel' by the value found in
+    list (or array) 'values' at the index given by the label. The labels
+    outside of 'values' are replaced by 0. The result is put in the 32-bit
+    image 'imOut'. The values are truncated to 32 bits.
+    """
+    
+    table = _array.array("I", [v & 0xffffffff for v in values])
+    err = core.MB_LabelLookup(imLabel.mbIm, imOut.mbIm, table)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
+def _labelRegions(imIn, imOut):
+    # Labels the particles of binary image 'imIn' or the cells of partition
+    # 'imIn' in 32-bit image 'imOut'. For a binary image, the pixels outside
+    # of the particles keep label 0.
+    if imIn.getDepth() == 1:
+        mamba.label(imIn, imOut)
+    else:
+        partitionLabel(imIn, imOut)
+
+def _labelProperty(imIn, imOut, imMeasure, prop):
+    # Labels each particle or cell of 'imIn' with property 'prop' computed
+    # by regionProps
+    with mamba.scratchImages(imIn, depth=32) as imWrk:
+        _labelRegions(imIn, imWrk)
+        props = regionProps(imWrk, imMeasure)
+        # The labels given by label and partitionLabel are lower than the
+        # number of pixels, the values can be indexed by label
+        labels = props["label"]
+        values = _array.array("Q", [0]) * (labels[-1] + 1)
+        for l, v in zip(labels, props[prop]):
+            values[l] = v
+        if imIn.getDepth() == 1:
+            values[0] = 0
+        labelLookup(imWrk, imOut, values)
   
 def partitionLabel(imIn, imOut):
     """
@@ -19,79 +125,29 @@ def partitionLabel(imIn, imOut):
     Warning! The label values of adjacent cells are not necessarily consecutive.
     """
     
-    imWrk1 = mamba.imageMb(imIn, 1)
-    imWrk2 = mamba.imageMb(imIn, 32)
-    
-    if imIn.getDepth() == 1:
-        mamba.negate(imIn, imWrk1)
-    else:
-        mamba.threshold(imIn, imWrk1, 0, 0)
-    nb1 = mamba.label(imWrk1, imWrk2)
-    mamba.convertByMask(imWrk1, imOut, mamba.computeMaxRange(imOut)[1], 0)
-    mamba.logic(imOut, imWrk2, imOut, "sup")
-    nb2 = mamba.label(imIn, imWrk2)
-    mamba.addConst(imWrk2, nb1, imWrk2)
-    mamba.logic(imOut, imWrk2, imOut, "inf")
-    return nb1 + nb2
+    with mamba.scratchImages(imIn, [1, 32]) as (imWrk1, imWrk2):
+        if imIn.getDepth() == 1:
+            mamba.negate(imIn, imWrk1)
+        else:
+            mamba.threshold(imIn, imWrk1, 0, 0)
+        nb1 = mamba.label(imWrk1, imWrk2)
+        mamba.convertByMask(imWrk1, imOut, mamba.computeMaxRange(imOut)[1], 0)
+        mamba.logic(imOut, imWrk2, imOut, "sup")
+        nb2 = mamba.label(imIn, imWrk2)
+        mamba.addConst(imWrk2, nb1, imWrk2)
+        mamba.logic(imOut, imWrk2, imOut, "inf")
+        return nb1 + nb2
     
 def measureLabelling(imIn, imMeasure, imOut):
     """
     Labelling each particle of the binary image or each cell of the partition 'imIn'
     with the number of pixels in the binary image 'imMeasure' contained in each particle
     or each cell of the partition. The result is put is the 32-bit image 'imOut'.
+    When 'imMeasure' is a greyscale or 32-bit image, each particle or cell is
+    labelled with the sum of its values (see volumeLabelling).
     """
     
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 1)
-    imWrk3 = mamba.imageMb(imIn, 8)
-    imWrk4 = mamba.imageMb(imIn, 8)
-    imWrk5 = mamba.imageMb(imIn, 8)
-    imWrk6 = mamba.imageMb(imIn, 32)
-    
-    # Output image is emptied.
-    imOut.reset()
-    # Labelling the initial image.
-    if imIn.getDepth() == 1:
-        nbParticles = mamba.label(imIn, imWrk1)
-    else:
-        nbParticles = partitionLabel(imIn, imWrk1)
-    # Defining output LUTs.
-    outLuts = [[0 for i in range(256)] for i in range(4)]
-    # Converting the imMeasure image to 8-bit.
-    mamba.convert(imMeasure, imWrk4)
-    while nbParticles > 0:
-        # Particles with labels between 1 and 255 are extracted.
-        mamba.threshold(imWrk1, imWrk2, 0, 255)
-        mamba.convert(imWrk2, imWrk3)
-        mamba.copyBytePlane(imWrk1, 0, imWrk5)
-        mamba.logic(imWrk3, imWrk5, imWrk3, "inf")
-        # The points contained in each particle are labelled.
-        mamba.logic(imWrk3, imWrk4, imWrk5, "inf")
-        # The histogram is computed.
-        histo = mamba.getHistogram(imWrk5)
-        # The same operation is performed for the 255 particles. 
-        for i in range(1, 256):
-            # The number of points in each particle is obtained from the histogram.
-            value = histo[i]
-            j = 3
-            # This value is splitted in powers of 256 and stored in the four 
-            # output LUTs.
-            while j >= 0:
-                n = 2 ** (8 * j)
-                outLuts[j][i] = value // n
-                value = value % n
-                j -= 1
-        # Each LUT is used to label each byte plane of a temporary image with the
-        # corresponding value.
-        for i in range(4):
-            mamba.lookup(imWrk3, imWrk5, outLuts[i])
-            mamba.copyBytePlane(imWrk5, i, imWrk6)
-        # The intermediary result is accumulated in the final image.
-        mamba.logic(imOut, imWrk6, imOut, "sup")
-        # 255 is subtracted from the initial labelled image in order to process
-        # the next 255 particles.
-        mamba.floorSubConst(imWrk1, 255, imWrk1)
-        nbParticles -= 255
+    _labelProperty(imIn, imOut, imMeasure, "volume")
  
 def areaLabelling(imIn, imOut):
     """
@@ -100,13 +156,7 @@ def areaLabelling(imIn, imOut):
     is stored in the 32-bit image 'imOut'.
     """
 	
-    imWrk = mamba.imageMb(imIn, 1)
-    
-    if imIn.getDepth() == 1:
-        mamba.copy(imIn, imWrk)
-    else:
-        imWrk.fill(1)
-    measureLabelling(imIn, imWrk, imOut)
+    _labelProperty(imIn, imOut, None, "area")
 	
 def diameterLabelling(imIn, imOut, dir, grid=mamba.DEFAULT_GRID):
     """
@@ -118,18 +168,16 @@ def diameterLabelling(imIn, imOut, dir, grid=mamba.DEFAULT_GRID):
     'dir' can be any strictly positive integer value.
     """
     
-    imWrk1 = mamba.imageMb(imIn, 1)
-    imWrk2 = mamba.imageMb(imIn)
-    
-    ed = 1 << ((dir - 1)%(mamba.gridNeighbors(grid)//2)) +1
-    if imIn.getDepth() == 1:
-        mamba.copy(imIn, imWrk1)
-        mamba.diffNeighbor(imIn, imWrk1, ed, grid=grid)
-    else:
-        mamba.nonEqualNeighbors(imIn, imWrk2, ed, grid=grid, edge= mamba.EMPTY)
-        mamba.threshold(imWrk2, imWrk1, 1, mamba.computeMaxRange(imWrk2)[1])
-    # They are used for the labelling.
-    measureLabelling(imIn, imWrk1, imOut)
+    with mamba.scratchImages(imIn, [1, None]) as (imWrk1, imWrk2):
+        ed = 1 << ((dir - 1)%(mamba.gridNeighbors(grid)//2)) +1
+        if imIn.getDepth() == 1:
+            mamba.copy(imIn, imWrk1)
+            mamba.diffNeighbor(imIn, imWrk1, ed, grid=grid)
+        else:
+            mamba.nonEqualNeighbors(imIn, imWrk2, ed, grid=grid, edge= mamba.EMPTY)
+            mamba.threshold(imWrk2, imWrk1, 1, mamba.computeMaxRange(imWrk2)[1])
+        # They are used for the labelling.
+        measureLabelling(imIn, imWrk1, imOut)
  
 def feretDiameterLabelling(imIn, imOut, direc):
     """
@@ -140,60 +188,15 @@ def feretDiameterLabelling(imIn, imOut, direc):
     set to "horizontal", the corresponding diameter is used.    
     """
     
-    imWrk1 = mamba.imageMb(imIn, 1)
-    imWrk2 = mamba.imageMb(imIn, 32)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    imWrk4 = mamba.imageMb(imIn, 32)
-    
-    imWrk1.fill(1)
     if direc == "horizontal":
-        dir = 7    
+        prop = "horizontalFeret"
     elif direc == "vertical":
-        dir = 1
+        prop = "verticalFeret"
     else:
         mamba.raiseExceptionOnError(core.MB_ERR_BAD_DIRECTION)
         # The above statement generates an error ('direc' is not horizontal or 
         # vertical.
-    # An horizontal or vertical distance function is generated.
-    mamba.linearErode(imWrk1, imWrk1, dir, grid=mamba.SQUARE, edge=mamba.EMPTY)
-    mamba.computeDistance(imWrk1, imOut, grid=mamba.SQUARE, edge=mamba.FILLED)
-    mamba.addConst(imOut, 1, imOut)
-    if imIn.getDepth() == 1:
-	    # Each particle is valued with the distance.
-        mamba.convertByMask(imIn, imWrk2, 0, mamba.computeMaxRange(imWrk3)[1])
-        mamba.logic(imOut, imWrk2, imWrk3, "inf")
-        # The valued image is preserved.
-        mamba.copy(imWrk3, imWrk4)
-        # Each component is labelled by the maximal coordinate.
-        mamba.build(imWrk2, imWrk3)
-        # Using the dual reconstruction, we label the particles with the
-        # minimal ccordinate.
-        mamba.negate(imWrk2, imWrk2)
-        mamba.logic(imWrk2, imWrk4, imWrk4, "sup")
-        mamba.dualBuild(imWrk2, imWrk4)
-        # We subtract 1 because the selected coordinate must be outside the particle.
-        mamba.subConst(imWrk4, 1, imWrk4)
-        mamba.negate(imWrk2, imWrk2)
-        mamba.logic(imWrk2, imWrk4, imWrk4, "inf")
-        # Then, the subtraction gives the Feret diameter.
-        mamba.sub(imWrk3, imWrk4, imOut)
-    else:
-        mamba.copy(imOut, imWrk3)
-        if imIn.getDepth() == 32:
-            mamba.copy(imIn, imWrk2)
-        else:
-            mamba.convert(imIn, imWrk2)
-	# Using the cells builds (direct and dual to label the cells with the maximum
-        # and minimum distance.
-        mamba.cellsBuild(imWrk2, imWrk3)
-        mamba.cellsBuild(imWrk2, imWrk3)
-        mamba.negate(imOut, imOut)
-        mamba.cellsBuild(imWrk2, imOut)
-        mamba.negate(imOut, imOut)
-        # Subtracting 1...
-        mamba.subConst(imOut, 1, imOut)
-        # ... and getting the final result.
-        mamba.sub(imWrk3, imOut, imOut)
+    _labelProperty(imIn, imOut, None, prop)
 		
 def volumeLabelling(imIn1, imIn2, imOut):
     """
@@ -202,30 +205,4 @@ def volumeLabelling(imIn1, imIn2, imOut):
     this component. The result is put in the 32-bit image 'imOut'.
     """
     
-    imWrk1 = mamba.imageMb(imIn1, 1)
-    imWrk2 = mamba.imageMb(imIn1, 32)
-    imWrk3 = mamba.imageMb(imIn1, 8)
-    
-    imOut.reset()
-    n = imIn2.getDepth()
-    # Case of a 8-bit image.
-    if n == 8:
-        for i in range(8):
-            # Each bit plane is extracted and used in the labelling.
-            mamba.copyBitPlane(imIn2, i, imWrk1)
-            measureLabelling(imIn1, imWrk1, imWrk2)
-            # The resulting labels are combined to obtain the final one.
-            v = 2 ** i
-            mamba.mulConst(imWrk2, v, imWrk2)
-            mamba.add(imOut, imWrk2, imOut)
-    else:
-        for j in range(4):
-            # Each byte plane is treated.
-            mamba.copyBytePlane(imIn2, j, imWrk3)
-            for i in range(8):
-                mamba.copyBitPlane(imWrk3, i, imWrk1)
-                measureLabelling(imIn1, imWrk1, imWrk2)
-                v = 2 ** (8 * j + i)
-                mamba.mulConst(imWrk2, v, imWrk2)
-                mamba.add(imOut, imWrk2, imOut) 
-
+    _labelProperty(imIn1, imOut, imIn2, "volume")
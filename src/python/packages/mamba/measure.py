@@ -78,22 +78,22 @@ def computeDiameter(imIn, dir, scale=(1.0, 1.0), grid=mamba.DEFAULT_GRID):
     if dir == 0:
         return 0.0
     dir = ((dir - 1)%(mamba.gridNeighbors(grid)//2)) +1
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk)
-    mamba.diffNeighbor(imIn, imWrk, 1<<dir, grid=grid)
-    if grid == mamba.HEXAGONAL:
-        l = scale[1]
-        if dir != 2:
-            l = 2*l*scale[0]/math.sqrt(scale[0]*scale[0] + 4*scale[1]*scale[1])
-    else:
-        if dir == 1:
-            l = scale[0]
-        elif dir == 3:
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imWrk)
+        mamba.diffNeighbor(imIn, imWrk, 1<<dir, grid=grid)
+        if grid == mamba.HEXAGONAL:
             l = scale[1]
+            if dir != 2:
+                l = 2*l*scale[0]/math.sqrt(scale[0]*scale[0] + 4*scale[1]*scale[1])
         else:
-            l = scale[0]*scale[1]/math.sqrt(scale[0]*scale[0] + scale[1]*scale[1])
-    l = l*mamba.computeVolume(imWrk)
-    return l
+            if dir == 1:
+                l = scale[0]
+            elif dir == 3:
+                l = scale[1]
+            else:
+                l = scale[0]*scale[1]/math.sqrt(scale[0]*scale[0] + scale[1]*scale[1])
+        l = l*mamba.computeVolume(imWrk)
+        return l
 
 def computePerimeter(imIn, scale=(1.0, 1.0), grid=mamba.DEFAULT_GRID):
     """
@@ -126,25 +126,25 @@ def computeConnectivityNumber(imIn, grid=mamba.DEFAULT_GRID):
     
     if imIn.getDepth() != 1:
         mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
-    imWrk  = mamba.imageMb(imIn)
-    if grid == mamba.HEXAGONAL:
-        dse = mamba.doubleStructuringElement([1,6],[0],mamba.HEXAGONAL)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = mamba.computeVolume(imWrk)
-        dse = mamba.doubleStructuringElement([1],[0,2],mamba.HEXAGONAL)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = n - mamba.computeVolume(imWrk)
-    else:
-        dse = mamba.doubleStructuringElement([3,4,5],[0],mamba.SQUARE)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = mamba.computeVolume(imWrk)
-        dse = mamba.doubleStructuringElement([4],[0,3,5],mamba.SQUARE)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = n - mamba.computeVolume(imWrk)
-        dse = mamba.doubleStructuringElement([3,5],[0,4],mamba.SQUARE)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = n + mamba.computeVolume(imWrk)
-    return n
+    with mamba.scratchImages(imIn) as imWrk:
+        if grid == mamba.HEXAGONAL:
+            dse = mamba.doubleStructuringElement([1,6],[0],mamba.HEXAGONAL)
+            mamba.hitOrMiss(imIn, imWrk, dse)
+            n = mamba.computeVolume(imWrk)
+            dse = mamba.doubleStructuringElement([1],[0,2],mamba.HEXAGONAL)
+            mamba.hitOrMiss(imIn, imWrk, dse)
+            n = n - mamba.computeVolume(imWrk)
+        else:
+            dse = mamba.doubleStructuringElement([3,4,5],[0],mamba.SQUARE)
+            mamba.hitOrMiss(imIn, imWrk, dse)
+            n = mamba.computeVolume(imWrk)
+            dse = mamba.doubleStructuringElement([4],[0,3,5],mamba.SQUARE)
+            mamba.hitOrMiss(imIn, imWrk, dse)
+            n = n - mamba.computeVolume(imWrk)
+            dse = mamba.doubleStructuringElement([3,5],[0,4],mamba.SQUARE)
+            mamba.hitOrMiss(imIn, imWrk, dse)
+            n = n + mamba.computeVolume(imWrk)
+        return n
 
 def computeComponentsNumber(imIn, grid=mamba.DEFAULT_GRID):
     """
@@ -152,8 +152,8 @@ def computeComponentsNumber(imIn, grid=mamba.DEFAULT_GRID):
     an integer value.
     """
     
-    imWrk =  mamba.imageMb(imIn, 32)
-    return  mamba.label(imIn, imWrk, grid=grid)
+    with mamba.scratchImages(imIn, depth=32) as imWrk:
+        return  mamba.label(imIn, imWrk, grid=grid)
     
 
 def computeFeretDiameters(imIn, scale=(1.0, 1.0)):
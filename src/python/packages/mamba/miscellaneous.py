@@ -105,12 +105,12 @@ def multiSuperpose(imInout, *imIns):
     'imInout'. The binary images are put above the greyscale. The
     result is meant to be seen with an appropriate color palette.
     """
-    imWrk = mamba.imageMb(imInout)
+    with mamba.scratchImages(imInout) as imWrk:
     
-    mamba.subConst(imInout, len(imIns), imInout)
-    for i,im in enumerate(imIns):
-        mamba.convertByMask(im, imWrk, 0, 256-len(imIns)+i)
-        mamba.logic(imInout, imWrk, imInout, "sup")
+        mamba.subConst(imInout, len(imIns), imInout)
+        for i,im in enumerate(imIns):
+            mamba.convertByMask(im, imWrk, 0, 256-len(imIns)+i)
+            mamba.logic(imInout, imWrk, imInout, "sup")
 
 # Mix/Split color image ########################################################
 # Mixes three greyscale images to create a color image (RGB) or split a
@@ -196,7 +196,8 @@ def PIL2Mamba(pilim, imOut):
     """
     depth = imOut.getDepth()
     (width, height) = imOut.getSize()
-    next_mbIm = utils.loadFromPILFormat(pilim, size=(width,height))
-    err = core.MB_Convert(next_mbIm, imOut.mbIm)
-    mamba.raiseExceptionOnError(err)
+    next_mbIm = utils.loadFromPILFormat(pilim, size=(width,height), im_out=imOut.mbIm)
+    if next_mbIm is not imOut.mbIm:
+        err = core.MB_Convert(next_mbIm, imOut.mbIm)
+        mamba.raiseExceptionOnError(err)
     imOut.update()
@@ -33,13 +33,13 @@ def closing(imIn, imOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.FILLED):
     is slightly modified to avoid errors (non extensivity).
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if edge==mamba.EMPTY:
-        mamba.copy(imIn, imWrk)
-    mamba.dilate(imIn, imOut, n, se=se)
-    mamba.erode(imOut, imOut, n, se=se.transpose(), edge=edge)
-    if edge==mamba.EMPTY:
-        mamba.logic(imOut, imWrk, imOut, "sup")
+    with mamba.scratchImages(imIn) as imWrk:
+        if edge==mamba.EMPTY:
+            mamba.copy(imIn, imWrk)
+        mamba.dilate(imIn, imOut, n, se=se)
+        mamba.erode(imOut, imOut, n, se=se.transpose(), edge=edge)
+        if edge==mamba.EMPTY:
+            mamba.logic(imOut, imWrk, imOut, "sup")
 
 def buildOpen(imIn, imOut, n=1, se=mamba.DEFAULT_SE):
     """
@@ -47,10 +47,10 @@ def buildOpen(imIn, imOut, n=1, se=mamba.DEFAULT_SE):
     result in 'imOut'. 'n' controls the size of the opening.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk)
-    mamba.erode(imIn, imOut, n, se=se)
-    mamba.build(imWrk, imOut, grid=se.getGrid())
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imWrk)
+        mamba.erode(imIn, imOut, n, se=se)
+        mamba.build(imWrk, imOut, grid=se.getGrid())
 
 def buildClose(imIn, imOut, n=1, se=mamba.DEFAULT_SE):
     """
@@ -58,10 +58,10 @@ def buildClose(imIn, imOut, n=1, se=mamba.DEFAULT_SE):
     the result in 'imOut'. 'n' controls the size of the closing.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk)
-    mamba.dilate(imIn, imOut, n, se=se)
-    mamba.dualBuild(imWrk, imOut, grid=se.getGrid())
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imWrk)
+        mamba.dilate(imIn, imOut, n, se=se)
+        mamba.dualBuild(imWrk, imOut, grid=se.getGrid())
 
 def linearOpen(imIn, imOut, dir, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -80,13 +80,13 @@ def linearClose(imIn, imOut, dir, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED)
     If 'edge' is set to 'EMPTY', the operation must be modified to remain extensive.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if edge==mamba.EMPTY:
-        mamba.copy(imIn, imWrk)
-    mamba.linearDilate(imIn, imOut, dir, n, grid=grid)
-    mamba.linearErode(imOut, imOut, mamba.transposeDirection(dir, grid=grid), n, edge=edge, grid=grid)
-    if edge==mamba.EMPTY:
-        mamba.logic(imOut, imWrk, imOut, "sup")
+    with mamba.scratchImages(imIn) as imWrk:
+        if edge==mamba.EMPTY:
+            mamba.copy(imIn, imWrk)
+        mamba.linearDilate(imIn, imOut, dir, n, grid=grid)
+        mamba.linearErode(imOut, imOut, mamba.transposeDirection(dir, grid=grid), n, edge=edge, grid=grid)
+        if edge==mamba.EMPTY:
+            mamba.logic(imOut, imWrk, imOut, "sup")
    
 def supOpen(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     """
@@ -101,22 +101,21 @@ def supOpen(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     similar to the horizontal and vertical size.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk1.reset()
-    if grid == mamba.SQUARE:
-        size = int((1.4142 * n + 1)/2)
-        linearOpen(imIn, imWrk2, 2, size, edge=mamba.EMPTY, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        linearOpen(imIn, imWrk2, 4, size, edge=mamba.EMPTY, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        d = 4
-    else:
-        d = 6
-    for i in range(1, d, 2):
-        linearOpen(imIn, imWrk2, i, n, edge=mamba.EMPTY, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-    mamba.copy(imWrk1, imOut)
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        imWrk1.reset()
+        if grid == mamba.SQUARE:
+            size = int((1.4142 * n + 1)/2)
+            linearOpen(imIn, imWrk2, 2, size, edge=mamba.EMPTY, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+            linearOpen(imIn, imWrk2, 4, size, edge=mamba.EMPTY, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+            d = 4
+        else:
+            d = 6
+        for i in range(1, d, 2):
+            linearOpen(imIn, imWrk2, i, n, edge=mamba.EMPTY, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+        mamba.copy(imWrk1, imOut)
     
 def infClose(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     """
@@ -131,21 +130,20 @@ def infClose(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     similar to the horizontal and vertical size.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk1.fill(mamba.computeMaxRange(imIn)[1])
-    if grid == mamba.SQUARE:
-        size = int((1.4142 * n + 1)/2)
-        linearClose(imIn, imWrk2, 2, size, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-        linearClose(imIn, imWrk2, 4, size, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-        d = 4
-    else:
-        d = 6
-    for i in range(1, d, 2):
-        linearClose(imIn, imWrk2, i, n, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-    mamba.copy(imWrk1, imOut)
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        imWrk1.fill(mamba.computeMaxRange(imIn)[1])
+        if grid == mamba.SQUARE:
+            size = int((1.4142 * n + 1)/2)
+            linearClose(imIn, imWrk2, 2, size, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
+            linearClose(imIn, imWrk2, 4, size, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
+            d = 4
+        else:
+            d = 6
+        for i in range(1, d, 2):
+            linearClose(imIn, imWrk2, i, n, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
+        mamba.copy(imWrk1, imOut)
     
 
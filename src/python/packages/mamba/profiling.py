@@ -0,0 +1,194 @@
+"""
+Profiling of the operators.
+
+This module provides the profile context manager, which records the calls
+to the Mamba library functions (MB_*) made inside its block, with their
+number, wall time and processed pixels, and attributes them to the
+operators of the mamba packages that called them.
+"""
+
+import sys
+import os.path
+import time
+
+__all__ = ["profile"]
+
+# Timer used for the measures
+_timer = getattr(time, "perf_counter", time.time)
+
+# Directories of the packages whose functions are operators
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_packages = (os.path.join(_root, "mamba"), os.path.join(_root, "mamba3D"))
+_core = os.path.join(_root, "mamba", "core.py")
+_ignored = (os.path.join(_root, "mamba", "profiling.py"),
+            os.path.join(_root, "mamba", "error.py"))
+
+class _profileNode:
+    # A node of the call tree (an operator or a library function)
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.time = 0.0
+        self.pixels = 0
+        self.primitives = 0
+        self.children = {}
+
+def _codeKind(code):
+    # Returns (kind, name) for the code of a library function ("primitive")
+    # or an operator ("operator"), None for any other code
+    filename = os.path.abspath(code.co_filename)
+    name = code.co_name
+    if filename==_core:
+        if name.startswith("MB"):
+            return ("primitive", name)
+        return None
+    if name.startswith("_") or name.startswith("<") or filename in _ignored:
+        return None
+    if os.path.dirname(filename) not in _packages:
+        return None
+    return ("operator", getattr(code, "co_qualname", name))
+
+# Library functions processing a part of their image only
+_partialPixels = {
+    "MB_PutPixel": lambda args: 1,
+    "MB_GetPixel": lambda args: 1,
+    "MB_CopyLine": lambda args: args["src"].width,
+    "MB_CropCopy": lambda args: args["w"]*args["h"],
+}
+
+def _pixels(frame):
+    # Number of pixels processed by a library function (the pixels of the
+    # first image given to the function for most of them)
+    code = frame.f_code
+    if code.co_name in _partialPixels:
+        return _partialPixels[code.co_name](frame.f_locals)
+    for arg in code.co_varnames[:code.co_argcount]:
+        im = frame.f_locals.get(arg)
+        if hasattr(im, "width") and hasattr(im, "height"):
+            return im.width*im.height
+    return 0
+
+class profile:
+    """
+    Profiles the operators called inside a 'with' block.
+
+    Example:
+    >>>with profile() as prof:
+    >>>    watershedSegment(imIn, imMarker)
+    >>>print(prof.report())
+    >>>print(prof.report(tree=True))
+
+    For each library function (MB_*), attribute 'primitives' gives the list
+    [number of calls, wall time in seconds, number of pixels processed]. For
+    each operator of the mamba packages which calls (directly or not) library
+    functions, attribute 'operators' gives the list [number of calls, total
+    time, self time] where the self time is spent in the operator itself
+    (Python code) and not in the operators or functions it calls.
+
+    Profiling relies on the Python profiling hook of the calling thread, it
+    does not slow down the operators outside of the 'with' block.
+    """
+
+    def __init__(self):
+        self.primitives = {}
+        self.operators = {}
+        self.root = _profileNode("")
+        self._stack = []
+        self._kinds = {}
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = sys.getprofile()
+        sys.setprofile(self._dispatch)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        sys.setprofile(self._previous)
+        self._previous = None
+        self._stack = []
+        return False
+
+    def _dispatch(self, frame, event, arg):
+        # Profiling hook
+        if event=="call":
+            code = frame.f_code
+            try:
+                kind = self._kinds[code]
+            except KeyError:
+                kind = self._kinds[code] = _codeKind(code)
+            if kind:
+                if self._stack:
+                    parent = self._stack[-1][1]
+                else:
+                    parent = self.root
+                node = parent.children.get(kind[1])
+                if node is None:
+                    node = parent.children[kind[1]] = _profileNode(kind[1])
+                pixels = 0
+                if kind[0]=="primitive":
+                    pixels = _pixels(frame)
+                # frame, node, kind, start, time in children, pixels, primitives
+                self._stack.append([frame, node, kind[0], _timer(), 0.0, pixels,
+                                    kind[0]=="primitive" and 1 or 0])
+        elif event=="return" and self._stack and self._stack[-1][0] is frame:
+            (f, node, kind, start, inner, pixels, prims) = self._stack.pop()
+            elapsed = _timer()-start
+            node.calls += 1
+            node.time += elapsed
+            node.pixels += pixels
+            node.primitives += prims
+            if kind=="primitive":
+                stats = self.primitives.setdefault(node.name, [0, 0.0, 0])
+                stats[2] += pixels
+            elif prims>0:
+                stats = self.operators.setdefault(node.name, [0, 0.0, 0.0])
+                stats[2] += elapsed-inner
+            else:
+                stats = None
+            if stats:
+                stats[0] += 1
+                stats[1] += elapsed
+            if self._stack:
+                parent = self._stack[-1]
+                parent[4] += elapsed
+                parent[5] += pixels
+                parent[6] += prims
+        if self._previous is not None:
+            self._previous(frame, event, arg)
+
+    def _flatReport(self):
+        lines = ["%-32s %8s %12s %12s %10s" %
+                 ("function", "calls", "time (s)", "pixels", "Mpix/s")]
+        stats = sorted(self.primitives.items(), key=lambda s: -s[1][1])
+        for name, (calls, t, pixels) in stats:
+            lines.append("%-32s %8d %12.6f %12d %10.1f" %
+                         (name, calls, t, pixels, t and pixels/t/1e6 or 0.0))
+        lines.append("")
+        lines.append("%-32s %8s %12s %12s" %
+                     ("operator", "calls", "total (s)", "self (s)"))
+        stats = sorted(self.operators.items(), key=lambda s: -s[1][1])
+        for name, (calls, t, selfTime) in stats:
+            lines.append("%-32s %8d %12.6f %12.6f" % (name, calls, t, selfTime))
+        return lines
+
+    def _treeReport(self, node, indent, lines):
+        children = [c for c in node.children.values() if c.primitives>0]
+        for child in sorted(children, key=lambda c: -c.time):
+            lines.append("%-40s %8d %12.6f %12d" %
+                         (indent+child.name, child.calls, child.time, child.pixels))
+            self._treeReport(child, indent+"  ", lines)
+
+    def report(self, tree=False):
+        """
+        Returns the profiling report as a string. By default, the report
+        gives the library functions and the operators sorted by decreasing
+        time. If 'tree' is True, the report gives the tree of the calls
+        (each operator followed by the operators and functions it called)
+        with their number of calls, time and processed pixels.
+        """
+        if tree:
+            lines = ["%-40s %8s %12s %12s" % ("operator", "calls", "time (s)", "pixels")]
+            self._treeReport(self.root, "", lines)
+        else:
+            lines = self._flatReport()
+        return "\n".join(lines)
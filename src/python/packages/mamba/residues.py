@@ -19,13 +19,13 @@ def _generateMask_(imIn1, imIn2, imOut):
     #to 'imIn2' with 'imIn1' strictly positive.
     #Depth of 'imOut' is 1.
     
-    imWrk = mamba.imageMb(imOut)
-    mamba.generateSupMask(imIn1, imIn2, imOut, False)
-    if imIn1.getDepth()==1:
-        mamba.negate(imIn1, imWrk)
-    else:
-        mamba.threshold(imIn1, imWrk, 0, 0)
-    mamba.diff(imOut, imWrk, imOut)
+    with mamba.scratchImages(imOut) as imWrk:
+        mamba.generateSupMask(imIn1, imIn2, imOut, False)
+        if imIn1.getDepth()==1:
+            mamba.negate(imIn1, imWrk)
+        else:
+            mamba.threshold(imIn1, imWrk, 0, 0)
+        mamba.diff(imOut, imWrk, imOut)
 
 def binaryUltimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -46,12 +46,11 @@ def binaryUltimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, edge=ma
     The edge is set to 'FILLED' by default.
     """
 
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 32)
-    mamba.computeDistance(imIn, imWrk1, grid=grid, edge=edge)
-    mamba.maxima(imWrk1, imOut1, grid=grid)
-    mamba.convertByMask(imOut1, imWrk2, 0, mamba.computeMaxRange(imWrk2)[1])
-    mamba.logic(imWrk1, imWrk2, imOut2, "inf")
+    with mamba.scratchImages(imIn, 2, 32) as (imWrk1, imWrk2):
+        mamba.computeDistance(imIn, imWrk1, grid=grid, edge=edge)
+        mamba.maxima(imWrk1, imOut1, grid=grid)
+        mamba.convertByMask(imOut1, imWrk2, 0, mamba.computeMaxRange(imWrk2)[1])
+        mamba.logic(imWrk1, imWrk2, imOut2, "inf")
 
 def ultimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -66,29 +65,26 @@ def ultimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     The edge is always set to 'FILLED'.
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    i = 0
-    mamba.copy(imIn, imWrk1)
-    v2 = mamba.computeVolume(imWrk1)
-    v1 = v2 + 1
-    imOut1.reset()
-    imOut2.reset()
-    while v1 > v2:
-        i += 1
-        v1 = v2
-        mamba.erode(imWrk1, imWrk2, se=se)
-        mamba.build(imWrk1, imWrk2, grid=grid)
-        mamba.sub(imWrk1, imWrk2, imWrk2)
-        _generateMask_(imWrk2, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk2, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        mamba.erode(imWrk1, imWrk1, se=se)
+    with mamba.scratchImages(imIn, [1, None, None, 32]) as (maskIm, imWrk1, imWrk2, imWrk3):
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        i = 0
+        mamba.copy(imIn, imWrk1)
         v2 = mamba.computeVolume(imWrk1)
+        v1 = v2 + 1
+        imOut1.reset()
+        imOut2.reset()
+        while v1 > v2:
+            i += 1
+            v1 = v2
+            mamba.erode(imWrk1, imWrk2, se=se)
+            mamba.build(imWrk1, imWrk2, grid=grid)
+            mamba.sub(imWrk1, imWrk2, imWrk2)
+            _generateMask_(imWrk2, imOut1, maskIm)
+            mamba.convertByMask(maskIm, imWrk3, 0, i)
+            mamba.logic(imOut1, imWrk2, imOut1, "sup")
+            mamba.logic(imOut2, imWrk3, imOut2, "sup")
+            mamba.erode(imWrk1, imWrk1, se=se)
+            v2 = mamba.computeVolume(imWrk1)
 
 def binarySkeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -104,14 +100,13 @@ def binarySkeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, edge=
     The edge is set to 'FILLED' by default.
     """
 
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 32)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    mamba.computeDistance(imIn, imWrk1, grid=grid, edge=edge)
-    mamba.whiteTopHat(imWrk1, imWrk2, 1, se=se)
-    mamba.threshold(imWrk2, imOut1, 1, mamba.computeMaxRange(imWrk2)[1])
-    mamba.convertByMask(imOut1, imWrk2, 0, mamba.computeMaxRange(imWrk2)[1])
-    mamba.logic(imWrk1, imWrk2, imOut2, "inf")
+    with mamba.scratchImages(imIn, 2, 32) as (imWrk1, imWrk2):
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        mamba.computeDistance(imIn, imWrk1, grid=grid, edge=edge)
+        mamba.whiteTopHat(imWrk1, imWrk2, 1, se=se)
+        mamba.threshold(imWrk2, imOut1, 1, mamba.computeMaxRange(imWrk2)[1])
+        mamba.convertByMask(imOut1, imWrk2, 0, mamba.computeMaxRange(imWrk2)[1])
+        mamba.logic(imWrk1, imWrk2, imOut2, "inf")
 
 def skeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -127,28 +122,25 @@ def skeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     The edge is always set to 'FILLED'.
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    i = 0
-    mamba.copy(imIn, imWrk1)
-    v2 = mamba.computeVolume(imWrk1)
-    v1 = v2 + 1
-    imOut1.reset()
-    imOut2.reset()
-    while v1 > v2:
-        i += 1
-        v1 = v2
-        mamba.opening(imWrk1, imWrk2, se=se)
-        mamba.sub(imWrk1, imWrk2, imWrk2)
-        _generateMask_(imWrk2, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk2, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        mamba.erode(imWrk1, imWrk1, se=se)
+    with mamba.scratchImages(imIn, [1, None, None, 32]) as (maskIm, imWrk1, imWrk2, imWrk3):
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        i = 0
+        mamba.copy(imIn, imWrk1)
         v2 = mamba.computeVolume(imWrk1)
+        v1 = v2 + 1
+        imOut1.reset()
+        imOut2.reset()
+        while v1 > v2:
+            i += 1
+            v1 = v2
+            mamba.opening(imWrk1, imWrk2, se=se)
+            mamba.sub(imWrk1, imWrk2, imWrk2)
+            _generateMask_(imWrk2, imOut1, maskIm)
+            mamba.convertByMask(maskIm, imWrk3, 0, i)
+            mamba.logic(imOut1, imWrk2, imOut1, "sup")
+            mamba.logic(imOut2, imWrk3, imOut2, "sup")
+            mamba.erode(imWrk1, imWrk1, se=se)
+            v2 = mamba.computeVolume(imWrk1)
 
 def ultimateOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -161,35 +153,31 @@ def ultimateOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32. 
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    imWrk4 = mamba.imageMb(imIn)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    i = 0
-    mamba.copy(imIn, imWrk1)
-    v2 = mamba.computeVolume(imWrk1)
-    mamba.copy(imWrk1, imWrk4)
-    v1 = v2 + 1
-    imOut1.reset()
-    imOut2.reset()
-    if grid == mamba.HEXAGONAL:
-        dilation = mamba.largeHexagonalDilate
-    else:
-        dilation = mamba.largeSquareDilate
-    while v1 > v2:
-        i += 1
-        v1 = v2
-        mamba.erode(imWrk4, imWrk4, se=se)
-        dilation(imWrk4, imWrk2, i)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        v2 = mamba.computeVolume(imWrk4)
-        mamba.copy(imWrk2, imWrk1)
+    with mamba.scratchImages(imIn, [1, None, None, 32, None]) as (maskIm, imWrk1, imWrk2, imWrk3, imWrk4):
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        i = 0
+        mamba.copy(imIn, imWrk1)
+        v2 = mamba.computeVolume(imWrk1)
+        mamba.copy(imWrk1, imWrk4)
+        v1 = v2 + 1
+        imOut1.reset()
+        imOut2.reset()
+        if grid == mamba.HEXAGONAL:
+            dilation = mamba.largeHexagonalDilate
+        else:
+            dilation = mamba.largeSquareDilate
+        while v1 > v2:
+            i += 1
+            v1 = v2
+            mamba.erode(imWrk4, imWrk4, se=se)
+            dilation(imWrk4, imWrk2, i)
+            mamba.sub(imWrk1, imWrk2, imWrk1)
+            _generateMask_(imWrk1, imOut1, maskIm)
+            mamba.convertByMask(maskIm, imWrk3, 0, i)
+            mamba.logic(imOut1, imWrk1, imOut1, "sup")
+            mamba.logic(imOut2, imWrk3, imOut2, "sup")
+            v2 = mamba.computeVolume(imWrk4)
+            mamba.copy(imWrk2, imWrk1)
         
 def ultimateIsotropicOpening(imIn, imOut1, imOut2, step =1, grid=mamba.DEFAULT_GRID):
     """
@@ -202,34 +190,31 @@ def ultimateIsotropicOpening(imIn, imOut1, imOut2, step =1, grid=mamba.DEFAULT_G
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32. 
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    i = 0
-    mamba.copy(imIn, imWrk1)
-    v2 = mamba.computeVolume(imWrk1)
-    v1 = v2 + 1
-    imOut1.reset()
-    imOut2.reset()
-    if grid == mamba.HEXAGONAL:
-        iso_dilation = mamba.largeDodecagonalDilate
-        iso_erosion = mamba.largeDodecagonalErode
-    else:
-        iso_dilation = mamba.largeOctogonalDilate
-        iso_erosion = mamba.largeOctogonalErode
-    while v1 > v2:
-        i += step
-        v1 = v2
-        iso_erosion(imWrk1, imWrk2, i)
-        v2 = mamba.computeVolume(imWrk2)
-        iso_dilation(imWrk2, imWrk2, i)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        mamba.copy(imWrk2, imWrk1)
+    with mamba.scratchImages(imIn, [1, None, None, 32]) as (maskIm, imWrk1, imWrk2, imWrk3):
+        i = 0
+        mamba.copy(imIn, imWrk1)
+        v2 = mamba.computeVolume(imWrk1)
+        v1 = v2 + 1
+        imOut1.reset()
+        imOut2.reset()
+        if grid == mamba.HEXAGONAL:
+            iso_dilation = mamba.largeDodecagonalDilate
+            iso_erosion = mamba.largeDodecagonalErode
+        else:
+            iso_dilation = mamba.largeOctogonalDilate
+            iso_erosion = mamba.largeOctogonalErode
+        while v1 > v2:
+            i += step
+            v1 = v2
+            iso_erosion(imWrk1, imWrk2, i)
+            v2 = mamba.computeVolume(imWrk2)
+            iso_dilation(imWrk2, imWrk2, i)
+            mamba.sub(imWrk1, imWrk2, imWrk1)
+            _generateMask_(imWrk1, imOut1, maskIm)
+            mamba.convertByMask(maskIm, imWrk3, 0, i)
+            mamba.logic(imOut1, imWrk1, imOut1, "sup")
+            mamba.logic(imOut2, imWrk3, imOut2, "sup")
+            mamba.copy(imWrk2, imWrk1)
 
 def ultimateBuildOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -241,32 +226,48 @@ def ultimateBuildOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32. 
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    imWrk4 = mamba.imageMb(imIn)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    i = 0
-    mamba.copy(imIn, imWrk1)
-    v2 = mamba.computeVolume(imWrk1)
-    mamba.copy(imWrk1, imWrk4)
-    v1 = v2 + 1
-    imOut1.reset()
-    imOut2.reset()
-    while v1 > v2:
-        i += 1
-        v1 = v2
-        mamba.erode(imWrk4, imWrk4, se=se)
-        mamba.copy(imWrk4, imWrk2)
-        mamba.hierarBuild(imWrk1, imWrk2, grid=mamba.DEFAULT_GRID)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        v2 = mamba.computeVolume(imWrk4)
-        mamba.copy(imWrk2, imWrk1)
+    if imIn.getDepth()==1:
+        # Binary images are processed as greyscale images of values 0 and 1
+        with mamba.scratchImages(imIn, 2, 8) as (imWrk1, imWrk2):
+            mamba.convertByMask(imIn, imWrk1, 0, 1)
+            ultimateBuildOpening(imWrk1, imWrk2, imOut2, grid=grid)
+            mamba.threshold(imWrk2, imOut1, 1, 255)
+        return
+    # The openings by reconstruction are connected filters: the nodes of the
+    # max-tree kept by the openings of each size are found with
+    # the successive erosions of the image, without any reconstruction
+    tree = mamba.maxTree(imIn, mamba.DEFAULT_GRID)
+    tree.ultimate(tree.buildSizes(grid), imOut1, imOut2)
+
+def ultimateAttributeOpening(imIn, imOut1, imOut2, attribute="area", grid=mamba.DEFAULT_GRID):
+    """
+    Ultimate attribute opening of image 'imIn'. 'imOut1' contains the
+    ultimate opening whereas 'imOut2' contains the granulometric function.
+    
+    The primitive functions are the attribute openings with 'attribute'
+    ("area", "volume" or "height", see areaOpening and volumeOpening). They
+    are all computed from a single max-tree of 'imIn' ('grid' sets the
+    connectivity of the components).
+    
+    Depth of 'imOut1' is the same as 'imIn' (8-bit or 32-bit), depth of
+    'imOut2' is 32.
+    """
+
+    mamba.maxTree(imIn, grid).ultimate(attribute, imOut1, imOut2)
+
+def ultimateAttributeClosing(imIn, imOut1, imOut2, attribute="area", grid=mamba.DEFAULT_GRID):
+    """
+    Ultimate attribute closing of image 'imIn', dual operator of
+    ultimateAttributeOpening. 'imOut1' contains the ultimate closing whereas
+    'imOut2' contains the granulometric function.
+    
+    The closings are computed from a single min-tree of 'imIn'.
+    
+    Depth of 'imOut1' is the same as 'imIn' (8-bit or 32-bit), depth of
+    'imOut2' is 32.
+    """
+
+    mamba.minTree(imIn, grid).ultimate(attribute, imOut1, imOut2)
          
 def _initialQuasiDist_(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -274,28 +275,25 @@ def _initialQuasiDist_(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     quasi-distance is not lipchitzian (see MM documentation for details).
     """
     
-    maskIm = mamba.imageMb(imIn, 1)
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    i = 0
-    mamba.copy(imIn, imWrk1)
-    v2 = mamba.computeVolume(imWrk1)
-    v1 = v2 + 1
-    imOut1.reset()
-    imOut2.reset()
-    while v1 > v2:
-        i += 1
-        v1 = v2
-        mamba.erode(imWrk1, imWrk2, se=se)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        mamba.copy(imWrk2, imWrk1)
+    with mamba.scratchImages(imIn, [1, None, None, 32]) as (maskIm, imWrk1, imWrk2, imWrk3):
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        i = 0
+        mamba.copy(imIn, imWrk1)
         v2 = mamba.computeVolume(imWrk1)
+        v1 = v2 + 1
+        imOut1.reset()
+        imOut2.reset()
+        while v1 > v2:
+            i += 1
+            v1 = v2
+            mamba.erode(imWrk1, imWrk2, se=se)
+            mamba.sub(imWrk1, imWrk2, imWrk1)
+            _generateMask_(imWrk1, imOut1, maskIm)
+            mamba.convertByMask(maskIm, imWrk3, 0, i)
+            mamba.logic(imOut1, imWrk1, imOut1, "sup")
+            mamba.logic(imOut2, imWrk3, imOut2, "sup")
+            mamba.copy(imWrk2, imWrk1)
+            v2 = mamba.computeVolume(imWrk1)
        
 def quasiDistance(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -310,27 +308,24 @@ def quasiDistance(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32.
     """
 
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 32)
-    imWrk3 = mamba.imageMb(imIn, 32)
-    maskIm = mamba.imageMb(imIn, 1) 
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    _initialQuasiDist_(imIn, imOut1, imOut2, grid=grid)
-    mamba.copy(imOut2, imWrk1)
-    v1 = mamba.computeVolume(imOut2)
-    v2 = v1 + 1
-    while v2 > v1:
-        v2 = v1
-        mamba.erode(imWrk1, imWrk2, se=se)
-        mamba.sub(imWrk1, imWrk2, imWrk2)
-        mamba.threshold(imWrk2, maskIm, 2, mamba.computeMaxRange(imWrk2)[1])
-        mamba.convertByMask(maskIm, imWrk3, 0, mamba.computeMaxRange(imWrk3)[1])
-        mamba.logic(imWrk2, imWrk3, imWrk2, "inf")
-        mamba.subConst(imWrk2, 1, imWrk3)
-        mamba.logic(imWrk2, imWrk3, imWrk2, "inf") # Patch non saturated subtraction
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        v1 = mamba.computeVolume(imWrk1)
-    mamba.copy(imWrk1, imOut2)
+    with mamba.scratchImages(imIn, [32, 32, 32, 1]) as (imWrk1, imWrk2, imWrk3, maskIm):
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        _initialQuasiDist_(imIn, imOut1, imOut2, grid=grid)
+        mamba.copy(imOut2, imWrk1)
+        v1 = mamba.computeVolume(imOut2)
+        v2 = v1 + 1
+        while v2 > v1:
+            v2 = v1
+            mamba.erode(imWrk1, imWrk2, se=se)
+            mamba.sub(imWrk1, imWrk2, imWrk2)
+            mamba.threshold(imWrk2, maskIm, 2, mamba.computeMaxRange(imWrk2)[1])
+            mamba.convertByMask(maskIm, imWrk3, 0, mamba.computeMaxRange(imWrk3)[1])
+            mamba.logic(imWrk2, imWrk3, imWrk2, "inf")
+            mamba.subConst(imWrk2, 1, imWrk3)
+            mamba.logic(imWrk2, imWrk3, imWrk2, "inf") # Patch non saturated subtraction
+            mamba.sub(imWrk1, imWrk2, imWrk1)
+            v1 = mamba.computeVolume(imWrk1)
+        mamba.copy(imWrk1, imOut2)
 
 def fullRegularisedGradient(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, maxSize=16):
     """
@@ -342,14 +337,13 @@ def fullRegularisedGradient(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, maxSi
     Warning! 'imOut2' is a greyscale image (depth equal to 8).
     """
 
-    imWrk = mamba.imageMb(imIn)
-    maskIm = mamba.imageMb(imIn, 1) 
-    imOut1.reset()
-    imOut2.reset()
-    for i in range(1, maxSize + 1):
-        mamba.regularisedGradient(imIn, imWrk, i, grid=grid)
-        _generateMask_(imWrk, imOut1, maskIm)
-        mamba.logic(imOut1, imWrk, imOut1, "sup")
-        mamba.convertByMask(maskIm, imWrk, 0, i)
-        mamba.logic(imOut2, imWrk, imOut2, "sup")
+    with mamba.scratchImages(imIn, [None, 1]) as (imWrk, maskIm):
+        imOut1.reset()
+        imOut2.reset()
+        for i in range(1, maxSize + 1):
+            mamba.regularisedGradient(imIn, imWrk, i, grid=grid)
+            _generateMask_(imWrk, imOut1, maskIm)
+            mamba.logic(imOut1, imWrk, imOut1, "sup")
+            mamba.convertByMask(maskIm, imWrk, 0, i)
+            mamba.logic(imOut2, imWrk, imOut2, "sup")
  
@@ -80,12 +80,11 @@ def markerControlledWatershed(imIn, imMarkers, imOut, grid=mamba.DEFAULT_GRID):
     'imOut' contains the valued watershed.
     """
     
-    im_mark = mamba.imageMb(imIn, 32)
-    imWrk = mamba.imageMb(imIn)
-    label(imMarkers, im_mark, grid=grid)
-    watershedSegment(imIn, im_mark, grid=grid)
-    mamba.copyBytePlane(im_mark, 3, imWrk)
-    mamba.logic(imWrk, imIn, imOut, 'inf')
+    with mamba.scratchImages(imIn, [32, None]) as (im_mark, imWrk):
+        label(imMarkers, im_mark, grid=grid)
+        watershedSegment(imIn, im_mark, grid=grid)
+        mamba.copyBytePlane(im_mark, 3, imWrk)
+        mamba.logic(imWrk, imIn, imOut, 'inf')
 
 def valuedWatershed(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -94,9 +93,9 @@ def valuedWatershed(imIn, imOut, grid=mamba.DEFAULT_GRID):
     in initial image 'imIn'.
     """
     
-    im_min = mamba.imageMb(imIn, 1)
-    mamba.minima(imIn, im_min, grid=grid)
-    markerControlledWatershed(imIn, im_min, imOut, grid=grid)
+    with mamba.scratchImages(imIn, depth=1) as im_min:
+        mamba.minima(imIn, im_min, grid=grid)
+        markerControlledWatershed(imIn, im_min, imOut, grid=grid)
 
 def fastSKIZ(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -105,10 +104,10 @@ def fastSKIZ(imIn, imOut, grid=mamba.DEFAULT_GRID):
     transform by hierarchical queues.
     """
     
-    imWrk = mamba.imageMb(imIn, 8)
-    mamba.convertByMask(imIn, imWrk, 1, 0)
-    markerControlledWatershed(imWrk, imIn, imWrk, grid=grid)
-    mamba.threshold(imWrk, imOut, 0, 0)
+    with mamba.scratchImages(imIn, depth=8) as imWrk:
+        mamba.convertByMask(imIn, imWrk, 1, 0)
+        markerControlledWatershed(imWrk, imIn, imWrk, grid=grid)
+        mamba.threshold(imWrk, imOut, 0, 0)
 
 def geodesicSKIZ(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -116,15 +115,14 @@ def geodesicSKIZ(imIn, imMask, imOut, grid=mamba.DEFAULT_GRID):
     geodesic mask 'imMask'. The result is in binary image 'imOut'.
     """
     
-    imWrk1 = mamba.imageMb(imIn, 8)
-    imWrk2 = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk2)
-    mamba.build(imMask, imWrk2, grid=grid)
-    mamba.convertByMask(imWrk2, imWrk1, 2, 1)
-    mamba.sub(imWrk1, imIn, imWrk1)
-    markerControlledWatershed(imWrk1, imIn, imWrk1, grid=grid)
-    mamba.threshold(imWrk1, imOut, 0, 0)
-    mamba.logic(imOut, imWrk2, imOut, "inf")
+    with mamba.scratchImages(imIn, [8, None]) as (imWrk1, imWrk2):
+        mamba.copy(imIn, imWrk2)
+        mamba.build(imMask, imWrk2, grid=grid)
+        mamba.convertByMask(imWrk2, imWrk1, 2, 1)
+        mamba.sub(imWrk1, imIn, imWrk1)
+        markerControlledWatershed(imWrk1, imIn, imWrk1, grid=grid)
+        mamba.threshold(imWrk1, imOut, 0, 0)
+        mamba.logic(imOut, imWrk2, imOut, "inf")
     
 def mosaic(imIn, imOut, imWts, grid=mamba.DEFAULT_GRID):
     """
@@ -136,21 +134,20 @@ def mosaic(imIn, imOut, imWts, grid=mamba.DEFAULT_GRID):
     the maximum value of 'imIn' pixels inside them.
     """
    
-    imWrk1 = mamba.imageMb(imIn, 1)
-    imWrk2 = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk2)
-    im_mark = mamba.imageMb(imIn, 32)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    mamba.gradient(imIn, imOut, se=se)
-    mamba.minima(imOut, imWrk1, grid=grid) 
-    mamba.add(im_mark, imWrk1, im_mark) 
-    imWrk1.convert(8)
-    mamba.build(imWrk1, imWrk2, grid=grid)
-    mamba.add(im_mark, imWrk2, im_mark)   
-    watershedSegment(imOut, im_mark, grid=grid)
-    mamba.copyBytePlane(im_mark, 3, imWts)
-    mamba.subConst(im_mark, 1, im_mark)
-    mamba.copyBytePlane(im_mark, 0, imOut)
+    with mamba.scratchImages(imIn, [1, None, 32, 8]) as (imWrk1, imWrk2, im_mark, imWrk3):
+        mamba.copy(imIn, imWrk2)
+        im_mark.reset()
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        mamba.gradient(imIn, imOut, se=se)
+        mamba.minima(imOut, imWrk1, grid=grid) 
+        mamba.add(im_mark, imWrk1, im_mark) 
+        mamba.convert(imWrk1, imWrk3)
+        mamba.build(imWrk3, imWrk2, grid=grid)
+        mamba.add(im_mark, imWrk2, im_mark)   
+        watershedSegment(imOut, im_mark, grid=grid)
+        mamba.copyBytePlane(im_mark, 3, imWts)
+        mamba.subConst(im_mark, 1, im_mark)
+        mamba.copyBytePlane(im_mark, 0, imOut)
     
 def mosaicGradient(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -161,30 +158,25 @@ def mosaicGradient(imIn, imOut, grid=mamba.DEFAULT_GRID):
     second one been valued by the infima.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn)
-    imWrk4 = mamba.imageMb(imIn)
-    imWrk5 = mamba.imageMb(imIn)
-    imWrk6 = mamba.imageMb(imIn, 1)
-    mosaic(imIn, imWrk2, imWrk3, grid=grid)
-    mamba.sub(imWrk2, imWrk3, imWrk1)
-    mamba.logic(imWrk2, imWrk3, imWrk2, "sup")
-    mamba.negate(imWrk2, imWrk2)
-    mamba.threshold(imWrk3, imWrk6, 1, 255)
-    mamba.multiplePoints(imWrk6, imWrk6, grid=grid)
-    mamba.convertByMask(imWrk6, imWrk3, 0, 255)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    mamba.dilate(imWrk1, imWrk4, se=se)
-    mamba.dilate(imWrk2, imWrk5, se=se)
-    while mamba.computeVolume(imWrk3) != 0:
-        mamba.dilate(imWrk1, imWrk1, 2, se=se)
-        mamba.dilate(imWrk2, imWrk2, 2, se=se)
-        mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
-        mamba.logic(imWrk2, imWrk3, imWrk2, "inf")
-        mamba.logic(imWrk1, imWrk4, imWrk4, "sup")
-        mamba.logic(imWrk2, imWrk5, imWrk5, "sup")
-        mamba.erode(imWrk3, imWrk3, 2, se=se)
-    mamba.negate(imWrk5, imWrk5)
-    mamba.sub(imWrk4, imWrk5, imOut)
+    with mamba.scratchImages(imIn, [None, None, None, None, None, 1]) as (imWrk1, imWrk2, imWrk3, imWrk4, imWrk5, imWrk6):
+        mosaic(imIn, imWrk2, imWrk3, grid=grid)
+        mamba.sub(imWrk2, imWrk3, imWrk1)
+        mamba.logic(imWrk2, imWrk3, imWrk2, "sup")
+        mamba.negate(imWrk2, imWrk2)
+        mamba.threshold(imWrk3, imWrk6, 1, 255)
+        mamba.multiplePoints(imWrk6, imWrk6, grid=grid)
+        mamba.convertByMask(imWrk6, imWrk3, 0, 255)
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        mamba.dilate(imWrk1, imWrk4, se=se)
+        mamba.dilate(imWrk2, imWrk5, se=se)
+        while mamba.computeVolume(imWrk3) != 0:
+            mamba.dilate(imWrk1, imWrk1, 2, se=se)
+            mamba.dilate(imWrk2, imWrk2, 2, se=se)
+            mamba.logic(imWrk1, imWrk3, imWrk1, "inf")
+            mamba.logic(imWrk2, imWrk3, imWrk2, "inf")
+            mamba.logic(imWrk1, imWrk4, imWrk4, "sup")
+            mamba.logic(imWrk2, imWrk5, imWrk5, "sup")
+            mamba.erode(imWrk3, imWrk3, 2, se=se)
+        mamba.negate(imWrk5, imWrk5)
+        mamba.sub(imWrk4, imWrk5, imOut)
 
@@ -134,9 +134,9 @@ def thin(imIn, imOut, dse, edge=mamba.EMPTY):
     'edge' is set to EMPTY by default.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    hitOrMiss(imIn, imWrk, dse, edge=edge)
-    mamba.diff(imIn, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        hitOrMiss(imIn, imWrk, dse, edge=edge)
+        mamba.diff(imIn, imWrk, imOut)
     
 def thick(imIn, imOut, dse):
     """
@@ -147,9 +147,9 @@ def thick(imIn, imOut, dse):
     The edge is always EMPTY (as for hitOrMiss).
     """
     
-    imWrk = mamba.imageMb(imIn)
-    hitOrMiss(imIn, imWrk, dse, edge=mamba.EMPTY)
-    mamba.logic(imIn, imWrk, imOut, "or") 
+    with mamba.scratchImages(imIn) as imWrk:
+        hitOrMiss(imIn, imWrk, dse, edge=mamba.EMPTY)
+        mamba.logic(imIn, imWrk, imOut, "or") 
     
 def rotatingThin(imIn, imOut, dse, edge=mamba.FILLED):
     """
@@ -164,20 +164,20 @@ def rotatingThin(imIn, imOut, dse, edge=mamba.FILLED):
     'edge' is set to FILLED by default (default value is EMPTY in simple thin).
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if edge == mamba.FILLED:
-        mamba.negate(imIn, imOut)
-        for d in mamba.getDirections(dse.getGrid(), True):
-            hitOrMiss(imOut, imWrk, dse.flip(), edge=mamba.EMPTY)
-            mamba.logic(imWrk, imOut, imOut, "sup")
-            dse = dse.rotate()
-        mamba.negate(imOut, imOut)
-    else:
-        mamba.copy(imIn, imOut)
-        for d in mamba.getDirections(dse.getGrid(), True):
-            hitOrMiss(imOut, imWrk, dse, edge=mamba.EMPTY)
-            mamba.diff(imOut, imWrk, imOut)
-            dse = dse.rotate()
+    with mamba.scratchImages(imIn) as imWrk:
+        if edge == mamba.FILLED:
+            mamba.negate(imIn, imOut)
+            for d in mamba.getDirections(dse.getGrid(), True):
+                hitOrMiss(imOut, imWrk, dse.flip(), edge=mamba.EMPTY)
+                mamba.logic(imWrk, imOut, imOut, "sup")
+                dse = dse.rotate()
+            mamba.negate(imOut, imOut)
+        else:
+            mamba.copy(imIn, imOut)
+            for d in mamba.getDirections(dse.getGrid(), True):
+                hitOrMiss(imOut, imWrk, dse, edge=mamba.EMPTY)
+                mamba.diff(imOut, imWrk, imOut)
+                dse = dse.rotate()
 
 def rotatingThick(imIn, imOut, dse):
     """
@@ -192,12 +192,12 @@ def rotatingThick(imIn, imOut, dse):
     The edge is always set to EMPTY.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    for d in mamba.getDirections(dse.getGrid(), True):
-        hitOrMiss(imOut, imWrk, dse, edge=mamba.EMPTY)
-        mamba.logic(imWrk, imOut, imOut, "sup")
-        dse = dse.rotate()
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imOut)
+        for d in mamba.getDirections(dse.getGrid(), True):
+            hitOrMiss(imOut, imWrk, dse, edge=mamba.EMPTY)
+            mamba.logic(imWrk, imOut, imOut, "sup")
+            dse = dse.rotate()
 
 def infThin(imIn, imOut, dse, edge=mamba.EMPTY):
     """
@@ -210,14 +210,13 @@ def infThin(imIn, imOut, dse, edge=mamba.EMPTY):
     'edge' is set to EMPTY by default.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    mamba.copy(imIn, imWrk1)
-    for i in range(mamba.gridNeighbors(dse.getGrid())):
-        hitOrMiss(imWrk1, imWrk2, dse, edge=edge)
-        mamba.diff(imOut, imWrk2, imOut)
-        dse = dse.rotate()
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        mamba.copy(imIn, imOut)
+        mamba.copy(imIn, imWrk1)
+        for i in range(mamba.gridNeighbors(dse.getGrid())):
+            hitOrMiss(imWrk1, imWrk2, dse, edge=edge)
+            mamba.diff(imOut, imWrk2, imOut)
+            dse = dse.rotate()
 
 def supThick(imIn, imOut, dse):
     """
@@ -230,14 +229,13 @@ def supThick(imIn, imOut, dse):
     The edge is always set to EMPTY.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk1)
-    mamba.copy(imIn, imOut)
-    for i in range(mamba.gridNeighbors(dse.getGrid())):
-        hitOrMiss(imWrk1, imWrk2, dse)
-        mamba.logic(imWrk2, imOut, imOut, "sup")
-        dse = dse.rotate()
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        mamba.copy(imIn, imWrk1)
+        mamba.copy(imIn, imOut)
+        for i in range(mamba.gridNeighbors(dse.getGrid())):
+            hitOrMiss(imWrk1, imWrk2, dse)
+            mamba.logic(imWrk2, imOut, imOut, "sup")
+            dse = dse.rotate()
     
 def fullThin(imIn, imOut, dse, edge=mamba.EMPTY):
     """
@@ -250,17 +248,17 @@ def fullThin(imIn, imOut, dse, edge=mamba.EMPTY):
     """
     
     if edge == mamba.EMPTY:
-        imWrk = mamba.imageMb(imIn)
-        mamba.copy(imIn, imOut)
-        v1 = mamba.computeVolume(imOut)
-        v2 = 0
-        while v1 != v2:
-            v2 = v1
-            for i in range(mamba.gridNeighbors(dse.getGrid())):
-                hitOrMiss(imOut, imWrk, dse)
-                mamba.diff(imOut, imWrk, imOut)
-                dse = dse.rotate()
+        with mamba.scratchImages(imIn) as imWrk:
+            mamba.copy(imIn, imOut)
             v1 = mamba.computeVolume(imOut)
+            v2 = 0
+            while v1 != v2:
+                v2 = v1
+                for i in range(mamba.gridNeighbors(dse.getGrid())):
+                    hitOrMiss(imOut, imWrk, dse)
+                    mamba.diff(imOut, imWrk, imOut)
+                    dse = dse.rotate()
+                v1 = mamba.computeVolume(imOut)
     else:
         mamba.negate(imIn, imOut)
         v1 = mamba.computeVolume(imOut)
@@ -428,25 +426,24 @@ def endPoints(imIn, imOut, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     extremities touching the edge.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    if grid == mamba.HEXAGONAL:
-        dse1 = hexagonalE
-        dse2 = hexagonalL
-        nb = 6
-        step = 1
-    else:
-        dse1 = squareE
-        dse2 = squareL
-        nb = 4
-        step = 2
-    rotatingThin(imIn, imWrk1, dse2, edge=edge)
-    # added to avoid blocking of the process in clipping
-    mamba.diff(imIn, imWrk1, imOut)
-    for i in range(nb):
-        hitOrMiss(imWrk1, imWrk2, dse1, edge=edge)
-        mamba.logic(imOut, imWrk2, imOut, "sup")
-        dse1 = dse1.rotate(step)
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        if grid == mamba.HEXAGONAL:
+            dse1 = hexagonalE
+            dse2 = hexagonalL
+            nb = 6
+            step = 1
+        else:
+            dse1 = squareE
+            dse2 = squareL
+            nb = 4
+            step = 2
+        rotatingThin(imIn, imWrk1, dse2, edge=edge)
+        # added to avoid blocking of the process in clipping
+        mamba.diff(imIn, imWrk1, imOut)
+        for i in range(nb):
+            hitOrMiss(imWrk1, imWrk2, dse1, edge=edge)
+            mamba.logic(imOut, imWrk2, imOut, "sup")
+            dse1 = dse1.rotate(step)
 
 def multiplePoints(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -458,23 +455,22 @@ def multiplePoints(imIn, imOut, grid=mamba.DEFAULT_GRID):
     to be missed.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    endPoints(imIn, imWrk2)
-    if grid == mamba.HEXAGONAL:
-        dse_list = [hexagonalS1, hexagonalS2]
-        step = 1
-        nb = 6
-    else:
-        dse_list = [squareS1, squareS2]
-        step = 2
-        nb = 4
-    for dse in dse_list:
-        for i in range(nb):
-            hitOrMiss(imIn, imWrk1, dse)
-            mamba.logic(imWrk1, imWrk2, imWrk2, "sup")
-            dse = dse.rotate(step)
-    mamba.diff(imIn, imWrk2, imOut)
+    with mamba.scratchImages(imIn, 2) as (imWrk1, imWrk2):
+        endPoints(imIn, imWrk2)
+        if grid == mamba.HEXAGONAL:
+            dse_list = [hexagonalS1, hexagonalS2]
+            step = 1
+            nb = 6
+        else:
+            dse_list = [squareS1, squareS2]
+            step = 2
+            nb = 4
+        for dse in dse_list:
+            for i in range(nb):
+                hitOrMiss(imIn, imWrk1, dse)
+                mamba.logic(imWrk1, imWrk2, imWrk2, "sup")
+                dse = dse.rotate(step)
+        mamba.diff(imIn, imWrk2, imOut)
 
 def whiteClip(imIn, imOut, step=0, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -486,20 +482,20 @@ def whiteClip(imIn, imOut, step=0, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     'edge' is set to FILLED by default.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    if step == 0:
-        v1 = mamba.computeVolume(imOut)
-        v2 = 0
-        while v1 != v2:
-            v2 = v1
-            endPoints(imOut, imWrk, grid=grid, edge=edge)
-            mamba.diff(imOut, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imOut)
+        if step == 0:
             v1 = mamba.computeVolume(imOut)
-    else:
-        for i in range(step):
-            endPoints(imOut, imWrk, grid=grid, edge=edge)
-            mamba.diff(imOut, imWrk, imOut)
+            v2 = 0
+            while v1 != v2:
+                v2 = v1
+                endPoints(imOut, imWrk, grid=grid, edge=edge)
+                mamba.diff(imOut, imWrk, imOut)
+                v1 = mamba.computeVolume(imOut)
+        else:
+            for i in range(step):
+                endPoints(imOut, imWrk, grid=grid, edge=edge)
+                mamba.diff(imOut, imWrk, imOut)
 
 def blackClip(imIn, imOut, step=0, grid=mamba.DEFAULT_GRID):
     """
@@ -511,21 +507,21 @@ def blackClip(imIn, imOut, step=0, grid=mamba.DEFAULT_GRID):
     'edge' is always set to FILLED.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.negate(imIn, imOut)
-    if step == 0:
-        v1 = mamba.computeVolume(imOut)
-        v2 = 0
-        while v1 != v2:
-            v2 = v1
-            endPoints(imOut, imWrk, grid=grid, edge=mamba.FILLED)
-            mamba.diff(imOut, imWrk, imOut)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.negate(imIn, imOut)
+        if step == 0:
             v1 = mamba.computeVolume(imOut)
-    else:
-        for i in range(step):
-            endPoints(imOut, imWrk, grid=grid, edge=mamba.FILLED)
-            mamba.diff(imOut, imWrk, imOut)
-    mamba.negate(imOut, imOut)
+            v2 = 0
+            while v1 != v2:
+                v2 = v1
+                endPoints(imOut, imWrk, grid=grid, edge=mamba.FILLED)
+                mamba.diff(imOut, imWrk, imOut)
+                v1 = mamba.computeVolume(imOut)
+        else:
+            for i in range(step):
+                endPoints(imOut, imWrk, grid=grid, edge=mamba.FILLED)
+                mamba.diff(imOut, imWrk, imOut)
+        mamba.negate(imOut, imOut)
     
 def homotopicReduction(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -551,16 +547,16 @@ def computeSKIZ(imIn, imOut, grid=mamba.DEFAULT_GRID):
     module).
     """
 
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imWrk)
-    if grid == mamba.SQUARE:
-        dse = squareS3
-        thick(imWrk, imWrk, dse)
-        thick(imWrk, imWrk, dse.rotate(2))
-        thick(imWrk, imWrk, dse.rotate(4))
-        thick(imWrk, imWrk, dse.rotate(6))
-    thickM(imWrk, imWrk, grid=grid)
-    blackClip(imWrk, imOut, grid=grid)
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imWrk)
+        if grid == mamba.SQUARE:
+            dse = squareS3
+            thick(imWrk, imWrk, dse)
+            thick(imWrk, imWrk, dse.rotate(2))
+            thick(imWrk, imWrk, dse.rotate(4))
+            thick(imWrk, imWrk, dse.rotate(6))
+        thickM(imWrk, imWrk, grid=grid)
+        blackClip(imWrk, imOut, grid=grid)
 
     
 ################################################################################
@@ -600,13 +596,13 @@ def rotatingGeodesicThick(imIn, imMask, imOut, dse):
     'imIn', 'imMask' and 'imOut' are binary images.
     """
 
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    for i in range(mamba.gridNeighbors(dse.getGrid())):
-        hitOrMiss(imOut, imWrk, dse)
-        mamba.logic(imWrk, imOut, imOut, "sup")
-        mamba.logic(imMask, imOut, imOut, "inf")
-        dse = dse.rotate()
+    with mamba.scratchImages(imIn) as imWrk:
+        mamba.copy(imIn, imOut)
+        for i in range(mamba.gridNeighbors(dse.getGrid())):
+            hitOrMiss(imOut, imWrk, dse)
+            mamba.logic(imWrk, imOut, imOut, "sup")
+            mamba.logic(imMask, imOut, imOut, "inf")
+            dse = dse.rotate()
 
 def rotatingGeodesicThin(imIn, imMask, imOut, dse):
     """
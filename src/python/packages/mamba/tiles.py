@@ -0,0 +1,269 @@
+"""
+Tiled images.
+
+This module defines the tiledImageMb class, an image stored in a raw file
+which is processed by tiles, for images too large to be held in memory or
+in a single imageMb. Local operators are applied to overlapping tiles
+whose margin (the halo) is large enough for the result to be identical to
+the one obtained on the whole image.
+"""
+
+import mamba
+import mamba.core as core
+
+import os
+import mmap
+import ctypes
+
+__all__ = ["DEFAULT_TILE_SIZE", "tiledImageMb", "processTiles", "tiledErode",
+           "tiledDilate", "tiledGradient", "tiledOpening", "tiledClosing",
+           "tiledAlternateFilter", "tiledFullAlternateFilter"]
+
+# Default size of the tiles
+DEFAULT_TILE_SIZE = 1024
+
+def _roundUp(value, step):
+    return ((value+step-1)//step)*step
+
+class tiledImageMb:
+    """
+    Image stored in a raw file and processed by tiles.
+    
+    The file contains the image lines one after the other without any
+    header. Each line holds width*depth/8 bytes: one byte per pixel for
+    greyscale images, four bytes (native byte order) per pixel for 32-bit
+    images and one bit per pixel for binary images (pixel x being bit x%8 of
+    byte x/8). The width must be a multiple of 64 and the height must be
+    even.
+    
+    The file is memory-mapped, only the tiles being processed are read. If
+    'mode' is "r", the file is opened copy-on-write (it is never modified),
+    if it is "r+" the changes are written into the file and if it is "w"
+    the file is created (or truncated) and filled with 0.
+    """
+    
+    def __init__(self, path, width, height, depth=8, mode="r+"):
+        if depth not in (1, 8, 32):
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        if width<=0 or height<=0 or width%64 or height%2:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+        if mode not in ("r", "r+", "w"):
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.name = path
+        size = (width*height*depth)//8
+        if mode=="w":
+            self._file = open(path, "w+b")
+            self._file.truncate(size)
+        else:
+            self._file = open(path, mode=="r" and "rb" or "r+b")
+            if os.fstat(self._file.fileno()).st_size<size:
+                self._file.close()
+                mamba.raiseExceptionOnError(core.MB_ERR_LOAD_DATA)
+        access = mode=="r" and mmap.ACCESS_COPY or mmap.ACCESS_WRITE
+        self._map = mmap.mmap(self._file.fileno(), size, access=access)
+        self._buffer = ctypes.c_char.from_buffer(self._map)
+        self._address = ctypes.addressof(self._buffer)
+        
+    def __del__(self):
+        self.close()
+        
+    def __repr__(self):
+        return "tiledImageMb(%s, %d, %d, %d)" % (repr(self.name), self.width,
+                                                 self.height, self.depth)
+    
+    def close(self):
+        """
+        Closes the file of the image (the changes are written into the file).
+        The image cannot be used anymore.
+        """
+        if getattr(self, "_map", None) is not None:
+            del self._buffer
+            self._map.close()
+            self._file.close()
+            self._map = None
+        
+    def getSize(self):
+        """
+        Returns the size (width, height) of the image.
+        """
+        return (self.width, self.height)
+        
+    def getDepth(self):
+        """
+        Returns the depth of the image.
+        """
+        return self.depth
+        
+    def _copyLines(self, im, x, y, x0, y0, w, h, toFile):
+        # Copies the region (x0, y0, w, h) of imageMb 'im' to (or from) the
+        # region of the image at position (x, y)
+        if self._map is None:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        if im.getDepth()!=self.depth:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        (iw, ih) = im.getSize()
+        if (x%64 or x0%64 or w%64 or x<0 or y<0 or x0<0 or y0<0 or
+            x+w>self.width or y+h>self.height or x0+w>iw or y0+h>ih):
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+        fileLine = (self.width*self.depth)//8
+        imLine = (iw*self.depth)//8
+        count = (w*self.depth)//8
+        fileAddress = self._address + y*fileLine + (x*self.depth)//8
+        imAddress = im.mbIm._pixelsAddress() + y0*imLine + (x0*self.depth)//8
+        for i in range(h):
+            if toFile:
+                ctypes.memmove(fileAddress, imAddress, count)
+            else:
+                ctypes.memmove(imAddress, fileAddress, count)
+            fileAddress += fileLine
+            imAddress += imLine
+        
+    def readTile(self, imOut, x, y):
+        """
+        Reads the region of the image starting at position (x, y) into
+        'imOut' (an imageMb of the same depth, filled completely). 'x' must
+        be a multiple of 64.
+        """
+        (w, h) = imOut.getSize()
+        self._copyLines(imOut, x, y, 0, 0, w, h, False)
+        imOut.update()
+        
+    def writeTile(self, imIn, x, y, x0=0, y0=0, w=None, h=None):
+        """
+        Writes the region of 'imIn' (an imageMb of the same depth) starting
+        at position (x0, y0) with size 'w'x'h' into the image at position
+        (x, y). The whole 'imIn' is written by default. 'x', 'x0' and 'w'
+        must be multiples of 64.
+        """
+        (iw, ih) = imIn.getSize()
+        if w is None:
+            w = iw-x0
+        if h is None:
+            h = ih-y0
+        self._copyLines(imIn, x, y, x0, y0, w, h, True)
+        
+    def load(self, imIn):
+        """
+        Writes imageMb 'imIn' (of the same size and depth) into the image.
+        """
+        if imIn.getSize()!=self.getSize():
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+        self.writeTile(imIn, 0, 0)
+        
+    def extract(self, imOut):
+        """
+        Reads the whole image into imageMb 'imOut' (of the same size and
+        depth).
+        """
+        if imOut.getSize()!=self.getSize():
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+        self.readTile(imOut, 0, 0)
+
+def processTiles(func, imIn, imOut, radius, tileSize=DEFAULT_TILE_SIZE):
+    """
+    Applies 'func' to tiled image 'imIn' and puts the result in tiled image
+    'imOut' (of the same size but possibly of another depth). 'func' is
+    called as func(imTileIn, imTileOut) for each tile, 'imTileIn' holding
+    the tile of 'imIn' and its halo.
+    
+    'radius' is the distance from which a pixel of the result can be
+    influenced by the input pixels (n for an erosion of size n). The halo
+    is at least 'radius' wide (it is rounded to a multiple of 64 pixels
+    horizontally and of 2 pixels vertically) so that the result is identical
+    to the one of 'func' applied to the whole image. Tiles are 'tileSize'
+    pixels wide and high (rounded the same way). 'imIn' and 'imOut' must
+    be different images.
+    """
+    
+    if imIn is imOut or imIn.name==imOut.name:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    if imIn.getSize()!=imOut.getSize():
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+    (width, height) = imIn.getSize()
+    haloX = _roundUp(radius, 64)
+    haloY = _roundUp(radius, 2)
+    tileW = _roundUp(max(tileSize, 1), 64)
+    tileH = _roundUp(max(tileSize, 1), 2)
+    # Tile images, by size
+    images = {}
+    for ty in range(0, height, tileH):
+        th = min(tileH, height-ty)
+        y0 = max(ty-haloY, 0)
+        y1 = min(ty+th+haloY, height)
+        for tx in range(0, width, tileW):
+            tw = min(tileW, width-tx)
+            x0 = max(tx-haloX, 0)
+            x1 = min(tx+tw+haloX, width)
+            size = (x1-x0, y1-y0)
+            if size not in images:
+                images[size] = (mamba.imageMb(size[0], size[1], imIn.getDepth()),
+                                mamba.imageMb(size[0], size[1], imOut.getDepth()))
+            (imTileIn, imTileOut) = images[size]
+            imIn.readTile(imTileIn, x0, y0)
+            func(imTileIn, imTileOut)
+            imOut.writeTile(imTileOut, tx, ty, tx-x0, ty-y0, tw, th)
+
+def tiledErode(imIn, imOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.FILLED,
+               tileSize=DEFAULT_TILE_SIZE):
+    """
+    Erosion of size 'n' of tiled image 'imIn' (see erode). The result is put
+    in tiled image 'imOut'.
+    """
+    processTiles(lambda i, o: mamba.erode(i, o, n, se=se, edge=edge),
+                 imIn, imOut, n, tileSize)
+
+def tiledDilate(imIn, imOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.EMPTY,
+                tileSize=DEFAULT_TILE_SIZE):
+    """
+    Dilation of size 'n' of tiled image 'imIn' (see dilate). The result is
+    put in tiled image 'imOut'.
+    """
+    processTiles(lambda i, o: mamba.dilate(i, o, n, se=se, edge=edge),
+                 imIn, imOut, n, tileSize)
+
+def tiledGradient(imIn, imOut, n=1, se=mamba.DEFAULT_SE, tileSize=DEFAULT_TILE_SIZE):
+    """
+    Morphological gradient of thickness 'n' of tiled image 'imIn' (see
+    gradient). The result is put in tiled image 'imOut'.
+    """
+    processTiles(lambda i, o: mamba.gradient(i, o, n, se=se),
+                 imIn, imOut, n, tileSize)
+
+def tiledOpening(imIn, imOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.FILLED,
+                 tileSize=DEFAULT_TILE_SIZE):
+    """
+    Opening of size 'n' of tiled image 'imIn' (see opening). The result is
+    put in tiled image 'imOut'.
+    """
+    processTiles(lambda i, o: mamba.opening(i, o, n, se=se, edge=edge),
+                 imIn, imOut, 2*n, tileSize)
+
+def tiledClosing(imIn, imOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.FILLED,
+                 tileSize=DEFAULT_TILE_SIZE):
+    """
+    Closing of size 'n' of tiled image 'imIn' (see closing). The result is
+    put in tiled image 'imOut'.
+    """
+    processTiles(lambda i, o: mamba.closing(i, o, n, se=se, edge=edge),
+                 imIn, imOut, 2*n, tileSize)
+
+def tiledAlternateFilter(imIn, imOut, n, openFirst, se=mamba.DEFAULT_SE,
+                         tileSize=DEFAULT_TILE_SIZE):
+    """
+    Alternate filter of size 'n' of tiled image 'imIn' (see alternateFilter).
+    The result is put in tiled image 'imOut'.
+    """
+    processTiles(lambda i, o: mamba.alternateFilter(i, o, n, openFirst, se=se),
+                 imIn, imOut, 4*n, tileSize)
+
+def tiledFullAlternateFilter(imIn, imOut, n, openFirst, se=mamba.DEFAULT_SE,
+                             tileSize=DEFAULT_TILE_SIZE):
+    """
+    Full alternate filter of size 'n' of tiled image 'imIn' (see
+    fullAlternateFilter). The result is put in tiled image 'imOut'.
+    """
+    processTiles(lambda i, o: mamba.fullAlternateFilter(i, o, n, openFirst, se=se),
+                 imIn, imOut, 2*n*(n+1), tileSize)
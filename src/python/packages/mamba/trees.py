@@ -0,0 +1,285 @@
+"""
+Component trees.
+
+This module provides operators computed through the component tree of an
+image. The max-tree of a greyscale or 32-bit image gathers the connected
+components of all its upper threshold sets, each component being the child
+of the component of the lower threshold which contains it (the min-tree
+does the same with the lower threshold sets). The tree is built in a single
+pass over the image and many connected filters (attribute openings and
+closings, ultimate openings, granulometries) are then obtained from it
+without any new flooding of the image.
+"""
+
+import mamba
+import mamba.core as core
+
+import array
+
+__all__ = ["maxTree", "minTree", "areaOpening", "areaClosing", "volumeOpening",
+           "volumeClosing", "attributeGranulometry"]
+
+# Names of the attributes of the nodes and their column in the table
+# computed by the library
+_nodeColumns = {
+    "area": core.MB_NODE_AREA,
+    "volume": core.MB_NODE_VOLUME,
+    "height": core.MB_NODE_HEIGHT,
+    "xmin": core.MB_NODE_XMIN,
+    "ymin": core.MB_NODE_YMIN,
+    "xmax": core.MB_NODE_XMAX,
+    "ymax": core.MB_NODE_YMAX,
+}
+
+class maxTree:
+    """
+    Max-tree of an 8-bit or 32-bit image.
+
+    The tree is built once when the object is created. Each pixel belongs to
+    a node (a connected component of an upper threshold set of the image,
+    with 'grid' connectivity) and the nodes are stored in arrays, node 0
+    being the root. The attributes of the nodes are computed on the first
+    request and kept, so the image can be filtered with many thresholds
+    without building the tree again.
+
+    Example:
+    >>>tree = maxTree(imIn)
+    >>>for area in (10, 100, 1000):
+    >>>    tree.filter("area", area, imOut)
+
+    The image given to the constructor must not be modified while the tree
+    is in use.
+    """
+
+    _dual = False
+
+    def __init__(self, imIn, grid=mamba.DEFAULT_GRID):
+        if imIn.getDepth()==1:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        (w, h) = imIn.getSize()
+        self.imIn = imIn
+        self.grid = grid
+        self.imNodes = mamba.imageMb(imIn, 32)
+        table = array.array("I", [0]) * (core.MB_TREE_COLUMNS*w*h)
+        err, nb = core.MB_MaxTree(imIn.mbIm, self.imNodes.mbIm, table,
+                                  int(self._dual), grid.id)
+        mamba.raiseExceptionOnError(err)
+        # The table is reduced to the actual number of nodes
+        self.table = (table[core.MB_TREE_PARENT*w*h:core.MB_TREE_PARENT*w*h+nb] +
+                      table[core.MB_TREE_LEVEL*w*h:core.MB_TREE_LEVEL*w*h+nb])
+        self.nbNodes = nb
+        self._props = None
+
+    def getNodeNumber(self):
+        """
+        Returns the number of nodes of the tree.
+        """
+        return self.nbNodes
+
+    def getParents(self):
+        """
+        Returns the array of the parent of each node (the root is its own
+        parent). A node is always numbered after its parent.
+        """
+        return self.table[:self.nbNodes]
+
+    def getLevels(self):
+        """
+        Returns the array of the level of each node (the threshold of its
+        component).
+        """
+        return self.table[self.nbNodes:]
+
+    def getAttribute(self, name):
+        """
+        Returns the array of attribute 'name' of the nodes. 'name' can be
+        "area" (number of pixels), "volume" (sum of the heights of the pixels
+        above the level of the parent), "height" (difference between the
+        extreme value of the component and the level of the parent) or
+        "xmin", "ymin", "xmax", "ymax" (bounding box of the component).
+        """
+        if name not in _nodeColumns:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        if self._props is None:
+            self._props = array.array("Q", [0]) * (core.MB_NODE_COLUMNS*self.nbNodes)
+            err = core.MB_TreeProps(self.imIn.mbIm, self.imNodes.mbIm, self.table,
+                                    self._props)
+            mamba.raiseExceptionOnError(err)
+        c = _nodeColumns[name]
+        return self._props[c*self.nbNodes:(c+1)*self.nbNodes]
+
+    def _values(self, attribute):
+        # Attribute 'attribute' given by its name or by the array of the
+        # values of the nodes
+        if isinstance(attribute, str):
+            return self.getAttribute(attribute)
+        if len(attribute)<self.nbNodes:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        return array.array("Q", attribute)
+
+    def filter(self, attribute, threshold, imOut):
+        """
+        Removes the nodes whose attribute is lower than 'threshold' and puts
+        the filtered image in 'imOut' (8-bit or 32-bit). The pixels of a
+        removed node take the level of the closest node kept above it.
+        'attribute' is the name of an attribute (see getAttribute) or an
+        array of values, one for each node.
+
+        An increasing attribute (area, volume, height) gives an opening
+        (closing for a min-tree).
+        """
+        err = core.MB_TreeFilter(self.imNodes.mbIm, imOut.mbIm, self.table,
+                                 self._values(attribute), threshold)
+        mamba.raiseExceptionOnError(err)
+        imOut.update()
+
+    def build(self, imOut):
+        """
+        Reconstructs the image from its tree and puts it in 'imOut'.
+        """
+        self.filter("area", 0, imOut)
+
+    def dynamicBuild(self, h, imOut):
+        """
+        Puts in 'imOut' the reconstruction of the image by the image lowered
+        by 'h' (raised by 'h' for a min-tree), as build (dualBuild) would
+        compute it.
+        """
+        err = core.MB_TreeDynamicBuild(self.imNodes.mbIm, imOut.mbIm, self.table,
+                                       self.getAttribute("height"), h,
+                                       int(self._dual))
+        mamba.raiseExceptionOnError(err)
+        imOut.update()
+
+    def ultimate(self, attribute, imOut1, imOut2):
+        """
+        Ultimate attribute opening (closing for a min-tree) with the
+        increasing 'attribute' (see filter). 'imOut1' receives the maximal
+        residue and 'imOut2' (32-bit) the size where it is reached.
+        """
+        err = core.MB_TreeUltimateOpening(self.imNodes.mbIm, imOut1.mbIm,
+                                          imOut2.mbIm, self.table,
+                                          self._values(attribute))
+        mamba.raiseExceptionOnError(err)
+        imOut1.update()
+        imOut2.update()
+
+    def granulometry(self, attribute):
+        """
+        Returns the granulometric curve of the filters by the increasing
+        'attribute' (see attributeGranulometry). The volume decreases with
+        the size for a max-tree and increases for a min-tree.
+        """
+        values = self._values(attribute)
+        parents = self.getParents()
+        levels = self.getLevels()
+        area = self.getAttribute("area")
+        losses = {}
+        for n in range(1, self.nbNodes):
+            size = values[n]+1
+            loss = (levels[n]-levels[parents[n]])*area[n]
+            losses[size] = losses.get(size, 0) + loss
+        volume = mamba.computeVolume(self.imIn)
+        curve = [(0, volume)]
+        for size in sorted(losses):
+            # The levels of a min-tree decrease from the root, the removed
+            # nodes are raised to the level of their parent
+            volume -= losses[size]
+            curve.append((size, volume))
+        return curve
+
+    def buildSizes(self, grid=mamba.DEFAULT_GRID):
+        """
+        Returns an array giving for each node the largest size of the
+        openings by reconstruction (closings for a min-tree) that keep it.
+        The openings use the elementary structuring element of 'grid'. The
+        array can be given as attribute to the filter and ultimate methods.
+        """
+        sizes = array.array("Q", [0]) * self.nbNodes
+        se = mamba.structuringElement(mamba.getDirections(grid), grid)
+        err = core.MB_TreeBuildSizes(self.imIn.mbIm, self.imNodes.mbIm, self.table,
+                                     sizes, se.getEncodedDirections(), grid.id)
+        mamba.raiseExceptionOnError(err)
+        return sizes
+
+class minTree(maxTree):
+    """
+    Min-tree of an 8-bit or 32-bit image, built from the lower threshold sets
+    of the image. The levels decrease from the root to the leaves and the
+    heights and volumes are measured below the level of the parent. The
+    methods are those of maxTree.
+    """
+
+    _dual = True
+
+def areaOpening(imIn, imOut, area, grid=mamba.DEFAULT_GRID):
+    """
+    Area opening of 'imIn': the connected components of the threshold sets
+    of 'imIn' with less than 'area' pixels are removed. The result is put in
+    'imOut'.
+
+    The opening is computed through the max-tree of 'imIn'. 'grid' sets the
+    connectivity of the components.
+
+    Only works with 8-bit or 32-bit images.
+    """
+
+    maxTree(imIn, grid).filter("area", area, imOut)
+
+def areaClosing(imIn, imOut, area, grid=mamba.DEFAULT_GRID):
+    """
+    Area closing of 'imIn': the connected components of the lower threshold
+    sets of 'imIn' with less than 'area' pixels are filled. The result is put
+    in 'imOut'.
+
+    The closing is computed through the min-tree of 'imIn'. 'grid' sets the
+    connectivity of the components.
+
+    Only works with 8-bit or 32-bit images.
+    """
+
+    minTree(imIn, grid).filter("area", area, imOut)
+
+def volumeOpening(imIn, imOut, volume, grid=mamba.DEFAULT_GRID):
+    """
+    Volume opening of 'imIn': the connected components of the threshold sets
+    of 'imIn' whose volume (sum of the heights of their pixels above the
+    threshold) is lower than 'volume' are removed. The result is put in
+    'imOut'.
+
+    The opening is computed through the max-tree of 'imIn'. 'grid' sets the
+    connectivity of the components.
+
+    Only works with 8-bit or 32-bit images.
+    """
+
+    maxTree(imIn, grid).filter("volume", volume, imOut)
+
+def volumeClosing(imIn, imOut, volume, grid=mamba.DEFAULT_GRID):
+    """
+    Volume closing of 'imIn', dual operator of volumeOpening. The result is
+    put in 'imOut'.
+
+    The closing is computed through the min-tree of 'imIn'. 'grid' sets the
+    connectivity of the components.
+
+    Only works with 8-bit or 32-bit images.
+    """
+
+    minTree(imIn, grid).filter("volume", volume, imOut)
+
+def attributeGranulometry(imIn, attribute="area", grid=mamba.DEFAULT_GRID):
+    """
+    Computes the granulometric curve of 'imIn' by the attribute openings
+    using 'attribute' ("area", "volume" or "height"). The curve is returned
+    as a list of tuples (size, volume) where volume is the volume of the
+    image opened with this size. The list starts with size 0 (the volume of
+    'imIn') and only holds the sizes where the volume changes.
+
+    All the openings are obtained from a single max-tree of 'imIn'. 'grid'
+    sets the connectivity of the components.
+
+    Only works with 8-bit or 32-bit images.
+    """
+
+    return maxTree(imIn, grid).granulometry(attribute)
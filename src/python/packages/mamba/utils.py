@@ -8,10 +8,18 @@ These functions are not meant to be used by the end user.
 import mamba.core as core
 from .error import *
 
-import struct
+import array
+import glob
+import os
+import sys
 
 from PIL import Image
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 ###############################################################################
 #  Utilities functions
 #
@@ -34,7 +42,24 @@ def create(width,height,depth):
     
     return im
 
-def loadFromPILFormat(pilim, size=None, rgb2l = None):
+def createMapped(path, offset, width, height, depth):
+    """
+    Creates a C core image of size 'width'x'height' and depth 'depth' whose
+    pixels are the raw data found at position 'offset' in file 'path'. The
+    file is mapped in memory, no copy of the pixels is made. The image can
+    be modified but the changes are not written into the file
+    (copy-on-write).
+    
+    Returns a mamba image structure.
+    """
+
+    im = core.MB_Image()
+    err = core.MB_CreateMapped(im, path, offset, width, height, depth)
+    raiseExceptionOnError(err)
+    
+    return im
+
+def loadFromPILFormat(pilim, size=None, rgb2l = None, im_out=None):
     """
     Converts a PIL/PILLOW image into a C core image. All images are converted in grey 
     scale format (i.e. "L" in PIL/PILLOW) before performing computations. The 
@@ -48,6 +73,9 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
     If the image is not fitting in the current size, the image is either padded
     or cropped.
     
+    If 'im_out' is given and has the depth and size of the loaded image, the
+    pixels are loaded into it instead of a newly created image.
+    
     Returns a mamba image structure.
     """
     
@@ -59,7 +87,8 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
         
     # Mode management
     # By default, the image depth is 8-bit
-    # 32-bit images are extracted from I and F modes
+    # 32-bit images are extracted from I and F modes, the typecode gives
+    # the format (array module) and byte order of the PIL data
     depth = 8
     if pilim.mode == 'RGB':
         pilim = pilim.convert("L", rgb2l)
@@ -78,19 +107,19 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
     elif pilim.mode=='I;16':
         depth = 32
         fmt = "H"
-        end = ""
+        end = "little"
     elif pilim.mode=='I;16B':
         depth = 32
         fmt = "H"
-        end = ">"
+        end = "big"
     elif pilim.mode=='I;32' or pilim.mode=='I':
         depth = 32
         fmt = "I"
-        end = ""
+        end = sys.byteorder
     elif pilim.mode=='F;32' or pilim.mode=='F':
         depth = 32
         fmt = "f"
-        end = ""
+        end = sys.byteorder
     else:
         # Ugly ...
         depth = 8
@@ -102,10 +131,15 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
     else:
         (w,h)= pilim.size
     
-    # Creating the mamba image. 
-    im_out = core.MB_Image()
-    err = core.MB_Create(im_out,w,h,depth)
-    raiseExceptionOnError(err)
+    # Creating the mamba image if the given one cannot be reused (its size
+    # is the size rounded by the C core).
+    wc = ((w+core.MB_ROUND_W-1)//core.MB_ROUND_W)*core.MB_ROUND_W
+    hc = ((h+core.MB_ROUND_H-1)//core.MB_ROUND_H)*core.MB_ROUND_H
+    if im_out==None or im_out.depth!=depth or \
+       im_out.width!=wc or im_out.height!=hc:
+        im_out = core.MB_Image()
+        err = core.MB_Create(im_out,w,h,depth)
+        raiseExceptionOnError(err)
     
     # Loading the image data.
     wc = im_out.width
@@ -125,16 +159,28 @@ def loadFromPILFormat(pilim, size=None, rgb2l = None):
         # For 32-bit image, the pil image format may not be exacty the
         # desired format (unsigned 32-bit value). The data are converted
         # into the appropriate format.
-        bypd = struct.calcsize(fmt)
-        unpack_data = struct.unpack(end+wc*hc*fmt, s)
-        unpack_data = [int(v) for v in unpack_data]
-        s = struct.pack(wc*hc*"I", *unpack_data)
+        if numpy!=None:
+            # The data are widened and byte swapped directly into the
+            # image pixels.
+            dtype = numpy.dtype(fmt).newbyteorder(end=='little' and '<' or '>')
+            data = numpy.frombuffer(s, dtype=dtype).reshape(hc, wc)
+            numpy.asarray(im_out)[:,:] = data
+            return im_out
+        data = array.array(fmt)
+        data.frombytes(s)
+        if end!=sys.byteorder:
+            data.byteswap()
+        if fmt=="f":
+            data = array.array("I", map(int, data))
+        elif fmt!="I":
+            data = array.array("I", data)
+        s = data.tobytes()
     err = core.MB_Load(im_out,s,len(s))
     raiseExceptionOnError(err)
     
     return im_out
         
-def load(filename, size=None, rgb2l = None):
+def load(filename, size=None, rgb2l = None, im_out=None):
     """
     Loads an image into a C core image object. You can give any image format
     that is actually supported by PIL/PILLOW. All images are converted in grey scale
@@ -149,15 +195,37 @@ def load(filename, size=None, rgb2l = None):
     If the image is not fitting in the current size, the image is either padded
     or cropped.
     
+    If 'im_out' is given and has the right depth and size, the image is loaded
+    into it (see loadFromPILFormat).
+    
     Returns a mamba image structure.
     """
     
     # Mode management
     pilim = Image.open(filename)
-    im_out = loadFromPILFormat(pilim, size, rgb2l)
+    im_out = loadFromPILFormat(pilim, size, rgb2l, im_out)
     
     return im_out
 
+def listNumberedFiles(path):
+    """
+    Returns the list of the files found in directory 'path' whose names are
+    of the form X.ext where X is a number. The list is sorted in increasing
+    order of X.
+    """
+    
+    all_files = glob.glob(os.path.join(path, '*'))
+    files_dict = {}
+    for f in all_files:
+        try:
+            nb = int(os.path.splitext(os.path.basename(f))[0])
+            files_dict[nb] = f
+        except ValueError:
+            # This file is not named <a_number>.ext
+            pass
+    
+    return [files_dict[nb] for nb in sorted(files_dict.keys())]
+
 def convertToPILFormat(im_in):
     """
     Converts a mamba C core image 'im_in' structure into a PIL image.
@@ -14,6 +14,15 @@ import mamba.core as core
 
 # Arithmetic operators #########################################################
 
+# C functions computing the logical operations of logic3D
+_logicFunctions = {
+    "and": core.MB3D_And,
+    "or": core.MB3D_Or,
+    "xor": core.MB3D_Xor,
+    "inf": core.MB3D_Inf,
+    "sup": core.MB3D_Sup,
+}
+
 def add3D(imIn1, imIn2, imOut):
     """
     Adds 'imIn2' pixel values to 'imIn1' pixel values and puts the result in
@@ -29,14 +38,8 @@ def add3D(imIn1, imIn2, imOut):
     The operation is also saturated for greyscale images (e.g. on a 8-bit
     greyscale image, 255+1=255). With 32-bit images, the addition is not saturated.
     """
-    outl = len(imOut)
-    in1l = len(imIn1)
-    in2l = len(imIn2)
-    if in1l!=outl or in2l!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-
-    for i in range(outl):
-        mamba.add(imIn1[i], imIn2[i], imOut[i])
+    err = core.MB3D_Add(imIn1.mb3DIm, imIn2.mb3DIm, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
 
 def sub3D(imIn1, imIn2, imOut):
     """
@@ -53,14 +56,8 @@ def sub3D(imIn1, imIn2, imOut):
     The operation is also saturated for grey-scale images (e.g. on a grey scale 
     image 0-1=0) but not for 32-bit images.
     """
-    outl = len(imOut)
-    in1l = len(imIn1)
-    in2l = len(imIn2)
-    if in1l!=outl or in2l!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-
-    for i in range(outl):
-        mamba.sub(imIn1[i], imIn2[i], imOut[i])
+    err = core.MB3D_Sub(imIn1.mb3DIm, imIn2.mb3DIm, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
     
 def mul3D(imIn1, imIn2, imOut):
     """
@@ -77,14 +74,8 @@ def mul3D(imIn1, imIn2, imOut):
     The operation is also saturated for greyscale images (e.g. on a greyscale 
     image 255*255=255).
     """
-    outl = len(imOut)
-    in1l = len(imIn1)
-    in2l = len(imIn2)
-    if in1l!=outl or in2l!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-
-    for i in range(outl):
-        mamba.mul(imIn1[i], imIn2[i], imOut[i])
+    err = core.MB3D_Mul(imIn1.mb3DIm, imIn2.mb3DIm, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
     
 def div3D(imIn1, imIn2, imOut):
     """
@@ -100,14 +91,8 @@ def div3D(imIn1, imIn2, imOut):
 	the maximal pixel value whenever the corresponding pixel in 'imIn2' is
 	equal to zero.
     """
-    outl = len(imOut)
-    in1l = len(imIn1)
-    in2l = len(imIn2)
-    if in1l!=outl or in2l!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.div(imIn1[i], imIn2[i], imOut[i])
+    err = core.MB3D_Div(imIn1.mb3DIm, imIn2.mb3DIm, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
 
 def addConst3D(imIn, v, imOut):
     """
@@ -121,13 +106,8 @@ def addConst3D(imIn, v, imOut):
     
     The operation is saturated (limited to 255) for greyscale images.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.addConst(imIn[i], v, imOut[i])
+    err = core.MB3D_ConAdd(imIn.mb3DIm, v, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
     
 def subConst3D(imIn, v, imOut):
     """
@@ -141,13 +121,8 @@ def subConst3D(imIn, v, imOut):
     
     The operation is saturated (lower limit is 0) for greyscale images.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.subConst(imIn[i], v, imOut[i])
+    err = core.MB3D_ConSub(imIn.mb3DIm, v, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
     
 def divConst3D(imIn, v, imOut):
     """
@@ -161,13 +136,8 @@ def divConst3D(imIn, v, imOut):
     For a 8-bit image, v will be restricted between 1 and 255.
     You cannot use it with binary images.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.divConst(imIn[i], v, imOut[i])
+    err = core.MB3D_ConDiv(imIn.mb3DIm, v, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
     
 def mulConst3D(imIn, v, imOut):
     """
@@ -179,13 +149,8 @@ def mulConst3D(imIn, v, imOut):
     The operation is saturated for greyscale images. You cannot use it with 
     binary images.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.mulConst(imIn[i], v, imOut[i])
+    err = core.MB3D_ConMul(imIn.mb3DIm, v, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
         
 def mulRealConst3D(imIn, v, imOut, nearest=False, precision=2):
     """
@@ -213,13 +178,8 @@ def negate3D(imIn, imOut):
     The operation is a binary complement for binary images and a negation for
     greyscale and 32-bit images.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.negate(imIn[i], imOut[i])
+    err = core.MB3D_Inv(imIn.mb3DIm, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
         
 def logic3D(imIn1, imIn2 , imOut, log):
     """
@@ -236,14 +196,11 @@ def logic3D(imIn1, imIn2 , imOut, log):
     'imIn1', imIn2' and 'imOut' can be 1-bit, 8-bit or 32-bit images of same
     size and depth.
     """
-    outl = len(imOut)
-    in1l = len(imIn1)
-    in2l = len(imIn2)
-    if in1l!=outl or in2l!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.logic(imIn1[i], imIn2[i], imOut[i], log)
+    function = _logicFunctions.get(log)
+    if function is None:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    err = function(imIn1.mb3DIm, imIn2.mb3DIm, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
         
 def diff3D(imIn1, imIn2, imOut):
     """
@@ -257,14 +214,8 @@ def diff3D(imIn1, imIn2, imOut):
     'imIn1', imIn2' and 'imOut' can be 1-bit, 8-bit or 32-bit images of same
     size and depth.
     """
-    outl = len(imOut)
-    in1l = len(imIn1)
-    in2l = len(imIn2)
-    if in1l!=outl or in2l!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.diff(imIn1[i], imIn2[i], imOut[i])
+    err = core.MB3D_Diff(imIn1.mb3DIm, imIn2.mb3DIm, imOut.mb3DIm)
+    mamba.raiseExceptionOnError(err)
 
 # Saturated arithmetic operators (for 32-bit images)
 
@@ -14,7 +14,6 @@ import mamba3D as m3D
 import mamba
 import mamba.core as core
 from mambaDisplay import getDisplayer
-import glob
 import os
 
 ################################################################################
@@ -64,6 +63,13 @@ class image3DMb:
         
         When loading a 3D image as a sequence make sure all the images have
         the same size.
+        
+        By adding contiguous=True to the arguments, the 3D image pixels are
+        stored in a single memory block, the 2D images of the sequence being
+        parts of it. The raw data of the 3D image are then loaded and
+        extracted at once and the image can be used as a NumPy array without
+        copy (see __array__). A 3D image created from another one (image3DMb(im3D)
+        or image3DMb(im3D, depth)) uses the same storage unless specified.
         """
         
         global _image3D_index
@@ -78,10 +84,16 @@ class image3DMb:
         
         # List of all the parameters that must be retrieved from the arguments
         self.rgbfilter = None
+        self._contiguous = False
+        if len(args)>0 and isinstance(args[0], image3DMb):
+            self._contiguous = args[0]._contiguous
         # First we look into the dictionnary to see if they were specified
         # specifically by the user
         if "rgbfilter" in kwargs:
             self.rgbfilter = kwargs["rgbfilter"]
+        if "contiguous" in kwargs:
+            self._contiguous = kwargs["contiguous"]
+        self.mb3DIm = None
             
         # We analyze the arguments given to the constructor
         if len(args)==0:
@@ -126,22 +138,45 @@ class image3DMb:
             # -> image3DMb(width, height, length, depth)
             self._createSeq(args[0],args[1],args[3],args[2])
         
-        self.mb3DIm = core.MB3D_Image()
-        err = core.MB3D_Create(self.mb3DIm, len(self.seq))
-        mamba.raiseExceptionOnError(err)
-        for position,im in enumerate(self.seq):
-            err = core.MB3D_Stack(self.mb3DIm, im.mbIm, position)
-            mamba.raiseExceptionOnError(err)
+        if self.mb3DIm is None:
+            self.mb3DIm = self._stackSeq(self.seq)
             
     def _createSeq(self, w, h, d, l):
         # Creates the sequence according to the parameters
         self.length = l
-        self.seq = []
-        for i in range(self.length):
-            self.seq.append(mamba.imageMb(w, h, d, rgbfilter=self.rgbfilter))
+        if self._contiguous:
+            (self.mb3DIm, self.seq) = self._createContiguous(w, h, d, l)
+        else:
+            self.seq = []
+            for i in range(self.length):
+                self.seq.append(mamba.imageMb(w, h, d, rgbfilter=self.rgbfilter))
         self.width, self.height = self.seq[0].getSize()
         self.depth = self.seq[0].getDepth()
         
+    def _stackSeq(self, seq):
+        # Creates the C core 3D image stacking the images of 'seq'
+        mb3DIm = core.MB3D_Image()
+        err = core.MB3D_Create(mb3DIm, len(seq))
+        mamba.raiseExceptionOnError(err)
+        for position,im in enumerate(seq):
+            err = core.MB3D_Stack(mb3DIm, im.mbIm, position)
+            mamba.raiseExceptionOnError(err)
+        return mb3DIm
+        
+    def _createContiguous(self, w, h, d, l):
+        # Creates a C core 3D image stored in a single memory block and
+        # the sequence of its images. The images keep the C core 3D image
+        # alive as they do not own their pixels.
+        mb3DIm = core.MB3D_Image()
+        err = core.MB3D_CreateContiguous(mb3DIm, w, h, d, l)
+        mamba.raiseExceptionOnError(err)
+        seq = []
+        for i in range(l):
+            im = mamba.imageMb._fromMbIm(mb3DIm._plane(i), "%s - %d" % (self.name, i+1))
+            im._volume = mb3DIm
+            seq.append(im)
+        return (mb3DIm, seq)
+        
     def __iter__(self):
         """
         Makes a mamba image sequence iterable.
@@ -210,22 +245,38 @@ class image3DMb:
         assert(len(data)==im_size*self.length)
         
         # Loading the data
-        for i,im in enumerate(self.seq):
-            err = core.MB_Load(im.mbIm, data[i*im_size:(i+1)*im_size], im_size)
-            mamba.raiseExceptionOnError(err)
+        err = core.MB3D_Load(self.mb3DIm, data, len(data))
+        mamba.raiseExceptionOnError(err)
         
     def extractRaw(self):
         """
         Extracts and returns the image raw string data.
         This method only works on 8 and 32-bit images.
         """
-        data = b""
-        for im in self.seq:
-            err,s = core.MB_Extract(im.mbIm)
-            mamba.raiseExceptionOnError(err)
-            data += s
+        err,data = core.MB3D_Extract(self.mb3DIm)
+        mamba.raiseExceptionOnError(err)
         return data
         
+    def __array__(self, dtype=None, copy=None):
+        """
+        Returns a NumPy array of shape (length, height, width) holding the
+        pixels of the 3D image. If the 3D image was created with
+        contiguous=True, the array shares its memory with the image (no copy
+        is made unless 'copy' is True or a different 'dtype' is requested)
+        and writing into the array modifies the image pixels. Otherwise the
+        pixels are always copied.
+        
+        Binary images give the bit-packed pixels (see mamba.imageMb.__array__).
+        """
+        import numpy
+        if self._contiguous:
+            if copy is None:
+                return numpy.asarray(self.mb3DIm, dtype=dtype)
+            return numpy.array(self.mb3DIm, dtype=dtype, copy=copy)
+        if copy is False:
+            raise ValueError("the images of the 3D image are not contiguous")
+        return numpy.stack([numpy.asarray(im.mbIm, dtype=dtype) for im in self.seq])
+        
     def load(self, path, rgbfilter=None):
         """
         Loads a 3D stack (sequence) of images found in directory 'path'.
@@ -243,32 +294,31 @@ class image3DMb:
         """
         
         self.name = path
-        all_files = glob.glob(os.path.join(path, '*'))
-        files_dict = {}
-        for f in all_files:
-            try:
-                nb = int(os.path.splitext(os.path.basename(f))[0])
-                files_dict[nb] = f
-            except ValueError:
-                # This file is not named <a_number>.ext
-                pass
-        files_keys = sorted(files_dict.keys())
-        
-        if self.seq == []:
+        files = mamba.utils.listNumberedFiles(path)
+        
+        if self.seq == [] and self._contiguous:
+            # There is no image yet in the sequence, its size is given by
+            # the first image
+            im = mamba.imageMb(files[0], self.depth, rgbfilter=rgbfilter)
+            self._createSeq(im.mbIm.width, im.mbIm.height, self.depth, len(files))
+            mamba.copy(im, self.seq[0])
+            for i in range(1,self.length):
+                self.seq[i].load(files[i], rgbfilter=rgbfilter)
+        elif self.seq == []:
             # There is no image yet in the sequence
-            self.length = len(files_keys)
-            im = mamba.imageMb(files_dict[files_keys[0]], self.depth, rgbfilter=rgbfilter)
+            self.length = len(files)
+            im = mamba.imageMb(files[0], self.depth, rgbfilter=rgbfilter)
             self.width = im.mbIm.width
             self.height = im.mbIm.height
             self.seq.append(im)
             for i in range(1,self.length):
                 self.seq.append(mamba.imageMb(self.width, self.height, self.depth, rgbfilter=rgbfilter))
-                self.seq[i].load(files_dict[files_keys[i]], rgbfilter=rgbfilter)
+                self.seq[i].load(files[i], rgbfilter=rgbfilter)
         else:
-            l = min(len(files_keys),self.length)
+            l = min(len(files),self.length)
             # The sequence is overloaded 
             for i in range(l):
-                self.seq[i].load(files_dict[files_keys[i]], rgbfilter=rgbfilter)
+                self.seq[i].load(files[i], rgbfilter=rgbfilter)
      
     def save(self, path, extension=".png", palette=None):
         """
@@ -329,16 +379,16 @@ class image3DMb:
         A zero value makes the image completely dark.
         """
         
-        for im in self.seq:
-            im.fill(v)
+        err = core.MB3D_ConSet(self.mb3DIm, v)
+        mamba.raiseExceptionOnError(err)
 
     def reset(self):
         """
         Resets the 3D image (all the pixels are put to 0).
         """
         
-        for im in self.seq:
-            im.reset()
+        err = core.MB3D_ConSet(self.mb3DIm, 0)
+        mamba.raiseExceptionOnError(err)
         
     def convert(self, depth):
         """
@@ -347,14 +397,14 @@ class image3DMb:
         convert3D function (see this function for details).
         """
 
-        mb3DIm = core.MB3D_Image()
-        err = core.MB3D_Create(mb3DIm, self.length)
-        mamba.raiseExceptionOnError(err)
-        seq = []
-        for i in range(self.length):
-            seq.append(mamba.imageMb(self.width, self.height, depth, rgbfilter=self.rgbfilter))
-            err = core.MB3D_Stack(mb3DIm, seq[-1].mbIm, i)
-            mamba.raiseExceptionOnError(err)
+        if self._contiguous:
+            (mb3DIm, seq) = self._createContiguous(self.width, self.height,
+                                                   depth, self.length)
+        else:
+            seq = []
+            for i in range(self.length):
+                seq.append(mamba.imageMb(self.width, self.height, depth, rgbfilter=self.rgbfilter))
+            mb3DIm = self._stackSeq(seq)
 
         err = core.MB3D_Convert(self.mb3DIm, mb3DIm)
         mamba.raiseExceptionOnError(err)
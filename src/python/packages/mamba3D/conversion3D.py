@@ -39,13 +39,8 @@ def convertByMask3D(imIn, imOut, mFalse, mTrue):
     
     This function works with 3D images.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.convertByMask(imIn[i], imOut[i], mFalse, mTrue)
+    err = core.MB3D_Mask(imIn.mb3DIm, imOut.mb3DIm, mFalse, mTrue)
+    mamba.raiseExceptionOnError(err)
 
 def threshold3D(imIn, imOut, low, high):
     """
@@ -60,13 +55,8 @@ def threshold3D(imIn, imOut, low, high):
     
     This function works with 3D images.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.threshold(imIn[i], imOut[i], low, high)
+    err = core.MB3D_Thresh(imIn.mb3DIm, imOut.mb3DIm, low, high)
+    mamba.raiseExceptionOnError(err)
     
 def generateSupMask3D(imIn1, imIn2, imOut, strict):
     """
@@ -77,14 +67,8 @@ def generateSupMask3D(imIn1, imIn2, imOut, strict):
     'imIn1' and imIn2' can be 1-bit, 8-bit or 32-bit images of same
     size, length and depth.
     """
-    outl = len(imOut)
-    in1l = len(imIn1)
-    in2l = len(imIn2)
-    if in1l!=outl or in2l!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.generateSupMask(imIn1[i], imIn2[i], imOut[i], strict)
+    err = core.MB3D_SupMask(imIn1.mb3DIm, imIn2.mb3DIm, imOut.mb3DIm, int(strict))
+    mamba.raiseExceptionOnError(err)
         
 def lookup3D(imIn, imOut, lutable):
     """
@@ -94,11 +78,6 @@ def lookup3D(imIn, imOut, lutable):
     'lutable' is a list containing 256 values with the first one corresponding 
     to 0 and the last one to 255.
     """
-    outl = len(imOut)
-    inl = len(imIn)
-    if inl!=outl:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    
-    for i in range(outl):
-        mamba.lookup(imIn[i], imOut[i], lutable)
+    err = core.MB3D_Lookup(imIn.mb3DIm, imOut.mb3DIm, lutable)
+    mamba.raiseExceptionOnError(err)
 
@@ -17,6 +17,10 @@ def copy3D(imIn, imOut, firstPlaneIn=0, firstPlaneOut=0):
     Copies 3D image 'imIn' into 'imOut'. 'firstPlaneIn' indicates the starting
     plane inside 'imIn' and 'firstPlaneOut' the starting plane inside 'imOut'.
     """
+    if firstPlaneIn==0 and firstPlaneOut==0 and len(imIn)==len(imOut):
+        err = core.MB3D_Copy(imIn.mb3DIm, imOut.mb3DIm)
+        mamba.raiseExceptionOnError(err)
+        return
     nbPlanes = min(len(imOut)-firstPlaneOut, len(imIn)-firstPlaneIn)
     for i in range(nbPlanes):
         mamba.copy(imIn[i+firstPlaneIn], imOut[i+firstPlaneOut])
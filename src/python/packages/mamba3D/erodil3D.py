@@ -78,6 +78,18 @@ class structuringElement3D:
             return self.directions_w0[:]
         return self.directions[:]
         
+    def getEncodedDirections(self, withoutZero=False):
+        """
+        Returns the directions of the structuring element encoded in a single
+        value (bit d set for direction d) as expected by the 3D neighbor
+        functions of the library. If 'withoutZero' is set to True, direction 0
+        is not included.
+        """
+        enc = 0
+        for d in self.getDirections(withoutZero):
+            enc |= 1<<d
+        return enc
+        
     def hasZero(self):
         """
         Returns True if the central point (0) is included in the direction list.
@@ -104,6 +116,27 @@ CUBE3X3X3 = structuringElement3D(list(range(27)) , m3D.CUBIC)
 # Dilation and erosion functions
 ################################################################################
 
+def _neighbor3D(function, imIn, imOut, n, se, edge, init):
+    # Applies 'n' times the 3D neighbor operation 'function' (MB3D_InfNb or
+    # MB3D_SupNb) with structuring element 'se'. The library computes the
+    # whole 3D image in a single call. When 'se' does not contain the origin,
+    # 'imOut' is filled with 'init' before each step.
+    m3D.copy3D(imIn, imOut)
+    neighbors = se.getEncodedDirections(withoutZero=True)
+    grid = se.getGrid().getCValue()
+    if se.hasZero():
+        for size in range(n):
+            err = function(imOut.mb3DIm, imOut.mb3DIm, neighbors, grid, edge.id)
+            mamba.raiseExceptionOnError(err)
+    else:
+        imWrk = m3D.image3DMb(imOut)
+        for size in range(n):
+            m3D.copy3D(imOut, imWrk)
+            imOut.fill(init)
+            err = function(imWrk.mb3DIm, imOut.mb3DIm, neighbors, grid, edge.id)
+            mamba.raiseExceptionOnError(err)
+    imOut.update()
+    
 def dilate3D(imIn, imOut, n=1, se=CUBOCTAHEDRON1, edge=mamba.EMPTY):
     """
     This operator performs a dilation, using the structuring element 'se' (set
@@ -115,34 +148,9 @@ def dilate3D(imIn, imOut, n=1, se=CUBOCTAHEDRON1, edge=mamba.EMPTY):
     in use is at position 0 even if this point does not belong to it.
     """
     
-    (width,height,length) = imIn.getSize()
-    depth = imIn.getDepth()
-    if length!=len(imOut):
+    if len(imIn)!=len(imOut):
         mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    zext = se.grid.getZExtension()
-    imWrk = m3D.image3DMb(width, height, length+zext*2, depth)
-    if edge==mamba.EMPTY:
-        for i in range(zext):
-            imWrk[i].reset()
-            imWrk[length+zext*2-1-i].reset()
-    else:
-        value = mamba.computeMaxRange(imIn[0])[1]
-        for i in range(zext):
-            imWrk[i].fill(value)
-            imWrk[length+zext*2-1-i].fill(value)
-    
-    m3D.copy3D(imIn, imOut)
-    
-    dirs = se.getDirections(withoutZero=True)
-    for size in range(n):
-        m3D.copy3D(imOut, imWrk, 0, 1)
-        if not se.hasZero():
-            imOut.reset()
-        for i in range(length):
-            dirs_enc = se.grid.getEncodedDirs(dirs,i)
-            mamba.supNeighbor(imWrk[i], imOut[i], dirs_enc[-1], grid=se.grid.get2DGrid(), edge=edge)
-            mamba.supNeighbor(imWrk[i+1], imOut[i], dirs_enc[0], grid=se.grid.get2DGrid(), edge=edge)
-            mamba.supNeighbor(imWrk[i+2], imOut[i], dirs_enc[1], grid=se.grid.get2DGrid(), edge=edge)
+    _neighbor3D(core.MB3D_SupNb, imIn, imOut, n, se, edge, 0)
     
 def linearDilate3D(imIn, imOut, d, n=1, grid=m3D.DEFAULT_GRID3D, edge=mamba.EMPTY):
     """
@@ -167,34 +175,9 @@ def erode3D(imIn, imOut, n=1, se=CUBOCTAHEDRON1, edge=mamba.FILLED):
     in use is at position 0 even if this point does not belong to it.
     """
     
-    (width,height,length) = imIn.getSize()
-    depth = imIn.getDepth()
-    if length!=len(imOut):
+    if len(imIn)!=len(imOut):
         mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
-    zext = se.grid.getZExtension()
-    imWrk = m3D.image3DMb(width, height, length+zext*2, depth)
-    if edge==mamba.EMPTY:
-        for i in range(zext):
-            imWrk[i].reset()
-            imWrk[length+zext*2-1-i].reset()
-    else:
-        value = mamba.computeMaxRange(imIn[0])[1]
-        for i in range(zext):
-            imWrk[i].fill(value)
-            imWrk[length+zext*2-1-i].fill(value)
-    
-    m3D.copy3D(imIn, imOut)
-    
-    dirs = se.getDirections(withoutZero=True)
-    for size in range(n):
-        m3D.copy3D(imOut, imWrk, 0, 1)
-        if not se.hasZero():
-            imOut.fill(m3D.computeMaxRange3D(imIn)[1])
-        for i in range(length):
-            dirs_enc = se.grid.getEncodedDirs(dirs,i)
-            mamba.infNeighbor(imWrk[i], imOut[i], dirs_enc[-1], grid=se.grid.get2DGrid(), edge=edge)
-            mamba.infNeighbor(imWrk[i+1], imOut[i], dirs_enc[0], grid=se.grid.get2DGrid(), edge=edge)
-            mamba.infNeighbor(imWrk[i+2], imOut[i], dirs_enc[1], grid=se.grid.get2DGrid(), edge=edge)
+    _neighbor3D(core.MB3D_InfNb, imIn, imOut, n, se, edge, mamba.computeMaxRange(imIn[0])[1])
     
 def linearErode3D( imIn, imOut, d, n=1, grid=m3D.DEFAULT_GRID3D, edge=mamba.FILLED):
     """
@@ -11,36 +11,6 @@ import mamba3D as m3D
 import mamba
 import mamba.core as core
 
-################################################################################
-# Private functions to cover all the depth cases for build and dualbuild 
-# functions
-
-def _build3D_1(imMask, imInout, grid):
-    # Build function for binary 3D images
-    if imMask.getDepth()!=1:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
-    imMask_8 = m3D.image3DMb(imMask, 8)
-    imInout_8= m3D.image3DMb(imInout, 8)
-    m3D.convert3D(imMask, imMask_8)
-    m3D.convert3D(imInout, imInout_8)
-    err = core.MB3D_HierarBld(imMask_8.mb3DIm, imInout_8.mb3DIm, grid.getCValue())
-    mamba.raiseExceptionOnError(err)
-    m3D.convert3D(imMask_8, imMask)
-    m3D.convert3D(imInout_8, imInout)
-
-def _dualBuild3D_1(imMask, imInout, grid):
-    # Build function for binary 3D images
-    if imMask.getDepth()!=1:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
-    imMask_8 = m3D.image3DMb(imMask, 8)
-    imInout_8= m3D.image3DMb(imInout, 8)
-    m3D.convert3D(imMask, imMask_8)
-    m3D.convert3D(imInout, imInout_8)
-    err = core.MB3D_HierarDualBld(imMask_8.mb3DIm, imInout_8.mb3DIm, grid.getCValue())
-    mamba.raiseExceptionOnError(err)
-    m3D.convert3D(imMask_8, imMask)
-    m3D.convert3D(imInout_8, imInout)
-
 ################################################################################
 
 def upperGeodesicDilate3D(imIn, imMask, imOut, n=1, se=m3D.CUBOCTAHEDRON1):
@@ -154,17 +124,15 @@ def build3D(imMask, imInout, grid=m3D.DEFAULT_GRID3D):
     the geodesic reconstruction of 'imInout' inside the mask image and puts the
     result in the same image.
     
-    This operator uses a hierarchical implementation of the reconstruction.
+    This operator uses a hierarchical implementation of the reconstruction
+    (binary images are rebuilt directly on their packed pixels).
     
     This function will use the mamba3D default grid unless specified otherwise
     in 'grid'. It works only with grids FACE_CENTER_CUBIC and CUBIC.
     """
     
-    if imInout.getDepth()==1:
-        _build3D_1(imMask, imInout, grid)
-    else:
-        err = core.MB3D_HierarBld(imMask.mb3DIm, imInout.mb3DIm, grid.getCValue())
-        mamba.raiseExceptionOnError(err)
+    err = core.MB3D_HierarBld(imMask.mb3DIm, imInout.mb3DIm, grid.getCValue())
+    mamba.raiseExceptionOnError(err)
 
 def dualBuild3D(imMask, imInout, grid=m3D.DEFAULT_GRID3D):
     """
@@ -172,17 +140,15 @@ def dualBuild3D(imMask, imInout, grid=m3D.DEFAULT_GRID3D):
     This operator performs the geodesic dual reconstruction (by erosions)
     of 'imInout' inside the mask image and puts the result in the same image.
     
-    This operator uses a hierarchical implementation of the reconstruction.
+    This operator uses a hierarchical implementation of the reconstruction
+    (binary images are rebuilt directly on their packed pixels).
     
     This function will use the mamba3D default grid unless specified otherwise
     in 'grid'. It works only with grids FACE_CENTER_CUBIC and CUBIC.
     """
     
-    if imInout.getDepth()==1:
-        _dualBuild3D_1(imMask, imInout, grid)
-    else:
-        err = core.MB3D_HierarDualBld(imMask.mb3DIm, imInout.mb3DIm, grid.getCValue())
-        mamba.raiseExceptionOnError(err)
+    err = core.MB3D_HierarDualBld(imMask.mb3DIm, imInout.mb3DIm, grid.getCValue())
+    mamba.raiseExceptionOnError(err)
 
 def closeHoles3D(imIn, imOut, grid=m3D.DEFAULT_GRID3D):
     """
@@ -286,20 +286,16 @@ class _gridCCubic3D(_grid3D):
         return 16
     
     def getCValue(self):
-        return core.MB3D_INVALID_GRID
+        return core.MB3D_CC_GRID
     
     def __repr__(self):
         return "mamba3D."+self.name
     
     def __eq__(self, other):
-        comp  = other.getCValue()==core.MB3D_INVALID_GRID
-        comp &= other.maxNeighbors()==16
-        return comp
+        return other.getCValue()==core.MB3D_CC_GRID
     
     def __ne__(self, other):
-        comp  = other.getCValue()==core.MB3D_INVALID_GRID
-        comp &= other.maxNeighbors()==16
-        return not comp
+        return other.getCValue()!=core.MB3D_CC_GRID
 
 CENTER_CUBIC = _gridCCubic3D()
 
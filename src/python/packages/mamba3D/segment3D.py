@@ -31,7 +31,7 @@ def label3D(imIn, imOut, lblow=0, lbhigh=256, grid=m3D.DEFAULT_GRID3D):
     mamba.raiseExceptionOnError(err)
     return nbobj
 
-def watershedSegment3D(imIn, imMarker, grid=m3D.DEFAULT_GRID3D, max_level=0):
+def watershedSegment3D(imIn, imMarker, grid=m3D.DEFAULT_GRID3D, max_level=0, slabs=False):
     """
     Segments greyscale or 32-bit 3D image 'imIn' using the watershed algorithm.
     'imMarker' is used both as the marker image (the wells from which the
@@ -47,13 +47,20 @@ def watershedSegment3D(imIn, imMarker, grid=m3D.DEFAULT_GRID3D, max_level=0):
     original marker). The last plane represents the actual watershed line
     (pixels set to 255).
     
+    If 'slabs' is True, the planes are split into slabs flooded concurrently
+    by the threads (see setThreadNumber). The result is the same but the
+    total amount of work is larger, so this is only faster with enough cores.
+    
     This operator works only with grids FACE_CENTER_CUBIC and CUBIC.
     """
     
-    err = core.MB3D_Watershed(imIn.mb3DIm, imMarker.mb3DIm, max_level, grid.getCValue())
+    if slabs:
+        err = core.MB3D_SlabWatershed(imIn.mb3DIm, imMarker.mb3DIm, max_level, grid.getCValue())
+    else:
+        err = core.MB3D_Watershed(imIn.mb3DIm, imMarker.mb3DIm, max_level, grid.getCValue())
     mamba.raiseExceptionOnError(err)
 
-def basinSegment3D(imIn, imMarker, grid=m3D.DEFAULT_GRID3D, max_level=0):
+def basinSegment3D(imIn, imMarker, grid=m3D.DEFAULT_GRID3D, max_level=0, slabs=False):
     """
     Segments 3D image 'imIn' (greyscale or 32-bit) using the watershed algorithm.
     'imMarker' is used both as the marker image (the wells from which the
@@ -70,10 +77,17 @@ def basinSegment3D(imIn, imMarker, grid=m3D.DEFAULT_GRID3D, max_level=0):
     line) and is faster than watershedSegment3D if you are not interested in the 
     watershed line.
     
+    If 'slabs' is True, the planes are split into slabs flooded concurrently
+    by the threads (see setThreadNumber). The result is the same but the
+    total amount of work is larger, so this is only faster with enough cores.
+    
     This operator works only with grids FACE_CENTER_CUBIC and CUBIC.
     """
     
-    err = core.MB3D_Basins(imIn.mb3DIm, imMarker.mb3DIm, max_level, grid.getCValue())
+    if slabs:
+        err = core.MB3D_SlabBasins(imIn.mb3DIm, imMarker.mb3DIm, max_level, grid.getCValue())
+    else:
+        err = core.MB3D_Basins(imIn.mb3DIm, imMarker.mb3DIm, max_level, grid.getCValue())
     mamba.raiseExceptionOnError(err)
 
 def markerControlledWatershed3D(imIn, imMarkers, imOut, grid=m3D.DEFAULT_GRID3D):
@@ -28,7 +28,14 @@
  * THE SOFTWARE.
  */
 
-%module core
+%module(threads="1") core
+
+/* The interpreter lock is released during the calls to the library so
+ * that the other Python threads can run while an image is computed. The
+ * functions creating Python objects keep it.
+ */
+%nothread MB_Image::_pixelsAddress;
+%nothread MB3D_Image::_pixelsAddress;
 
 /* Inclusion inside the c file wrapper created by swig*/
 %{
@@ -164,11 +171,140 @@
     }
 }
 
+%typemap(in) (MB_Image **psrcs, Uint32 nbsrcs) {
+    if (PyList_Check($input)) {
+        int size = PyList_Size($input);
+        int i = 0;
+        $2 = (Uint32) size;
+        $1 = (MB_Image **) malloc((size+1)*sizeof(MB_Image *));
+        for (i = 0; i < size; i++) {
+            PyObject *o = PyList_GetItem($input,i);
+            if (SWIG_ConvertPtr(o, (void **) &$1[i], $descriptor(MB_Image *), 0) == -1) {
+                PyErr_SetString(PyExc_TypeError,"list must contain images");
+                free($1);
+                return NULL;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,"not a list");
+        return NULL;
+    }
+}
+
+%typemap(freearg) (MB_Image **psrcs, Uint32 nbsrcs) {
+    free((MB_Image **) $1);
+}
+
+%typemap(in) (Uint32 *pprog, Uint32 proglen) {
+    if (PyList_Check($input)) {
+        int size = PyList_Size($input);
+        int i = 0;
+        $2 = (Uint32) size;
+        $1 = (Uint32 *) malloc((size+1)*sizeof(Uint32));
+        for (i = 0; i < size; i++) {
+            PyObject *o = PyList_GetItem($input,i);
+            if (PyInt_Check(o))
+                $1[i] = (Uint32) PyLong_AsUnsignedLongMask(o);
+            else {
+                PyErr_SetString(PyExc_TypeError,"list must contain integer");
+                free($1);
+                return NULL;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,"not a list");
+        return NULL;
+    }
+}
+
+%typemap(freearg) (Uint32 *pprog, Uint32 proglen) {
+    free((Uint32 *) $1);
+}
+
+%typemap(in) (Uint64 *pprops, Uint32 nbrows) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_WRITABLE)!=0) {
+        PyErr_SetString(PyExc_TypeError,"expecting a writable buffer");
+        return NULL;
+    }
+    $1 = (Uint64 *) view.buf;
+    $2 = (Uint32) (view.len/(MB_REGION_COLUMNS*sizeof(Uint64)));
+}
+
+%typemap(freearg) (Uint64 *pprops, Uint32 nbrows) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (Uint32 *plabels, Uint32 nblabels) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_WRITABLE)!=0) {
+        PyErr_SetString(PyExc_TypeError,"expecting a writable buffer");
+        return NULL;
+    }
+    $1 = (Uint32 *) view.buf;
+    $2 = (Uint32) (view.len/sizeof(Uint32));
+}
+
+%typemap(freearg) (Uint32 *plabels, Uint32 nblabels) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (Uint32 *pvalues, Uint32 nbvalues) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_SIMPLE)!=0) {
+        PyErr_SetString(PyExc_TypeError,"expecting a buffer");
+        return NULL;
+    }
+    $1 = (Uint32 *) view.buf;
+    $2 = (Uint32) (view.len/sizeof(Uint32));
+}
+
+%typemap(freearg) (Uint32 *pvalues, Uint32 nbvalues) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (Uint32 *ptree, Uint32 nbnodes) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_WRITABLE)!=0) {
+        PyErr_SetString(PyExc_TypeError,"expecting a writable buffer");
+        return NULL;
+    }
+    $1 = (Uint32 *) view.buf;
+    $2 = (Uint32) (view.len/(MB_TREE_COLUMNS*sizeof(Uint32)));
+}
+
+%typemap(freearg) (Uint32 *ptree, Uint32 nbnodes) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (Uint64 *pnodeprops, Uint32 nbrows) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_WRITABLE)!=0) {
+        PyErr_SetString(PyExc_TypeError,"expecting a writable buffer");
+        return NULL;
+    }
+    $1 = (Uint64 *) view.buf;
+    $2 = (Uint32) (view.len/(MB_NODE_COLUMNS*sizeof(Uint64)));
+}
+
+%typemap(freearg) (Uint64 *pnodeprops, Uint32 nbrows) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (Uint64 *pattr, Uint32 nbattr) (Py_buffer view) {
+    if (PyObject_GetBuffer($input, &view, PyBUF_WRITABLE)!=0) {
+        PyErr_SetString(PyExc_TypeError,"expecting a writable buffer");
+        return NULL;
+    }
+    $1 = (Uint64 *) view.buf;
+    $2 = (Uint32) (view.len/sizeof(Uint64));
+}
+
+%typemap(freearg) (Uint64 *pattr, Uint32 nbattr) {
+    PyBuffer_Release(&view$argnum);
+}
+
 %apply int *OUTPUT {Sint32 *px, Sint32 *py};
 %apply unsigned int *OUTPUT {Uint32 *min, Uint32 *max};
 %apply unsigned long long *OUTPUT {Uint64 *pVolume};
 %apply unsigned int *OUTPUT {Uint32 *isEmpty};
 %apply unsigned int *OUTPUT {Uint32 *pNbobj};
+%apply unsigned int *OUTPUT {Uint32 *pNbnodes};
 %apply unsigned int *OUTPUT {Uint32 *pixVal};
 %apply unsigned int *OUTPUT {Uint32 *ulx, Uint32 *uly, Uint32 *brx, Uint32 *bry};
 
@@ -188,7 +324,36 @@
     /* Image destructor */
     ~MB_Image() {
         MB_Destroy($self);
-    }    
+    }
+    
+    /* Address of the pixel array (used to share the pixels without copy) */
+    PyObject *_pixelsAddress() {
+        return PyLong_FromVoidPtr((void *) $self->pixels);
+    }
+    
+    %pythoncode %{
+    @property
+    def __array_interface__(self):
+        """
+        Exposes the pixel array of the image without copying it (NumPy
+        array interface). The array shape is (height, width) for 8-bit
+        and 32-bit images. Binary images are exposed bit-packed, as
+        (height, width/8) bytes, pixel x being bit x%8 of byte x/8.
+        """
+        import sys
+        if self.depth == 32:
+            typestr = (sys.byteorder == 'little' and '<' or '>') + 'u4'
+            itemsize = 4
+        else:
+            typestr = '|u1'
+            itemsize = 1
+        linesize = (self.width*self.depth)//8
+        return {'version': 3,
+                'shape': (self.height, linesize//itemsize),
+                'typestr': typestr,
+                'strides': (linesize, itemsize),
+                'data': (self._pixelsAddress(), False)}
+    %}
 }
 
 /* extending the MB3D_Image structure with creator and destructor */
@@ -198,6 +363,45 @@
     ~MB3D_Image() {
         MB3D_Destroy($self);
     }    
+    
+    /* Image at the given position (owned by the 3D image) */
+    MB_Image *_plane(Uint32 position) {
+        if (position>=$self->length) return NULL;
+        return $self->seq[position];
+    }
+    
+    /* Address of the contiguous pixel array (0 if the images were stacked) */
+    PyObject *_pixelsAddress() {
+        return PyLong_FromVoidPtr((void *) $self->pixels);
+    }
+    
+    %pythoncode %{
+    @property
+    def __array_interface__(self):
+        """
+        Exposes the contiguous pixel array of the 3D image without copying
+        it (NumPy array interface), with shape (length, height, width) for
+        8-bit and 32-bit images. Binary images are exposed bit-packed, as
+        (length, height, width/8) bytes. Only available for 3D images
+        created by MB3D_CreateContiguous.
+        """
+        import sys
+        if self._pixelsAddress() == 0:
+            raise AttributeError("the images of the 3D image are not contiguous")
+        plane = self._plane(0)
+        if plane.depth == 32:
+            typestr = (sys.byteorder == 'little' and '<' or '>') + 'u4'
+            itemsize = 4
+        else:
+            typestr = '|u1'
+            itemsize = 1
+        linesize = (plane.width*plane.depth)//8
+        return {'version': 3,
+                'shape': (self.length, plane.height, linesize//itemsize),
+                'typestr': typestr,
+                'strides': (plane.height*linesize, linesize, itemsize),
+                'data': (self._pixelsAddress(), False)}
+    %}
 }
 
 
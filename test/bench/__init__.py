@@ -0,0 +1,3 @@
+#
+# package placeholder
+#
@@ -0,0 +1,115 @@
+"""
+Benchmarks of the heavy Python operators of the mamba package.
+
+The operators are timed over random images smoothed by an alternate filter,
+so that their regions and basins are not reduced to single pixels.
+"""
+
+
+#Permission is hereby granted, free of charge, to any person
+#obtaining a copy of this software and associated documentation files
+#(the "Software"), to deal in the Software without restriction, including
+#without limitation the rights to use, copy, modify, merge, publish, 
+#distribute, sublicense, and/or sell copies of the Software, and to permit 
+#persons to whom the Software is furnished to do so, subject to the following 
+#conditions: The above copyright notice and this permission notice shall be 
+#included in all copies or substantial portions of the Software.
+
+#Except as contained in this notice, the names of the above copyright 
+#holders shall not be used in advertising or otherwise to promote the sale, 
+#use or other dealings in this Software without their prior written 
+#authorization.
+
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+from mamba import *
+from tools.MambaBenchRunner import Benchmark, randomImage
+
+GRIDS = (HEXAGONAL, SQUARE)
+
+def _smoothImage(size, depth, grid=DEFAULT_GRID):
+    # Random image smoothed by an alternate filter so that its regions and
+    # basins have a realistic size
+    im = randomImage(size, 8)
+    alternateFilter(im, im, 2, True, structuringElement(getDirections(grid), grid))
+    if depth==1:
+        imOut = imageMb(im, 1)
+        threshold(im, imOut, 128, 255)
+    elif depth==32:
+        imOut = imageMb(im, 32)
+        convert(im, imOut)
+    else:
+        imOut = im
+    return imOut
+
+def _markers(size):
+    # Regularly spaced markers
+    imMarker = imageMb(size, size, 32)
+    imMarker.reset()
+    label = 1
+    for y in range(size//32, size, size//16):
+        for x in range(size//32, size, size//16):
+            imMarker.setPixel(label, (x, y))
+            label += 1
+    return imMarker
+
+def _buildSetup(size, depth, grid):
+    imMask = _smoothImage(size, depth, grid)
+    imMarker = imageMb(imMask)
+    imInout = imageMb(imMask)
+    if depth==1:
+        erode(imMask, imMarker, 4, se=structuringElement(getDirections(grid), grid))
+    else:
+        subConst(imMask, 32, imMarker)
+    def run():
+        copy(imMarker, imInout)
+        build(imMask, imInout, grid=grid)
+    return run
+
+def _watershedSetup(size, depth, grid):
+    imIn = _smoothImage(size, depth, grid)
+    imMarker = _markers(size)
+    imInout = imageMb(imMarker)
+    def run():
+        copy(imMarker, imInout)
+        watershedSegment(imIn, imInout, grid=grid)
+    return run
+
+def _labelSetup(size, depth, grid):
+    imIn = _smoothImage(size, depth, grid)
+    imOut = imageMb(size, size, 32)
+    return lambda: label(imIn, imOut, grid=grid)
+
+def _largeHexagonalErodeSetup(size, depth, grid):
+    imIn = _smoothImage(size, depth)
+    imOut = imageMb(imIn)
+    return lambda: largeHexagonalErode(imIn, imOut, 20)
+
+def _waterfallsSetup(size, depth, grid):
+    imIn = _smoothImage(size, 8, grid)
+    imWts = imageMb(imIn)
+    gradient(imIn, imWts, se=structuringElement(getDirections(grid), grid))
+    valuedWatershed(imWts, imIn, grid=grid)
+    imOut = imageMb(imIn)
+    return lambda: waterfalls(imIn, imOut, grid=grid)
+
+def _measureLabellingSetup(size, depth, grid):
+    imIn = _smoothImage(size, 1)
+    imMeasure = randomImage(size, 1)
+    imOut = imageMb(size, size, 32)
+    return lambda: measureLabelling(imIn, imMeasure, imOut)
+
+BENCHMARKS = [
+    Benchmark("build", _buildSetup, (1, 8, 32), GRIDS),
+    Benchmark("watershedSegment", _watershedSetup, (8, 32), GRIDS),
+    Benchmark("label", _labelSetup, (1, 8), GRIDS),
+    Benchmark("largeHexagonalErode", _largeHexagonalErodeSetup, (1, 8, 32)),
+    Benchmark("waterfalls", _waterfallsSetup, (8,), GRIDS, maxSize=1024),
+    Benchmark("measureLabelling", _measureLabellingSetup, (1,), maxSize=2048),
+]
@@ -0,0 +1,397 @@
+"""
+Benchmarks of the Mamba core library functions (MB_*).
+
+Each core function is timed over random images of every depth it accepts
+(the depth given in the results is the depth of the processed image) and,
+for neighbor operators, on both grids.
+"""
+
+
+#Permission is hereby granted, free of charge, to any person
+#obtaining a copy of this software and associated documentation files
+#(the "Software"), to deal in the Software without restriction, including
+#without limitation the rights to use, copy, modify, merge, publish, 
+#distribute, sublicense, and/or sell copies of the Software, and to permit 
+#persons to whom the Software is furnished to do so, subject to the following 
+#conditions: The above copyright notice and this permission notice shall be 
+#included in all copies or substantial portions of the Software.
+
+#Except as contained in this notice, the names of the above copyright 
+#holders shall not be used in advertising or otherwise to promote the sale, 
+#use or other dealings in this Software without their prior written 
+#authorization.
+
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+from mamba import *
+import array
+import mamba.core as core
+from tools.MambaBenchRunner import Benchmark, randomImage
+
+GRIDS = (HEXAGONAL, SQUARE)
+
+def _allNeighbors(grid):
+    # Encoding of all the neighbors of the grid
+    nb = 0
+    for d in getDirections(grid, True):
+        nb |= 1<<d
+    return nb
+
+def _checked(setup):
+    # Verifies that the function to time does not fail
+    def checkedSetup(size, depth, grid):
+        func = setup(size, depth, grid)
+        result = func()
+        if isinstance(result, (list, tuple)):
+            result = result[0]
+        raiseExceptionOnError(result or core.MB_NO_ERR)
+        return func
+    return checkedSetup
+
+def _constantImage(size, depth, value):
+    im = imageMb(size, size, depth)
+    im.fill(value)
+    return im
+
+def _binary(func):
+    # Operators taking two images and producing an image of the same depth
+    def setup(size, depth, grid):
+        im1 = randomImage(size, depth)
+        im2 = randomImage(size, depth)
+        imOut = imageMb(im1)
+        return lambda: func(im1.mbIm, im2.mbIm, imOut.mbIm)
+    return setup
+
+def _unary(func, *args):
+    # Operators taking an image and producing an image of the same depth
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        imOut = imageMb(imIn)
+        return lambda: func(imIn.mbIm, imOut.mbIm, *args)
+    return setup
+
+def _constant(func, value):
+    # Operators combining an image with a constant value
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        imOut = imageMb(imIn)
+        return lambda: func(imIn.mbIm, value, imOut.mbIm)
+    return setup
+
+def _measure(func, *args):
+    # Operators computing a measure on an image
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        return lambda: func(imIn.mbIm, *args)
+    return setup
+
+def _convert(func, outDepth, *args):
+    # Operators changing the depth of the image
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        imOut = imageMb(size, size, outDepth)
+        return lambda: func(imIn.mbIm, imOut.mbIm, *args)
+    return setup
+
+def _neighbor(func, *args):
+    # Neighbor operators working in place on their second image
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        imOut = imageMb(imIn)
+        if args:
+            return lambda: func(imIn.mbIm, imOut.mbIm, *(args+(grid.id, EMPTY.id)))
+        nb = _allNeighbors(grid)
+        return lambda: func(imIn.mbIm, imOut.mbIm, nb, grid.id, EMPTY.id)
+    return setup
+
+def _supMaskSetup(size, depth, grid):
+    im1 = randomImage(size, depth)
+    im2 = randomImage(size, depth)
+    imOut = imageMb(size, size, 1)
+    return lambda: core.MB_SupMask(im1.mbIm, im2.mbIm, imOut.mbIm, 1)
+
+def _divSetup(size, depth, grid):
+    imIn = randomImage(size, depth)
+    imDiv = _constantImage(size, depth, 3)
+    imOut = imageMb(imIn)
+    return lambda: core.MB_Div(imIn.mbIm, imDiv.mbIm, imOut.mbIm)
+
+def _conSetSetup(size, depth, grid):
+    imOut = imageMb(size, size, depth)
+    return lambda: core.MB_ConSet(imOut.mbIm, 1)
+
+def _copyLineSetup(size, depth, grid):
+    imIn = randomImage(size, depth)
+    imOut = imageMb(imIn)
+    def func():
+        for y in range(size):
+            core.MB_CopyLine(imIn.mbIm, imOut.mbIm, y, size-1-y)
+    return func
+
+def _cropCopySetup(size, depth, grid):
+    imIn = randomImage(size, depth)
+    imOut = imageMb(imIn)
+    return lambda: core.MB_CropCopy(imIn.mbIm, size//4, size//4, imOut.mbIm,
+                                    0, 0, size//2, size//2)
+
+def _loadSetup(size, depth, grid):
+    imIn = randomImage(size, depth)
+    err, data = core.MB_Extract(imIn.mbIm)
+    return lambda: core.MB_Load(imIn.mbIm, data, len(data))
+
+def _pixelSetup(func):
+    # Pixel access, every pixel of the image is read or written once
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        points = [(x, y) for y in range(size) for x in range(size)]
+        if func is core.MB_PutPixel:
+            def run():
+                for x, y in points:
+                    func(imIn.mbIm, 1, x, y)
+        else:
+            def run():
+                for x, y in points:
+                    func(imIn.mbIm, x, y)
+        return run
+    return setup
+
+def _lookupSetup(size, depth, grid):
+    imIn = randomImage(size, depth)
+    imOut = imageMb(imIn)
+    lut = [255-i for i in range(256)]
+    return lambda: core.MB_Lookup(imIn.mbIm, imOut.mbIm, lut)
+
+def _maskSetup(size, depth, grid):
+    imIn = randomImage(size, 1)
+    imOut = imageMb(size, size, depth)
+    return lambda: core.MB_Mask(imIn.mbIm, imOut.mbIm, 10, 200)
+
+def _labelSetup(size, depth, grid):
+    imIn = randomImage(size, depth)
+    imOut = imageMb(size, size, 32)
+    return lambda: core.MB_Label(imIn.mbIm, imOut.mbIm, 0, 256, grid.id)
+
+def _labelImage(size):
+    # Labels of the particles of a random binary image
+    imLabel = imageMb(size, size, 32)
+    nb = label(randomImage(size, 1), imLabel)
+    return (imLabel, nb)
+
+def _regionLabelsSetup(size, depth, grid):
+    (imLabel, nb) = _labelImage(size)
+    labels = array.array("I", [0]) * (size*size)
+    return lambda: core.MB_RegionLabels(imLabel.mbIm, labels)
+
+def _regionPropsSetup(size, depth, grid):
+    (imLabel, nb) = _labelImage(size)
+    imMeasure = randomImage(size, depth)
+    labels = array.array("I", range(nb+1))
+    table = array.array("Q", [0]) * (core.MB_REGION_COLUMNS * (nb+1))
+    return lambda: core.MB_RegionProps(imLabel.mbIm, imMeasure.mbIm, labels, table)
+
+def _labelLookupSetup(size, depth, grid):
+    (imLabel, nb) = _labelImage(size)
+    imOut = imageMb(imLabel)
+    values = array.array("I", range(nb+1))
+    return lambda: core.MB_LabelLookup(imLabel.mbIm, imOut.mbIm, values)
+
+def _distanceSetup(size, depth, grid):
+    imIn = randomImage(size, 1)
+    imOut = imageMb(size, size, 32)
+    return lambda: core.MB_Distanceb(imIn.mbIm, imOut.mbIm, grid.id, EMPTY.id)
+
+def _reconstruction(func, dual=False):
+    # Reconstructions, the marker is restored before each build
+    def setup(size, depth, grid):
+        imMask = randomImage(size, depth)
+        imMarker = imageMb(imMask)
+        imInout = imageMb(imMask)
+        if depth==1:
+            imMarker.reset()
+            for i in range(0, size, 16):
+                imMarker.setPixel(1, (i, i))
+        elif dual:
+            addConst(imMask, 64, imMarker)
+        else:
+            subConst(imMask, 64, imMarker)
+        if dual and depth==1:
+            negate(imMarker, imMarker)
+        def run():
+            core.MB_Copy(imMarker.mbIm, imInout.mbIm)
+            if func in (core.MB_BldNb, core.MB_DualBldNb):
+                func(imMask.mbIm, imInout.mbIm, 1, grid.id)
+            else:
+                func(imMask.mbIm, imInout.mbIm, grid.id)
+        return run
+    return setup
+
+def _flooding(func, sparse=False):
+    # Watershed and basins, the markers are restored before each flooding
+    # (with 'sparse', the 16-bit levels are spread over the 32-bit range)
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        if sparse:
+            mulConst(imIn, 65537, imIn)
+        imMarker = imageMb(size, size, 32)
+        imInout = imageMb(imMarker)
+        imMarker.reset()
+        label = 1
+        for y in range(size//32, size, size//16):
+            for x in range(size//32, size, size//16):
+                imMarker.setPixel(label, (x, y))
+                label += 1
+        def run():
+            core.MB_Copy(imMarker.mbIm, imInout.mbIm)
+            func(imIn.mbIm, imInout.mbIm, 0, grid.id)
+        return run
+    return setup
+
+def _cellsBuildSetup(size, depth, grid):
+    # Over-segmented mosaic of the particles labels, sparsely marked
+    (imLabel, nb) = _labelImage(size)
+    imCells = imageMb(size, size, depth)
+    if depth==8:
+        copyBytePlane(imLabel, 0, imCells)
+    else:
+        copy(imLabel, imCells)
+    imMask = imageMb(size, size, 1)
+    threshold(randomImage(size, 8), imMask, 250, 255)
+    imMarker = imageMb(imCells)
+    convertByMask(imMask, imMarker, 0, computeMaxRange(imMarker)[1])
+    logic(randomImage(size, depth), imMarker, imMarker, "inf")
+    imInout = imageMb(imCells)
+    def run():
+        core.MB_Copy(imMarker.mbIm, imInout.mbIm)
+        core.MB_CellsBld(imCells.mbIm, imInout.mbIm, grid.id)
+    return run
+
+def _maxTreeSetup(size, depth, grid):
+    imIn = randomImage(size, depth)
+    imNodes = imageMb(size, size, 32)
+    table = array.array("I", [0]) * (core.MB_TREE_COLUMNS*size*size)
+    return lambda: core.MB_MaxTree(imIn.mbIm, imNodes.mbIm, table, 0, grid.id)
+
+def _treeSetup(function):
+    # The max-tree is built once, only the function using it is timed
+    def setup(size, depth, grid):
+        imIn = randomImage(size, depth)
+        if grid is None:
+            grid = DEFAULT_GRID
+        tree = maxTree(imIn, grid)
+        values = tree.getAttribute("area")
+        imOut1 = imageMb(imIn)
+        imOut2 = imageMb(size, size, 32)
+        se = structuringElement(getDirections(grid), grid)
+        if function==core.MB_TreeProps:
+            props = array.array("Q", [0]) * (core.MB_NODE_COLUMNS*tree.nbNodes)
+            return lambda: function(imIn.mbIm, tree.imNodes.mbIm, tree.table, props)
+        elif function==core.MB_TreeFilter:
+            return lambda: function(tree.imNodes.mbIm, imOut1.mbIm, tree.table, values, 20)
+        elif function==core.MB_TreeDynamicBuild:
+            height = tree.getAttribute("height")
+            return lambda: function(tree.imNodes.mbIm, imOut1.mbIm, tree.table, height, 20, 0)
+        elif function==core.MB_TreeUltimateOpening:
+            return lambda: function(tree.imNodes.mbIm, imOut1.mbIm, imOut2.mbIm,
+                                    tree.table, values)
+        return lambda: function(imIn.mbIm, tree.imNodes.mbIm, tree.table, values,
+                                se.getEncodedDirections(), grid.id)
+    return setup
+
+def _expressionSetup(size, depth, grid):
+    im1 = randomImage(size, depth)
+    im2 = randomImage(size, depth)
+    imOut = imageMb(im1)
+    prog = [core.MB_EXPR_LOAD, 0, core.MB_EXPR_LOAD, 1, core.MB_EXPR_INF,
+            core.MB_EXPR_ADDCONST, 20, 0]
+    return lambda: core.MB_Expression([im1.mbIm, im2.mbIm], imOut.mbIm, prog)
+
+ALL = (1, 8, 32)
+GREY = (8, 32)
+
+BENCHMARKS = [
+    Benchmark("MB_And", _binary(core.MB_And), ALL),
+    Benchmark("MB_Or", _binary(core.MB_Or), ALL),
+    Benchmark("MB_Xor", _binary(core.MB_Xor), ALL),
+    Benchmark("MB_Inv", _unary(core.MB_Inv), ALL),
+    Benchmark("MB_Inf", _binary(core.MB_Inf), ALL),
+    Benchmark("MB_Sup", _binary(core.MB_Sup), ALL),
+    Benchmark("MB_SupMask", _supMaskSetup, ALL),
+    Benchmark("MB_Add", _binary(core.MB_Add), ALL),
+    Benchmark("MB_Sub", _binary(core.MB_Sub), ALL),
+    Benchmark("MB_Mul", _binary(core.MB_Mul), GREY),
+    Benchmark("MB_Div", _divSetup, GREY),
+    Benchmark("MB_Diff", _binary(core.MB_Diff), ALL),
+    Benchmark("MB_ConAdd", _constant(core.MB_ConAdd, 20), GREY),
+    Benchmark("MB_ConSub", _constant(core.MB_ConSub, 20), GREY),
+    Benchmark("MB_ConMul", _constant(core.MB_ConMul, 3), GREY),
+    Benchmark("MB_ConDiv", _constant(core.MB_ConDiv, 3), GREY),
+    Benchmark("MB_ConSet", _conSetSetup, ALL),
+    Benchmark("MB_Volume", _measure(core.MB_Volume), ALL),
+    Benchmark("MB_Check", _measure(core.MB_Check), ALL),
+    Benchmark("MB_Histo", _measure(core.MB_Histo, [0]*256), (8,)),
+    Benchmark("MB_Range", _measure(core.MB_Range), ALL),
+    Benchmark("MB_depthRange", _measure(core.MB_depthRange), ALL),
+    Benchmark("MB_Frame", _measure(core.MB_Frame, 128), ALL),
+    Benchmark("MB_Compare", _binary(lambda a, b, c: core.MB_Compare(a, a, c)), ALL),
+    Benchmark("MB_Lookup", _lookupSetup, (8,)),
+    Benchmark("MB_Thresh", _convert(core.MB_Thresh, 1, 10, 200), GREY),
+    Benchmark("MB_Mask", _maskSetup, GREY),
+    Benchmark("MB_CopyBitPlane", _convert(core.MB_CopyBitPlane, 1, 3), GREY),
+    Benchmark("MB_CopyBytePlane", _convert(core.MB_CopyBytePlane, 8, 1), (32,)),
+    Benchmark("MB_Convert", _convert(core.MB_Convert, 8), (1, 32)),
+    Benchmark("MB_Copy", _unary(core.MB_Copy), ALL),
+    Benchmark("MB_CopyLine", _copyLineSetup, ALL),
+    Benchmark("MB_CropCopy", _cropCopySetup, GREY),
+    Benchmark("MB_Load", _loadSetup, GREY),
+    Benchmark("MB_Extract", _measure(core.MB_Extract), GREY),
+    Benchmark("MB_PutPixel", _pixelSetup(core.MB_PutPixel), ALL, maxSize=256),
+    Benchmark("MB_GetPixel", _pixelSetup(core.MB_GetPixel), ALL, maxSize=256),
+    Benchmark("MB_Expression", _expressionSetup, GREY),
+    Benchmark("MB_Label", _labelSetup, (1, 8), GRIDS),
+    Benchmark("MB_RegionLabels", _regionLabelsSetup, (32,)),
+    Benchmark("MB_RegionProps", _regionPropsSetup, ALL),
+    Benchmark("MB_LabelLookup", _labelLookupSetup, (32,)),
+    Benchmark("MB_Distanceb", _distanceSetup, (1,), GRIDS),
+    Benchmark("MB_InfNb", _neighbor(core.MB_InfNb), ALL, GRIDS),
+    Benchmark("MB_SupNb", _neighbor(core.MB_SupNb), ALL, GRIDS),
+    Benchmark("MB_DiffNb", _neighbor(core.MB_DiffNb), ALL, GRIDS),
+    Benchmark("MB_InfFarNb", _neighbor(core.MB_InfFarNb, 1, 10), ALL, GRIDS),
+    Benchmark("MB_SupFarNb", _neighbor(core.MB_SupFarNb, 1, 10), ALL, GRIDS),
+    Benchmark("MB_InfSegment", _neighbor(core.MB_InfSegment, 1, 21), ALL, GRIDS),
+    Benchmark("MB_SupSegment", _neighbor(core.MB_SupSegment, 1, 21), ALL, GRIDS),
+    Benchmark("MB_Erode", _neighbor(lambda a, b, nb, g, e: core.MB_Erode(a, b, nb, 5, g, e)),
+              ALL, GRIDS),
+    Benchmark("MB_Dilate", _neighbor(lambda a, b, nb, g, e: core.MB_Dilate(a, b, nb, 5, g, e)),
+              ALL, GRIDS),
+    Benchmark("MB_Shift", _neighbor(lambda a, b, nb, g, e: core.MB_Shift(a, b, 1, 5, 0, g)),
+              ALL, GRIDS),
+    Benchmark("MB_ShiftVector", _unary(core.MB_ShiftVector, 3, -2, 0), ALL),
+    Benchmark("MB_InfVector", _unary(core.MB_InfVector, 3, -2, EMPTY.id), ALL),
+    Benchmark("MB_SupVector", _unary(core.MB_SupVector, 3, -2, EMPTY.id), ALL),
+    Benchmark("MB_BinHitOrMiss", _neighbor(
+              lambda a, b, nb, g, e: core.MB_BinHitOrMiss(a, b, 0x1, 0x6, g, e)), (1,), GRIDS),
+    Benchmark("MB_BldNb", _reconstruction(core.MB_BldNb), ALL, GRIDS),
+    Benchmark("MB_DualBldNb", _reconstruction(core.MB_DualBldNb, True), ALL, GRIDS),
+    Benchmark("MB_HierarBld", _reconstruction(core.MB_HierarBld), ALL, GRIDS),
+    Benchmark("MB_HierarDualBld", _reconstruction(core.MB_HierarDualBld, True), ALL, GRIDS),
+    Benchmark("MB_CellsBld", _cellsBuildSetup, GREY, GRIDS),
+    Benchmark("MB_MaxTree", _maxTreeSetup, GREY, GRIDS),
+    Benchmark("MB_TreeProps", _treeSetup(core.MB_TreeProps), GREY),
+    Benchmark("MB_TreeFilter", _treeSetup(core.MB_TreeFilter), GREY),
+    Benchmark("MB_TreeDynamicBuild", _treeSetup(core.MB_TreeDynamicBuild), GREY),
+    Benchmark("MB_TreeUltimateOpening", _treeSetup(core.MB_TreeUltimateOpening), GREY),
+    Benchmark("MB_TreeBuildSizes", _treeSetup(core.MB_TreeBuildSizes), GREY, GRIDS),
+    Benchmark("MB_Watershed", _flooding(core.MB_Watershed), GREY, GRIDS),
+    Benchmark("MB_Basins", _flooding(core.MB_Basins), GREY, GRIDS),
+    Benchmark("MB_Watershed sparse", _flooding(core.MB_Watershed, True), (32,), GRIDS),
+    Benchmark("MB_Basins sparse", _flooding(core.MB_Basins, True), (32,), GRIDS),
+]
+
+for bench in BENCHMARKS:
+    bench.setup = _checked(bench.setup)
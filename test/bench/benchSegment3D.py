@@ -0,0 +1,87 @@
+"""
+Benchmarks of the 3D watershed and basins segmentations.
+
+Each segmentation is timed with the serial flooding and with the flooding
+by slabs of planes (use option -j of runBench.py to give the number of
+threads), so that the two can be compared on the machine.
+"""
+
+
+#Permission is hereby granted, free of charge, to any person
+#obtaining a copy of this software and associated documentation files
+#(the "Software"), to deal in the Software without restriction, including
+#without limitation the rights to use, copy, modify, merge, publish, 
+#distribute, sublicense, and/or sell copies of the Software, and to permit 
+#persons to whom the Software is furnished to do so, subject to the following 
+#conditions: The above copyright notice and this permission notice shall be 
+#included in all copies or substantial portions of the Software.
+
+#Except as contained in this notice, the names of the above copyright 
+#holders shall not be used in advertising or otherwise to promote the sale, 
+#use or other dealings in this Software without their prior written 
+#authorization.
+
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+import os
+from mamba import *
+from mamba3D import *
+from tools.MambaBenchRunner import Benchmark
+
+GRIDS = (CUBIC, FACE_CENTER_CUBIC)
+
+# Number of planes of the measured images
+LENGTH = 64
+
+def _smoothImage3D(size, depth):
+    # Random 3D image smoothed by an alternate filter so that its basins
+    # have a realistic size
+    im = image3DMb(size, size, LENGTH, 8)
+    for i in range(LENGTH):
+        im[i].loadRaw(os.urandom(size*size))
+    alternateFilter3D(im, im, 2, True)
+    if depth==32:
+        imOut = image3DMb(im, 32)
+        convert3D(im, imOut)
+        return imOut
+    return im
+
+def _markers3D(size):
+    # Regularly spaced markers
+    imMarker = image3DMb(size, size, LENGTH, 32)
+    imMarker.reset()
+    label = 1
+    for z in range(LENGTH//8, LENGTH, LENGTH//4):
+        for y in range(size//16, size, size//8):
+            for x in range(size//16, size, size//8):
+                imMarker.setPixel(label, (x, y, z))
+                label += 1
+    return imMarker
+
+def _segmentSetup(op, slabs):
+    def setup(size, depth, grid):
+        imIn = _smoothImage3D(size, depth)
+        imMarker = _markers3D(size)
+        imInout = image3DMb(imMarker)
+        def run():
+            copy3D(imMarker, imInout)
+            op(imIn, imInout, grid=grid, slabs=slabs)
+        return run
+    return setup
+
+BENCHMARKS = [
+    Benchmark("watershedSegment3D", _segmentSetup(watershedSegment3D, False),
+              (8, 32), GRIDS, maxSize=256, length=LENGTH),
+    Benchmark("watershedSegment3D slabs", _segmentSetup(watershedSegment3D, True),
+              (8, 32), GRIDS, maxSize=256, length=LENGTH),
+    Benchmark("basinSegment3D", _segmentSetup(basinSegment3D, False),
+              (8, 32), GRIDS, maxSize=256, length=LENGTH),
+    Benchmark("basinSegment3D slabs", _segmentSetup(basinSegment3D, True),
+              (8, 32), GRIDS, maxSize=256, length=LENGTH),
+]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+This is the Mamba Benchmark Platform main entry.
+
+This script times the core library functions and the heavy operators of
+Mamba over several image sizes, depths and grids. The results can be saved
+in a JSON file and compared with the ones of a previous run (the baseline).
+
+Usage:
+    python runBench.py <options>
+    options :
+        -h or --help displays this short description
+        -s <sizes> comma-separated list of the image sizes (square images)
+        to measure (default is 256,1024,4096)
+        -t <pattern> only plays the benchmarks whose name contains the
+        pattern
+        -m <benchModule> plays the specified benchmark module (benchCore or
+        benchComposites). If not specified, the script will play all the
+        benchmarks.
+        -n <n> number of measures of each case (the best one is kept,
+        default is 3)
+        -o or --output <file> writes the results in the given JSON file
+        -b or --baseline <file> compares the results with the ones stored in
+        the given JSON file. The script exits with status 1 when a case is
+        slower than its baseline by more than the tolerated ratio.
+        -r <ratio> tolerated slowdown ratio (default is 1.2)
+        -j <n> number of threads used by the operators (default is 1)
+        -l lists the benchmarks and the core functions they do not cover
+        
+visit www.mamba-image.org for more.
+    
+Copyright (c) <2009>, <Nicolas BEUCHER>
+
+Permission is hereby granted, free of charge, to any person
+obtaining a copy of this software and associated documentation files
+(the "Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish, 
+distribute, sublicense, and/or sell copies of the Softwared, and to permit 
+persons to whom the Software is furnished to do so, subject to the following 
+conditions: The above copyright notice and this permission notice shall be 
+included in all copies or substantial portions of the Software.
+
+Except as contained in this notice, the names of the above copyright 
+holders shall not be used in advertising or otherwise to promote the sale, 
+use or other dealings in this Software without their prior written 
+authorization.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import os
+import sys
+import getopt
+
+from tools.MambaBenchRunner import MambaBenchRunner
+
+################################################################################
+# Global variables
+################################################################################
+_sizes = [256, 1024, 4096]
+_pattern = None
+_benchModule = None
+_repeat = 3
+_fpath = ''
+_baseline = ''
+_ratio = 1.2
+_list = False
+_threads = 1
+
+BENCH_DIRECTORY = 'bench'
+
+# Core functions that are not benchmarked (image management and errors)
+UNTIMED_FUNCTIONS = ['MB_Create', 'MB_CreateMapped', 'MB_Destroy', 'MB_getImageCounter',
+                     'MB_SetThreadNumber', 'MB_GetThreadNumber', 'MB_StrErr']
+
+################################################################################
+# Functions
+################################################################################
+
+def benchModules():
+    """
+    Returns the names of all the benchmark modules.
+    """
+    modules = []
+    for f in sorted(os.listdir(BENCH_DIRECTORY)):
+        name, ext = os.path.splitext(f)
+        if name!='__init__' and ext=='.py':
+            modules.append(BENCH_DIRECTORY+'.'+name)
+    return modules
+
+def listBenchmarks(modules):
+    """
+    Prints the benchmarks of the modules and the core functions they miss.
+    """
+    import mamba.core as core
+    names = []
+    for module in modules:
+        __import__(module)
+        for bench in sys.modules[module].BENCHMARKS:
+            print("%-32s %s depths=%s" % (bench.name, module, bench.depths))
+            names.append(bench.name)
+    missing = [name for name in dir(core)
+               if name.startswith('MB_') and callable(getattr(core, name))
+               and not isinstance(getattr(core, name), type)
+               and not name.startswith('MB3D_') and name not in names
+               and name not in UNTIMED_FUNCTIONS]
+    if missing:
+        print("core functions without benchmark: %s" % (", ".join(missing)))
+
+################################################################################
+# Parsing the command line options and running the benchmarks
+################################################################################
+try:
+    opts, args = getopt.getopt(sys.argv[1:], 'hls:t:m:n:o:b:r:j:',
+                               ["help", "output=", "baseline="])
+except getopt.GetoptError as err:
+    # print help information and exit:
+    print(str(err))
+    print(__doc__)
+    sys.exit(2)
+    
+for o, a in opts:
+    try:
+        if o == "-s":
+            _sizes = [int(s) for s in a.split(',')]
+        elif o == "-n":
+            _repeat = int(a)
+        elif o == "-r":
+            _ratio = float(a)
+        elif o == "-j":
+            _threads = int(a)
+    except ValueError:
+        print("parameter of option %s incorrect: %s" % (o, a))
+        sys.exit(2)
+    if o in ("-o", "--output"):
+        _fpath = a
+    elif o in ("-b", "--baseline"):
+        _baseline = a
+    elif o in ("-h", "--help"):
+        print(__doc__)
+        sys.exit()
+    elif o == "-t":
+        _pattern = a
+    elif o == "-m":
+        _benchModule = a
+    elif o == "-l":
+        _list = True
+
+try:
+    import mamba
+except ImportError:
+    print("mamba module not found !")
+    sys.exit(1)
+
+if _benchModule:
+    _modules = [BENCH_DIRECTORY+'.'+_benchModule]
+else:
+    _modules = benchModules()
+
+if _list:
+    listBenchmarks(_modules)
+    sys.exit()
+
+# Launching the benchmarks
+mamba.setThreadNumber(_threads)
+_mb_runner = MambaBenchRunner(repeat=_repeat)
+for module in _modules:
+    _mb_runner.runModule(module, _sizes, _pattern)
+if _fpath:
+    _mb_runner.save(_fpath)
+if _baseline:
+    if _mb_runner.compare(_baseline, _ratio):
+        sys.exit(1)
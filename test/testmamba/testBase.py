@@ -11,13 +11,21 @@ Python function:
     imageMb.save
     imageMb.loadRaw
     imageMb.extractRaw
+    imageMb.fromMapped
+    imageMb.__array__
     setImageIndex
     getImageCounter
+    loadFrames
+    scratchImages
+    setScratchPoolSize
+    getScratchPoolSize
+    clearScratchPool
     
 C function:
     MB_Create
     MB_Load
     MB_Extract
+    MB_CreateMapped
 """
 
 from mamba import *
@@ -27,6 +35,7 @@ import unittest
 from PIL import Image
 import random
 import os
+import threading
 
 class TestCreate(unittest.TestCase):
 
@@ -163,6 +172,28 @@ class TestCreate(unittest.TestCase):
             
             del(im)
             
+    def testLoadFrames(self):
+        """Ensures that a directory of frames is loaded in the same image"""
+        os.mkdir("frames")
+        for i in range(4):
+            Image.new("L", (100,60), i*10).save(os.path.join("frames", "%d.png" % (i+1)))
+        open(os.path.join("frames", "notes.txt"), "w").close()
+        im8 = imageMb(128,64,8)
+        mbIm = im8.mbIm
+        vols = []
+        for im in loadFrames("frames", im8):
+            self.assertTrue(im is im8)
+            self.assertTrue(im.mbIm is mbIm)
+            vols.append(computeVolume(im))
+        self.assertEqual(vols, [i*10*100*60 for i in range(4)])
+        im32 = imageMb(128,64,32)
+        files = [os.path.join("frames", "3.png"), os.path.join("frames", "2.png")]
+        vols = [computeVolume(im) for im in loadFrames(files, im32)]
+        self.assertEqual(vols, [20*100*60, 10*100*60])
+        for f in os.listdir("frames"):
+            os.remove(os.path.join("frames", f))
+        os.rmdir("frames")
+            
     def testSave(self):
         """Ensures that the save method works properly"""
         for i in range(5):
@@ -224,6 +255,178 @@ class TestCreate(unittest.TestCase):
         self.assertEqual(len(rawdata), 128*128*4)
         self.assertEqual(rawdata, 128*128*b"\x44\x33\x22\x11")
         
+    def testFromMapped(self):
+        """Verifies that images are mapped on raw files without copy"""
+        f = open("test.dat","wb")
+        f.write(16*b"\xff")
+        f.write(128*64*b"\x11")
+        f.write(128*64*b"\x22\x00\x00\x00")
+        f.close()
+        nb = getImageCounter()
+        im8 = imageMb.fromMapped("test.dat", 128, 64, 8, 16)
+        self.assertEqual(getImageCounter(), nb+1)
+        self.assertEqual(im8.getSize(), (128,64))
+        self.assertEqual(im8.getDepth(), 8)
+        self.assertEqual(computeVolume(im8), 128*64*0x11)
+        im32 = imageMb.fromMapped("test.dat", 128, 64, 32, 16+128*64)
+        self.assertEqual(computeVolume(im32), 128*64*0x22)
+        im1 = imageMb.fromMapped("test.dat", 64, 2, 1)
+        self.assertEqual(computeVolume(im1), 64*2)
+        # Copy-on-write: the file is left unchanged
+        im8.fill(0x33)
+        add(im8, im8, im8)
+        self.assertEqual(computeVolume(im8), 128*64*0x66)
+        im32.reset()
+        negate(im1, im1)
+        self.assertEqual(computeVolume(im1), 0)
+        try:
+            import numpy
+            numpy.asarray(im32)[:] = 5
+            self.assertEqual(computeVolume(im32), 128*64*5)
+        except ImportError:
+            pass
+        del(im8, im32, im1)
+        im32 = imageMb.fromMapped("test.dat", 128, 64, 32, 16+128*64)
+        self.assertEqual(computeVolume(im32), 128*64*0x22)
+        del(im32)
+        self.assertEqual(getImageCounter(), nb)
+        im8 = imageMb.fromMapped("test.dat", 128, 64, 8, 16)
+        self.assertEqual(computeVolume(im8), 128*64*0x11)
+        del(im8)
+        self.assertRaises(MambaError, imageMb.fromMapped, "test.dat", 128, 64, 8, 8)
+        self.assertRaises(MambaError, imageMb.fromMapped, "test.dat", 100, 64, 8)
+        self.assertRaises(MambaError, imageMb.fromMapped, "test.dat", 128, 63, 8)
+        self.assertRaises(MambaError, imageMb.fromMapped, "test.dat", 128, 64, 16)
+        self.assertRaises(MambaError, imageMb.fromMapped, "test.dat", 128, 64, 32, 32+128*64)
+        self.assertRaises(MambaError, imageMb.fromMapped, "nofile.dat", 128, 64, 8)
+        os.remove("test.dat")
+        
+    def testNamespace(self):
+        """Verifies that the standard modules used by mamba are not exported"""
+        names = {}
+        exec("from mamba import *", names)
+        for name in ["array", "collections", "threading", "sys", "time", "ctypes", "mmap"]:
+            self.assertNotIn(name, names)
+        
+    def testArrayInterface(self):
+        """Verifies that the pixels are shared with NumPy arrays without copy"""
+        try:
+            import numpy
+        except ImportError:
+            return
+        im1 = imageMb(128,64,1)
+        im8 = imageMb(128,64,8)
+        im32 = imageMb(128,64,32)
+        a8 = numpy.asarray(im8)
+        self.assertEqual(a8.shape, (64,128))
+        self.assertEqual(a8.dtype, numpy.uint8)
+        im8.setPixel(0x55, (3,5))
+        self.assertEqual(a8[5,3], 0x55)
+        a8[10,20] = 0x77
+        self.assertEqual(im8.getPixel((20,10)), 0x77)
+        a32 = numpy.asarray(im32)
+        self.assertEqual(a32.shape, (64,128))
+        self.assertEqual(a32.dtype, numpy.uint32)
+        a32[:] = 0x11223344
+        self.assertEqual(computeVolume(im32), 128*64*0x11223344)
+        a1 = numpy.asarray(im1)
+        self.assertEqual(a1.shape, (64,16))
+        im1.setPixel(1, (9,2))
+        bits = numpy.unpackbits(a1, axis=1, bitorder='little')
+        self.assertEqual(bits[2,9], 1)
+        self.assertEqual(bits.sum(), 1)
+        c8 = numpy.array(im8, copy=True)
+        c8[0,0] = 0x33
+        self.assertEqual(im8.getPixel((0,0)), 0)
+        f8 = numpy.asarray(im8, dtype=numpy.float64)
+        self.assertEqual(f8.dtype, numpy.float64)
+        self.assertEqual(f8[10,20], 0x77)
+        f8[10,20] = 0
+        self.assertEqual(im8.getPixel((20,10)), 0x77)
+        
+    def _pipeline(self, imIn, imOut):
+        imWrk = imageMb(imIn)
+        imMark = imageMb(imIn, 1)
+        gradient(imIn, imWrk)
+        minima(imWrk, imMark)
+        threshold(imWrk, imOut, 0, 60)
+        build(imOut, imMark)
+        copy(imMark, imOut)
+        
+    def testConcurrentPipelines(self):
+        """Verifies that independent pipelines can run in concurrent threads"""
+        clearScratchPool()
+        nb = getImageCounter()
+        ims = []
+        for i in range(4):
+            im = imageMb(256,128,8)
+            im.loadRaw(bytes(random.getrandbits(8) for j in range(256*128)))
+            ims.append((im, imageMb(im, 1), imageMb(im, 1)))
+        threads = [threading.Thread(target=self._pipeline, args=(im, imOut))
+                   for (im, imOut, imRef) in ims]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for (im, imOut, imRef) in ims:
+            self._pipeline(im, imRef)
+            (x,y) = compare(imOut, imRef, imRef)
+            self.assertLess(x, 0)
+        del(ims, threads, t, im, imOut, imRef)
+        clearScratchPool()
+        self.assertEqual(getImageCounter(), nb)
+        
+    def testThreadNumber(self):
+        """Verifies that the number of threads can be set and retrieved"""
+        nb = getThreadNumber()
+        self.assertGreaterEqual(nb, 1)
+        setThreadNumber(3)
+        self.assertEqual(getThreadNumber(), 3)
+        self.assertRaises(MambaError, setThreadNumber, 0)
+        self.assertEqual(getThreadNumber(), 3)
+        setThreadNumber(nb)
+        
+    def testScratchImages(self):
+        """Verifies that the work images are reused and bounded by the pool size"""
+        (budget, used) = getScratchPoolSize()
+        clearScratchPool()
+        self.assertEqual(getScratchPoolSize()[1], 0)
+        im = imageMb(128, 128, 8)
+        nb = getImageCounter()
+        with scratchImages(im) as imWrk:
+            self.assertEqual(imWrk.getSize(), (128, 128))
+            self.assertEqual(imWrk.getDepth(), 8)
+            self.assertEqual(getImageCounter(), nb+1)
+        self.assertEqual(getScratchPoolSize()[1], 128*128)
+        with scratchImages(im, [1, None, 32]) as (imWrk1, imWrk2, imWrk3):
+            self.assertEqual(imWrk1.getDepth(), 1)
+            self.assertTrue(imWrk2 is imWrk)
+            self.assertEqual(imWrk3.getDepth(), 32)
+            self.assertEqual(getScratchPoolSize()[1], 0)
+        with scratchImages(im, 2, 32) as (imWrk1, imWrk2):
+            self.assertTrue(imWrk1 is imWrk3 or imWrk2 is imWrk3)
+            self.assertFalse(imWrk1 is imWrk2)
+        self.assertEqual(getImageCounter(), nb+4)
+        
+        # The least recently released images are freed first
+        setScratchPoolSize(128*128*4)
+        self.assertEqual(getScratchPoolSize(), (128*128*4, 128*128*4))
+        with scratchImages(im) as imWrk1:
+            self.assertFalse(imWrk1 is imWrk)
+        with scratchImages(im) as imWrk1:
+            pass
+        self.assertEqual(getScratchPoolSize()[1], 128*128)
+        self.assertRaises(MambaError, setScratchPoolSize, -1)
+        
+        setScratchPoolSize(0)
+        self.assertEqual(getScratchPoolSize()[1], 0)
+        with scratchImages(im) as imWrk1:
+            pass
+        self.assertEqual(getScratchPoolSize()[1], 0)
+        setScratchPoolSize(budget)
+        del(imWrk, imWrk1, imWrk2, imWrk3)
+        self.assertEqual(getImageCounter(), nb)
+        
     def testImageNaming(self):
         """Verifies that image names methods are correctly working"""
         im8 = imageMb(128,128,8)
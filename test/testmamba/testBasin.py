@@ -16,6 +16,7 @@ C function:
 """
 
 from mamba import *
+from tools.MambaTestImages import sparseLevelImages
 import unittest
 import random
 
@@ -226,3 +227,21 @@ class TestBasin(unittest.TestCase):
             vol = computeVolume(self.im8_2)
             self.assertTrue(exp_vol1<=vol and exp_vol2>=vol, "wall at %d [%d,%d]: %d/%d/%d" %(i,w//4,(3*w)//4,vol,exp_vol1,exp_vol2))
 
+    def testBasinSparseLevels32(self):
+        """Verifies the segmentation of 32-bit images with sparse levels"""
+        (w,h) = self.im32_1.getSize()
+        # Levels spread over the 32-bit range, then up to just below and
+        # just above the number of pixels (the levels are compressed from it)
+        for (w, h, maxval) in ((w, h, 99*40000000+12345), (512, 256, 512*256-1),
+                               (512, 256, 512*256)):
+            (imIn, imSparse, imMarkers, sparseLevel) = sparseLevelImages(w, h, maxval)
+            imRef = imageMb(imMarkers)
+            imOut = imageMb(imMarkers)
+            for grid in (HEXAGONAL, SQUARE):
+                for level in (0, 1, 20, 100):
+                    copy(imMarkers, imRef)
+                    copy(imMarkers, imOut)
+                    basinSegment(imIn, imRef, grid=grid, max_level=level)
+                    basinSegment(imSparse, imOut, grid=grid, max_level=sparseLevel(level))
+                    (x,y) = compare(imOut, imRef, imOut)
+                    self.assertLess(x, 0, "maxval %d, level %d" % (maxval, level))
@@ -0,0 +1,77 @@
+"""
+Test cases for the batch processing found in the batch module of mamba
+package.
+
+The results computed by the worker processes must be identical to the ones
+computed in the process and returned in the order of the inputs.
+
+Python functions and classes:
+    batch.map
+"""
+
+from mamba import *
+import mamba
+import unittest
+import random
+
+def _gradientPipeline(imIn, imOut):
+    gradient(imIn, imOut)
+
+def _thresholdPipeline(imIn, imOut):
+    threshold(imIn, imOut, 100, 255)
+
+def _badPipeline(imIn, imOut):
+    copy(imIn, imageMb(imIn, 32))
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(14)
+        self.ims = []
+        for i in range(9):
+            im = imageMb(128+64*(i%3), 64+2*i, 8)
+            (w,h) = im.getSize()
+            im.loadRaw(bytes(random.getrandbits(8) for j in range(w*h)))
+            self.ims.append(im)
+
+    def tearDown(self):
+        del(self.ims)
+
+    def _check(self, results, pipeline, depth=None):
+        self.assertEqual(len(results), len(self.ims))
+        for (imIn, imOut) in zip(self.ims, results):
+            self.assertEqual(imOut.getSize(), imIn.getSize())
+            imRef = imageMb(imIn, depth or imIn.getDepth())
+            pipeline(imIn, imRef)
+            (x,y) = compare(imOut, imRef, imRef)
+            self.assertLess(x, 0)
+
+    def testParameters(self):
+        """Tests that incorrect parameters raise an exception"""
+        self.assertRaises(MambaError, list, mamba.batch.map(_gradientPipeline, self.ims, 0))
+        self.assertRaises(MambaError, list, mamba.batch.map(_gradientPipeline, self.ims, 2, depth=16))
+
+    def testMap(self):
+        """Verifies that the results are computed and returned in order"""
+        self._check(list(mamba.batch.map(_gradientPipeline, self.ims, 2)), _gradientPipeline)
+        self._check(list(mamba.batch.map(_gradientPipeline, iter(self.ims), 1)), _gradientPipeline)
+
+    def testDepth(self):
+        """Verifies a pipeline changing the depth of the images"""
+        results = list(mamba.batch.map(_thresholdPipeline, self.ims, 2, depth=1))
+        self._check(results, _thresholdPipeline, 1)
+        bins = results
+        results = list(mamba.batch.map(_gradientPipeline, bins, 2))
+        self.ims = bins
+        self._check(results, _gradientPipeline)
+
+    def testError(self):
+        """Verifies that the errors of the pipeline are raised"""
+        self.assertRaises(MambaError, list, mamba.batch.map(_badPipeline, self.ims, 2))
+
+    def testStop(self):
+        """Verifies that the iteration can be stopped before its end"""
+        for (i, imOut) in enumerate(mamba.batch.map(_gradientPipeline, self.ims, 2)):
+            if i==2:
+                break
+        self._check(list(mamba.batch.map(_gradientPipeline, self.ims, 2)), _gradientPipeline)
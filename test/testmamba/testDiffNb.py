@@ -464,3 +464,32 @@ class TestDiffNb(unittest.TestCase):
             vol = computeVolume(self.im32_1)
             self.assertEqual(vol, 0)
 
+            
+    def testMultithreaded(self):
+        """Verifies that the result does not depend on the number of threads"""
+        nb = getThreadNumber()
+        for (depth, val) in [(1, 1), (8, 128), (32, 0x80000000)]:
+            imIn = imageMb(128, 250, depth)
+            imRef = imageMb(128, 250, depth)
+            imOut = imageMb(128, 250, depth)
+            im8 = imageMb(128, 250, 8)
+            size = im8.mbIm.width*im8.mbIm.height
+            im8.loadRaw(bytes(random.getrandbits(8) for i in range(size)))
+            if depth==1:
+                threshold(im8, imIn, 128, 255)
+            elif depth==8:
+                copy(im8, imIn)
+            else:
+                copyBytePlane(im8, 1, imIn)
+            for grid in [HEXAGONAL, SQUARE]:
+                for edge in [EMPTY, FILLED]:
+                    nbs = random.randint(1, 0xff)
+                    setThreadNumber(1)
+                    imRef.fill(val)
+                    diffNeighbor(imIn, imRef, nbs, grid=grid, edge=edge)
+                    setThreadNumber(4)
+                    imOut.fill(val)
+                    diffNeighbor(imIn, imOut, nbs, grid=grid, edge=edge)
+                    (x,y) = compare(imRef, imOut, imRef)
+                    self.assertLess(x, 0, "%d %s %s: (%d,%d)" % (depth, grid, edge, x, y))
+        setThreadNumber(nb)
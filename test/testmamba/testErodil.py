@@ -290,6 +290,92 @@ class TestErodil(unittest.TestCase):
         (x,y) = compare(self.im8_3, self.im8_2, self.im8_1)
         self.assertLess(x, 0)
         
+    def _randomImages(self):
+        ims = []
+        im8 = imageMb(128, 130, 8)
+        size = im8.mbIm.width*im8.mbIm.height
+        im8.loadRaw(bytes(random.getrandbits(8) for i in range(size)))
+        for depth in [1, 8, 32]:
+            im = imageMb(128, 130, depth)
+            if depth==1:
+                threshold(im8, im, 128, 255)
+            elif depth==8:
+                copy(im8, im)
+            else:
+                copyBytePlane(im8, 2, im)
+            ims.append(im)
+        return ims
+        
+    def _iterate(self, func, imIn, imOut, n, se, edge):
+        # Reference computation made of n calls to the neighbor function
+        imWrk = imageMb(imIn)
+        copy(imIn, imOut)
+        for i in range(n):
+            copy(imOut, imWrk)
+            if func==infNeighbor:
+                imOut.fill(computeMaxRange(imIn)[1])
+            else:
+                imOut.reset()
+            func(imWrk, imOut, se.getEncodedDirections(), grid=se.getGrid(), edge=edge)
+        
+    def testErodeIterations(self):
+        """Verifies that erosions of size n are equal to n unit erosions"""
+        for imIn in self._randomImages():
+            imRef = imageMb(imIn)
+            imOut = imageMb(imIn)
+            for se in [HEXAGON, SQUARE3X3, TRIPOD, SEGMENT.rotate(2)]:
+                for n in [1, 3, 150]:
+                    for edge in [EMPTY, FILLED]:
+                        self._iterate(infNeighbor, imIn, imRef, n, se, edge)
+                        erode(imIn, imOut, n, se=se, edge=edge)
+                        (x,y) = compare(imRef, imOut, imRef)
+                        self.assertLess(x, 0, "%s %d %s" % (se, n, edge))
+                        # In place computation
+                        copy(imIn, imOut)
+                        erode(imOut, imOut, n, se=se, edge=edge)
+                        (x,y) = compare(imRef, imOut, imRef)
+                        self.assertLess(x, 0, "%s %d %s" % (se, n, edge))
+        
+    def testDilateIterations(self):
+        """Verifies that dilations of size n are equal to n unit dilations"""
+        for imIn in self._randomImages():
+            imRef = imageMb(imIn)
+            imOut = imageMb(imIn)
+            for se in [HEXAGON, SQUARE3X3, TRIPOD, SEGMENT.rotate(2)]:
+                for n in [1, 3, 150]:
+                    for edge in [EMPTY, FILLED]:
+                        self._iterate(supNeighbor, imIn, imRef, n, se, edge)
+                        dilate(imIn, imOut, n, se=se, edge=edge)
+                        (x,y) = compare(imRef, imOut, imRef)
+                        self.assertLess(x, 0, "%s %d %s" % (se, n, edge))
+                        # In place computation
+                        copy(imIn, imOut)
+                        dilate(imOut, imOut, n, se=se, edge=edge)
+                        (x,y) = compare(imRef, imOut, imRef)
+                        self.assertLess(x, 0, "%s %d %s" % (se, n, edge))
+        
+    def testThreadsIterations(self):
+        """Verifies that erosions and dilations of size n do not depend on the thread number"""
+        nb = getThreadNumber()
+        for imIn in self._randomImages():
+            imRef = imageMb(imIn)
+            imOut = imageMb(imIn)
+            for op in [erode, dilate]:
+                for se in [HEXAGON, SQUARE3X3]:
+                    for n in [1, 3, 20, 40]:
+                        setThreadNumber(1)
+                        op(imIn, imRef, n, se=se, edge=FILLED)
+                        setThreadNumber(4)
+                        op(imIn, imOut, n, se=se, edge=FILLED)
+                        (x,y) = compare(imRef, imOut, imRef)
+                        self.assertLess(x, 0, "%s %d: (%d,%d)" % (se, n, x, y))
+                        # In place computation
+                        copy(imIn, imOut)
+                        op(imOut, imOut, n, se=se, edge=FILLED)
+                        (x,y) = compare(imRef, imOut, imRef)
+                        self.assertLess(x, 0, "%s %d: (%d,%d)" % (se, n, x, y))
+        setThreadNumber(nb)
+        
     def _drawConjHexag(self, im, x, y, value):
         drawSquare(im, (x-1,y-1,x+1,y+1), value)
         im.setPixel(value, (x,y-2))
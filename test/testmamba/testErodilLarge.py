@@ -88,6 +88,34 @@ class TestErodilLarge(unittest.TestCase):
                 (x,y) = compare(self.im8_1, self.im8_2, self.im8_3)
                 self.assertLess(x, 0)
             
+    def testLargeLinearRandom(self):
+        """Verifies the large linear operators on random images of all depths"""
+        im8 = imageMb(128, 66, 8)
+        size = im8.mbIm.width*im8.mbIm.height
+        im8.loadRaw(bytes(random.getrandbits(8) for i in range(size)))
+        for depth in [1, 8, 32]:
+            imIn = imageMb(128, 66, depth)
+            imRef = imageMb(imIn)
+            imOut = imageMb(imIn)
+            if depth==1:
+                threshold(im8, imIn, 64, 255)
+            elif depth==8:
+                copy(im8, imIn)
+            else:
+                copyBytePlane(im8, 3, imIn)
+            for grid in [HEXAGONAL, SQUARE]:
+                for d in getDirections(grid):
+                    for n in [0, 1, 2, 7, 40, 200]:
+                        for edge in [EMPTY, FILLED]:
+                            linearErode(imIn, imRef, d, n, grid=grid, edge=edge)
+                            largeLinearErode(imIn, imOut, d, n, grid=grid, edge=edge)
+                            (x,y) = compare(imRef, imOut, imRef)
+                            self.assertLess(x, 0)
+                            linearDilate(imIn, imRef, d, n, grid=grid, edge=edge)
+                            largeLinearDilate(imIn, imOut, d, n, grid=grid, edge=edge)
+                            (x,y) = compare(imRef, imOut, imRef)
+                            self.assertLess(x, 0)
+        
     def testLargeHexagonalErode(self):
         """Verifies the large hexagonal erosion"""
         (w,h) = self.im8_1.getSize()
@@ -0,0 +1,190 @@
+"""
+Test cases for the point-wise expressions found in the expressions module of
+mamba package.
+
+The expressions chain point-wise operators and compute them in a single pass.
+The result must be identical to the one obtained with the operators.
+
+Python functions and classes:
+    expr
+    expression
+
+C functions:
+    MB_Expression
+"""
+
+from mamba import *
+import unittest
+import random
+
+class TestExpressions(unittest.TestCase):
+
+    def setUp(self):
+        # Creating three images for each possible depth
+        self.im1_1 = imageMb(1)
+        self.im1_2 = imageMb(1)
+        self.im1_3 = imageMb(1)
+        self.im8_1 = imageMb(8)
+        self.im8_2 = imageMb(8)
+        self.im8_3 = imageMb(8)
+        self.im32_1 = imageMb(32)
+        self.im32_2 = imageMb(32)
+        self.im32_3 = imageMb(32)
+        self.im8s2_1 = imageMb(128,128,8)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im1_3)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        del(self.im8s2_1)
+
+    def _randomFill(self, im):
+        (w,h) = im.getSize()
+        depth = im.getDepth()
+        if depth==1:
+            imWrk = imageMb(im, 8)
+            self._randomFill(imWrk)
+            threshold(imWrk, im, 128, 255)
+            return
+        elif depth==8:
+            data = bytes(random.getrandbits(8) for i in range(w*h))
+        else:
+            # The values stay below 2**31
+            data = bytes(random.getrandbits(8) if i%4!=3 else random.getrandbits(7)
+                         for i in range(w*h*4))
+        im.loadRaw(data)
+
+    def _randomExpression(self, depth, level=0):
+        ims = {1: (self.im1_1, self.im1_2), 8: (self.im8_1, self.im8_2),
+               32: (self.im32_1, self.im32_2)}
+        if level>3 or random.random()<0.25:
+            return expr(random.choice(ims[depth]))
+        ops = ["negate", "logic", "add", "sub", "diff"]
+        if depth==1:
+            ops += ["threshold", "supMask"]
+        else:
+            ops += ["addConst", "subConst", "mulConst", "convertByMask"]
+        if depth==8:
+            ops.append("lookup")
+        op = random.choice(ops)
+        if op=="negate":
+            return self._randomExpression(depth, level+1).negate()
+        elif op=="logic":
+            log = random.choice(["and", "or", "xor", "inf", "sup"])
+            return self._randomExpression(depth, level+1).logic(
+                self._randomExpression(depth, level+1), log)
+        elif op in ("add", "sub", "diff"):
+            return getattr(self._randomExpression(depth, level+1), op)(
+                self._randomExpression(depth, level+1))
+        elif op=="threshold":
+            low = random.randint(0, 200)
+            e = self._randomExpression(random.choice((8, 32)), level+1)
+            return e.threshold(low, low+random.randint(0, 100))
+        elif op=="supMask":
+            d = random.choice((1, 8, 32))
+            return self._randomExpression(d, level+1).generateSupMask(
+                self._randomExpression(d, level+1), random.random()<0.5)
+        elif op=="convertByMask":
+            e = self._randomExpression(1, level+1)
+            return e.convertByMask(random.randint(0, 1000), random.randint(0, 1000), depth)
+        elif op=="lookup":
+            lut = [random.randint(0, 255) for i in range(256)]
+            return self._randomExpression(8, level+1).lookup(lut)
+        else:
+            v = random.randint(-300, 300)
+            if op=="mulConst":
+                v = random.randint(0, 5)
+            return getattr(self._randomExpression(depth, level+1), op)(v)
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        self.assertRaises(MambaError, expr(self.im8_1).inf, self.im32_1)
+        self.assertRaises(MambaError, expr(self.im1_1).diff, self.im8_1)
+        self.assertRaises(MambaError, expr(self.im1_1).threshold, 0, 1)
+        self.assertRaises(MambaError, expr(self.im1_1).addConst, 1)
+        self.assertRaises(MambaError, expr(self.im8_1).convertByMask, 0, 255)
+        self.assertRaises(MambaError, expr(self.im1_1).convertByMask, 0, 255, 1)
+        self.assertRaises(MambaError, expr(self.im32_1).lookup, list(range(256)))
+        self.assertRaises(MambaError, expr(self.im8_1).negate().evaluate, self.im32_3)
+        self.assertRaises(MambaError, expr(self.im8_1).threshold(1, 2).evaluate, self.im8_3)
+
+    def testValueAcceptation(self):
+        """Tests that incorrect values raise an exception"""
+        self.assertRaises(MambaError, expr(self.im8_1).threshold, 200, 100)
+        self.assertRaises(MambaError, expr(self.im8_1).logic, self.im8_2, "nand")
+        self.assertRaises(MambaError, expr(self.im8_1).lookup, list(range(255)))
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        e = expr(self.im8_1).inf(self.im8s2_1)
+        self.assertRaises(MambaError, e.evaluate, self.im8_3)
+        self.assertRaises(MambaError, expr(self.im8_1).evaluate, self.im8s2_1)
+
+    def testChain(self):
+        """Verifies a chain of operators against the operators"""
+        self._randomFill(self.im8_1)
+        self._randomFill(self.im8_2)
+        e = expr(self.im8_1).inf(self.im8_2).addConst(20).threshold(10, 200)
+        e.convertByMask(0, 255).evaluate(self.im8_3)
+        logic(self.im8_1, self.im8_2, self.im8_2, "inf")
+        addConst(self.im8_2, 20, self.im8_2)
+        threshold(self.im8_2, self.im1_1, 10, 200)
+        convertByMask(self.im1_1, self.im8_2, 0, 255)
+        (x,y) = compare(self.im8_3, self.im8_2, self.im8_3)
+        self.assertLess(x, 0)
+
+    def testLargeConstants(self):
+        """Verifies the constants out of the pixel range against the operators"""
+        for (im, imOut, imExp) in ((self.im8_1, self.im8_2, self.im8_3),
+                                   (self.im32_1, self.im32_2, self.im32_3)):
+            self._randomFill(im)
+            for v in (2**31, 2**31+5, 2**32-1, 2**33+3, 2**15, -2**31, -2**15):
+                expr(im).addConst(v).evaluate(imOut)
+                addConst(im, v, imExp)
+                (x,y) = compare(imOut, imExp, imExp)
+                self.assertLess(x, 0, "addConst %d" % v)
+                expr(im).subConst(v).evaluate(imOut)
+                subConst(im, v, imExp)
+                (x,y) = compare(imOut, imExp, imExp)
+                self.assertLess(x, 0, "subConst %d" % v)
+
+    def testInPlace(self):
+        """Verifies that an expression can be evaluated into one of its images"""
+        self._randomFill(self.im32_1)
+        self._randomFill(self.im32_2)
+        sub(self.im32_2, self.im32_1, self.im32_3)
+        expr(self.im32_2).sub(self.im32_1).evaluate(self.im32_1)
+        (x,y) = compare(self.im32_3, self.im32_1, self.im32_3)
+        self.assertLess(x, 0)
+
+    def testMixedDepths(self):
+        """Verifies operations mixing depths"""
+        self._randomFill(self.im1_1)
+        self._randomFill(self.im8_1)
+        e = expr(self.im1_1).add(self.im8_1)
+        self.assertEqual(e.depth, 8)
+        e.evaluate(self.im8_2)
+        add(self.im1_1, self.im8_1, self.im8_3)
+        (x,y) = compare(self.im8_3, self.im8_2, self.im8_3)
+        self.assertLess(x, 0)
+
+    def testRandomExpressions(self):
+        """Verifies random expressions against the operators"""
+        for im in (self.im1_1, self.im1_2, self.im8_1, self.im8_2, self.im32_1, self.im32_2):
+            self._randomFill(im)
+        outs = {1: (self.im1_3, imageMb(1)), 8: (self.im8_3, imageMb(8)),
+                32: (self.im32_3, imageMb(32))}
+        for i in range(100):
+            depth = random.choice((1, 8, 32))
+            e = self._randomExpression(depth)
+            (imOut, imExp) = outs[depth]
+            e.evaluate(imOut)
+            e._evaluateEager(imExp)
+            (x,y) = compare(imOut, imExp, imExp)
+            self.assertLess(x, 0, repr(e))
@@ -1,8 +1,8 @@
 """
 Test cases for the hierarchical dual build function.
 
-The function works on greyscale images. All images, both input and output, must
-have the same depth.
+The function works on binary, greyscale and 32-bit images. All images, both
+input and output, must have the same depth.
 
 The function builds (dual operation) an image using the first input image as a
 mask.
@@ -56,9 +56,10 @@ class TestHierarDualBld(unittest.TestCase):
 
     def testDepthAcceptation(self):
         """Tests that incorrect depth raises an exception"""
-        self.assertRaises(MambaError, hierarDualBuild, self.im1_1, self.im1_2)
         self.assertRaises(MambaError, hierarDualBuild, self.im1_1, self.im8_2)
         self.assertRaises(MambaError, hierarDualBuild, self.im1_1, self.im32_2)
+        # Binary images are rebuilt like greyscale and 32-bit ones
+        hierarDualBuild(self.im1_1, self.im1_2)
         self.assertRaises(MambaError, hierarDualBuild, self.im8_1, self.im1_2)
         #self.assertRaises(MambaError, hierarDualBuild, self.im8_1, self.im8_2)
         self.assertRaises(MambaError, hierarDualBuild, self.im8_1, self.im32_2)
@@ -163,3 +164,29 @@ class TestHierarDualBld(unittest.TestCase):
             (x,y) = compare(self.im32_4, self.im32_2, self.im32_3)
             self.assertLess(x, 0)
 
+    def _directionalBuild(self, imMask, imInout, grid):
+        vol = 0
+        prec_vol = -1
+        while(prec_vol!=vol):
+            prec_vol = vol
+            for d in getDirections(grid, True):
+                vol = dualbuildNeighbor(imMask, imInout, d, grid)
+
+    def testComputationBinary(self):
+        """Tests binary hierarchical dual build against the directional one"""
+        (w,h) = self.im1_1.getSize()
+        for i in range(5):
+            for grid in (HEXAGONAL, SQUARE):
+                self.im1_1.fill(1)
+                for j in range(2000):
+                    x = random.randint(0, w-13)
+                    y = random.randint(0, h-4)
+                    drawSquare(self.im1_1, (x, y, x+random.randint(0, 12), y+random.randint(0, 3)), 0)
+                self.im1_2.fill(1)
+                for j in range(20):
+                    self.im1_2.setPixel(0, (random.randint(0, w-1), random.randint(0, h-1)))
+                copy(self.im1_2, self.im1_3)
+                hierarDualBuild(self.im1_1, self.im1_2, grid=grid)
+                self._directionalBuild(self.im1_1, self.im1_3, grid)
+                (x,y) = compare(self.im1_3, self.im1_2, self.im1_3)
+                self.assertLess(x, 0, "%s (%d,%d)" % (grid, x, y))
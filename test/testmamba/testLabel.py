@@ -482,3 +482,40 @@ class TestLabel(unittest.TestCase):
         self.assertEqual(mi, 10)
         self.assertEqual(ma, 229)
 
+
+    def testMultithreaded(self):
+        """Verifies that the labels do not depend on the number of threads"""
+        nb = getThreadNumber()
+        for depth in [1, 8, 32]:
+            imIn = imageMb(128, 250, depth)
+            imRef = imageMb(128, 250, 32)
+            imOut = imageMb(128, 250, 32)
+            im8 = imageMb(128, 250, 8)
+            size = im8.mbIm.width*im8.mbIm.height
+            im8.loadRaw(bytes(random.choice((0, 0, 1, 200)) for i in range(size)))
+            if depth==1:
+                threshold(im8, imIn, 100, 255)
+            elif depth==8:
+                copy(im8, imIn)
+            else:
+                copyBytePlane(im8, 1, imIn)
+            for grid in [HEXAGONAL, SQUARE]:
+                for (lblow, lbhigh) in [(0, 256), (10, 20)]:
+                    setThreadNumber(1)
+                    n1 = label(imIn, imRef, lblow, lbhigh, grid=grid)
+                    setThreadNumber(4)
+                    n4 = label(imIn, imOut, lblow, lbhigh, grid=grid)
+                    self.assertEqual(n1, n4)
+                    (x,y) = compare(imRef, imOut, imRef)
+                    self.assertLess(x, 0, "%d %s %d: (%d,%d)" % (depth, grid, lblow, x, y))
+        setThreadNumber(nb)
+
+    def testIsolatedPixels(self):
+        """Labels an image where every other pixel is an isolated particle"""
+        (w,h) = self.im1_1.getSize()
+        self.im1_1.reset()
+        for wi in range(0,w,2):
+            for hi in range(0,h,2):
+                self.im1_1.setPixel(1, (wi,hi))
+        n = label(self.im1_1, self.im32_1, grid=SQUARE)
+        self.assertEqual(n, (w//2)*(h//2))
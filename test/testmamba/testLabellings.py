@@ -9,6 +9,13 @@ Python functions and classes:
     diameterLabelling
     feretdiameterLabelling
     volumeLabelling
+    regionProps
+    labelLookup
+
+C functions:
+    MB_RegionLabels
+    MB_RegionProps
+    MB_LabelLookup
 """
 
 from mamba import *
@@ -149,6 +156,68 @@ class TestLabellings(unittest.TestCase):
         (x,y) = computeRange(self.im32_2)
         self.assertEqual(y, 256, "Feret diameter : %d" % (y))
    
+    def testRegionProps(self):
+        """Verifies the properties of the regions against the operators"""
+        self._genTestImage1(self.im8_1)
+        nbLabels = partitionLabel(self.im8_1, self.im32_1)
+        props = regionProps(self.im32_1, self.im8_1)
+        self.assertRaises(MambaError, regionProps, self.im8_1)
+        self.assertNotIn("volume", regionProps(self.im32_1))
+        (w, h) = self.im32_1.getSize()
+        self.assertEqual(len(props["label"]), len(props["area"]))
+        self.assertEqual(sum(props["area"]), w*h)
+        for (r, l) in enumerate(props["label"]):
+            threshold(self.im32_1, self.im1_1, l, l)
+            area = computeVolume(self.im1_1)
+            self.assertEqual(props["area"][r], area)
+            self.assertGreater(area, 0)
+            convertByMask(self.im1_1, self.im8_2, 0, 255)
+            logic(self.im8_1, self.im8_2, self.im8_2, "inf")
+            self.assertEqual(props["volume"][r], computeVolume(self.im8_2))
+            self.assertEqual(props["maximum"][r], computeRange(self.im8_2)[1])
+            (x1, y1, x2, y2) = extractFrame(self.im1_1, 1)
+            self.assertEqual((props["xmin"][r], props["ymin"][r]), (x1, y1))
+            self.assertEqual((props["xmax"][r], props["ymax"][r]), (x2, y2))
+            self.assertEqual(props["horizontalFeret"][r], x2-x1+1)
+            self.assertEqual(props["verticalFeret"][r], y2-y1+1)
+        # Point and square regions
+        self.im32_1.reset()
+        self.im32_1.setPixel(1, (10, 20))
+        drawSquare(self.im32_1, (30, 40, 33, 43), 2)
+        props = regionProps(self.im32_1)
+        self.assertEqual(props["area"][1], 1)
+        self.assertEqual((props["xcentroid"][1], props["ycentroid"][1]), (10.0, 20.0))
+        self.assertEqual(props["area"][2], 16)
+        self.assertEqual((props["xcentroid"][2], props["ycentroid"][2]), (31.5, 41.5))
+        self.assertEqual(props["diagonalFeret"][2], 7)
+        self.assertEqual(props["antidiagonalFeret"][2], 7)
+        self.assertEqual(props["area"][0], w*h-17)
+        # Sparse labels give one row per label
+        self.im32_1.setPixel(0x10000000, (50, 60))
+        self.im32_1.setPixel(0xffffffff, (0, 0))
+        props = regionProps(self.im32_1)
+        self.assertEqual(list(props["label"]), [0, 1, 2, 0x10000000, 0xffffffff])
+        self.assertEqual(list(props["area"]), [w*h-19, 1, 16, 1, 1])
+        self.assertEqual((props["xmin"][3], props["ymin"][3]), (50, 60))
+        self.assertEqual((props["xmax"][4], props["ymax"][4]), (0, 0))
+        areaLabelling(self.im32_1, self.im32_2)
+        self.assertEqual(self.im32_2.getPixel((31, 41)), 16)
+        self.assertEqual(self.im32_2.getPixel((50, 60)), 1)
+
+    def testLabelLookup(self):
+        """Verifies the replacement of labels by values"""
+        self._genTestImage2(self.im32_1)
+        (x, y) = computeRange(self.im32_1)
+        labelLookup(self.im32_1, self.im32_2, [2*i+1 for i in range(y)])
+        mulConst(self.im32_1, 2, self.im32_3)
+        addConst(self.im32_3, 1, self.im32_3)
+        threshold(self.im32_1, self.im1_1, y, y)
+        convertByMask(self.im1_1, self.im32_1, computeMaxRange(self.im32_1)[1], 0)
+        logic(self.im32_3, self.im32_1, self.im32_3, "inf")
+        (x, y) = compare(self.im32_2, self.im32_3, self.im32_3)
+        self.assertLess(x, 0)
+        self.assertRaises(MambaError, labelLookup, self.im8_1, self.im32_2, [0])
+
     def testVolumeLabelling(self):
         """Testing the volume labelling"""
         self._genTestImage1(self.im8_1)
@@ -171,6 +240,10 @@ class TestLabellings(unittest.TestCase):
             threshold(self.im32_1, self.im1_2, s, s)
             (x,y) = compare(self.im1_1, self.im1_2, self.im1_3)            
             self.assertLess(x, 0) 
+        # measureLabelling with a non-binary measure gives the volume
+        measureLabelling(self.im8_1, self.im32_2, self.im32_3)
+        (x,y) = compare(self.im32_1, self.im32_3, self.im32_3)
+        self.assertLess(x, 0)
 
         
         
@@ -209,3 +209,16 @@ class TestMiscellaneous(unittest.TestCase):
         self.assertEqual(self.im32_1.getPixel((130,128)), 4)
         self.assertEqual(self.im32_1.getPixel((132,128)), 1600000)
         
+    def testPIL2Mamba16(self):
+        """Verifies the conversion of 16-bit pil images into mamba images"""
+        for mode in ["I;16", "I;16B"]:
+            im = Image.new(mode, (256,256))
+            im.putpixel((128,128), 0x1234)
+            im.putpixel((130,128), 0xffff)
+            im.putpixel((1,255), 7)
+            PIL2Mamba(im, self.im32_1)
+            self.assertEqual(self.im32_1.getPixel((128,128)), 0x1234)
+            self.assertEqual(self.im32_1.getPixel((130,128)), 0xffff)
+            self.assertEqual(self.im32_1.getPixel((1,255)), 7)
+            self.assertEqual(computeVolume(self.im32_1), 0x1234+0xffff+7)
+        
@@ -196,6 +196,25 @@ class TestPartitions(unittest.TestCase):
         (x,y) = compare(self.im8_3, self.im8_2, self.im8_3)
         self.assertLess(x, 0)
         
+    def testCellsBuild32(self):
+        """Verifies the cell reconstruction of disconnected cells of same value"""
+        (w,h) = self.im32_1.getSize()
+        self.im32_1.reset()
+        drawSquare(self.im32_1, (0,0,w//4-1,h-1), 0x10000)
+        drawSquare(self.im32_1, (3*w//4,0,w-1,h-1), 0x10000)
+        self.im32_2.reset()
+        self.im32_2.setPixel(0x20000, (2,2))
+        self.im32_2.setPixel(0x30000, (w//8,h-3))
+        self.im32_2.setPixel(5, (w//2,h//2))
+        cellsBuild(self.im32_1, self.im32_2, HEXAGONAL)
+        self.im32_3.fill(5)
+        drawSquare(self.im32_3, (0,0,w//4-1,h-1), 0x30000)
+        drawSquare(self.im32_3, (3*w//4,0,w-1,h-1), 0)
+        (x,y) = compare(self.im32_3, self.im32_2, self.im32_3)
+        self.assertLess(x, 0)
+        self.assertRaises(MambaError, cellsBuild, self.im8_1, self.im32_2)
+        self.assertRaises(MambaError, cellsBuild, self.im1_1, self.im1_1)
+        
     def testCellsExtract(self):
         """Verifies the cell extraction function"""
         (w,h) = self.im8_1.getSize()
@@ -0,0 +1,72 @@
+"""
+Test cases for the profiling of operators found in the profiling module of
+mamba package.
+
+Python functions and classes:
+    profile
+"""
+
+from mamba import *
+import unittest
+import sys
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.im8_1 = imageMb(256, 256, 8)
+        self.im8_2 = imageMb(256, 256, 8)
+
+    def tearDown(self):
+        del(self.im8_1)
+        del(self.im8_2)
+
+    def testHookRestored(self):
+        """Verifies that the profiling hook is removed at the end of the block"""
+        previous = sys.getprofile()
+        with profile():
+            copy(self.im8_1, self.im8_2)
+        self.assertIs(sys.getprofile(), previous)
+        try:
+            with profile():
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertIs(sys.getprofile(), previous)
+
+    def testPrimitives(self):
+        """Verifies the number of calls and pixels of the library functions"""
+        with profile() as prof:
+            for i in range(3):
+                copy(self.im8_1, self.im8_2)
+            self.im8_1.setPixel(1, (10, 10))
+        (calls, t, pixels) = prof.primitives["MB_Copy"]
+        self.assertEqual(calls, 3)
+        self.assertEqual(pixels, 3*256*256)
+        self.assertGreaterEqual(t, 0.0)
+        self.assertEqual(prof.primitives["MB_PutPixel"][2], 1)
+        copy(self.im8_1, self.im8_2)
+        self.assertEqual(prof.primitives["MB_Copy"][0], 3)
+
+    def testOperators(self):
+        """Verifies that the functions are attributed to their operators"""
+        with profile() as prof:
+            gradient(self.im8_1, self.im8_2)
+            erode(self.im8_1, self.im8_2)
+        self.assertEqual(prof.operators["erode"][0], 2)
+        (calls, t, selfTime) = prof.operators["gradient"]
+        self.assertEqual(calls, 1)
+        self.assertLessEqual(selfTime, t)
+        node = prof.root.children["gradient"]
+        self.assertEqual(node.children["erode"].children["MB_Erode"].calls, 1)
+        self.assertEqual(prof.root.children["erode"].calls, 1)
+        self.assertNotIn("MB_Erode", prof.root.children)
+
+    def testReport(self):
+        """Verifies that the reports contain the operators and functions"""
+        with profile() as prof:
+            gradient(self.im8_1, self.im8_2)
+        for report in (prof.report(), prof.report(tree=True)):
+            self.assertIn("gradient", report)
+            self.assertIn("MB_Dilate", report)
+        self.assertIn("\n  dilate", prof.report(tree=True))
+
@@ -10,6 +10,8 @@ Python functions:
     ultimateOpening
     ultimateIsotropicOpening
     ultimateBuildOpening
+    ultimateAttributeOpening
+    ultimateAttributeClosing
     quasiDistance
     fullRegularisedGradient
 """
@@ -365,3 +367,43 @@ class TestResidues(unittest.TestCase):
             (x,y) = compare(self.im8_5, self.im8_4, self.im8_4)
             self.assertLess(x, 0)
 
+
+    def testUltimateAttributeOpening(self):
+        """Verifies the ultimate area opening and closing against the area openings"""
+        im8_1 = imageMb(64, 64, 8)
+        im8_2 = imageMb(64, 64, 8)
+        im8_3 = imageMb(64, 64, 8)
+        im8_4 = imageMb(64, 64, 8)
+        im1_1 = imageMb(64, 64, 1)
+        im1_2 = imageMb(64, 64, 1)
+        im32_1 = imageMb(64, 64, 32)
+        im32_2 = imageMb(64, 64, 32)
+        im32_3 = imageMb(64, 64, 32)
+        im8_1.loadRaw(bytes(random.randrange(16) for i in range(64*64)))
+        
+        # The residues only change at the sizes of the granulometric curve
+        im8_3.reset()
+        im32_3.reset()
+        copy(im8_1, im8_4)
+        for (size, volume) in attributeGranulometry(im8_1, "area")[1:]:
+            areaOpening(im8_1, im8_2, size)
+            sub(im8_4, im8_2, im8_4)
+            generateSupMask(im8_4, im8_3, im1_1, False)
+            threshold(im8_4, im1_2, 1, 255)
+            logic(im1_1, im1_2, im1_1, "inf")
+            convertByMask(im1_1, im32_1, 0, size)
+            logic(im32_3, im32_1, im32_3, "sup")
+            logic(im8_3, im8_4, im8_3, "sup")
+            copy(im8_2, im8_4)
+        ultimateAttributeOpening(im8_1, im8_2, im32_2, "area")
+        (x,y) = compare(im32_3, im32_2, im32_2)
+        self.assertLess(x, 0)
+        (x,y) = compare(im8_3, im8_2, im8_2)
+        self.assertLess(x, 0)
+        
+        negate(im8_1, im8_1)
+        ultimateAttributeClosing(im8_1, im8_2, im32_2, "area")
+        (x,y) = compare(im32_3, im32_2, im32_2)
+        self.assertLess(x, 0)
+        (x,y) = compare(im8_3, im8_2, im8_2)
+        self.assertLess(x, 0)
@@ -0,0 +1,153 @@
+"""
+Test cases for the tiled images found in the tiles module of mamba package.
+
+The operators applied by tiles must give the same result as the ones applied
+to the whole image.
+
+Python functions and classes:
+    tiledImageMb
+    processTiles
+    tiledErode
+    tiledDilate
+    tiledGradient
+    tiledOpening
+    tiledClosing
+    tiledAlternateFilter
+    tiledFullAlternateFilter
+"""
+
+from mamba import *
+import unittest
+import random
+import tempfile
+import shutil
+import os
+
+class TestTiles(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.im8_1 = imageMb(320, 258, 8)
+        self.im8_2 = imageMb(320, 258, 8)
+        self.im8_3 = imageMb(320, 258, 8)
+        self.im1_1 = imageMb(320, 258, 1)
+        self.im1_2 = imageMb(320, 258, 1)
+        self.im1_3 = imageMb(320, 258, 1)
+        self.im32_1 = imageMb(320, 258, 32)
+        random.seed(12)
+        self.im8_1.loadRaw(bytes(random.getrandbits(8) for i in range(320*258)))
+        threshold(self.im8_1, self.im1_1, 100, 255)
+
+    def tearDown(self):
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im1_3)
+        del(self.im32_1)
+        shutil.rmtree(self.dir)
+
+    def _tiled(self, name, im, mode="w"):
+        (w,h) = im.getSize()
+        return tiledImageMb(os.path.join(self.dir, name), w, h, im.getDepth(), mode)
+
+    def _compareTiled(self, tiledOp, op, imIn, imOut, imRef, *args, **kwargs):
+        tIn = self._tiled("in.raw", imIn)
+        tOut = self._tiled("out.raw", imOut)
+        tIn.load(imIn)
+        tiledOp(tIn, tOut, *args, tileSize=128, **kwargs)
+        tOut.extract(imOut)
+        op(imIn, imRef, *args, **kwargs)
+        (x,y) = compare(imOut, imRef, imOut)
+        self.assertLess(x, 0, (tiledOp.__name__, args, kwargs, x, y))
+        tIn.close()
+        tOut.close()
+
+    def testSizeAndDepth(self):
+        """Verifies that incorrect sizes or depths raise an exception"""
+        path = os.path.join(self.dir, "im.raw")
+        self.assertRaises(MambaError, tiledImageMb, path, 100, 64, 8, "w")
+        self.assertRaises(MambaError, tiledImageMb, path, 64, 63, 8, "w")
+        self.assertRaises(MambaError, tiledImageMb, path, 64, 64, 16, "w")
+        tIm = tiledImageMb(path, 64, 64, 8, "w")
+        self.assertEqual(tIm.getSize(), (64, 64))
+        self.assertEqual(tIm.getDepth(), 8)
+        self.assertRaises(MambaError, tIm.readTile, self.im1_1, 0, 0)
+        self.assertRaises(MambaError, tIm.readTile, imageMb(128, 64, 8), 0, 0)
+        self.assertRaises(MambaError, processTiles, copy, tIm, tIm, 0)
+        tIm.close()
+        self.assertRaises(MambaError, tiledImageMb, path, 128, 64, 8, "r")
+
+    def testLoadExtract(self):
+        """Verifies that an image is stored and read back from the file"""
+        for (im, imOut) in ((self.im8_1, self.im8_2), (self.im1_1, self.im1_2)):
+            tIm = self._tiled("im.raw", im)
+            tIm.load(im)
+            tIm.close()
+            tIm = self._tiled("im.raw", im, "r")
+            tIm.extract(imOut)
+            (x,y) = compare(im, imOut, imOut)
+            self.assertLess(x, 0)
+            tIm.close()
+        self.assertEqual(os.path.getsize(os.path.join(self.dir, "im.raw")), 320*258//8)
+
+    def testReadOnly(self):
+        """Verifies that an image opened in read mode leaves its file unchanged"""
+        tIm = self._tiled("im.raw", self.im8_1)
+        tIm.load(self.im8_1)
+        tIm.close()
+        tIm = self._tiled("im.raw", self.im8_1, "r")
+        self.im8_2.reset()
+        tIm.writeTile(self.im8_2, 0, 0, 0, 0, 64, 2)
+        tIm.close()
+        tIm = self._tiled("im.raw", self.im8_1, "r")
+        tIm.extract(self.im8_2)
+        (x,y) = compare(self.im8_1, self.im8_2, self.im8_2)
+        self.assertLess(x, 0)
+        tIm.close()
+
+    def testTiles(self):
+        """Verifies that tiles are read and written at their position"""
+        tIn = self._tiled("in.raw", self.im32_1)
+        self.im32_1.reset()
+        self.im32_1.setPixel(123456789, (70, 3))
+        tIn.load(self.im32_1)
+        imTile = imageMb(128, 64, 32)
+        tIn.readTile(imTile, 64, 2)
+        self.assertEqual(imTile.getPixel((6, 1)), 123456789)
+        tIn.writeTile(imTile, 192, 100, 0, 0, 64, 4)
+        tIn.extract(self.im32_1)
+        self.assertEqual(self.im32_1.getPixel((198, 101)), 123456789)
+        self.assertEqual(computeVolume(self.im32_1), 2*123456789)
+        tIn.close()
+
+    def testErodeDilate(self):
+        """Verifies the tiled erosions and dilations against the operators"""
+        for (imIn, imOut, imRef) in ((self.im8_1, self.im8_2, self.im8_3),
+                                     (self.im1_1, self.im1_2, self.im1_3)):
+            for se in (HEXAGON, SQUARE3X3, TRIANGLE, SQUARE2X2):
+                for n in (1, 3):
+                    for edge in (EMPTY, FILLED):
+                        self._compareTiled(tiledErode, erode, imIn, imOut, imRef,
+                                           n, se=se, edge=edge)
+                        self._compareTiled(tiledDilate, dilate, imIn, imOut, imRef,
+                                           n, se=se, edge=edge)
+
+    def testFilters(self):
+        """Verifies the tiled gradient, openings, closings and filters"""
+        for (imIn, imOut, imRef) in ((self.im8_1, self.im8_2, self.im8_3),
+                                     (self.im1_1, self.im1_2, self.im1_3)):
+            self._compareTiled(tiledGradient, gradient, imIn, imOut, imRef, 2)
+            self._compareTiled(tiledOpening, opening, imIn, imOut, imRef, 3)
+            self._compareTiled(tiledClosing, closing, imIn, imOut, imRef, 3,
+                               se=SQUARE3X3)
+            self._compareTiled(tiledAlternateFilter, alternateFilter,
+                               imIn, imOut, imRef, 2, True)
+            self._compareTiled(tiledFullAlternateFilter, fullAlternateFilter,
+                               imIn, imOut, imRef, 3, False)
+
+    def testLargeHalo(self):
+        """Verifies that a halo larger than the tiles gives the right result"""
+        self._compareTiled(tiledErode, erode, self.im8_1, self.im8_2, self.im8_3,
+                           100, se=SQUARE3X3)
@@ -0,0 +1,242 @@
+"""
+Test cases for the operators computed through the component trees found in
+the trees module of mamba package.
+
+Python functions and classes:
+    maxTree
+    minTree
+    areaOpening
+    areaClosing
+    volumeOpening
+    volumeClosing
+    attributeGranulometry
+
+C functions:
+    MB_MaxTree
+    MB_TreeProps
+    MB_TreeFilter
+    MB_TreeDynamicBuild
+    MB_TreeBuildSizes
+"""
+
+from mamba import *
+import unittest
+import random
+
+class TestTrees(unittest.TestCase):
+
+    def setUp(self):
+        # Small images keep the verification by threshold sets fast
+        self.im1_1 = imageMb(64, 64, 1)
+        self.im8_1 = imageMb(64, 64, 8)
+        self.im8_2 = imageMb(64, 64, 8)
+        self.im8_3 = imageMb(64, 64, 8)
+        self.im32_1 = imageMb(64, 64, 32)
+        self.im32_2 = imageMb(64, 64, 32)
+        self.im32_3 = imageMb(64, 64, 32)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+
+    def _randomFill(self, im, levels):
+        (w,h) = im.getSize()
+        im.loadRaw(bytes(random.randrange(levels) for i in range(w*h)))
+
+    def _areaOpening(self, imIn, imOut, area, grid):
+        # Area opening computed threshold by threshold
+        imMask = imageMb(imIn, 1)
+        imComp = imageMb(imIn, 1)
+        imLabel = imageMb(imIn, 32)
+        imWrk = imageMb(imIn)
+        imOut.reset()
+        for v in range(1, computeRange(imIn)[1]+1):
+            threshold(imIn, imMask, v, 255)
+            n = label(imMask, imLabel, grid=grid)
+            for i in range(1, n+1):
+                threshold(imLabel, imComp, i, i)
+                if computeVolume(imComp)>=area:
+                    convertByMask(imComp, imWrk, 0, v)
+                    logic(imOut, imWrk, imOut, "sup")
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        self.assertRaises(MambaError, areaOpening, self.im1_1, self.im1_1, 10)
+        self.assertRaises(MambaError, volumeClosing, self.im1_1, self.im8_1, 10)
+        self.im8_1.fill(255)
+        self.im32_1.fill(1000)
+        self.assertRaises(MambaError, areaOpening, self.im32_1, self.im8_1, 10)
+
+    def testTree(self):
+        """Verifies the nodes and the attributes of a max-tree and a min-tree"""
+        self.im8_1.fill(10)
+        drawSquare(self.im8_1, (5, 6, 14, 20), 50)
+        drawSquare(self.im8_1, (8, 8, 9, 9), 80)
+        drawSquare(self.im8_1, (40, 30, 42, 31), 0)
+        tree = maxTree(self.im8_1)
+        self.assertEqual(tree.getNodeNumber(), 4)
+        self.assertEqual(list(tree.getParents()), [0, 0, 1, 2])
+        self.assertEqual(list(tree.getLevels()), [0, 10, 50, 80])
+        self.assertEqual(list(tree.getAttribute("area")), [64*64, 64*64-6, 150, 4])
+        self.assertEqual(list(tree.getAttribute("height")), [80, 80, 70, 30])
+        self.assertEqual(tree.getAttribute("volume")[2], 150*40+4*30)
+        self.assertEqual(tree.getAttribute("xmin")[2], 5)
+        self.assertEqual(tree.getAttribute("ymin")[2], 6)
+        self.assertEqual(tree.getAttribute("xmax")[2], 14)
+        self.assertEqual(tree.getAttribute("ymax")[2], 20)
+        self.assertRaises(MambaError, tree.getAttribute, "perimeter")
+        tree = minTree(self.im8_1)
+        self.assertEqual(list(tree.getLevels()), [80, 50, 10, 0])
+        self.assertEqual(list(tree.getAttribute("area")), [64*64, 64*64-4, 64*64-150, 6])
+        self.assertEqual(list(tree.getAttribute("height")), [80, 80, 50, 10])
+
+    def testFilterReuse(self):
+        """Verifies the filters of a tree with several thresholds"""
+        self._randomFill(self.im8_1, 256)
+        for tree in (maxTree(self.im8_1), minTree(self.im8_1)):
+            tree.build(self.im8_2)
+            (x,y) = compare(self.im8_1, self.im8_2, self.im8_3)
+            self.assertLess(x, 0)
+            for area in (1, 5, 50, 64*64+1):
+                tree.filter("area", area, self.im8_2)
+                if isinstance(tree, minTree):
+                    areaClosing(self.im8_1, self.im8_3, area)
+                else:
+                    areaOpening(self.im8_1, self.im8_3, area)
+                (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+                self.assertLess(x, 0)
+            # Values given by the user
+            tree.filter([1]*tree.getNodeNumber(), 2, self.im8_2)
+            self.im8_3.fill(tree.getLevels()[0])
+            (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+            self.assertLess(x, 0)
+            self.assertRaises(MambaError, tree.filter, [1], 2, self.im8_2)
+
+    def testBuildSizes(self):
+        """Verifies the sizes of the nodes against the openings by reconstruction"""
+        for grid in (HEXAGONAL, SQUARE):
+            self._randomFill(self.im8_1, 256)
+            se = structuringElement(getDirections(grid), grid)
+            for tree in (maxTree(self.im8_1, grid), minTree(self.im8_1, grid)):
+                sizes = tree.buildSizes(grid)
+                for n in (1, 2, 5):
+                    tree.filter(sizes, n, self.im8_2)
+                    if isinstance(tree, minTree):
+                        buildClose(self.im8_1, self.im8_3, n, se=se)
+                    else:
+                        buildOpen(self.im8_1, self.im8_3, n, se=se)
+                    (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+                    self.assertLess(x, 0)
+
+    def testDynamicBuild(self):
+        """Verifies the reconstructions of the lowered and raised images"""
+        for grid in (HEXAGONAL, SQUARE):
+            self._randomFill(self.im8_1, 256)
+            convert(self.im8_1, self.im32_1)
+            mulConst(self.im32_1, 1000, self.im32_1)
+            for (im, imOut1, imOut2) in ((self.im8_1, self.im8_2, self.im8_3),
+                                         (self.im32_1, self.im32_2, self.im32_3)):
+                tree = maxTree(im, grid=grid)
+                for h in (0, 1, 20, 255):
+                    tree.dynamicBuild(h, imOut1)
+                    if im.getDepth()==8:
+                        subConst(im, h, imOut2)
+                    else:
+                        floorSubConst(im, h, imOut2)
+                    build(im, imOut2, grid=grid)
+                    (x,y) = compare(imOut1, imOut2, imOut2)
+                    self.assertLess(x, 0)
+                tree = minTree(im, grid=grid)
+                for h in (0, 1, 20, 255):
+                    tree.dynamicBuild(h, imOut1)
+                    if im.getDepth()==8:
+                        addConst(im, h, imOut2)
+                    else:
+                        ceilingAddConst(im, h, imOut2)
+                    dualBuild(im, imOut2, grid=grid)
+                    (x,y) = compare(imOut1, imOut2, imOut2)
+                    self.assertLess(x, 0)
+
+    def testAreaOpening(self):
+        """Verifies the area opening against the threshold sets"""
+        for grid in (HEXAGONAL, SQUARE):
+            self._randomFill(self.im8_1, 8)
+            area = random.randint(2, 20)
+            areaOpening(self.im8_1, self.im8_2, area, grid=grid)
+            self._areaOpening(self.im8_1, self.im8_3, area, grid)
+            (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+            self.assertLess(x, 0)
+
+    def testAreaClosing(self):
+        """Verifies that the area closing is the dual of the area opening"""
+        for grid in (HEXAGONAL, SQUARE):
+            self._randomFill(self.im8_1, 256)
+            area = random.randint(2, 50)
+            areaClosing(self.im8_1, self.im8_2, area, grid=grid)
+            negate(self.im8_1, self.im8_1)
+            areaOpening(self.im8_1, self.im8_3, area, grid=grid)
+            negate(self.im8_3, self.im8_3)
+            (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+            self.assertLess(x, 0)
+
+    def testVolume(self):
+        """Verifies the volume opening and closing"""
+        self._randomFill(self.im8_1, 256)
+        volumeOpening(self.im8_1, self.im8_2, 0)
+        (x,y) = compare(self.im8_1, self.im8_2, self.im8_3)
+        self.assertLess(x, 0)
+        self.im8_1.reset()
+        drawSquare(self.im8_1, (10, 10, 19, 19), 10)
+        drawSquare(self.im8_1, (30, 30, 39, 39), 30)
+        drawSquare(self.im8_1, (32, 32, 33, 33), 200)
+        # Volumes: 1000 for the first square, 3680 for the second one and
+        # 680 for its peak above 30
+        volumeOpening(self.im8_1, self.im8_2, 681)
+        self.im8_3.reset()
+        drawSquare(self.im8_3, (10, 10, 19, 19), 10)
+        drawSquare(self.im8_3, (30, 30, 39, 39), 30)
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+        self.assertLess(x, 0)
+        volumeOpening(self.im8_1, self.im8_2, 1001)
+        self.im8_3.reset()
+        drawSquare(self.im8_3, (30, 30, 39, 39), 30)
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+        self.assertLess(x, 0)
+        negate(self.im8_1, self.im8_1)
+        volumeClosing(self.im8_1, self.im8_2, 1001)
+        negate(self.im8_3, self.im8_3)
+        (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+        self.assertLess(x, 0)
+
+    def test32Bit(self):
+        """Verifies the area opening of 32-bit images"""
+        self._randomFill(self.im8_1, 256)
+        convert(self.im8_1, self.im32_1)
+        mulConst(self.im32_1, 100000, self.im32_1)
+        areaOpening(self.im32_1, self.im32_2, 15)
+        areaOpening(self.im8_1, self.im8_2, 15)
+        convert(self.im8_2, self.im32_3)
+        mulConst(self.im32_3, 100000, self.im32_3)
+        (x,y) = compare(self.im32_2, self.im32_3, self.im32_3)
+        self.assertLess(x, 0)
+
+    def testAttributeGranulometry(self):
+        """Verifies the granulometric curves against the openings"""
+        self._randomFill(self.im8_1, 16)
+        for (attribute, opening) in (("area", areaOpening), ("volume", volumeOpening)):
+            curve = attributeGranulometry(self.im8_1, attribute)
+            self.assertEqual(curve[0], (0, computeVolume(self.im8_1)))
+            self.assertEqual(curve[-1][1], computeRange(self.im8_1)[0]*64*64)
+            for (size, volume) in curve[:10]:
+                opening(self.im8_1, self.im8_2, size)
+                self.assertEqual(computeVolume(self.im8_2), volume)
+        for grid in (HEXAGONAL, SQUARE):
+            curve = minTree(self.im8_1, grid=grid).granulometry("area")
+            for (size, volume) in curve[:10]:
+                areaClosing(self.im8_1, self.im8_2, size, grid=grid)
+                self.assertEqual(computeVolume(self.im8_2), volume)
@@ -160,6 +160,34 @@ class TestArithmetic3D(unittest.TestCase):
         (x,y,z) = compare3D(self.im8_3, self.im8_1, self.im8_3)
         self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
         
+    def testLogicParameter3D(self):
+        """Verifies that an unknown logic operator raises an exception"""
+        self.assertRaises(MambaError, logic3D, self.im8_1, self.im8_2, self.im8_3, "nand")
+        
+    def testThreads3D(self):
+        """Verifies that the operators give the same result plane by plane with several threads"""
+        threads = getThreadNumber()
+        imIn1 = image3DMb(64,64,9,8)
+        imIn2 = image3DMb(64,64,9,8)
+        imOut = image3DMb(64,64,9,8)
+        im = imageMb(64,64,8)
+        for i in range(9):
+            imIn1[i].loadRaw(bytes(random.randint(0,255) for j in range(64*64)))
+            imIn2[i].loadRaw(bytes(random.randint(0,255) for j in range(64*64)))
+        setThreadNumber(4)
+        for (op3D, op) in ((add3D, add), (sub3D, sub), (mul3D, mul), (diff3D, diff)):
+            op3D(imIn1, imIn2, imOut)
+            for i in range(9):
+                op(imIn1[i], imIn2[i], im)
+                (x,y) = compare(imOut[i], im, im)
+                self.assertLess(x, 0)
+        addConst3D(imIn1, 100, imOut)
+        for i in range(9):
+            addConst(imIn1[i], 100, im)
+            (x,y) = compare(imOut[i], im, im)
+            self.assertLess(x, 0)
+        setThreadNumber(threads)
+        
     def testDiff3D(self):
         """Tests the logic operators on 3D images"""
         self.im8_1.fill(41)
@@ -203,6 +203,61 @@ class TestBase3D(unittest.TestCase):
         self.assertEqual(len(rawdata), 64*64*6*4)
         self.assertEqual(rawdata, 64*64*6*b"\x44\x33\x22\x11")
         
+    def testContiguous3D(self):
+        """Verifies the 3D images stored in a single memory block"""
+        im8_1 = image3DMb(64,64,5,8,contiguous=True)
+        im8_2 = image3DMb(im8_1)
+        im8_3 = image3DMb(64,64,5,8)
+        rawdata = bytes(random.randint(0,255) for i in range(64*64*5))
+        im8_1.loadRaw(rawdata)
+        im8_3.loadRaw(rawdata)
+        self.assertEqual(im8_1.extractRaw(), rawdata)
+        self.assertEqual(im8_3.extractRaw(), rawdata)
+        copy3D(im8_1, im8_2)
+        for i in range(5):
+            (x,y) = compare(im8_2[i], im8_3[i], im8_3[i])
+            self.assertLess(x, 0)
+        im8_1[2].setPixel(0x55, (3,4))
+        self.assertEqual(im8_1.getPixel((3,4,2)), 0x55)
+        im8_1.convert(32)
+        self.assertEqual(im8_1.getDepth(), 32)
+        self.assertEqual(im8_1.getPixel((3,4,2)), 0x55)
+        rawdata = im8_1.extractRaw()
+        self.assertEqual(len(rawdata), 64*64*5*4)
+        im8_1.loadRaw(rawdata)
+        
+    def testArrayInterface3D(self):
+        """Verifies that the pixels of contiguous 3D images are shared with NumPy"""
+        try:
+            import numpy
+        except ImportError:
+            return
+        im8 = image3DMb(128,64,4,8,contiguous=True)
+        im32 = image3DMb(128,64,4,32,contiguous=True)
+        a8 = numpy.asarray(im8)
+        self.assertEqual(a8.shape, (4,64,128))
+        self.assertEqual(a8.dtype, numpy.uint8)
+        im8.setPixel(0x55, (3,5,2))
+        self.assertEqual(a8[2,5,3], 0x55)
+        a8[1,10,20] = 0x77
+        self.assertEqual(im8.getPixel((20,10,1)), 0x77)
+        a32 = numpy.asarray(im32)
+        self.assertEqual(a32.shape, (4,64,128))
+        a32[:] = 0x11223344
+        self.assertEqual(computeVolume3D(im32), 4*128*64*0x11223344)
+        f8 = numpy.asarray(im8, dtype=numpy.float64)
+        self.assertEqual(f8.dtype, numpy.float64)
+        self.assertEqual(f8[1,10,20], 0x77)
+        f8[1,10,20] = 0
+        self.assertEqual(im8.getPixel((20,10,1)), 0x77)
+        im8 = image3DMb(128,64,4,8)
+        im8.setPixel(0x55, (3,5,2))
+        c8 = numpy.asarray(im8)
+        self.assertEqual(c8.shape, (4,64,128))
+        self.assertEqual(c8[2,5,3], 0x55)
+        c8[2,5,3] = 0
+        self.assertEqual(im8.getPixel((3,5,2)), 0x55)
+        
     def testImage3DMbLoad(self):
         """Verifies the loading method of the image3DMb class"""
         im = image3DMb(256,256,9,8)
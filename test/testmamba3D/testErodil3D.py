@@ -132,6 +132,42 @@ class TestErodil3D(unittest.TestCase):
         (x,y,z) = compare3D(self.im8_3, self.im8_2, self.im8_1)
         self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
         
+    def testCenterCubicErodil3D(self):
+        """Verifies the dilation and erosion on the center cubic grid"""
+        (w,h,l) = self.im8_1.getSize()
+        se = structuringElement3D(list(range(17)), CENTER_CUBIC)
+        self.im8_1.reset()
+        self.im8_1.setPixel(255, (w//2,h//2,l//2))
+        dilate3D(self.im8_1, self.im8_2, se=se)
+        self.assertEqual(computeVolume3D(self.im8_2), 17*255)
+        self.assertEqual(computeVolume(self.im8_2[l//2-1]), 4*255)
+        self.assertEqual(computeVolume(self.im8_2[l//2]), 9*255)
+        self.assertEqual(computeVolume(self.im8_2[l//2+1]), 4*255)
+        negate3D(self.im8_2, self.im8_2)
+        negate3D(self.im8_1, self.im8_1)
+        erode3D(self.im8_1, self.im8_3, se=se)
+        (x,y,z) = compare3D(self.im8_3, self.im8_2, self.im8_1)
+        self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
+        
+    def testThreadsErodil3D(self):
+        """Verifies that the erosion and dilation do not depend on the thread number"""
+        threads = getThreadNumber()
+        im32_1 = image3DMb(64,64,12,32)
+        im32_2 = image3DMb(64,64,12,32)
+        im32_3 = image3DMb(64,64,12,32)
+        for i in range(12):
+            im32_1[i].loadRaw(bytes(random.randrange(256) for j in range(4*64*64)))
+        for grid in (CUBIC, FACE_CENTER_CUBIC, CENTER_CUBIC):
+            se = structuringElement3D(list(range(1,grid.maxNeighbors()+1)), grid)
+            for op in (erode3D, dilate3D):
+                setThreadNumber(1)
+                op(im32_1, im32_2, 2, se=se)
+                setThreadNumber(4)
+                op(im32_1, im32_3, 2, se=se)
+                (x,y,z) = compare3D(im32_3, im32_2, im32_3)
+                self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
+        setThreadNumber(threads)
+        
     def testNoZeroErode3D(self):
         """Verifies the erosion correct behavior when direction 0 is missing"""
         se = structuringElement3D(range(1,27), CUBIC)
@@ -169,6 +169,30 @@ class TestGeodesy3D(unittest.TestCase):
             (x,y,z) = compare3D(self.im1_3, self.im1_2, self.im1_3)
             self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
         
+    def testBuild3DRandom_1(self):
+        """Verifies the binary reconstructions against the 8-bit ones"""
+        for grid in (FACE_CENTER_CUBIC, CUBIC):
+            self.im8_1.loadRaw(bytes(random.choice((0, 255)) for i in range(64*64*64)))
+            threshold3D(self.im8_1, self.im1_1, 1, 255)
+            self.im1_2.reset()
+            for i in range(10):
+                self.im1_2.setPixel(1, (random.randrange(64), random.randrange(64),
+                                        random.randrange(64)))
+            convert3D(self.im1_1, self.im8_1)
+            convert3D(self.im1_2, self.im8_2)
+            build3D(self.im1_1, self.im1_2, grid=grid)
+            build3D(self.im8_1, self.im8_2, grid=grid)
+            convert3D(self.im8_2, self.im1_3)
+            (x,y,z) = compare3D(self.im1_2, self.im1_3, self.im1_3)
+            self.assertLess(x, 0, "%s: diff in (%d,%d,%d)"%(repr(grid),x,y,z))
+            negate3D(self.im1_2, self.im1_2)
+            convert3D(self.im1_2, self.im8_2)
+            dualBuild3D(self.im1_1, self.im1_2, grid=grid)
+            dualBuild3D(self.im8_1, self.im8_2, grid=grid)
+            convert3D(self.im8_2, self.im1_3)
+            (x,y,z) = compare3D(self.im1_2, self.im1_3, self.im1_3)
+            self.assertLess(x, 0, "%s: diff in (%d,%d,%d)"%(repr(grid),x,y,z))
+        
     def testDualBuild3D_8(self):
         """Tests the reconstruction (dual) operator on 8-bit 3D images"""
         grids = [FACE_CENTER_CUBIC, CUBIC]
@@ -89,7 +89,7 @@ class TestGrids3D(unittest.TestCase):
         self.assertEqual(grid.getZExtension(), 1)
         self.assertEqual(grid.getDirections(), range(17))
         self.assertEqual(grid.maxNeighbors(), 16)
-        self.assertEqual(grid.getCValue(), core.MB3D_INVALID_GRID)
+        self.assertEqual(grid.getCValue(), core.MB3D_CC_GRID)
         self.assertEqual(repr(grid), "mamba3D.CENTER_CUBIC")
         
     def testCubicGrid(self):
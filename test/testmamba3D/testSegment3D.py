@@ -76,18 +76,26 @@ class TestSegment3D(unittest.TestCase):
         self.assertRaises(MambaError, label3D, self.im8_1, self.im8_2)
         self.assertRaises(MambaError, label3D, self.im32_1, self.im1_2)
         self.assertRaises(MambaError, label3D, self.im32_1, self.im8_2)
+        self.assertRaises(MambaError, watershedSegment3D, self.im1_1, self.im32_2, slabs=True)
+        self.assertRaises(MambaError, watershedSegment3D, self.im8_1, self.im8_2, slabs=True)
+        self.assertRaises(MambaError, basinSegment3D, self.im1_1, self.im32_2, slabs=True)
+        self.assertRaises(MambaError, basinSegment3D, self.im8_1, self.im8_2, slabs=True)
 
     def testGridAcceptation(self):
         """Tests that incorrect grid raises an exception"""
         self.assertRaises(MambaError, watershedSegment3D, self.im8_1, self.im32_2, grid=CENTER_CUBIC)
         self.assertRaises(MambaError, basinSegment3D, self.im8_1, self.im32_2, grid=CENTER_CUBIC)
         self.assertRaises(MambaError, label3D, self.im1_1, self.im32_2, grid=CENTER_CUBIC)
+        self.assertRaises(MambaError, watershedSegment3D, self.im8_1, self.im32_2, grid=CENTER_CUBIC, slabs=True)
+        self.assertRaises(MambaError, basinSegment3D, self.im8_1, self.im32_2, grid=CENTER_CUBIC, slabs=True)
         
     def testSizeCheck(self):
         """Verifies that the functions check the size of the image"""
         self.assertRaises(MambaError, watershedSegment3D, self.im8_1, self.im32_5)
         self.assertRaises(MambaError, basinSegment3D, self.im8_1, self.im32_5)
         self.assertRaises(MambaError, label3D, self.im1_1, self.im32_5)
+        self.assertRaises(MambaError, watershedSegment3D, self.im8_1, self.im32_5, slabs=True)
+        self.assertRaises(MambaError, basinSegment3D, self.im8_1, self.im32_5, slabs=True)
         
     def _drawBox3D(self, im, size, value):
         (w,h,l) = im.getSize()
@@ -351,6 +359,53 @@ class TestSegment3D(unittest.TestCase):
             vol = computeVolume3D(self.im8_2)
             self.assertTrue(exp_vol1<=vol and exp_vol2>=vol, "wall at %d [%d,%d]: %d//%d//%d" %(i,l//2,(3*l)//4,vol,exp_vol1,exp_vol2))
             
+    def testBasinSegment3D_32_8(self):
+        """Verifies that the 32-bit basin segment 3D operator gives the 8-bit result"""
+        im8 = image3DMb(64,16,12,8)
+        im32_1 = image3DMb(64,16,12,32)
+        im32_2 = image3DMb(64,16,12,32)
+        im32_3 = image3DMb(64,16,12,32)
+        for i in range(12):
+            im8[i].loadRaw(bytes(random.randrange(6) for j in range(64*16)))
+        convert3D(im8, im32_1)
+        markers = [(random.randrange(64), random.randrange(16), random.randrange(12))
+                   for i in range(10)]
+        for grid in (CUBIC, FACE_CENTER_CUBIC):
+            for (imIn, imOut) in ((im8, im32_2), (im32_1, im32_3)):
+                imOut.reset()
+                for (i, pos) in enumerate(markers):
+                    imOut.setPixel(i%4+1, pos)
+                basinSegment3D(imIn, imOut, grid=grid)
+            (x,y,z) = compare3D(im32_3, im32_2, im32_3)
+            self.assertLess(x, 0, "diff in (%d,%d,%d) with %s"%(x,y,z,repr(grid)))
+            
+    def testThreadsSegment3D(self):
+        """Verifies that the flooding by slabs gives the serial watershed and basins"""
+        threads = getThreadNumber()
+        im8 = image3DMb(64,16,12,8)
+        im32_1 = image3DMb(64,16,12,32)
+        im32_2 = image3DMb(64,16,12,32)
+        im32_3 = image3DMb(64,16,12,32)
+        for i in range(12):
+            im8[i].loadRaw(bytes(random.randrange(6) for j in range(64*16)))
+        convert3D(im8, im32_1)
+        mulConst3D(im32_1, 100000, im32_1)
+        markers = [(random.randrange(64), random.randrange(16), random.randrange(12))
+                   for i in range(10)]
+        for (imIn, level) in ((im8, 3), (im32_1, 300000)):
+            for grid in (CUBIC, FACE_CENTER_CUBIC):
+                for op in (watershedSegment3D, basinSegment3D):
+                    for max_level in (0, level):
+                        for (n, slabs, imOut) in ((1, False, im32_2), (4, True, im32_3)):
+                            imOut.reset()
+                            for (i, pos) in enumerate(markers):
+                                imOut.setPixel(i%4+1, pos)
+                            setThreadNumber(n)
+                            op(imIn, imOut, grid=grid, max_level=max_level, slabs=slabs)
+                        (x,y,z) = compare3D(im32_3, im32_2, im32_3)
+                        self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
+        setThreadNumber(threads)
+            
     def _drawWells(self, imOut, wall=[1,2,3,4]):
         (w,h,l) = imOut.getSize()
         
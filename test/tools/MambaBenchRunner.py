@@ -0,0 +1,193 @@
+"""
+Module defining the benchmark runner used by the Mamba Benchmark Platform.
+
+A benchmark module defines a list named BENCHMARKS of Benchmark objects. Each
+benchmark is run for every requested image size and for each of its depths
+and grids. The measured times can be saved in a JSON file and compared with
+the times of a previous run (the baseline).
+"""
+
+
+#Permission is hereby granted, free of charge, to any person
+#obtaining a copy of this software and associated documentation files
+#(the "Software"), to deal in the Software without restriction, including
+#without limitation the rights to use, copy, modify, merge, publish, 
+#distribute, sublicense, and/or sell copies of the Software, and to permit 
+#persons to whom the Software is furnished to do so, subject to the following 
+#conditions: The above copyright notice and this permission notice shall be 
+#included in all copies or substantial portions of the Software.
+
+#Except as contained in this notice, the names of the above copyright 
+#holders shall not be used in advertising or otherwise to promote the sale, 
+#use or other dealings in this Software without their prior written 
+#authorization.
+
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+import os
+import sys
+import json
+import time
+import platform
+
+import mamba
+import mamba.core as core
+
+# Format version of the JSON results files
+RESULTS_VERSION = 1
+
+def randomImage(size, depth):
+    """
+    Returns a square image of the given size and depth filled with random
+    pixels (binary images have about half of their pixels set). The values
+    of 32-bit images are limited to 16 bits, which is the usual range of
+    labels and distances (and keeps the hierarchical operators tractable).
+    """
+    im = mamba.imageMb(size, size, depth)
+    if depth==8:
+        im.loadRaw(os.urandom(size*size))
+        return im
+    imWrk = mamba.imageMb(im, 8)
+    imWrk.loadRaw(os.urandom(size*size))
+    if depth==1:
+        mamba.threshold(imWrk, im, 128, 255)
+    else:
+        im.reset()
+        mamba.copyBytePlane(imWrk, 0, im)
+        imWrk.loadRaw(os.urandom(size*size))
+        mamba.copyBytePlane(imWrk, 1, im)
+    return im
+
+class Benchmark:
+    """
+    A benchmark measures the time taken by a function over images.
+    
+    'setup' is called with the image size, depth and grid to measure and
+    returns the function to time (without argument). 'depths' gives the
+    image depths and 'grids' the grids (None when the grid is not relevant)
+    to measure. 'maxSize' limits the image size for slow operators. 'length'
+    is the number of planes of the images of 3D benchmarks.
+    """
+    def __init__(self, name, setup, depths=(8,), grids=(None,), maxSize=None, length=1):
+        self.name = name
+        self.setup = setup
+        self.depths = depths
+        self.grids = grids
+        self.maxSize = maxSize
+        self.length = length
+        
+    def cases(self, sizes):
+        "yields the (size, depth, grid) measured for the given image sizes"
+        for size in sizes:
+            if self.maxSize and size>self.maxSize:
+                continue
+            for depth in self.depths:
+                for grid in self.grids:
+                    yield (size, depth, grid)
+
+def resultKey(result):
+    "returns the key identifying a measure inside a result file"
+    return (result["name"], result["size"], result["depth"], result["grid"])
+
+class MambaBenchRunner:
+    """A benchmark runner class.
+    
+    This class runs the benchmarks of the given modules, keeps the best time
+    of several measures of each case, and writes or compares the results.
+    """
+    def __init__(self, repeat=3, minTime=0.05, stream=sys.stdout):
+        self.repeat = repeat
+        self.minTime = minTime
+        self.stream = stream
+        self.results = []
+        
+    def _measure(self, func):
+        # Returns the best time of a single call to func. Fast functions are
+        # called several times in a row to get a meaningful measure.
+        func()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter()-start
+        loops = max(1, int(self.minTime/max(elapsed, 1e-9)))
+        best = elapsed
+        for i in range(self.repeat):
+            start = time.perf_counter()
+            for j in range(loops):
+                func()
+            best = min(best, (time.perf_counter()-start)/loops)
+        return best
+        
+    def runModule(self, module, sizes, pattern=None):
+        "runs the benchmarks defined in the module given into argument"
+        __import__(module)
+        benchMod = sys.modules[module]
+        for bench in benchMod.BENCHMARKS:
+            if pattern and pattern not in bench.name:
+                continue
+            for size, depth, grid in bench.cases(sizes):
+                func = bench.setup(size, depth, grid)
+                t = self._measure(func)
+                del(func)
+                result = {
+                    "name": bench.name,
+                    "size": size,
+                    "depth": depth,
+                    "grid": grid is not None and repr(grid) or None,
+                    "time": t,
+                    "mpixs": size*size*bench.length/t/1e6,
+                }
+                self.results.append(result)
+                self.stream.write("%-32s %5d %2d-bit %-9s %12.6fs %10.1f Mpix/s\n" %
+                    (result["name"], size, depth, result["grid"] or "",
+                     t, result["mpixs"]))
+                self.stream.flush()
+                
+    def save(self, path):
+        "writes the results in JSON file 'path'"
+        content = {
+            "version": RESULTS_VERSION,
+            "mamba": mamba.VERSION,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "threads": mamba.getThreadNumber(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": self.results,
+        }
+        with open(path, "w") as f:
+            json.dump(content, f, indent=1, sort_keys=True)
+            
+    def compare(self, path, ratio):
+        """
+        Compares the results with the ones stored in JSON file 'path'. The
+        measures that are more than 'ratio' times slower than their baseline
+        are reported as regressions and returned.
+        """
+        with open(path) as f:
+            baseline = json.load(f)
+        reference = dict((resultKey(r), r["time"]) for r in baseline["results"])
+        regressions = []
+        self.stream.write("\nComparison with %s (mamba %s, %s)\n" %
+            (path, baseline.get("mamba"), baseline.get("date")))
+        for result in self.results:
+            key = resultKey(result)
+            if key not in reference:
+                continue
+            speedup = reference[key]/result["time"]
+            if speedup*ratio<1.0:
+                regressions.append((result, speedup))
+                status = "REGRESSION"
+            else:
+                status = ""
+            self.stream.write("%-32s %5d %2d-bit %-9s x%6.2f %s\n" %
+                (result["name"], result["size"], result["depth"],
+                 result["grid"] or "", speedup, status))
+        self.stream.write("%d regression(s) (tolerated slowdown: x%.2f)\n" %
+            (len(regressions), ratio))
+        return regressions
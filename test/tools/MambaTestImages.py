@@ -0,0 +1,54 @@
+"""
+Test images shared by the test cases of the Mamba Test Platform.
+"""
+
+#Permission is hereby granted, free of charge, to any person
+#obtaining a copy of this software and associated documentation files
+#(the "Software"), to deal in the Software without restriction, including
+#without limitation the rights to use, copy, modify, merge, publish, 
+#distribute, sublicense, and/or sell copies of the Software, and to permit 
+#persons to whom the Software is furnished to do so, subject to the following 
+#conditions: The above copyright notice and this permission notice shall be 
+#included in all copies or substantial portions of the Software.
+
+#Except as contained in this notice, the names of the above copyright 
+#holders shall not be used in advertising or otherwise to promote the sale, 
+#use or other dealings in this Software without their prior written 
+#authorization.
+
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+from mamba import *
+import random
+
+def sparseLevelImages(width, height, maxval):
+    """
+    Returns the 32-bit images (imRef, imSparse, imMarkers) and a function
+    sparseLevel of size 'width'x'height'. 'imRef' holds a random image with
+    levels 0 to 99 and flat basins. 'imSparse' holds the same image with
+    level v replaced by sparseLevel(v), the levels being spread up to
+    'maxval' (level 99). 'imMarkers' holds the labelled minima of the image.
+    sparseLevel(0) is 0 so that it can be given as max_level.
+    """
+    im8 = imageMb(width, height, 8)
+    im8.loadRaw(bytes(random.randint(0, 99) for i in range(width*height)))
+    closing(im8, im8)
+    im8.setPixel(99, (0, 0))
+    step = maxval//99
+    offset = maxval-99*step
+    imRef = imageMb(width, height, 32)
+    imSparse = imageMb(width, height, 32)
+    imMarkers = imageMb(width, height, 32)
+    convert(im8, imRef)
+    mulConst(imRef, step, imSparse)
+    addConst(imSparse, offset, imSparse)
+    imWrk = imageMb(width, height, 1)
+    minima(im8, imWrk)
+    label(imWrk, imMarkers)
+    return (imRef, imSparse, imMarkers, lambda v: v and v*step+offset)